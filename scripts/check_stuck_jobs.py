@@ -3,7 +3,9 @@
 Script to check for stuck jobs in the database and optionally mark them as failed.
 
 This helps diagnose and fix issues where jobs get stuck in 'pending' or 'processing' 
-state due to backend crashes or timeouts.
+state due to backend crashes or timeouts. Jobs still in the generation queue
+are skipped: the queue reaper requeues or fails them when their worker's
+lease expires (see mobius/storage/job_queue.py).
 """
 
 import asyncio
@@ -35,7 +37,7 @@ async def find_stuck_jobs(older_than_minutes: int = 5) -> List[Job]:
             else:
                 created_at = job.created_at
                 
-            if created_at < cutoff_time:
+            if created_at < cutoff_time and job.queued_at is None:
                 stuck_jobs.append(job)
     
     return stuck_jobs
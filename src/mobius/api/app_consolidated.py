@@ -47,6 +47,9 @@ image = (
         "fastapi>=0.104.0",
         "python-multipart>=0.0.6",
         "langgraph>=0.0.20",
+        "langgraph-checkpoint-postgres>=2.0.0",  # Durable workflow checkpoints
+        "psycopg[binary]>=3.1.0",
+        "psycopg-pool>=3.2.0",
         "pydantic>=2.0.0",
         "pydantic-settings>=2.0.0",
         "supabase>=2.0.0",
@@ -59,6 +62,9 @@ image = (
         "structlog>=23.0.0",
         "tenacity>=8.2.0",
         "tiktoken>=0.5.0",
+        "zstandard>=0.22.0",  # Compressed archived job state
+        "numpy>=1.26.0",
+        "scipy>=1.11.0",  # Sparse brand similarity index
         "hypothesis>=6.0.0",
         "neo4j>=5.14.0",  # Neo4j Python driver for graph database
         "certifi>=2023.0.0",  # CA bundle for SSL certificate verification
@@ -259,155 +265,53 @@ Return strict JSON matching the schema. Be decisive - make your best inference e
 
 # Generation worker function - runs in separate container for long-running generation workflows
 @app.function(image=image, secrets=secrets, timeout=600)  # 10 min timeout for generation
-def run_generation_worker(job_id: str, brand_id: str, prompt: str, template_id: str = None, generation_params: dict = None):
+def run_generation_worker():
     """
-    Background worker for image generation workflow.
-    
-    This function runs in a separate Modal container, independent of the HTTP request.
-    It executes the full generation workflow (generate → audit → finalize) and updates
-    job status in Supabase throughout the process.
-    
-    Args:
-        job_id: Unique job identifier
-        brand_id: Brand ID to generate for
-        prompt: User's generation prompt
-        template_id: Optional template ID
-        generation_params: Optional additional generation parameters
-    
+    Background worker for the durable generation queue.
+
+    Spawned by /v1/generate after it queues a job (and run every minute by
+    drain_generation_queue). Claims queued jobs in batches, runs each
+    generation workflow (generate → audit → finalize) under a lease renewed
+    by a heartbeat, and exits once the queue is empty. Jobs of a container
+    that dies are requeued when their lease expires
+    (see mobius/storage/job_queue.py).
+
     Returns:
-        dict with final job status and results
+        dict with the worker's counters
     """
     import sys
     sys.path.insert(0, "/root")
     
     import asyncio
     import structlog
-    from datetime import datetime, timezone
     
     logger = structlog.get_logger()
     
-    logger.info(
-        "generation_worker_started",
-        job_id=job_id,
-        brand_id=brand_id,
-        prompt=prompt[:100] if prompt else None,
-    )
-    
-    async def run_workflow():
-        from mobius.storage.jobs import JobStorage
-        from mobius.graphs.generation import run_generation_workflow
-        
-        job_storage = JobStorage()
-        
+    async def main():
+        from mobius.api.job_cancellation import start_job_cancel_bus
+        from mobius.api.job_events import job_event_bus
+        from mobius.storage.job_queue import GenerationWorker
+
+        worker = GenerationWorker()
+        logger.info("generation_worker_started", owner=worker.owner)
+        # Cancelled jobs stop as soon as the cancellation is broadcast
+        cancel_bus = await start_job_cancel_bus()
         try:
-            # Update job to processing state
-            await job_storage.update_job(job_id, {
-                "status": "processing",
-                "progress": 10.0,
-                "state": {
-                    "prompt": prompt,
-                    "brand_id": brand_id,
-                    "template_id": template_id,
-                    "started_at": datetime.now(timezone.utc).isoformat(),
-                }
-            })
-            
-            logger.info("generation_worker_processing", job_id=job_id)
-            
-            # Run the generation workflow
-            final_state = await run_generation_workflow(
-                brand_id=brand_id,
-                prompt=prompt,
-                job_id=job_id,
-                template_id=template_id,
-                **(generation_params or {})
-            )
-            
-            # Extract results
-            image_url = final_state.get("current_image_url") or final_state.get("image_uri")
-            status = final_state.get("status", "completed")
-            
-            # Debug logging to diagnose image URL issues
-            logger.info(
-                "final_state_debug",
-                job_id=job_id,
-                status=status,
-                current_image_url=final_state.get("current_image_url", "NOT_FOUND")[:100] if final_state.get("current_image_url") else "NOT_FOUND",
-                image_uri=final_state.get("image_uri", "NOT_FOUND")[:100] if final_state.get("image_uri") else "NOT_FOUND",
-                extracted_image_url=image_url[:100] if image_url else "NONE",
-                final_state_keys=list(final_state.keys()),
-            )
-            
-            # Update job with final state
-            # Set progress based on status - needs_review is 75%, completed is 100%
-            progress = 75.0 if status == "needs_review" else 100.0
-            
-            await job_storage.update_job(job_id, {
-                "status": status,
-                "progress": progress,
-                "state": {
-                    "prompt": prompt,
-                    "brand_id": brand_id,
-                    "template_id": template_id,
-                    "compliance_scores": final_state.get("compliance_scores", []),
-                    "is_approved": final_state.get("is_approved", False),
-                    "attempt_count": final_state.get("attempt_count", 0),
-                    "image_uri": image_url,
-                    "completed_at": datetime.now(timezone.utc).isoformat(),
-                }
-            })
-            
-            logger.info(
-                "generation_worker_completed",
-                job_id=job_id,
-                status=status,
-                has_image=bool(image_url),
-            )
-            
-            return {
-                "job_id": job_id,
-                "status": status,
-                "image_url": image_url,
-                "is_approved": final_state.get("is_approved", False),
-            }
-            
-        except Exception as e:
-            logger.error(
-                "generation_worker_failed",
-                job_id=job_id,
-                error=str(e),
-                error_type=type(e).__name__,
-            )
-            
-            # Update job with error status
-            try:
-                await job_storage.update_job(job_id, {
-                    "status": "failed",
-                    "progress": 0.0,
-                    "state": {
-                        "prompt": prompt,
-                        "brand_id": brand_id,
-                        "error": str(e),
-                        "error_type": type(e).__name__,
-                        "failed_at": datetime.now(timezone.utc).isoformat(),
-                    }
-                })
-            except Exception as update_error:
-                logger.error("failed_to_update_job_status", job_id=job_id, error=str(update_error))
-            
-            return {
-                "job_id": job_id,
-                "status": "failed",
-                "error": str(e),
-            }
-    
+            await worker.run(until_empty=True)
+        finally:
+            await cancel_bus.close()
+            # Deliver queued live events before the container exits
+            await job_event_bus.close()
+        logger.info("generation_worker_completed", **worker.stats())
+        return worker.stats()
+
     # Run the async workflow
-    return asyncio.run(run_workflow())
+    return asyncio.run(main())
 
 
 # Resume workflow worker - runs in separate container for tweak/regenerate operations
 @app.function(image=image, secrets=secrets, timeout=600)  # 10 min timeout
-def run_resume_workflow_worker(job_id: str, resume_state: dict):
+def run_resume_workflow_worker(job_id: str, resume_state: dict, resume_updates: dict = None):
     """
     Background worker for resuming workflow after user review decision.
     
@@ -417,6 +321,8 @@ def run_resume_workflow_worker(job_id: str, resume_state: dict):
     Args:
         job_id: Unique job identifier
         resume_state: The job state to resume from (includes prompt, brand_id, previous image, etc.)
+        resume_updates: The review decision to apply to the checkpointed workflow
+            state; resume_state is only used when the job has no checkpoint
     
     Returns:
         dict with final job status and results
@@ -437,9 +343,15 @@ def run_resume_workflow_worker(job_id: str, resume_state: dict):
         has_previous_image=bool(resume_state.get("current_image_url")),
     )
     
+    from mobius.api.job_cancellation import JobCancelledError, job_cancellations
+    from mobius.config import settings
+    from mobius.graphs.generation import DEADLINE_GRACE_SECONDS
+    from mobius.utils.deadline import new_deadline
+
     async def run_workflow():
         from mobius.storage.jobs import JobStorage
-        from mobius.graphs.generation import create_generation_workflow
+        from mobius.graphs.checkpoint import workflow_checkpointer
+        from mobius.graphs.registry import get_generation_workflow
         
         job_storage = JobStorage()
         
@@ -452,11 +364,30 @@ def run_resume_workflow_worker(job_id: str, resume_state: dict):
             
             logger.info("resume_workflow_worker_processing", job_id=job_id)
             
-            # Create and run workflow
-            workflow = create_generation_workflow()
+            # Run the compiled workflow (compiled once per container),
+            # continuing the checkpointed run when there is one
+            workflow = get_generation_workflow()
+
+            # The resumed run gets a deadline budget of its own
+            deadline_at = new_deadline()
+
+            async def resume():
+                updates = resume_updates or {"user_decision": resume_state.get("user_decision")}
+                final_state = await workflow_checkpointer.resume(
+                    workflow, job_id, {**updates, "deadline_at": deadline_at}
+                )
+                if final_state is None:
+                    config = await workflow_checkpointer.thread_config(job_id)
+                    final_state = await workflow.ainvoke(
+                        {**resume_state, "deadline_at": deadline_at}, config=config
+                    )
+                return final_state
+
+            # Registered by job_id so cancelling the job stops the run; the
+            # timeout only catches a step that overruns the deadline budget
             final_state = await asyncio.wait_for(
-                asyncio.shield(workflow.ainvoke(resume_state)),
-                timeout=300.0  # 5 minutes
+                job_cancellations.run(job_id, resume()),
+                timeout=settings.generation_deadline_seconds + DEADLINE_GRACE_SECONDS
             )
             
             # Extract results
@@ -494,6 +425,13 @@ def run_resume_workflow_worker(job_id: str, resume_state: dict):
                 "image_url": image_url,
             }
             
+        except JobCancelledError:
+            logger.info("resume_workflow_worker_cancelled", job_id=job_id)
+            return {
+                "job_id": job_id,
+                "status": "cancelled",
+            }
+
         except Exception as e:
             logger.error(
                 "resume_workflow_worker_failed",
@@ -523,8 +461,20 @@ def run_resume_workflow_worker(job_id: str, resume_state: dict):
                 "error": str(e),
             }
     
+    async def main():
+        from mobius.api.job_cancellation import start_job_cancel_bus
+        from mobius.api.job_events import job_event_bus
+
+        cancel_bus = await start_job_cancel_bus()
+        try:
+            return await run_workflow()
+        finally:
+            await cancel_bus.close()
+            # Deliver queued live events before the container exits
+            await job_event_bus.close()
+
     # Run the async workflow
-    return asyncio.run(run_workflow())
+    return asyncio.run(main())
 
 
 # Mount FastAPI app to Modal
@@ -818,6 +768,14 @@ def fastapi_app():
         from mobius.api.routes import delete_brand_handler
         result = await delete_brand_handler(brand_id=brand_id)
         return result
+
+    @web_app.get("/v1/brands/{brand_id}/assets")
+    @handle_api_errors(logger=logger)
+    async def list_assets(brand_id: str, limit: int = 100, cursor: str = None):
+        """List a brand's assets, newest first (cursor paginated)."""
+        from mobius.api.routes import list_assets_handler
+        result = await list_assets_handler(brand_id=brand_id, limit=limit, cursor=cursor)
+        return result
     
     # Generation Routes
     
@@ -827,6 +785,15 @@ def fastapi_app():
         from mobius.api.errors import MobiusError, ValidationError
         from mobius.storage.jobs import JobStorage
         from mobius.storage.brands import BrandStorage
+        from mobius.storage.brand_cache import brand_cache
+        from mobius.storage.result_cache import (
+            CACHE_MODES,
+            CACHE_OFF,
+            CACHE_USE,
+            cached_compliance_score,
+            result_cache,
+            result_cache_key,
+        )
         from mobius.api.utils import generate_request_id
         import uuid
         from datetime import datetime, timezone
@@ -841,6 +808,7 @@ def fastapi_app():
             async_mode = data.get("async_mode", True)  # Default to async for Modal
             idempotency_key = data.get("idempotency_key")
             generation_params = data.get("generation_params", {})
+            cache = data.get("cache") or request.query_params.get("cache", CACHE_OFF)
             
             # Validate required fields
             if not brand_id:
@@ -856,16 +824,52 @@ def fastapi_app():
                     message="prompt is required",
                     request_id=request_id,
                 )
+
+            if cache not in CACHE_MODES:
+                raise ValidationError(
+                    code="INVALID_CACHE_MODE",
+                    message=f"cache must be one of {', '.join(CACHE_MODES)}",
+                    request_id=request_id,
+                    details={"cache": cache},
+                )
             
             # Verify brand exists
-            brand_storage = BrandStorage()
-            brand = await brand_storage.get_brand(brand_id)
+            brand = await brand_cache.get(brand_id, storage=BrandStorage())
             if not brand:
                 raise ValidationError(
                     code="BRAND_NOT_FOUND",
                     message=f"Brand {brand_id} not found",
                     request_id=request_id,
                 )
+
+            # Opt-in result cache (see storage/result_cache.py)
+            cache_key = None
+            if cache != CACHE_OFF:
+                cache_key = result_cache_key(brand, {"prompt": prompt, **generation_params}, template_id)
+                if cache == CACHE_USE:
+                    cached_job = await result_cache.lookup(cache_key)
+                    if cached_job:
+                        return {
+                            "job_id": cached_job.job_id,
+                            "status": cached_job.status,
+                            "message": "Cached result returned (identical request already approved)",
+                            "image_url": cached_job.state.get("image_uri"),
+                            "compliance_score": cached_compliance_score(cached_job),
+                            "request_id": request_id,
+                            "cached": True,
+                        }
+                else:
+                    result_cache.record_refresh(cache_key)
+
+                # Identical request still queued or running: return its job
+                inflight_job = await result_cache.find_inflight(cache_key)
+                if inflight_job:
+                    return {
+                        "job_id": inflight_job.job_id,
+                        "status": inflight_job.status,
+                        "message": "Identical request already in progress. Poll /v1/jobs/{job_id} for status.",
+                        "request_id": request_id,
+                    }
             
             logger.info(
                 "generation_request_received",
@@ -880,6 +884,7 @@ def fastapi_app():
             job_storage = JobStorage()
             
             from mobius.models.job import Job
+            from mobius.storage.job_queue import PRIORITY_STANDARD
             job = Job(
                 job_id=job_id,
                 brand_id=brand_id,
@@ -889,9 +894,15 @@ def fastapi_app():
                     "prompt": prompt,
                     "brand_id": brand_id,
                     "template_id": template_id,
+                    "generation_params": generation_params,
                     "created_at": datetime.now(timezone.utc).isoformat(),
                 },
                 idempotency_key=idempotency_key,
+                result_cache_key=cache_key,
+                # Queued for generation workers until one finishes it
+                queued_at=datetime.now(timezone.utc),
+                queue_priority=PRIORITY_STANDARD,
+                organization_id=brand.organization_id,
             )
             await job_storage.create_job(job)
             
@@ -902,15 +913,10 @@ def fastapi_app():
                 brand_id=brand_id,
             )
             
-            # Spawn background worker using Modal's spawn()
-            # This runs in a separate container with its own 10-minute timeout
-            run_generation_worker.spawn(
-                job_id=job_id,
-                brand_id=brand_id,
-                prompt=prompt,
-                template_id=template_id,
-                generation_params=generation_params,
-            )
+            # Spawn a queue worker using Modal's spawn() so the job starts now.
+            # It runs in a separate container with its own 10-minute timeout;
+            # if that container dies, the job's lease expires and it is retried.
+            run_generation_worker.spawn()
             
             logger.info(
                 "generation_worker_spawned",
@@ -946,8 +952,82 @@ def fastapi_app():
                 }
             )
     
+    @web_app.post("/v1/generate/batch")
+    async def generate_batch(request: Request):
+        """Queue a batch of generations for one brand on Modal background workers."""
+        from mobius.api.routes import generate_batch_handler
+        from mobius.api.errors import MobiusError
+        from mobius.config import settings
+        import math
+
+        try:
+            data = await request.json()
+            result = await generate_batch_handler(
+                brand_id=data.get("brand_id"),
+                prompts=data.get("prompts"),
+                prompt=data.get("prompt"),
+                variations=data.get("variations"),
+                template_id=data.get("template_id"),
+                idempotency_key=data.get("idempotency_key"),
+                start_worker=False,
+                **data.get("generation_params", {}),
+            )
+
+            # Enough workers for the batch's share of the slots, but no more
+            # than the organization's concurrency cap can keep busy
+            batch_slots = max(
+                1, int(settings.generation_queue_concurrency * settings.generation_queue_batch_share)
+            )
+            workers = min(
+                math.ceil(result["total"] / batch_slots),
+                math.ceil(settings.generation_queue_org_max_concurrency / batch_slots),
+            )
+            for _ in range(workers):
+                run_generation_worker.spawn()
+
+            logger.info(
+                "batch_generation_workers_spawned",
+                batch_id=result["batch_id"],
+                workers=workers,
+            )
+            return result
+
+        except MobiusError as e:
+            logger.error("endpoint_error", error=str(e))
+            return JSONResponse(
+                status_code=e.status_code,
+                content={"error": e.error_response.model_dump()}
+            )
+        except Exception as e:
+            logger.error("unexpected_error", error=str(e))
+            return JSONResponse(
+                status_code=500,
+                content={
+                    "error": {
+                        "code": "INTERNAL_ERROR",
+                        "message": "An unexpected error occurred",
+                        "details": {"error": str(e)},
+                    }
+                }
+            )
+
     # Job Management Routes
     
+    @web_app.get("/v1/jobs")
+    @handle_api_errors(logger=logger)
+    async def list_jobs(
+        brand_id: str = None,
+        status: str = None,
+        limit: int = 100,
+        cursor: str = None,
+    ):
+        """List jobs, newest first (cursor paginated)."""
+        from mobius.api.routes import list_jobs_handler
+        result = await list_jobs_handler(
+            brand_id=brand_id, status=status, limit=limit, cursor=cursor
+        )
+        return result
+
     @web_app.get("/v1/jobs/{job_id}")
     async def get_job_status(job_id: str):
         """Get job status and results."""
@@ -1051,6 +1131,8 @@ def fastapi_app():
             
             state = job.state or {}
             state["user_decision"] = decision
+            # Changes applied to the checkpointed workflow state on resume
+            resume_updates = {"user_decision": decision}
             
             if decision == "approve":
                 # Simple approval - just update status
@@ -1119,6 +1201,10 @@ def fastapi_app():
                     state["current_image_url"] = previous_image
                 state["is_tweak"] = True
                 state["user_tweak_instruction"] = tweak_instruction
+                resume_updates.update({
+                    "prompt": correction_prompt,
+                    "user_tweak_instruction": tweak_instruction,
+                })
                 
                 logger.info(
                     "job_tweak_prepared",
@@ -1135,6 +1221,13 @@ def fastapi_app():
                 state["current_image_url"] = None
                 state["audit_history"] = []
                 state["is_tweak"] = False
+                resume_updates.update({
+                    "session_id": None,
+                    "attempt_count": 0,
+                    "current_image_url": None,
+                    "image_data_uri": None,
+                    "audit_history": [],
+                })
             
             # Update job to processing and prepare resume state
             state["needs_review"] = False
@@ -1156,7 +1249,8 @@ def fastapi_app():
             # Spawn background worker - returns immediately
             run_resume_workflow_worker.spawn(
                 job_id=job_id,
-                resume_state=resume_state
+                resume_state=resume_state,
+                resume_updates=resume_updates
             )
             
             logger.info(
@@ -1261,12 +1355,14 @@ def fastapi_app():
             )
     
     @web_app.get("/v1/templates")
-    async def list_templates(brand_id: str, limit: int = 100):
-        """List all templates for a brand."""
+    async def list_templates(brand_id: str, limit: int = 100, cursor: str = None):
+        """List templates for a brand, newest first (cursor paginated)."""
         from mobius.api.routes import list_templates_handler
         from mobius.api.errors import MobiusError
         try:
-            result = await list_templates_handler(brand_id=brand_id, limit=limit)
+            result = await list_templates_handler(
+                brand_id=brand_id, limit=limit, cursor=cursor
+            )
             return result
         except MobiusError as e:
             logger.error("endpoint_error", error=str(e))
@@ -1402,6 +1498,14 @@ def fastapi_app():
                 }
             )
     
+    @web_app.get("/v1/brands/{brand_id}/feedback/events")
+    @handle_api_errors(logger=logger)
+    async def list_feedback(brand_id: str, limit: int = 100, cursor: str = None):
+        """List feedback events for a brand, newest first (cursor paginated)."""
+        from mobius.api.routes import list_feedback_handler
+        result = await list_feedback_handler(brand_id=brand_id, limit=limit, cursor=cursor)
+        return result
+    
     # System Routes
     
     @web_app.get("/v1/health")
@@ -1487,6 +1591,28 @@ def fastapi_app():
                 }
             )
 
+    @web_app.post("/v1/graph/resync")
+    @handle_api_errors(logger=logger)
+    async def start_graph_resync(request: Request):
+        """Resync one organization's data into Neo4j in the background."""
+        from mobius.api.routes import start_graph_resync_handler
+        data = await request.json()
+        result = await start_graph_resync_handler(
+            organization_id=data.get("organization_id") if isinstance(data, dict) else None
+        )
+        lease_owner = result.pop("lease_owner", None)
+        if result.pop("start"):
+            run_graph_backfill.spawn(run_id=result["run_id"], lease_owner=lease_owner)
+        return result
+
+    @web_app.get("/v1/graph/resync/{run_id}")
+    @handle_api_errors(logger=logger)
+    async def get_graph_resync(run_id: str):
+        """Get graph resync progress."""
+        from mobius.api.routes import get_graph_resync_handler
+        result = await get_graph_resync_handler(run_id=run_id)
+        return result
+
     @web_app.get("/v1/brands/{brand_id}/graph")
     async def brand_graph(brand_id: str):
         """Get graph relationships for a brand."""
@@ -1515,14 +1641,15 @@ def fastapi_app():
             )
 
     @web_app.get("/v1/brands/{brand_id}/similar")
-    async def similar_brands(brand_id: str, min_shared_colors: int = 3):
+    async def similar_brands(brand_id: str, min_shared_colors: int = 3, weighted: bool = False):
         """Find brands with similar color palettes."""
         from mobius.api.routes import find_similar_brands_handler
         from mobius.api.errors import MobiusError
         try:
             result = await find_similar_brands_handler(
                 brand_id=brand_id,
-                min_shared_colors=min_shared_colors
+                min_shared_colors=min_shared_colors,
+                weighted=weighted
             )
             return result
         except MobiusError as e:
@@ -1545,12 +1672,16 @@ def fastapi_app():
             )
 
     @web_app.get("/v1/colors/{hex}/brands")
-    async def color_relationships(hex: str):
-        """Find all brands using a specific color."""
+    async def color_relationships(
+        hex: str, tolerance: float = None, limit: int = 100, offset: int = 0
+    ):
+        """Find all brands using a specific color (or a perceptually close one, paged)."""
         from mobius.api.routes import find_color_relationships_handler
         from mobius.api.errors import MobiusError
         try:
-            result = await find_color_relationships_handler(hex=hex)
+            result = await find_color_relationships_handler(
+                hex=hex, tolerance=tolerance, limit=limit, offset=offset
+            )
             return result
         except MobiusError as e:
             logger.error("endpoint_error", error=str(e))
@@ -1606,6 +1737,72 @@ def fastapi_app():
         from mobius.api.websocket_handlers import websocket_monitoring_endpoint
         await websocket_monitoring_endpoint(websocket, job_id)
 
+    @web_app.websocket("/ws/jobs")
+    async def websocket_jobs(websocket: WebSocket):
+        """Multiplexed WebSocket endpoint: subscribe to many jobs or brands on one connection."""
+        from mobius.api.websocket_handlers import websocket_multiplexed_endpoint
+        await websocket_multiplexed_endpoint(websocket)
+
+    @web_app.on_event("startup")
+    async def warm_up_workflows():
+        """Compile the LangGraph workflows before the first resume/tweak request."""
+        from mobius.config import settings
+        from mobius.graphs.registry import workflow_registry
+        if settings.workflow_warmup:
+            workflow_registry.warm_up()
+
+    @web_app.on_event("startup")
+    async def start_job_event_bus():
+        """Receive job events published by generation workers."""
+        from mobius.api.websocket_handlers import job_event_bus
+        try:
+            await job_event_bus.start()
+        except Exception as e:
+            # Live monitoring degrades to polling; the API still serves requests
+            logger.error("job_event_bus_start_failed", error=str(e))
+
+    @web_app.on_event("shutdown")
+    async def close_job_event_bus():
+        from mobius.api.websocket_handlers import job_event_bus
+        await job_event_bus.close()
+
+    @web_app.on_event("startup")
+    async def start_job_cancel_bus():
+        """Broadcast job cancellations to workers and receive them for local runs."""
+        from mobius.api.job_cancellation import start_job_cancel_bus
+        await start_job_cancel_bus()
+
+    @web_app.on_event("shutdown")
+    async def close_job_cancel_bus():
+        from mobius.api.job_cancellation import job_cancellations
+        if job_cancellations.bus is not None:
+            await job_cancellations.bus.close()
+
+    @web_app.on_event("startup")
+    async def start_graph_cache_bus():
+        """Evict graph query cache entries invalidated by the outbox drainer."""
+        from mobius.storage.graph import create_graph_cache_bus, graph_storage
+
+        bus = create_graph_cache_bus()
+        graph_storage.attach_invalidation_bus(bus)
+        try:
+            await bus.start()
+        except Exception as e:
+            # Entries written elsewhere are then only refreshed by the cache TTL
+            logger.error("graph_cache_bus_start_failed", error=str(e))
+
+    @web_app.on_event("shutdown")
+    async def close_graph_cache_bus():
+        from mobius.storage.graph import graph_storage
+        if graph_storage.invalidation_bus is not None:
+            await graph_storage.invalidation_bus.close()
+
+    @web_app.get("/v1/health/websockets")
+    async def websocket_health():
+        """WebSocket send queue depth, drops, lag and event replay for this container."""
+        from mobius.api.websocket_handlers import connection_manager, job_event_log
+        return {**connection_manager.get_connection_stats(), "replay": job_event_log.stats()}
+
     # Dashboard UI
 
     @web_app.get("/")
@@ -1717,3 +1914,110 @@ async def cleanup_expired_jobs():
     except Exception as e:
         logger.error("cleanup_job_failed", error=str(e))
         raise
+
+
+# Bulk Graph Backfill Worker
+@app.function(image=image, secrets=secrets, timeout=3600)
+async def run_graph_backfill(run_id: str, lease_owner: str = None):
+    """
+    Run or resume a checkpointed graph backfill (see mobius/storage/graph_backfill.py).
+
+    Spawned by POST /v1/graph/resync with the lease it claimed on the run;
+    the run row carries the organization.
+    """
+    import sys
+    sys.path.insert(0, "/root")  # Add mounted source to Python path
+
+    from mobius.storage.graph import create_graph_cache_bus, graph_storage
+    from mobius.storage.graph_backfill import GraphBackfill
+
+    # Web containers evict the cache entries the backfill rewrites
+    bus = create_graph_cache_bus()
+    graph_storage.attach_invalidation_bus(bus)
+    try:
+        await GraphBackfill().run(run_id=run_id, lease_owner=lease_owner)
+    finally:
+        await bus.close()
+
+
+# Generation Queue Reaper
+@app.function(
+    image=image,
+    secrets=secrets,
+    schedule=modal.Cron("* * * * *"),  # Run every minute
+    timeout=600,
+)
+async def drain_generation_queue():
+    """
+    Requeue generation jobs whose worker died and run anything still queued.
+
+    Workers spawned by /v1/generate normally empty the queue; this catches
+    jobs whose lease expired (see mobius/storage/job_queue.py) and reports
+    queue depth and lag.
+    """
+    import sys
+    sys.path.insert(0, "/root")  # Add mounted source to Python path
+
+    from mobius.api.job_cancellation import start_job_cancel_bus
+    from mobius.api.job_events import job_event_bus
+    from mobius.storage.job_queue import GenerationWorker
+    import structlog
+
+    logger = structlog.get_logger()
+    worker = GenerationWorker()
+    cancel_bus = await start_job_cancel_bus()
+    try:
+        await worker.run(until_empty=True)
+    finally:
+        await cancel_bus.close()
+        await job_event_bus.close()
+    queue_stats = await worker.queue.get_stats()
+
+    logger.info(
+        "generation_queue_drained",
+        **worker.stats(),
+        **queue_stats,
+    )
+
+
+# Graph Sync Outbox Drainer
+@app.function(
+    image=image,
+    secrets=secrets,
+    schedule=modal.Cron("* * * * *"),  # Run every minute
+    timeout=120,
+)
+async def drain_graph_sync_outbox():
+    """
+    Apply queued Neo4j sync events (see mobius/storage/graph_outbox.py).
+
+    Each invocation polls the outbox for just under a minute so sync lag stays
+    at the poll interval rather than the cron period, then purges applied
+    events past the retention window.
+    """
+    import sys
+    sys.path.insert(0, "/root")  # Add mounted source to Python path
+
+    from mobius.storage.graph import create_graph_cache_bus, graph_storage
+    from mobius.storage.graph_outbox import GraphSyncDrainer
+    import structlog
+
+    logger = structlog.get_logger()
+    # Web containers evict the cache entries each applied batch invalidates
+    bus = create_graph_cache_bus()
+    graph_storage.attach_invalidation_bus(bus)
+    drainer = GraphSyncDrainer()
+
+    try:
+        await drainer.run(duration_seconds=55)
+    finally:
+        await bus.close()
+    purged = await drainer.outbox.purge_processed()
+    backlog = await drainer.outbox.get_backlog_stats()
+
+    logger.info(
+        "graph_outbox_drainer_completed",
+        purged=purged,
+        **drainer.stats(),
+        **backlog,
+    )
@@ -4,22 +4,37 @@ Local development version of the Mobius API.
 
 This version extracts just the FastAPI app from app_consolidated.py
 for local development with uvicorn, without Modal dependencies.
+
+For fully offline runs (e.g. throughput benchmarks), combine with the
+in-process backends:
+
+    STORAGE_BACKEND=memory GEMINI_BACKEND=fake GEMINI_API_KEY=fake \\
+        uvicorn mobius.api.app_local:app --port 8000
+
+Files uploaded to the local storage backend are served from /local-storage
+so the ingestion workflow can download PDFs it just stored.
 """
 
+import asyncio
+import mimetypes
 import sys
 import os
 
 # Add src to path for local development
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
+
+DEFAULT_ORGANIZATION_ID = "00000000-0000-0000-0000-000000000000"
+
 
 # Import the FastAPI app creation logic from app_consolidated
 # We'll extract just the FastAPI parts, not the Modal parts
 def create_local_app() -> FastAPI:
     """Create FastAPI app for local development."""
-    
+
     app = FastAPI(
         title="Mobius V2 API (Local)",
         description="Brand governance platform with AI-powered compliance (Local Development)",
@@ -38,42 +53,127 @@ def create_local_app() -> FastAPI:
     )
 
     # Import and include all the routes
+    from mobius.api.errors import MobiusError
     from mobius.api.routes import (
         ingest_brand_handler,
         list_brands_handler,
         get_brand_handler,
         update_brand_handler,
         delete_brand_handler,
-        generate_asset_handler,
-        get_job_handler,
+        generate_handler,
+        generate_batch_handler,
+        get_job_status_handler,
         list_jobs_handler,
         cancel_job_handler,
         review_job_handler,
         tweak_completed_job_handler,
         health_check_handler,
     )
-    
+
+    @app.exception_handler(MobiusError)
+    async def mobius_error_handler(request: Request, exc: MobiusError):
+        return JSONResponse(
+            status_code=exc.status_code,
+            content={"error": exc.error_response.model_dump()},
+        )
+
     # Add all the routes manually (since we can't use the Modal web_app)
     @app.get("/v1/health")
     async def health():
         return await health_check_handler()
-    
+
     @app.post("/v1/brands/ingest")
-    async def ingest_brand(request):
-        # This would need proper request handling for local development
-        # For now, just return a placeholder
-        return {"message": "Local development - ingest not fully implemented"}
-    
+    async def ingest_brand(request: Request):
+        form = await request.form()
+        file_upload = form["file"]
+        logo_upload = form.get("logo")
+        result = await ingest_brand_handler(
+            organization_id=form.get("organization_id") or DEFAULT_ORGANIZATION_ID,
+            brand_name=form.get("brand_name") or file_upload.filename.replace(".pdf", ""),
+            file=await file_upload.read(),
+            content_type=file_upload.content_type or "application/pdf",
+            filename=file_upload.filename or "guidelines.pdf",
+            logo_file=await logo_upload.read() if logo_upload else None,
+            logo_filename=logo_upload.filename if logo_upload else None,
+            visual_scan_data=form.get("visual_scan_data"),
+        )
+        return result.model_dump() if hasattr(result, "model_dump") else result
+
     @app.get("/v1/brands")
-    async def list_brands():
-        return await list_brands_handler()
-    
+    async def list_brands(organization_id: str = DEFAULT_ORGANIZATION_ID, search: str = None, limit: int = 100):
+        result = await list_brands_handler(organization_id, search=search, limit=limit)
+        return result.model_dump() if hasattr(result, "model_dump") else result
+
     @app.get("/v1/brands/{brand_id}")
     async def get_brand(brand_id: str):
         return await get_brand_handler(brand_id)
-    
+
+    @app.post("/v1/generate")
+    async def generate(request: Request):
+        data = await request.json()
+        return await generate_handler(
+            brand_id=data.get("brand_id"),
+            prompt=data.get("prompt"),
+            template_id=data.get("template_id"),
+            webhook_url=data.get("webhook_url"),
+            async_mode=data.get("async_mode", True),
+            idempotency_key=data.get("idempotency_key"),
+            cache=data.get("cache") or request.query_params.get("cache", "off"),
+        )
+
+    @app.post("/v1/generate/batch")
+    async def generate_batch(request: Request):
+        data = await request.json()
+        return await generate_batch_handler(
+            brand_id=data.get("brand_id"),
+            prompts=data.get("prompts"),
+            prompt=data.get("prompt"),
+            variations=data.get("variations"),
+            template_id=data.get("template_id"),
+            idempotency_key=data.get("idempotency_key"),
+        )
+
+    @app.get("/v1/jobs")
+    async def list_jobs(brand_id: str = None, status: str = None, limit: int = 100, cursor: str = None):
+        return await list_jobs_handler(brand_id=brand_id, status=status, limit=limit, cursor=cursor)
+
+    @app.get("/v1/jobs/{job_id}")
+    async def get_job(job_id: str):
+        return await get_job_status_handler(job_id)
+
+    @app.post("/v1/jobs/{job_id}/cancel")
+    async def cancel_job(job_id: str):
+        return await cancel_job_handler(job_id)
+
+    @app.get("/local-storage/{bucket}/{path:path}")
+    async def local_storage_file(bucket: str, path: str):
+        """Serve files held by the memory/SQLite storage backend."""
+        from mobius.storage.database import get_supabase_client
+
+        try:
+            data = get_supabase_client().storage.from_(bucket).download(path)
+        except (AttributeError, FileNotFoundError):
+            return JSONResponse(status_code=404, content={"error": "not found"})
+        media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        return Response(content=data, media_type=media_type)
+
+    @app.on_event("startup")
+    async def start_graph_outbox_drainer():
+        """Apply queued Neo4j sync events in the background (idle without Neo4j)."""
+        from mobius.storage.graph_outbox import GraphSyncDrainer
+
+        app.state.graph_outbox_stop = asyncio.Event()
+        app.state.graph_outbox_task = asyncio.create_task(
+            GraphSyncDrainer().run(stop_event=app.state.graph_outbox_stop)
+        )
+
+    @app.on_event("shutdown")
+    async def stop_graph_outbox_drainer():
+        app.state.graph_outbox_stop.set()
+        await app.state.graph_outbox_task
+
     # Add other routes as needed...
-    
+
     return app
 
 # Create the app instance
@@ -81,4 +181,5 @@ app = create_local_app()
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    # reload needs the import string rather than the app object
+    uvicorn.run("mobius.api.app_local:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,267 @@
+"""
+Cooperative cancellation of running generation jobs.
+
+Cancelling a job used to only flip its status, while the workflow kept
+generating and auditing. Workflow runs now go through
+JobCancellationRegistry.run(), which registers the run's task under its
+job_id. cancel() cancels those tasks in this process and broadcasts the
+cancellation on a bus (settings.job_cancel_channel), so generation workers
+and resume containers elsewhere stop the job too.
+
+Cancelling the task stops the run at its current await: in-flight Gemini
+calls and logo downloads are abandoned, and nodes that have not started yet
+are skipped. The run returns at once, so its queue slot and lease are
+released straight away.
+
+Design Principles:
+- A cancelled job_id is remembered for tombstone_seconds, so a run that
+  starts after the cancel arrived (or a claim that raced it) stops immediately
+- Cancellations are best effort on the bus; generation workers also stop a
+  job at their next heartbeat once its row says cancelled (job_queue.py)
+- Metrics record how long cancelled runs took to stop and an estimate of the
+  worker time they would otherwise have used
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Awaitable, Dict, Optional, Set, TypeVar
+
+import structlog
+
+from mobius.config import settings
+
+if TYPE_CHECKING:
+    from mobius.api.job_events import JobEventBus
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+CANCEL_EVENT = "cancel"
+
+
+class JobCancelledError(Exception):
+    """Raised by JobCancellationRegistry.run() when its job was cancelled."""
+
+    def __init__(self, job_id: str, reason: str = "cancelled"):
+        super().__init__(f"Job {job_id} was cancelled")
+        self.job_id = job_id
+        self.reason = reason
+
+
+class JobCancellationRegistry:
+    """
+    Registry of running job tasks that can be cancelled by job_id.
+
+    Usage:
+        result = await job_cancellations.run(job_id, workflow.ainvoke(state))
+        await job_cancellations.cancel(job_id)      # from any process
+        job_cancellations.attach_bus(create_job_cancel_bus())
+    """
+
+    def __init__(self, tombstone_seconds: float = 600, max_tombstones: int = 10000):
+        self.tombstone_seconds = tombstone_seconds
+        self.max_tombstones = max_tombstones
+        self.bus: Optional["JobEventBus"] = None
+
+        # job_id -> tasks running the job in this process
+        self._runs: Dict[str, Set[asyncio.Task]] = {}
+        # task -> monotonic time the run started
+        self._started_at: Dict[asyncio.Task, float] = {}
+        # job_id -> (reason, monotonic time cancelled); oldest first
+        self._cancelled: "OrderedDict[str, tuple]" = OrderedDict()
+
+        self.cancel_requests = 0
+        self.jobs_stopped = 0
+        self.reclaimed_seconds = 0.0
+        self.max_stop_seconds = 0.0
+
+    def attach_bus(self, bus: "JobEventBus") -> None:
+        """
+        Exchange cancellations with other processes over a bus.
+
+        Call bus.start() afterwards in processes that run jobs so they receive
+        cancellations published elsewhere.
+
+        Args:
+            bus: Bus on settings.job_cancel_channel (see create_job_cancel_bus)
+        """
+        self.bus = bus
+        bus.subscribe(self._on_bus_event)
+
+    async def run(self, job_id: str, coro: Awaitable[T]) -> T:
+        """
+        Run a job's coroutine so that cancel(job_id) can stop it.
+
+        Args:
+            job_id: Job the coroutine works on
+            coro: Coroutine to run (e.g. workflow.ainvoke(...))
+
+        Returns:
+            The coroutine's result
+
+        Raises:
+            JobCancelledError: If the job was cancelled before or while it ran
+        """
+        if self.is_cancelled(job_id):
+            coro.close()
+            raise JobCancelledError(job_id, self._cancelled[job_id][0])
+
+        task = asyncio.ensure_future(coro)
+        self._runs.setdefault(job_id, set()).add(task)
+        self._started_at[task] = time.monotonic()
+        try:
+            return await task
+        except asyncio.CancelledError:
+            # Cancelled through the registry: report it, the caller keeps running
+            if task.cancelled() and self.is_cancelled(job_id) and not _cancelling(asyncio.current_task()):
+                raise JobCancelledError(job_id, self._cancelled[job_id][0])
+            raise
+        finally:
+            self._started_at.pop(task, None)
+            runs = self._runs.get(job_id)
+            if runs is not None:
+                runs.discard(task)
+                if not runs:
+                    del self._runs[job_id]
+
+    async def cancel(self, job_id: str, reason: str = "cancelled") -> int:
+        """
+        Cancel a job's runs here and in every process attached to the bus.
+
+        Args:
+            job_id: Job to cancel
+            reason: Short reason recorded with the cancellation
+
+        Returns:
+            Number of runs cancelled in this process
+        """
+        self.cancel_requests += 1
+        cancelled = self.cancel_local(job_id, reason)
+        if self.bus is not None:
+            try:
+                await self.bus.publish(job_id, {"type": CANCEL_EVENT, "reason": reason})
+            except Exception as e:
+                logger.warning("job_cancel_publish_failed", job_id=job_id, error=str(e))
+        return cancelled
+
+    def cancel_local(self, job_id: str, reason: str = "cancelled") -> int:
+        """
+        Cancel a job's runs in this process only.
+
+        Args:
+            job_id: Job to cancel
+            reason: Short reason recorded with the cancellation
+
+        Returns:
+            Number of runs cancelled
+        """
+        self._cancelled[job_id] = (reason, time.monotonic())
+        self._cancelled.move_to_end(job_id)
+        self._expire()
+
+        # Skips runs a cancel (e.g. our own, echoed by the bus) already stopped
+        tasks = [
+            task for task in self._runs.get(job_id, ())
+            if not task.done() and not task.cancelling()
+        ]
+        if not tasks:
+            return 0
+        # The outermost run (e.g. a worker's handler around the workflow) stops last
+        outermost = min(tasks, key=lambda task: self._started_at.get(task, 0.0))
+        outermost.add_done_callback(
+            self._make_stop_recorder(job_id, time.monotonic(), self._started_at.get(outermost))
+        )
+        for task in tasks:
+            task.cancel()
+        self.jobs_stopped += 1
+        logger.info("job_runs_cancelled", job_id=job_id, runs=len(tasks), reason=reason)
+        return len(tasks)
+
+    def is_cancelled(self, job_id: str) -> bool:
+        """Whether the job was cancelled within the last tombstone_seconds."""
+        entry = self._cancelled.get(job_id)
+        return entry is not None and time.monotonic() - entry[1] < self.tombstone_seconds
+
+    def is_running(self, job_id: str) -> bool:
+        """Whether this process is running the job."""
+        return bool(self._runs.get(job_id))
+
+    def stats(self) -> dict:
+        """Get cancellation counters for this process."""
+        return {
+            "running_jobs": len(self._runs),
+            "cancel_requests": self.cancel_requests,
+            "jobs_stopped": self.jobs_stopped,
+            "reclaimed_seconds": round(self.reclaimed_seconds, 1),
+            "max_stop_seconds": round(self.max_stop_seconds, 3),
+        }
+
+    def clear(self) -> None:
+        """Forget cancellations and reset metrics (useful for testing)."""
+        self._cancelled.clear()
+        self.cancel_requests = self.jobs_stopped = 0
+        self.reclaimed_seconds = self.max_stop_seconds = 0.0
+
+    def _make_stop_recorder(self, job_id: str, cancelled_at: float, started_at: Optional[float]):
+        def record(task: asyncio.Task) -> None:
+            stopped_at = time.monotonic()
+            stop_seconds = stopped_at - cancelled_at
+            self.max_stop_seconds = max(self.max_stop_seconds, stop_seconds)
+            # Worker time the run would still have used, judged by a typical job
+            elapsed = stopped_at - (started_at or cancelled_at)
+            self.reclaimed_seconds += max(0.0, settings.generation_queue_default_job_seconds - elapsed)
+            logger.info(
+                "job_run_stopped",
+                job_id=job_id,
+                stop_ms=int(stop_seconds * 1000),
+                ran_seconds=round(elapsed, 1),
+            )
+
+        return record
+
+    async def _on_bus_event(self, job_id: str, message: dict) -> None:
+        if message.get("type") == CANCEL_EVENT:
+            self.cancel_local(job_id, message.get("reason") or "cancelled")
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        while self._cancelled:
+            job_id, (_, cancelled_at) = next(iter(self._cancelled.items()))
+            if now - cancelled_at < self.tombstone_seconds and len(self._cancelled) <= self.max_tombstones:
+                break
+            self._cancelled.popitem(last=False)
+
+
+def _cancelling(task: Optional[asyncio.Task]) -> bool:
+    """Whether the caller's own task is being cancelled."""
+    return task is not None and task.cancelling() > 0
+
+
+def create_job_cancel_bus() -> "JobEventBus":
+    """Create the bus carrying job cancellations (settings.job_cancel_channel)."""
+    from mobius.api.job_events import create_job_event_bus
+
+    return create_job_event_bus(channel=settings.job_cancel_channel)
+
+
+async def start_job_cancel_bus() -> "JobEventBus":
+    """
+    Attach job_cancellations to a new cancellation bus and start receiving.
+
+    Returns:
+        The bus, to close when the process stops
+    """
+    bus = create_job_cancel_bus()
+    job_cancellations.attach_bus(bus)
+    try:
+        await bus.start()
+    except Exception as e:
+        # Cancellations still go out; running jobs stop at their next heartbeat
+        logger.error("job_cancel_bus_start_failed", error=str(e))
+    return bus
+
+
+# Global cancellation registry
+job_cancellations = JobCancellationRegistry()
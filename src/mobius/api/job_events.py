@@ -0,0 +1,509 @@
+"""
+Cross-process job event bus for live WebSocket monitoring.
+
+Generation workflows run in Modal worker containers, but browsers are
+connected to the web containers. Workflow nodes publish job events to this
+bus; every web container subscribes and fans the events out to its local
+WebSocket connections (see websocket_handlers.py).
+
+Backends (settings.job_event_bus):
+- "memory": delivers to subscribers in the same process (local development,
+  tests, and anything running the workflow inside the web process)
+- "supabase": Supabase Realtime broadcast. Publishers batch events into the
+  Realtime REST broadcast endpoint; web containers join the broadcast channel
+  over the Realtime WebSocket. Channels are private by default
+  (settings.job_event_private_channels), so only the service role may join
+  them (migration 012).
+
+Design Principles:
+- publish() never waits on the network: events are queued and sent by a
+  background task, so broadcasting adds no latency to workflow nodes
+- Events are best effort; a failed batch is retried with backoff before it
+  is dropped, and clients recover missed state from the job record
+- close() flushes queued events (called before a worker container exits)
+
+JobEventLog keeps the recent events of each job (with sequence numbers) so
+late or reconnecting WebSocket subscribers are replayed what they missed.
+"""
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+import httpx
+import structlog
+
+from mobius.config import settings
+
+logger = structlog.get_logger()
+
+JobEventHandler = Callable[[str, dict], Awaitable[None]]
+
+BROADCAST_EVENT = "job_event"
+
+# Job statuses after which no more events are expected
+TERMINAL_STATUSES = {"completed", "failed", "cancelled"}
+
+
+class _JobEvents:
+    """Replay buffer of one job."""
+
+    __slots__ = ("events", "first_seq", "evicted_through", "touched_at", "finished_at")
+
+    def __init__(self, max_events: int):
+        self.events: Deque[dict] = deque(maxlen=max_events)
+        # Oldest sequence number ever recorded here
+        self.first_seq: Optional[int] = None
+        # Newest sequence number pushed out of the buffer
+        self.evicted_through = 0
+        self.touched_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+
+
+class JobEventLog:
+    """
+    Bounded per-job ring buffer of published events.
+
+    Publishers stamp each event with a per-job sequence number ("seq", see
+    JobEventSequencer); every process delivering events to sockets records
+    them here. A subscriber that reconnects with the last seq it saw is
+    replayed the newer events from memory, provided none of them were
+    evicted.
+
+    Buffers expire with the job: grace_seconds after a terminal status
+    event, or ttl_seconds after the last event. At most max_jobs buffers
+    are kept (least recently active dropped first).
+
+    Usage:
+        job_event_log.record(job_id, message)              # on delivery
+        missed = job_event_log.since(job_id, last_seq)     # None if incomplete
+    """
+
+    def __init__(
+        self,
+        max_events: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        grace_seconds: Optional[float] = None,
+        max_jobs: int = 1000,
+    ):
+        self.max_events = max_events or settings.job_event_replay_size
+        self.ttl_seconds = ttl_seconds or settings.job_event_replay_ttl_seconds
+        self.grace_seconds = grace_seconds or settings.job_event_replay_grace_seconds
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, _JobEvents]" = OrderedDict()
+        self._expired_at = 0.0
+
+        self.replays = 0
+        self.replayed_events = 0
+        self.misses = 0
+
+    def record(self, job_id: str, message: dict) -> None:
+        """
+        Buffer a delivered event.
+
+        Args:
+            job_id: Job the event belongs to
+            message: Event message carrying a "seq" (unsequenced messages are ignored)
+        """
+        seq = message.get("seq")
+        if seq is None:
+            return
+        entry = self._entry(job_id)
+        if entry.first_seq is None:
+            entry.first_seq = seq
+        if len(entry.events) == entry.events.maxlen:
+            entry.evicted_through = entry.events[0]["seq"]
+        entry.events.append(message)
+        if message.get("type") == "status_change" and \
+                (message.get("payload") or {}).get("status") in TERMINAL_STATUSES:
+            entry.finished_at = time.monotonic()
+
+    def since(self, job_id: str, last_seq: Optional[int]) -> Optional[List[dict]]:
+        """
+        Get a job's buffered events newer than last_seq.
+
+        Args:
+            job_id: Job ID
+            last_seq: Last sequence number the subscriber received, or None
+                for a new subscriber (every buffered event is returned)
+
+        Returns:
+            Events in sequence order, or None if the buffer cannot prove it
+            holds every event after last_seq (unknown job, events evicted, or
+            this process started receiving after last_seq)
+        """
+        self._expire()
+        entry = self._jobs.get(job_id)
+        if last_seq is None:
+            return list(entry.events) if entry is not None else []
+
+        if entry is None or entry.first_seq is None or last_seq < entry.first_seq \
+                or entry.evicted_through > last_seq:
+            self.misses += 1
+            return None
+
+        missed = [event for event in entry.events if event["seq"] > last_seq]
+        self.replays += 1
+        self.replayed_events += len(missed)
+        return missed
+
+    def clear(self) -> None:
+        """Drop all buffers and reset metrics (useful for testing)."""
+        self._jobs.clear()
+        self._expired_at = 0.0
+        self.replays = self.replayed_events = self.misses = 0
+
+    def stats(self) -> dict:
+        """Get buffer sizes and replay counters."""
+        return {
+            "jobs": len(self._jobs),
+            "buffered_events": sum(len(entry.events) for entry in self._jobs.values()),
+            "replays": self.replays,
+            "replayed_events": self.replayed_events,
+            "misses": self.misses,
+        }
+
+    def _entry(self, job_id: str) -> _JobEvents:
+        self._expire()
+        entry = self._jobs.get(job_id)
+        if entry is None:
+            entry = self._jobs[job_id] = _JobEvents(self.max_events)
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+        else:
+            self._jobs.move_to_end(job_id)
+        entry.touched_at = time.monotonic()
+        return entry
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        if now - self._expired_at < 1.0:
+            return
+        self._expired_at = now
+        for job_id, entry in list(self._jobs.items()):
+            finished = entry.finished_at is not None and now - entry.finished_at > self.grace_seconds
+            if finished or now - entry.touched_at > self.ttl_seconds:
+                del self._jobs[job_id]
+
+
+class JobEventSequencer:
+    """
+    Hands out per-job event sequence numbers.
+
+    The numbers come from the job row (jobs.event_seq, migration 011), the
+    single source shared by every worker that publishes for the job, so a
+    resumed job continues above the numbers of earlier runs whatever the
+    containers' clocks say. Numbers are reserved in blocks of block_size;
+    an unused tail of a block leaves a gap, so sequence numbers increase
+    strictly per job but are not contiguous.
+
+    Usage:
+        seq = await job_event_sequencer.next_seq(job_id)   # None if unavailable
+    """
+
+    def __init__(self, block_size: Optional[int] = None, max_jobs: int = 1000):
+        self.block_size = block_size or settings.job_event_seq_block_size
+        self.max_jobs = max_jobs
+        # job_id -> [next number, last reserved number]
+        self._blocks: "OrderedDict[str, List[int]]" = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # Defaults to get_supabase_client() per reservation
+        self._client = None
+
+    async def next_seq(self, job_id: str) -> Optional[int]:
+        """
+        Get the next sequence number for a job's event.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Sequence number, or None if none could be reserved (unknown job
+            or database unavailable); the event is then sent unsequenced
+        """
+        block = self._blocks.get(job_id)
+        if block is None or block[0] > block[1]:
+            lock = self._locks.setdefault(job_id, asyncio.Lock())
+            async with lock:
+                block = self._blocks.get(job_id)
+                if block is None or block[0] > block[1]:
+                    block = await self._reserve(job_id)
+            self._locks.pop(job_id, None)
+            if block is None:
+                return None
+
+        seq = block[0]
+        block[0] += 1
+        return seq
+
+    async def _reserve(self, job_id: str) -> Optional[List[int]]:
+        from mobius.storage.database import get_supabase_client
+
+        client = self._client or get_supabase_client()
+        try:
+            result = client.rpc(
+                "reserve_job_event_seqs", {"p_job_id": job_id, "p_count": self.block_size}
+            ).execute()
+            if result.data is None:
+                return None
+            last = int(result.data)
+        except Exception as e:
+            logger.warning("job_event_seq_reserve_failed", job_id=job_id, error=str(e))
+            return None
+
+        block = [last - self.block_size + 1, last]
+        self._blocks[job_id] = block
+        self._blocks.move_to_end(job_id)
+        while len(self._blocks) > self.max_jobs:
+            self._blocks.popitem(last=False)
+        return block
+
+
+class JobEventBus(ABC):
+    """
+    Base job event bus: subscriber registry and dispatch.
+
+    Usage:
+        job_event_bus.subscribe(handler)        # handler(job_id, message)
+        await job_event_bus.start()             # begin receiving (web containers)
+        await job_event_bus.publish(job_id, message)
+        await job_event_bus.close()             # flush before exit
+    """
+
+    # True when events published here are delivered in other processes
+    distributed = False
+
+    def __init__(self):
+        self._handlers: List[JobEventHandler] = []
+
+    def subscribe(self, handler: JobEventHandler) -> None:
+        """Register a coroutine function called with (job_id, message) for each event."""
+        if handler not in self._handlers:
+            self._handlers.append(handler)
+
+    @abstractmethod
+    async def publish(self, job_id: str, message: dict) -> None:
+        """Publish an event for a job."""
+
+    async def start(self) -> None:
+        """Start receiving events from other processes (no-op by default)."""
+
+    async def close(self) -> None:
+        """Flush pending events and stop receiving (no-op by default)."""
+
+    async def _dispatch(self, job_id: str, message: dict) -> None:
+        for handler in list(self._handlers):
+            try:
+                await handler(job_id, message)
+            except Exception as e:
+                logger.warning("job_event_handler_failed", job_id=job_id, error=str(e))
+
+
+class InMemoryJobEventBus(JobEventBus):
+    """Delivers events to subscribers in this process."""
+
+    async def publish(self, job_id: str, message: dict) -> None:
+        await self._dispatch(job_id, message)
+
+
+class SupabaseRealtimeJobEventBus(JobEventBus):
+    """
+    Job events over Supabase Realtime broadcast.
+
+    Publishing queues the event and a background task posts batches to
+    POST /realtime/v1/api/broadcast. Receiving joins the broadcast channel
+    with the Realtime WebSocket client and dispatches to local subscribers.
+    """
+
+    distributed = True
+
+    def __init__(
+        self,
+        supabase_url: Optional[str] = None,
+        supabase_key: Optional[str] = None,
+        channel: Optional[str] = None,
+        max_batch: int = 100,
+        max_queue: int = 10000,
+        private: Optional[bool] = None,
+        publish_attempts: int = 3,
+        retry_base_seconds: float = 0.25,
+    ):
+        super().__init__()
+        self.supabase_url = (supabase_url or settings.supabase_url).rstrip("/")
+        self.supabase_key = supabase_key or settings.supabase_key
+        self.channel_name = channel or settings.job_event_channel
+        self.max_batch = max_batch
+        self.max_queue = max_queue
+        self.private = settings.job_event_private_channels if private is None else private
+        self.publish_attempts = publish_attempts
+        self.retry_base_seconds = retry_base_seconds
+
+        self._pending: Deque[Tuple[str, dict]] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._sender: Optional[asyncio.Task] = None
+        self._send_lock = asyncio.Lock()
+        self._http: Optional[httpx.AsyncClient] = None
+        self._realtime = None
+        self._channel = None
+        # Dispatches started from the Realtime callback (kept referenced until done)
+        self._dispatch_tasks: Set[asyncio.Task] = set()
+
+        self.published = 0
+        self.dropped = 0
+        self.received = 0
+        self.retries = 0
+
+    async def publish(self, job_id: str, message: dict) -> None:
+        if len(self._pending) >= self.max_queue:
+            # Realtime unreachable for a while: keep the newest events
+            self._pending.popleft()
+            self.dropped += 1
+        self._pending.append((job_id, message))
+        self._ensure_sender()
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        from realtime import AsyncRealtimeClient
+
+        ws_url = self.supabase_url.replace("https://", "wss://").replace("http://", "ws://")
+        self._realtime = AsyncRealtimeClient(f"{ws_url}/realtime/v1", token=self.supabase_key)
+        await self._realtime.connect()
+        self._channel = self._realtime.channel(
+            self.channel_name, {"config": {"private": self.private}}
+        )
+        self._channel.on_broadcast(BROADCAST_EVENT, self._on_broadcast)
+        await self._channel.subscribe()
+        logger.info("job_event_bus_subscribed", channel=self.channel_name, private=self.private)
+
+    async def close(self) -> None:
+        if self._sender is not None:
+            await self._flush()
+            # Holding the lock means no batch is mid-request when the sender stops
+            async with self._send_lock:
+                self._sender.cancel()
+                self._sender = None
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        if self._realtime is not None:
+            await self._realtime.close()
+            self._realtime = None
+
+    def stats(self) -> dict:
+        """Get publish/receive counters."""
+        return {
+            "pending": len(self._pending),
+            "published": self.published,
+            "dropped": self.dropped,
+            "received": self.received,
+            "retries": self.retries,
+        }
+
+    def _on_broadcast(self, message: Dict[str, Any]) -> None:
+        """Realtime callback (sync); hands the event to the local subscribers."""
+        payload = message.get("payload") or {}
+        job_id, event = payload.get("job_id"), payload.get("message")
+        if not job_id or not isinstance(event, dict):
+            return
+        self.received += 1
+        task = asyncio.get_running_loop().create_task(self._dispatch(job_id, event))
+        self._dispatch_tasks.add(task)
+        task.add_done_callback(self._dispatch_tasks.discard)
+
+    def _ensure_sender(self) -> None:
+        if self._sender is None or self._sender.done():
+            self._wakeup = asyncio.Event()
+            self._sender = asyncio.create_task(self._send_loop())
+
+    async def _send_loop(self) -> None:
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            await self._send_batch()
+
+    async def _flush(self, timeout: float = 5.0) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self._pending and loop.time() < deadline:
+            await self._send_batch()
+
+    async def _send_batch(self) -> None:
+        async with self._send_lock:
+            await self._post_batch()
+
+    async def _post_batch(self) -> None:
+        batch = [self._pending.popleft() for _ in range(min(self.max_batch, len(self._pending)))]
+        if not batch:
+            return
+        if self._http is None:
+            self._http = httpx.AsyncClient(timeout=5.0)
+
+        body = {
+            "messages": [
+                {
+                    "topic": self.channel_name,
+                    "event": BROADCAST_EVENT,
+                    "payload": {"job_id": job_id, "message": message},
+                    "private": self.private,
+                }
+                for job_id, message in batch
+            ]
+        }
+        for attempt in range(1, self.publish_attempts + 1):
+            try:
+                response = await self._http.post(
+                    f"{self.supabase_url}/realtime/v1/api/broadcast",
+                    headers={
+                        "apikey": self.supabase_key,
+                        "Authorization": f"Bearer {self.supabase_key}",
+                    },
+                    json=body,
+                )
+                response.raise_for_status()
+                self.published += len(batch)
+                return
+            except Exception as e:
+                if attempt < self.publish_attempts and _is_retryable(e):
+                    self.retries += 1
+                    await asyncio.sleep(self.retry_base_seconds * 2 ** (attempt - 1))
+                    continue
+                # Live events are best effort; clients catch up from the job record
+                self.dropped += len(batch)
+                logger.warning(
+                    "job_event_publish_failed",
+                    event_count=len(batch),
+                    attempts=attempt,
+                    error=str(e),
+                )
+                return
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Network errors, rate limiting and server errors are worth retrying; other 4xx are not."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return True
+
+
+def create_job_event_bus(channel: Optional[str] = None) -> JobEventBus:
+    """
+    Create the event bus selected by settings.job_event_bus.
+
+    Args:
+        channel: Realtime channel (defaults to settings.job_event_channel);
+            other event streams, such as graph cache invalidations, use a
+            channel of their own
+    """
+    if settings.job_event_bus == "supabase":
+        return SupabaseRealtimeJobEventBus(channel=channel)
+    return InMemoryJobEventBus()
+
+
+# Global job event bus, sequencer and replay buffer instances
+job_event_bus = create_job_event_bus()
+job_event_sequencer = JobEventSequencer()
+job_event_log = JobEventLog()
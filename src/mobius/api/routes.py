@@ -6,6 +6,7 @@ Implements all brand CRUD operations with validation and error handling.
 
 from mobius.api.utils import generate_request_id, set_request_id, get_request_id
 from mobius.api.errors import ValidationError, NotFoundError, StorageError
+from mobius.api.job_cancellation import JobCancelledError, job_cancellations
 from mobius.api.schemas import (
     IngestBrandRequest,
     IngestBrandResponse,
@@ -16,20 +17,53 @@ from mobius.api.schemas import (
 )
 from mobius.constants import MAX_PDF_SIZE_BYTES, ALLOWED_PDF_MIME_TYPES
 from mobius.storage.brands import BrandStorage
+from mobius.storage.brand_cache import brand_cache
+from mobius.storage.result_cache import (
+    CACHE_MODES,
+    CACHE_OFF,
+    CACHE_USE,
+    cached_compliance_score,
+    result_cache,
+    result_cache_key,
+)
 from mobius.storage.jobs import JobStorage
+from mobius.storage.job_state import job_state_metrics
+from mobius.storage.job_queue import (
+    PRIORITY_BATCH,
+    PRIORITY_STANDARD,
+    GenerationJobQueue,
+    generation_worker,
+)
 from mobius.storage.database import get_supabase_client
-from typing import Optional, Set
-import asyncio
+from mobius.storage.pagination import decode_cursor, next_cursor
+from mobius.config import settings
+from mobius.utils.deadline import new_deadline
+from typing import List, Optional
 import structlog
 from datetime import datetime, timezone
 import uuid
 
 logger = structlog.get_logger()
 
-# Module-level set to keep references to background tasks
-# This prevents them from being garbage collected before completion
-_background_tasks: Set[asyncio.Task] = set()
 
+def _validate_cursor(cursor: Optional[str], request_id: str) -> None:
+    """
+    Reject malformed pagination cursors before they reach storage.
+
+    Raises:
+        ValidationError: If the cursor cannot be decoded
+    """
+    if not cursor:
+        return
+    try:
+        decode_cursor(cursor)
+    except ValueError:
+        raise ValidationError(
+            code="INVALID_CURSOR",
+            message="Pagination cursor is invalid",
+            request_id=request_id,
+            details={"cursor": cursor},
+        )
 
 async def ingest_brand_handler(
     organization_id: str,
@@ -429,50 +463,22 @@ async def list_brands_handler(
         storage = BrandStorage()
         brands = await storage.list_brands(organization_id, search, limit)
 
-        # Get statistics for all brands in a single query (fixes N+1)
+        # Precomputed statistics from the brand_stats aggregate (one indexed query,
+        # independent of how many assets each brand has)
         brand_ids = [brand.brand_id for brand in brands]
-
-        # Single query to fetch all asset stats
-        client = get_supabase_client()
-        assets_result = (
-            client.table("assets")
-            .select("brand_id, compliance_score, created_at")
-            .in_("brand_id", brand_ids)
-            .execute()
-        ) if brand_ids else type('obj', (object,), {'data': []})()
-
-        # Group assets by brand_id for O(1) lookup
-        assets_by_brand: dict[str, list[dict]] = {}
-        for asset in assets_result.data:
-            bid = asset.get("brand_id")
-            if bid:
-                if bid not in assets_by_brand:
-                    assets_by_brand[bid] = []
-                assets_by_brand[bid].append(asset)
+        stats_by_brand = await storage.get_brand_stats(brand_ids)
 
         # Build brand items with pre-fetched stats
         brand_items = []
         for brand in brands:
-            brand_assets = assets_by_brand.get(brand.brand_id, [])
-            asset_count = len(brand_assets)
-            avg_score = 0.0
+            stats = stats_by_brand.get(brand.brand_id)
+            asset_count = stats["asset_count"] if stats else 0
+            avg_score = stats["avg_compliance_score"] if stats else 0.0
             last_activity = brand.updated_at
 
-            if asset_count > 0:
-                scores = [
-                    a["compliance_score"]
-                    for a in brand_assets
-                    if a.get("compliance_score") is not None
-                ]
-                avg_score = sum(scores) / len(scores) if scores else 0.0
-
-                # Get most recent activity
-                latest_asset = max(
-                    brand_assets,
-                    key=lambda a: a.get("created_at", ""),
-                )
+            if stats and stats.get("last_activity"):
                 last_activity = datetime.fromisoformat(
-                    latest_asset["created_at"].replace("Z", "+00:00")
+                    stats["last_activity"].replace("Z", "+00:00")
                 )
 
             brand_items.append(
@@ -854,16 +860,21 @@ async def save_template_handler(
 async def list_templates_handler(
     brand_id: str,
     limit: int = 100,
+    cursor: Optional[str] = None,
 ) -> dict:
     """
-    List all templates for a brand.
+    List templates for a brand, newest first.
 
     Args:
         brand_id: Brand UUID to filter templates
         limit: Maximum number of templates to return (default 100)
+        cursor: Optional cursor from the previous page's next_cursor
 
     Returns:
-        TemplateListResponse with list of templates
+        TemplateListResponse with list of templates and next_cursor
+
+    Raises:
+        ValidationError: If the cursor is invalid
     """
     from mobius.api.schemas import TemplateResponse, TemplateListResponse
     from mobius.storage.templates import TemplateStorage
@@ -876,11 +887,14 @@ async def list_templates_handler(
         request_id=request_id,
         brand_id=brand_id,
         limit=limit,
+        has_cursor=bool(cursor),
     )
 
+    _validate_cursor(cursor, request_id)
+
     try:
         template_storage = TemplateStorage()
-        templates = await template_storage.list_templates(brand_id, limit)
+        templates = await template_storage.list_templates(brand_id, limit, cursor=cursor)
 
         template_responses = [
             TemplateResponse(
@@ -906,6 +920,7 @@ async def list_templates_handler(
         return TemplateListResponse(
             templates=template_responses,
             total=len(template_responses),
+            next_cursor=next_cursor(templates, "template_id", limit),
             request_id=request_id,
         ).model_dump()
 
@@ -1083,6 +1098,7 @@ async def generate_handler(
     webhook_url: Optional[str] = None,
     async_mode: bool = False,
     idempotency_key: Optional[str] = None,
+    cache: str = CACHE_OFF,
     **additional_params,
 ) -> dict:
     """
@@ -1099,6 +1115,11 @@ async def generate_handler(
     2. Return existing job if found
     3. Create new job if not found
     
+    If cache is "use" or "refresh" (see storage/result_cache.py):
+    1. "use" returns the latest approved result of an identical request
+    2. An identical request still running is returned instead of a new job
+    3. Otherwise a new job is created and becomes the cached result
+    
     Args:
         brand_id: Brand ID to use for generation
         prompt: Generation prompt (can override template prompt)
@@ -1106,6 +1127,7 @@ async def generate_handler(
         webhook_url: Optional webhook URL for async completion
         async_mode: Whether to run asynchronously
         idempotency_key: Optional idempotency key for duplicate prevention
+        cache: Result cache mode: "off" (default), "use" or "refresh"
         **additional_params: Additional generation parameters
         
     Returns:
@@ -1113,7 +1135,8 @@ async def generate_handler(
         
     Raises:
         NotFoundError: If template or brand does not exist
-        ValidationError: If brand_id doesn't match template's brand
+        ValidationError: If brand_id doesn't match template's brand, or the
+            cache mode is unknown
     """
     from mobius.api.schemas import GenerateResponse
     from mobius.models.job import Job
@@ -1128,9 +1151,18 @@ async def generate_handler(
         template_id=template_id,
         async_mode=async_mode,
         idempotency_key=idempotency_key,
+        cache=cache,
     )
     
     try:
+        if cache not in CACHE_MODES:
+            raise ValidationError(
+                code="INVALID_CACHE_MODE",
+                message=f"cache must be one of {', '.join(CACHE_MODES)}",
+                request_id=request_id,
+                details={"cache": cache},
+            )
+
         # Check for existing job with same idempotency key
         if idempotency_key:
             job_storage = JobStorage()
@@ -1187,259 +1219,492 @@ async def generate_handler(
                 template_name=template_info["template_name"],
             )
         
-        # Verify brand exists
-        brand_storage = BrandStorage()
-        brand = await brand_storage.get_brand(brand_id)
+        # Verify brand exists (warms the shared cache for the generate/audit nodes)
+        brand = await brand_cache.get(brand_id, storage=BrandStorage())
         if not brand:
             logger.warning("brand_not_found", request_id=request_id, brand_id=brand_id)
             raise NotFoundError(resource="brand", resource_id=brand_id, request_id=request_id)
         
-        # Create new job
-        job_id = str(uuid.uuid4())
-        job = Job(
-            job_id=job_id,
-            brand_id=brand_id,
-            status="pending" if async_mode else "processing",
-            progress=0.0,
-            state={
-                "prompt": prompt,
-                "brand_id": brand_id,  # Include brand_id in state for workflow
-                "generation_params": generation_params,
-                "template_id": template_id,
-            },
-            webhook_url=webhook_url,
-            idempotency_key=idempotency_key,
-        )
-        
-        # Store job in database
-        job_storage = JobStorage()
-        await job_storage.create_job(job)
-        
-        logger.info(
-            "generation_job_created",
-            request_id=request_id,
-            job_id=job_id,
-            brand_id=brand_id,
-            template_used=template_id is not None,
-            idempotency_key=idempotency_key,
-        )
+        # Opt-in result cache: repeats get the approved result straight away
+        cache_key = None
+        if cache != CACHE_OFF:
+            cache_key = result_cache_key(brand, generation_params, template_id)
+            if cache == CACHE_USE:
+                cached_job = await result_cache.lookup(cache_key, storage=JobStorage())
+                if cached_job:
+                    return GenerateResponse(
+                        job_id=cached_job.job_id,
+                        status=cached_job.status,
+                        message="Cached result returned (identical request already approved)",
+                        image_url=cached_job.state.get("image_uri"),
+                        compliance_score=cached_compliance_score(cached_job),
+                        request_id=request_id,
+                        cached=True,
+                    ).model_dump()
+            else:
+                result_cache.record_refresh(cache_key)
+
+        async def start_generation() -> dict:
+            # Identical request still running in another process: return its job
+            if cache_key:
+                inflight_job = await result_cache.find_inflight(cache_key, storage=JobStorage())
+                if inflight_job:
+                    return GenerateResponse(
+                        job_id=inflight_job.job_id,
+                        status=inflight_job.status,
+                        message="Identical request already in progress. Poll /v1/jobs/{job_id} for status.",
+                        request_id=request_id,
+                    ).model_dump()
+
+            # Create new job
+            job_id = str(uuid.uuid4())
+            job = Job(
+                job_id=job_id,
+                brand_id=brand_id,
+                status="pending" if async_mode else "processing",
+                progress=0.0,
+                state={
+                    "prompt": prompt,
+                    "brand_id": brand_id,  # Include brand_id in state for workflow
+                    "generation_params": generation_params,
+                    "template_id": template_id,
+                },
+                webhook_url=webhook_url,
+                idempotency_key=idempotency_key,
+                result_cache_key=cache_key,
+                # Async jobs go through the durable generation queue
+                queued_at=datetime.now(timezone.utc) if async_mode else None,
+                queue_priority=PRIORITY_STANDARD,
+                organization_id=brand.organization_id,
+            )
         
-        # Execute generation workflow
-        from mobius.graphs.generation import run_generation_workflow
+            # Store job in database
+            job_storage = JobStorage()
+            await job_storage.create_job(job)
         
-        if async_mode:
-            # Run in background - return immediately with job_id
             logger.info(
-                "async_generation_started",
+                "generation_job_created",
                 request_id=request_id,
                 job_id=job_id,
-                brand_id=brand_id
+                brand_id=brand_id,
+                template_used=template_id is not None,
+                idempotency_key=idempotency_key,
             )
+        
+            # Execute generation workflow
+            from mobius.graphs.generation import run_generation_workflow
+        
+            if async_mode:
+                # Run in background - return immediately with job_id
+                logger.info(
+                    "async_generation_started",
+                    request_id=request_id,
+                    job_id=job_id,
+                    brand_id=brand_id
+                )
             
-            # Import asyncio to create background task
-            import asyncio
-            
-            # Define background task with better error handling
-            async def run_workflow_background():
-                # Create new JobStorage instance for background task
-                bg_job_storage = JobStorage()
-                
-                try:
-                    # Update job to processing state
-                    await bg_job_storage.update_job(job_id, {
-                        "status": "processing",
-                        "progress": 10.0,
-                        "state": {
-                            "prompt": prompt,
-                            "brand_id": brand_id,
-                            "generation_params": generation_params,
-                            "template_id": template_id,
-                            "started_at": datetime.now(timezone.utc).isoformat(),
-                        }
-                    })
-                    
-                    # Run workflow with proper cancellation handling
-                    final_state = await asyncio.shield(
-                        run_generation_workflow(
-                            brand_id=brand_id,
-                            prompt=prompt,
-                            job_id=job_id,
-                        )
-                    )
-                    
-                    # Update job with final state
-                    image_url = final_state.get("current_image_url") or final_state.get("image_uri")
-                    
-                    updates = {
-                        "status": final_state.get("status", "completed"),
-                        "progress": 100.0,
-                        "state": {
-                            "prompt": prompt,
-                            "brand_id": brand_id,
-                            "generation_params": generation_params,
-                            "template_id": template_id,
-                            "compliance_scores": final_state.get("compliance_scores", []),
-                            "is_approved": final_state.get("is_approved", False),
-                            "attempt_count": final_state.get("attempt_count", 0),
-                            "image_uri": image_url,
-                            "completed_at": datetime.now(timezone.utc).isoformat(),
-                            "original_had_logos": final_state.get("original_had_logos"),  # CRITICAL: Preserve logo configuration for tweaks
-                        },
-                    }
-                    
-                    await bg_job_storage.update_job(job_id, updates)
-                    
-                    logger.info(
-                        "async_generation_completed",
-                        request_id=request_id,
-                        job_id=job_id,
-                        status=updates["status"]
-                    )
-                    
-                    # Small delay to allow proper cleanup of async generators
-                    await asyncio.sleep(0.1)
-                except asyncio.CancelledError:
-                    logger.warning(
-                        "async_generation_cancelled",
-                        request_id=request_id,
-                        job_id=job_id
-                    )
-                    # Mark as failed due to cancellation
-                    try:
-                        await bg_job_storage.update_job(job_id, {
-                            "status": "failed",
-                            "progress": 0.0,
-                            "state": {
-                                "prompt": prompt,
-                                "brand_id": brand_id,
-                                "error": "Task was cancelled",
-                                "failed_at": datetime.now(timezone.utc).isoformat(),
-                            }
-                        })
-                    except Exception as update_error:
-                        logger.error("Failed to update cancelled job", job_id=job_id, error=str(update_error))
-                    raise
-                except Exception as e:
-                    logger.error(
-                        "async_generation_failed",
-                        request_id=request_id,
-                        job_id=job_id,
-                        error=str(e),
-                        error_type=type(e).__name__
-                    )
-                    # Update job with error status - use try/except to ensure this always works
-                    try:
-                        await bg_job_storage.update_job(job_id, {
-                            "status": "failed",
-                            "progress": 0.0,
-                            "state": {
-                                "prompt": prompt,
-                                "brand_id": brand_id,
-                                "error": str(e),
-                                "error_type": type(e).__name__,
-                                "failed_at": datetime.now(timezone.utc).isoformat(),
-                            }
-                        })
-                    except Exception as update_error:
-                        logger.error("Failed to update failed job", job_id=job_id, error=str(update_error))
-                        # Last resort - try to at least mark as failed with minimal data
-                        try:
-                            await bg_job_storage.update_job(job_id, {"status": "failed"})
-                        except:
-                            pass  # Give up if we can't even do this
-            
-            # Create background task with proper exception handling
-            task = asyncio.create_task(run_workflow_background(), name=f"generation_{job_id}")
-            
-            # Add task to registry to prevent garbage collection
-            _background_tasks.add(task)
-            
-            # Add done callback to log task completion/failure and remove from registry
-            def task_done_callback(task_result):
-                # Remove from registry when done
-                _background_tasks.discard(task_result)
-                
-                if task_result.cancelled():
-                    logger.warning("Background task was cancelled", job_id=job_id)
-                elif task_result.exception():
-                    logger.error("Background task failed with unhandled exception", 
-                               job_id=job_id, error=str(task_result.exception()))
-                else:
-                    logger.info("Background task completed successfully", job_id=job_id)
-            
-            task.add_done_callback(task_done_callback)
-            
-            logger.info("background_task_registered", job_id=job_id, active_tasks=len(_background_tasks))
+                # The job row is queued; a worker in this process picks it up now, and
+                # if the process goes away the lease expires and another worker retries it
+                generation_worker.start()
+
+                # Return immediately
+                return GenerateResponse(
+                    job_id=job_id,
+                    status="pending",
+                    message="Generation queued. Poll /v1/jobs/{job_id} for status.",
+                    image_url=None,
+                    compliance_score=None,
+                    request_id=request_id,
+                ).model_dump()
+            else:
+                # Run synchronously
+                final_state = await run_generation_workflow(
+                    brand_id=brand_id,
+                    prompt=prompt,
+                    job_id=job_id,
+                )
             
-            # Return immediately
-            return GenerateResponse(
-                job_id=job_id,
-                status="processing",
-                message="Generation started in background. Poll /v1/jobs/{job_id} for status.",
-                image_url=None,
-                compliance_score=None,
-                request_id=request_id,
-            ).model_dump()
-        else:
-            # Run synchronously
-            final_state = await run_generation_workflow(
-                brand_id=brand_id,
-                prompt=prompt,
-                job_id=job_id,
+                # Update job with final state
+                image_url = final_state.get("current_image_url") or final_state.get("image_uri")
+
+                updates = {
+                    "status": final_state.get("status", "completed"),
+                    "progress": 100.0,
+                    "state": {
+                        "prompt": prompt,
+                        "generation_params": generation_params,
+                        "template_id": template_id,
+                        "compliance_scores": final_state.get("compliance_scores", []),
+                        "is_approved": final_state.get("is_approved", False),
+                        "attempt_count": final_state.get("attempt_count", 0),
+                        "image_uri": image_url,
+                        "original_had_logos": final_state.get("original_had_logos"),  # CRITICAL: Preserve logo configuration for tweaks
+                    },
+                }
+
+                await job_storage.update_job(job_id, updates)
+
+                final_status = updates["status"]
+
+                logger.info(
+                    "generation_workflow_completed",
+                    request_id=request_id,
+                    job_id=job_id,
+                    final_status=final_status,
+                )
+
+                return GenerateResponse(
+                    job_id=job_id,
+                    status=final_status,
+                    message="Generation completed successfully" + (f" using template {template_info['template_name']}" if template_info else ""),
+                    image_url=image_url,
+                    compliance_score=final_state.get("compliance_scores", [{}])[-1].get("overall_score") if final_state.get("compliance_scores") else None,
+                    request_id=request_id,
+                ).model_dump()
+
+        if cache_key is None:
+            return await start_generation()
+
+        # Identical requests in this process share one run
+        response, collapsed = await result_cache.single_flight(cache_key, start_generation)
+        return {**response, "request_id": request_id} if collapsed else response
+
+    except (NotFoundError, ValidationError):
+        raise
+    except Exception as e:
+        logger.error("generation_failed", request_id=request_id, error=str(e))
+        raise StorageError(
+            operation="generate",
+            request_id=request_id,
+            details={"error": str(e)},
+        )
+
+
+
+async def generate_batch_handler(
+    brand_id: str,
+    prompts: Optional[List[str]] = None,
+    prompt: Optional[str] = None,
+    variations: Optional[int] = None,
+    template_id: Optional[str] = None,
+    idempotency_key: Optional[str] = None,
+    start_worker: bool = True,
+    **additional_params,
+) -> dict:
+    """
+    Queue many generations for one brand as a batch.
+
+    The brand and template are loaded and validated once. One parent job and
+    one child job per prompt are created in a single insert. Children are
+    queued in the batch priority class, so workers run them within the
+    organization's fair share without delaying single requests. Workers in the
+    same process share the cached brand and processed logos. The parent job
+    reports aggregate progress and results through get_job_status_handler.
+
+    Args:
+        brand_id: Brand ID to use for every asset
+        prompts: One asset per prompt
+        prompt: Single prompt to generate `variations` times (instead of prompts)
+        variations: Number of variations of prompt
+        template_id: Optional template applied to every asset
+        idempotency_key: Optional key; repeating it returns the existing batch
+        start_worker: Wake this process's generation worker (False when the
+            caller starts workers elsewhere, e.g. Modal containers)
+        **additional_params: Additional generation parameters for every asset
+
+    Returns:
+        GenerateBatchResponse with the batch (parent job) ID and child job IDs
+
+    Raises:
+        NotFoundError: If template or brand does not exist
+        ValidationError: If the prompts are missing or exceed the batch size limit,
+            or brand_id doesn't match the template's brand
+    """
+    from mobius.api.schemas import GenerateBatchResponse
+    from mobius.models.job import Job
+
+    request_id = generate_request_id()
+    set_request_id(request_id)
+
+    if prompts is None and prompt and variations:
+        prompts = [prompt] * variations
+    prompts = [p for p in (prompts or []) if p and p.strip()]
+
+    logger.info(
+        "batch_generation_request_received",
+        request_id=request_id,
+        brand_id=brand_id,
+        template_id=template_id,
+        count=len(prompts),
+        variations=variations,
+        idempotency_key=idempotency_key,
+    )
+
+    if not prompts:
+        raise ValidationError(
+            code="MISSING_PROMPTS",
+            message="Provide a non-empty prompts list, or a prompt with variations",
+            request_id=request_id,
+        )
+    if len(prompts) > settings.generation_batch_max_size:
+        raise ValidationError(
+            code="BATCH_TOO_LARGE",
+            message=f"A batch may contain at most {settings.generation_batch_max_size} prompts",
+            request_id=request_id,
+            details={"count": len(prompts), "max_size": settings.generation_batch_max_size},
+        )
+
+    try:
+        job_storage = JobStorage()
+
+        if idempotency_key:
+            existing_job = await job_storage.get_by_idempotency_key(idempotency_key)
+            if existing_job:
+                logger.info(
+                    "idempotent_request_matched",
+                    request_id=request_id,
+                    existing_job_id=existing_job.job_id,
+                    idempotency_key=idempotency_key,
+                )
+                return GenerateBatchResponse(
+                    batch_id=existing_job.job_id,
+                    status=existing_job.status,
+                    total=len(existing_job.state.get("child_job_ids", [])),
+                    child_job_ids=existing_job.state.get("child_job_ids", []),
+                    message="Existing batch returned (idempotent request)",
+                    request_id=request_id,
+                ).model_dump()
+
+        # Template and brand are resolved once for the whole batch
+        generation_params = dict(additional_params)
+        if template_id:
+            template_info = await apply_template_to_request(
+                template_id=template_id,
+                request_params=generation_params,
             )
-            
-            # Update job with final state
-            image_url = final_state.get("current_image_url") or final_state.get("image_uri")
+            if brand_id != template_info["template_brand_id"]:
+                raise ValidationError(
+                    code="BRAND_MISMATCH",
+                    message=f"Brand ID {brand_id} does not match template's brand {template_info['template_brand_id']}",
+                    request_id=request_id,
+                    details={
+                        "request_brand_id": brand_id,
+                        "template_brand_id": template_info["template_brand_id"],
+                        "template_id": template_id,
+                    },
+                )
+            generation_params = template_info["generation_params"]
 
-            updates = {
-                "status": final_state.get("status", "completed"),
-                "progress": 100.0,
-                "state": {
-                    "prompt": prompt,
-                    "generation_params": generation_params,
+        brand = await brand_cache.get(brand_id, storage=BrandStorage())
+        if not brand:
+            logger.warning("brand_not_found", request_id=request_id, brand_id=brand_id)
+            raise NotFoundError(resource="brand", resource_id=brand_id, request_id=request_id)
+
+        now = datetime.now(timezone.utc)
+        batch_id = str(uuid.uuid4())
+        child_ids = [str(uuid.uuid4()) for _ in prompts]
+        repeated = len(set(prompts)) < len(prompts)
+
+        parent = Job(
+            job_id=batch_id,
+            brand_id=brand_id,
+            status="pending",
+            progress=0.0,
+            state={
+                "batch": True,
+                "brand_id": brand_id,
+                "template_id": template_id,
+                "generation_params": generation_params,
+                "child_job_ids": child_ids,
+            },
+            idempotency_key=idempotency_key,
+            organization_id=brand.organization_id,
+        )
+        children = []
+        for index, (child_id, child_prompt) in enumerate(zip(child_ids, prompts)):
+            # The prompt is kept in state["prompt"] only
+            child_params = dict(generation_params)
+            if repeated:
+                # Identical prompts are distinct variations, not duplicates
+                child_params["variation"] = index + 1
+            children.append(Job(
+                job_id=child_id,
+                brand_id=brand_id,
+                status="pending",
+                progress=0.0,
+                state={
+                    "prompt": child_prompt,
+                    "brand_id": brand_id,
+                    "generation_params": child_params,
                     "template_id": template_id,
-                    "compliance_scores": final_state.get("compliance_scores", []),
-                    "is_approved": final_state.get("is_approved", False),
-                    "attempt_count": final_state.get("attempt_count", 0),
-                    "image_uri": image_url,
-                    "original_had_logos": final_state.get("original_had_logos"),  # CRITICAL: Preserve logo configuration for tweaks
+                    "batch_id": batch_id,
+                    "batch_index": index,
                 },
-            }
+                queued_at=now,
+                queue_priority=PRIORITY_BATCH,
+                organization_id=brand.organization_id,
+                parent_job_id=batch_id,
+            ))
 
-            await job_storage.update_job(job_id, updates)
+        # The parent first so the children's foreign key resolves
+        await job_storage.create_job(parent)
+        await job_storage.create_jobs(children)
 
-            final_status = updates["status"]
+        logger.info(
+            "batch_generation_queued",
+            request_id=request_id,
+            batch_id=batch_id,
+            brand_id=brand_id,
+            count=len(children),
+        )
 
-            logger.info(
-                "generation_workflow_completed",
-                request_id=request_id,
-                job_id=job_id,
-                final_status=final_status,
-            )
+        if start_worker:
+            generation_worker.start()
+
+        return GenerateBatchResponse(
+            batch_id=batch_id,
+            status="pending",
+            total=len(children),
+            child_job_ids=child_ids,
+            message=f"Batch of {len(children)} queued. Poll /v1/jobs/{batch_id} for progress.",
+            request_id=request_id,
+        ).model_dump()
 
-            return GenerateResponse(
-                job_id=job_id,
-                status=final_status,
-                message="Generation completed successfully" + (f" using template {template_info['template_name']}" if template_info else ""),
-                image_url=image_url,
-                compliance_score=final_state.get("compliance_scores", [{}])[-1].get("overall_score") if final_state.get("compliance_scores") else None,
-                request_id=request_id,
-            ).model_dump()
-        
     except (NotFoundError, ValidationError):
         raise
     except Exception as e:
-        logger.error("generation_failed", request_id=request_id, error=str(e))
+        logger.error("batch_generation_failed", request_id=request_id, error=str(e))
         raise StorageError(
-            operation="generate",
+            operation="generate_batch",
             request_id=request_id,
             details={"error": str(e)},
         )
 
 
+def summarize_batch(children: list) -> dict:
+    """
+    Aggregate the child jobs of a batch.
+
+    Args:
+        children: Child Job entities in request order
+
+    Returns:
+        Dictionary with status, progress, total, per-status counts and
+        per-child results (prompt, status, image_url, compliance_score, error)
+    """
+    counts: dict = {}
+    results = []
+    for child in children:
+        counts[child.status] = counts.get(child.status, 0) + 1
+        state = child.state or {}
+        scores = state.get("compliance_scores") or []
+        results.append({
+            "job_id": child.job_id,
+            "prompt": state.get("prompt"),
+            "status": child.status,
+            "image_url": state.get("image_uri") or state.get("current_image_url"),
+            "compliance_score": (scores[-1] or {}).get("overall_score") if scores else None,
+            "error": child.error,
+        })
+
+    # needs_review children wait for a person, not for a worker
+    settled = {"completed", "failed", "cancelled", "needs_review"}
+    if any(child.status not in settled for child in children):
+        status = "pending" if set(counts) == {"pending"} else "processing"
+    elif counts.get("needs_review"):
+        status = "needs_review"
+    elif counts.get("completed"):
+        status = "completed"
+    elif counts.get("cancelled") == len(children):
+        status = "cancelled"
+    else:
+        status = "failed"
+
+    return {
+        "status": status,
+        "progress": round(sum(c.progress for c in children) / len(children), 1) if children else 0.0,
+        "total": len(children),
+        "counts": counts,
+        "results": results,
+    }
+
+
 
 # Job Management Handlers
 
+async def list_jobs_handler(
+    brand_id: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> dict:
+    """
+    List jobs, newest first, with optional brand and status filters.
+
+    Args:
+        brand_id: Optional brand UUID to filter by
+        status: Optional job status to filter by
+        limit: Maximum number of jobs to return (default 100)
+        cursor: Optional cursor from the previous page's next_cursor
+
+    Returns:
+        JobListResponse with job summaries and next_cursor
+
+    Raises:
+        ValidationError: If the cursor is invalid
+    """
+    from mobius.api.schemas import JobListItem, JobListResponse
+
+    request_id = generate_request_id()
+    set_request_id(request_id)
+
+    logger.info(
+        "list_jobs_request",
+        request_id=request_id,
+        brand_id=brand_id,
+        status=status,
+        limit=limit,
+        has_cursor=bool(cursor),
+    )
+
+    _validate_cursor(cursor, request_id)
+
+    try:
+        job_storage = JobStorage()
+        jobs = await job_storage.list_jobs(
+            brand_id=brand_id, status=status, limit=limit, cursor=cursor
+        )
+
+        items = [
+            JobListItem(
+                job_id=j.job_id,
+                brand_id=j.brand_id,
+                status=j.status,
+                progress=j.progress,
+                error=j.error,
+                created_at=j.created_at,
+                updated_at=j.updated_at,
+            )
+            for j in jobs
+        ]
+
+        logger.info("list_jobs_success", request_id=request_id, count=len(items))
+
+        return JobListResponse(
+            jobs=items,
+            total=len(items),
+            next_cursor=next_cursor(jobs, "job_id", limit),
+            request_id=request_id,
+        ).model_dump()
+
+    except Exception as e:
+        logger.error("list_jobs_failed", request_id=request_id, error=str(e))
+        raise StorageError(
+            operation="list_jobs",
+            request_id=request_id,
+            details={"error": str(e)},
+        )
+
 async def get_job_status_handler(job_id: str) -> dict:
     """
     Get job status and results.
@@ -1513,6 +1778,24 @@ async def get_job_status_handler(job_id: str) -> dict:
                                         "fix_suggestion": v.get("fix_suggestion", "")
                                     })
 
+        # A batch reports its children's aggregate progress and results; the
+        # parent row is brought up to date so job listings show the same status
+        batch = None
+        if job.state and job.state.get("batch"):
+            batch = summarize_batch(await job_storage.list_child_jobs(job_id))
+            if job.status != "cancelled" and (batch["status"], batch["progress"]) != (job.status, job.progress):
+                job = await job_storage.update_job(
+                    job_id, {"status": batch["status"], "progress": batch["progress"]}
+                )
+
+        # Where the job stands while it waits for a generation worker
+        queue_info = None
+        if job.status == "pending" and job.queued_at:
+            try:
+                queue_info = await GenerationJobQueue().get_position(job_id)
+            except Exception as e:
+                logger.warning("job_queue_position_failed", request_id=request_id, job_id=job_id, error=str(e))
+
         return JobStatusResponse(
             job_id=job.job_id,
             status=job.status,
@@ -1521,6 +1804,9 @@ async def get_job_status_handler(job_id: str) -> dict:
             compliance_score=compliance_score,
             violations=violations,
             error=job.error,
+            queue_position=queue_info["queue_position"] if queue_info else None,
+            eta_seconds=queue_info["eta_seconds"] if queue_info else None,
+            batch=batch,
             created_at=job.created_at,
             updated_at=job.updated_at,
             request_id=request_id,
@@ -1537,6 +1823,20 @@ async def get_job_status_handler(job_id: str) -> dict:
         )
 
 
+async def run_cancellable(job_id: str, coro) -> None:
+    """
+    Run a job's background work so that cancelling the job stops it.
+
+    Args:
+        job_id: Job the work belongs to
+        coro: Coroutine doing the work (it records its own results)
+    """
+    try:
+        await job_cancellations.run(job_id, coro)
+    except JobCancelledError as e:
+        logger.info("background_job_cancelled", job_id=job_id, reason=e.reason)
+
+
 async def cancel_job_handler(job_id: str) -> dict:
     """
     Cancel a running job.
@@ -1585,7 +1885,24 @@ async def cancel_job_handler(job_id: str) -> dict:
             )
         
         # Update job status to cancelled
-        await job_storage.update_job(job_id, {"status": "cancelled"})
+        # Cancelled jobs also leave the generation queue
+        await job_storage.update_job(job_id, {"status": "cancelled", "queued_at": None})
+
+        # Stop the run wherever it is: this process, a generation worker or
+        # a resume container
+        await job_cancellations.cancel(job_id)
+
+        # Cancelling a batch cancels the children that have not finished
+        if job.state and job.state.get("batch"):
+            child_job_ids = await job_storage.cancel_children(job_id)
+            for child_job_id in child_job_ids:
+                await job_cancellations.cancel(child_job_id, reason="batch_cancelled")
+            logger.info(
+                "batch_children_cancelled",
+                request_id=request_id,
+                job_id=job_id,
+                count=len(child_job_ids),
+            )
         
         logger.info("cancel_job_success", request_id=request_id, job_id=job_id)
         
@@ -1681,6 +1998,8 @@ async def review_job_handler(
         # Update state with user decision
         state = job.state or {}
         state["user_decision"] = decision
+        # Changes applied to the checkpointed workflow state on resume
+        resume_updates = {"user_decision": decision}
 
         if decision == "approve":
             # Override approval and mark as complete
@@ -1804,6 +2123,10 @@ async def review_job_handler(
             # Mark this as a tweak operation so generate_node knows to use multi-turn
             state["is_tweak"] = True
             state["user_tweak_instruction"] = tweak_instruction
+            resume_updates.update({
+                "prompt": correction_prompt,
+                "user_tweak_instruction": tweak_instruction,
+            })
 
             logger.info(
                 "job_tweak_requested",
@@ -1827,6 +2150,13 @@ async def review_job_handler(
             state["attempt_count"] = 0  # CRITICAL: Forces continue_conversation=False
             state["current_image_url"] = None
             state["audit_history"] = []
+            resume_updates.update({
+                "session_id": None,
+                "attempt_count": 0,
+                "current_image_url": None,
+                "image_data_uri": None,
+                "audit_history": [],
+            })
 
             logger.info(
                 "regenerate_state_reset",
@@ -1852,7 +2182,8 @@ async def review_job_handler(
         )
 
         # Resume LangGraph workflow from correction node
-        from mobius.graphs.generation import create_generation_workflow
+        from mobius.graphs.checkpoint import workflow_checkpointer
+        from mobius.graphs.registry import get_generation_workflow
 
         # Extract prompt from job state
         prompt = state.get("prompt", "")
@@ -1870,19 +2201,29 @@ async def review_job_handler(
         async def resume_workflow():
             bg_job_storage = JobStorage()
             try:
-                # Create workflow
-                workflow = create_generation_workflow()
-                
-                # Ensure brand_id is in state (required by workflow)
-                resume_state = {
-                    **state,
-                    "brand_id": job.brand_id,  # Add brand_id from job record
-                    "job_id": job_id,  # Ensure job_id is also present
-                }
-                
-                # Resume from existing state (preserved from needs_review)
-                # The workflow will route through correct -> generate -> audit
-                final_state = await workflow.ainvoke(resume_state)
+                # Compiled once per process
+                workflow = get_generation_workflow()
+
+                # The resumed run gets a deadline budget of its own
+                deadline_at = new_deadline()
+
+                # Continue the checkpointed run from the review node
+                final_state = await workflow_checkpointer.resume(
+                    workflow, job_id, {**resume_updates, "deadline_at": deadline_at}
+                )
+
+                if final_state is None:
+                    # No checkpoint: rebuild state (brand_id is required by workflow)
+                    resume_state = {
+                        **state,
+                        "brand_id": job.brand_id,  # Add brand_id from job record
+                        "job_id": job_id,  # Ensure job_id is also present
+                        "deadline_at": deadline_at,
+                    }
+
+                    # Rerun from generate with the state preserved from needs_review
+                    config = await workflow_checkpointer.thread_config(job_id)
+                    final_state = await workflow.ainvoke(resume_state, config=config)
                 
                 # Update job with final state
                 image_url = final_state.get("current_image_url") or final_state.get("image_uri")
@@ -1923,7 +2264,7 @@ async def review_job_handler(
                     }
                 })
         
-        asyncio.create_task(resume_workflow())
+        asyncio.create_task(run_cancellable(job_id, resume_workflow()))
 
         logger.info(
             "review_job_success",
@@ -1956,6 +2297,82 @@ async def review_job_handler(
         )
 
 
+async def list_assets_handler(
+    brand_id: str,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> dict:
+    """
+    List a brand's asset library, newest first.
+
+    Args:
+        brand_id: Brand UUID
+        limit: Maximum number of assets to return (default 100)
+        cursor: Optional cursor from the previous page's next_cursor
+
+    Returns:
+        AssetListResponse with asset summaries and next_cursor
+
+    Raises:
+        ValidationError: If the cursor is invalid
+    """
+    from mobius.api.schemas import AssetListItem, AssetListResponse
+    from mobius.storage.assets import AssetStorage
+
+    request_id = generate_request_id()
+    set_request_id(request_id)
+
+    logger.info(
+        "list_assets_request",
+        request_id=request_id,
+        brand_id=brand_id,
+        limit=limit,
+        has_cursor=bool(cursor),
+    )
+
+    _validate_cursor(cursor, request_id)
+
+    try:
+        asset_storage = AssetStorage()
+        assets = await asset_storage.list_assets(brand_id, limit, cursor=cursor)
+
+        items = [
+            AssetListItem(
+                asset_id=a.asset_id,
+                brand_id=a.brand_id,
+                job_id=a.job_id,
+                prompt=a.prompt,
+                image_url=a.image_url,
+                compliance_score=a.compliance_score,
+                status=a.status,
+                created_at=a.created_at,
+            )
+            for a in assets
+        ]
+
+        logger.info(
+            "list_assets_success",
+            request_id=request_id,
+            brand_id=brand_id,
+            count=len(items),
+        )
+
+        return AssetListResponse(
+            assets=items,
+            total=len(items),
+            next_cursor=next_cursor(assets, "asset_id", limit),
+            request_id=request_id,
+        ).model_dump()
+
+    except Exception as e:
+        logger.error("list_assets_failed", request_id=request_id, error=str(e))
+        raise StorageError(
+            operation="list_assets",
+            request_id=request_id,
+            details={"error": str(e)},
+        )
+
+
 async def save_asset_to_library_handler(
     job_id: str,
     asset_name: Optional[str] = None,
@@ -1978,7 +2395,6 @@ async def save_asset_to_library_handler(
         ValidationError: If job is not completed
     """
     from mobius.storage.jobs import JobStorage
-    from mobius.storage.database import get_supabase_client
     
     request_id = generate_request_id()
     set_request_id(request_id)
@@ -2093,6 +2509,14 @@ async def save_asset_to_library_handler(
         )
 
 
+def _persisted_job_state(workflow_state: dict) -> dict:
+    """Workflow state as stored on the job (checkpoint-only image bytes and run deadline dropped)."""
+    return {
+        key: value for key, value in workflow_state.items()
+        if key not in ("image_data_uri", "deadline_at")
+    }
+
+
 async def tweak_completed_job_handler(
     job_id: str,
     tweak_instruction: str,
@@ -2116,7 +2540,8 @@ async def tweak_completed_job_handler(
         ValidationError: If job is not completed or tweak_instruction is empty
     """
     from mobius.storage.jobs import JobStorage
-    from mobius.graphs.generation import create_generation_workflow
+    from mobius.graphs.checkpoint import workflow_checkpointer
+    from mobius.graphs.registry import get_generation_workflow
 
     request_id = generate_request_id()
     set_request_id(request_id)
@@ -2230,10 +2655,8 @@ async def tweak_completed_job_handler(
         if "original_had_logos" not in state:
             # Infer from existing state if not already set
             # Check if the original generation likely had logos based on brand guidelines
-            from mobius.storage.brands import BrandStorage
             try:
-                brand_storage = BrandStorage()
-                brand = await brand_storage.get_brand(job.brand_id)
+                brand = await brand_cache.get(job.brand_id, storage=BrandStorage())
                 has_brand_logos = bool(brand and brand.guidelines and brand.guidelines.logos)
                 logo_count = len(brand.guidelines.logos) if has_brand_logos else 0
                 
@@ -2276,10 +2699,12 @@ async def tweak_completed_job_handler(
             prompt=state["prompt"][:50] if state.get("prompt") else None
         )
 
-        # Update job status to correcting
+        # Update job status to correcting; the tweaked image no longer answers
+        # the original request, so the job leaves the result cache
         await job_storage.update_job(job_id, {
             "status": "correcting",
-            "state": state
+            "state": state,
+            "result_cache_key": None,
         })
 
         logger.info(
@@ -2298,7 +2723,41 @@ async def tweak_completed_job_handler(
         
         async def resume_workflow():
             try:
-                # CRITICAL: First run correct_node to build the tweak prompt
+                workflow = get_generation_workflow()
+                # The tweak run gets a deadline budget of its own
+                workflow_state["deadline_at"] = new_deadline()
+
+                # The checkpoint holds the full state of the last run (brand, logo
+                # configuration, session, image bytes). Re-enter it after audit so
+                # route_after_audit sends the tweak through correct -> generate.
+                final_state = await workflow_checkpointer.resume(
+                    workflow,
+                    job_id,
+                    {
+                        "user_tweak_instruction": tweak_instruction,
+                        "user_decision": "tweak",
+                        "needs_review": False,
+                        "is_approved": False,
+                        "deadline_at": workflow_state["deadline_at"],
+                    },
+                    as_node="audit",
+                )
+                if final_state is not None:
+                    await job_storage.update_job(job_id, {
+                        "status": final_state.get("status", "completed"),
+                        "progress": 100.0,
+                        "state": _persisted_job_state(final_state)
+                    })
+                    logger.info(
+                        "tweak_workflow_completed",
+                        job_id=job_id,
+                        final_status=final_state.get("status"),
+                        is_approved=final_state.get("is_approved"),
+                        from_checkpoint=True
+                    )
+                    return
+
+                # No checkpoint: run correct_node on the rebuilt state to build the tweak prompt
                 # This converts user_tweak_instruction into a proper correction prompt
                 logger.info(
                     "running_correct_node_for_tweak",
@@ -2326,9 +2785,7 @@ async def tweak_completed_job_handler(
                 if "prompt" not in workflow_state:
                     raise ValueError("prompt missing from workflow state")
                 
-                # Now create workflow and resume from generate node
-                workflow = create_generation_workflow()
-                
+                # Now resume the compiled workflow from the generate node
                 logger.info(
                     "invoking_workflow",
                     job_id=job_id,
@@ -2339,13 +2796,14 @@ async def tweak_completed_job_handler(
                 )
                 
                 # Resume with updated state (now has correction prompt)
-                final_state = await workflow.ainvoke(workflow_state)
+                config = await workflow_checkpointer.thread_config(job_id)
+                final_state = await workflow.ainvoke(workflow_state, config=config)
                 
                 # Update job with final state
                 await job_storage.update_job(job_id, {
                     "status": final_state.get("status", "completed"),
                     "progress": 100.0,
-                    "state": final_state
+                    "state": _persisted_job_state(final_state)
                 })
                 
                 logger.info(
@@ -2369,7 +2827,7 @@ async def tweak_completed_job_handler(
                 })
         
         # Run workflow in background
-        asyncio.create_task(resume_workflow())
+        asyncio.create_task(run_cancellable(job_id, resume_workflow()))
 
         logger.info(
             "tweak_completed_job_success",
@@ -2411,8 +2869,9 @@ async def submit_feedback_handler(
     Submit feedback for an asset.
     
     Stores feedback event with action (approve/reject) and optional reason.
-    The database trigger automatically updates the brand's feedback_count
-    and learning_active flag.
+    The database trigger automatically updates the brand's feedback counters
+    and learning_active flag in the same transaction, so the statistics
+    returned here are a single-row read.
     
     Args:
         asset_id: Asset UUID
@@ -2576,6 +3035,72 @@ async def get_feedback_stats_handler(brand_id: str) -> dict:
         )
 
 
+async def list_feedback_handler(
+    brand_id: str,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> dict:
+    """
+    List feedback events for a brand, newest first.
+
+    Args:
+        brand_id: Brand UUID
+        limit: Maximum number of feedback events to return (default 100)
+        cursor: Optional cursor from the previous page's next_cursor
+
+    Returns:
+        FeedbackListResponse with feedback events and next_cursor
+
+    Raises:
+        ValidationError: If the cursor is invalid
+    """
+    from mobius.api.schemas import FeedbackListItem, FeedbackListResponse
+    from mobius.storage.feedback import FeedbackStorage
+
+    request_id = generate_request_id()
+    set_request_id(request_id)
+
+    logger.info(
+        "list_feedback_request",
+        request_id=request_id,
+        brand_id=brand_id,
+        limit=limit,
+        has_cursor=bool(cursor),
+    )
+
+    _validate_cursor(cursor, request_id)
+
+    try:
+        feedback_storage = FeedbackStorage()
+        feedback = await feedback_storage.list_feedback_by_brand(
+            brand_id, limit, cursor=cursor
+        )
+
+        items = [FeedbackListItem(**f.model_dump()) for f in feedback]
+
+        logger.info(
+            "list_feedback_success",
+            request_id=request_id,
+            brand_id=brand_id,
+            count=len(items),
+        )
+
+        return FeedbackListResponse(
+            feedback=items,
+            total=len(items),
+            next_cursor=next_cursor(feedback, "feedback_id", limit),
+            request_id=request_id,
+        ).model_dump()
+
+    except Exception as e:
+        logger.error("list_feedback_failed", request_id=request_id, error=str(e))
+        raise StorageError(
+            operation="list_feedback",
+            request_id=request_id,
+            details={"error": str(e)},
+        )
+
+
 
 # System Endpoints
 
@@ -2628,6 +3153,14 @@ async def health_check_handler() -> dict:
         overall_status = "degraded"
         logger.error("storage_check_failed", request_id=request_id, error=str(e))
     
+    # Generation queue depth (reported, does not affect health)
+    generation_queue = None
+    if database_status == "healthy":
+        try:
+            generation_queue = await GenerationJobQueue().get_stats()
+        except Exception as e:
+            logger.warning("generation_queue_stats_failed", request_id=request_id, error=str(e))
+
     # API is healthy if we got here
     api_status = "healthy"
     
@@ -2640,6 +3173,8 @@ async def health_check_handler() -> dict:
         api=api_status,
     )
     
+    from mobius.graphs.registry import workflow_registry
+
     return HealthCheckResponse(
         status=overall_status,
         database=database_status,
@@ -2647,6 +3182,12 @@ async def health_check_handler() -> dict:
         api=api_status,
         timestamp=datetime.now(timezone.utc),
         request_id=request_id,
+        workflows=workflow_registry.stats(),
+        generation_queue=generation_queue,
+        cancellations=job_cancellations.stats(),
+        brand_cache=brand_cache.stats(),
+        result_cache=result_cache.stats(),
+        job_state=job_state_metrics.stats(),
     ).model_dump()
 
 
@@ -3044,6 +3585,12 @@ Generate a brand-compliant image using the Vision Model (gemini-3-pro-image-prev
 - Use `idempotency_key` to prevent duplicate job creation
 - If job with same key exists and is not expired, returns existing job
 - Keys expire after 24 hours
+
+**Result Cache:**
+- Set `cache: "use"` to get the approved result of an identical earlier request
+  (same brand guidelines, prompt, template, params and seed) instantly, with `cached: true`
+- Set `cache: "refresh"` to generate anew; the new result replaces the cached one
+- Identical requests still in progress return the running job instead of starting another
                     """,
                     "operationId": "generate",
                     "tags": ["Generation"],
@@ -3222,7 +3769,7 @@ Generate a brand-compliant image using the Vision Model (gemini-3-pro-image-prev
                 },
                 "get": {
                     "summary": "List templates",
-                    "description": "List all templates for a brand",
+                    "description": "List templates for a brand, newest first. Pass next_cursor from the previous page as cursor to fetch the next page.",
                     "operationId": "listTemplates",
                     "tags": ["Templates"],
                     "parameters": [
@@ -3238,6 +3785,12 @@ Generate a brand-compliant image using the Vision Model (gemini-3-pro-image-prev
                             "required": False,
                             "schema": {"type": "integer", "default": 100},
                         },
+                        {
+                            "name": "cursor",
+                            "in": "query",
+                            "required": False,
+                            "schema": {"type": "string"},
+                        },
                     ],
                     "responses": {
                         "200": {
@@ -3501,6 +4054,12 @@ Generate a brand-compliant image using the Vision Model (gemini-3-pro-image-prev
                             "description": "Client-provided key to prevent duplicate job creation",
                             "example": "client-request-456",
                         },
+                        "cache": {
+                            "type": "string",
+                            "enum": ["off", "use", "refresh"],
+                            "default": "off",
+                            "description": "Result cache: reuse the approved result of an identical request, or refresh it",
+                        },
                     },
                 },
                 "GenerateResponse": {
@@ -3539,6 +4098,10 @@ Generate a brand-compliant image using the Vision Model (gemini-3-pro-image-prev
                             "description": "Request ID for tracing",
                             "example": "req_gen_123",
                         },
+                        "cached": {
+                            "type": "boolean",
+                            "description": "Whether the result came from the result cache",
+                        },
                     },
                     "required": ["job_id", "status", "message", "request_id"],
                 },
@@ -3732,6 +4295,7 @@ Generate a brand-compliant image using the Vision Model (gemini-3-pro-image-prev
                             "items": {"$ref": "#/components/schemas/TemplateResponse"},
                         },
                         "total": {"type": "integer"},
+                        "next_cursor": {"type": "string", "nullable": True},
                         "request_id": {"type": "string"},
                     },
                 },
@@ -4351,9 +4915,8 @@ async def get_brand_graph_handler(brand_id: str) -> dict:
         brand_id=brand_id
     )
 
-    # Get full brand from PostgreSQL (source of truth)
-    brand_storage = BrandStorage()
-    brand = await brand_storage.get_brand(brand_id)
+    # Get full brand from PostgreSQL (source of truth), via the shared cache
+    brand = await brand_cache.get(brand_id, storage=BrandStorage())
     
     if not brand:
         raise NotFoundError(
@@ -4455,13 +5018,30 @@ async def get_brand_graph_handler(brand_id: str) -> dict:
     return brand_graph
 
 
-async def find_color_relationships_handler(hex: str) -> dict:
+async def find_color_relationships_handler(
+    hex: str, tolerance: Optional[float] = None, limit: int = 100, offset: int = 0
+) -> dict:
     """
     GET /v1/colors/{hex}/brands
 
     Find all brands using a specific color.
+
+    Without tolerance, only brands using the exact hex code are returned
+    (Neo4j). With tolerance, brands using any color within that perceptual
+    distance (CIE76 ΔE) are returned from the in-process Lab-space color
+    index, each with its closest matching color, one page at a time:
+    total_count is the number of matching brands and next_offset is set
+    when more remain.
+
+    Args:
+        hex: Color code, with or without "#"
+        tolerance: Optional maximum ΔE (0-100); ~2.3 is a just-noticeable difference
+        limit: Page size for tolerance searches (1-500)
+        offset: Matching brands to skip for tolerance searches
     """
+    from mobius.storage.brand_similarity import brand_similarity_index
     from mobius.storage.graph import graph_storage
+    from mobius.utils.color import normalize_hex
 
     # Ensure hex code has # prefix
     if not hex.startswith("#"):
@@ -4473,25 +5053,76 @@ async def find_color_relationships_handler(hex: str) -> dict:
     logger.info(
         "color_relationships_request",
         request_id=request_id,
-        hex=hex
+        hex=hex,
+        tolerance=tolerance
     )
 
-    brands = await graph_storage.find_brands_using_color(hex)
+    if tolerance is None:
+        brands = await graph_storage.find_brands_using_color(hex)
+
+        return {
+            "color": hex,
+            "brands": brands,
+            "brand_count": len(brands)
+        }
+
+    if not 0 <= tolerance <= 100:
+        raise ValidationError(
+            code="INVALID_TOLERANCE",
+            message="tolerance must be between 0 and 100 (ΔE)",
+            request_id=request_id,
+            details={"tolerance": tolerance}
+        )
+    if not 1 <= limit <= 500 or offset < 0:
+        raise ValidationError(
+            code="INVALID_PAGE",
+            message="limit must be between 1 and 500 and offset must not be negative",
+            request_id=request_id,
+            details={"limit": limit, "offset": offset}
+        )
+    try:
+        hex = normalize_hex(hex)
+    except ValueError:
+        raise ValidationError(
+            code="INVALID_COLOR",
+            message="Color must be a 6-digit hex code",
+            request_id=request_id,
+            details={"hex": hex}
+        )
+
+    brands, total = await brand_similarity_index.find_brands_near_color(
+        hex, tolerance, limit=limit, offset=offset
+    )
+    has_more = offset + len(brands) < total
 
     return {
         "color": hex,
+        "tolerance": tolerance,
         "brands": brands,
-        "brand_count": len(brands)
+        "brand_count": len(brands),
+        "total_count": total,
+        "truncated": has_more,
+        "next_offset": offset + len(brands) if has_more else None
     }
 
 
-async def find_similar_brands_handler(brand_id: str, min_shared_colors: int = 3) -> dict:
+async def find_similar_brands_handler(
+    brand_id: str, min_shared_colors: int = 3, weighted: bool = False
+) -> dict:
     """
     GET /v1/brands/{brand_id}/similar
 
     Find brands with similar color palettes.
+
+    Served from the in-process brand similarity index (built from PostgreSQL),
+    so it works without Neo4j.
+
+    Args:
+        brand_id: Brand to compare against
+        min_shared_colors: Minimum number of colors in common
+        weighted: Rank by usage_weight-weighted Jaccard instead of Jaccard
     """
-    from mobius.storage.graph import graph_storage
+    from mobius.storage.brand_similarity import brand_similarity_index
 
     request_id = generate_request_id()
     set_request_id(request_id)
@@ -4500,17 +5131,19 @@ async def find_similar_brands_handler(brand_id: str, min_shared_colors: int = 3)
         "similar_brands_request",
         request_id=request_id,
         brand_id=brand_id,
-        min_shared_colors=min_shared_colors
+        min_shared_colors=min_shared_colors,
+        weighted=weighted
     )
 
-    similar_brands = await graph_storage.find_similar_brands(
-        brand_id, min_shared_colors
+    similar_brands = await brand_similarity_index.find_similar(
+        brand_id, min_shared_colors=min_shared_colors, weighted=weighted
     )
 
     return {
         "brand_id": brand_id,
         "similar_brands": similar_brands,
-        "count": len(similar_brands)
+        "count": len(similar_brands),
+        "metric": "weighted_jaccard" if weighted else "jaccard"
     }
 
 
@@ -4546,6 +5179,76 @@ async def find_color_pairings_handler(hex: str, min_samples: int = 5) -> dict:
     }
 
 
+async def start_graph_resync_handler(organization_id: Optional[str]) -> dict:
+    """
+    POST /v1/graph/resync
+
+    Prepare a Neo4j resync of one organization's brands, assets, templates
+    and feedback. The caller runs the backfill in the background
+    (GraphBackfill.run with the returned run_id and lease_owner); an
+    interrupted resync is resumed from its checkpoint by starting it again
+    once its worker's lease has expired.
+
+    Args:
+        organization_id: Organization to resync
+
+    Returns:
+        Dictionary with run_id, status, start (False if the run is already
+        in progress) and, when starting, the lease_owner the run was claimed with
+    """
+    from mobius.storage.graph import graph_storage
+    from mobius.storage.graph_backfill import GraphBackfillRuns
+
+    request_id = generate_request_id()
+    set_request_id(request_id)
+
+    if not organization_id or not isinstance(organization_id, str):
+        raise ValidationError(
+            code="MISSING_ORGANIZATION_ID",
+            message="organization_id is required",
+            request_id=request_id,
+            details={"organization_id": organization_id}
+        )
+
+    logger.info("graph_resync_requested", request_id=request_id, organization_id=organization_id)
+
+    if not graph_storage._is_enabled():
+        raise ValidationError(
+            code="GRAPH_DISABLED",
+            message="Graph database not configured",
+            request_id=request_id,
+        )
+
+    runs = GraphBackfillRuns()
+    run_id = f"org-{organization_id}"
+    lease_owner = uuid.uuid4().hex
+
+    # Only one caller can take the lease; a run whose worker died is taken
+    # over once its lease (renewed on every checkpoint) expires
+    if await runs.claim_run(run_id, organization_id, lease_owner) is None:
+        current = await runs.get_run(run_id)
+        return {"run_id": run_id, "status": current["status"] if current else "running", "start": False}
+
+    return {"run_id": run_id, "status": "pending", "start": True, "lease_owner": lease_owner}
+
+
+async def get_graph_resync_handler(run_id: str) -> dict:
+    """
+    GET /v1/graph/resync/{run_id}
+
+    Get the progress of a graph backfill run.
+    """
+    from mobius.storage.graph_backfill import GraphBackfillRuns
+
+    request_id = generate_request_id()
+    set_request_id(request_id)
+
+    run = await GraphBackfillRuns().get_run(run_id)
+    if run is None:
+        raise NotFoundError(resource="graph_resync", resource_id=run_id, request_id=request_id)
+    return run
+
+
 async def graph_health_check_handler() -> dict:
     """
     GET /v1/health/graph
@@ -4584,7 +5287,8 @@ async def graph_health_check_handler() -> dict:
                 "status": "healthy",
                 "node_count": node_count,
                 "stats_by_label": stats,
-                "database": graph_storage.driver._config.database
+                "database": graph_storage.driver._config.database,
+                "query_cache": graph_storage.query_cache.stats()
             }
 
     except Exception as e:
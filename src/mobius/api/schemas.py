@@ -5,7 +5,7 @@ Defines all API request and response models with validation.
 """
 
 from pydantic import BaseModel, Field, HttpUrl
-from typing import List, Optional, Dict, Any
+from typing import List, Literal, Optional, Dict, Any
 from datetime import datetime
 
 
@@ -25,6 +25,12 @@ class GenerateRequest(BaseModel):
         "returns the existing job instead of creating a new one.",
         max_length=64,
     )
+    cache: Literal["off", "use", "refresh"] = Field(
+        default="off",
+        description="Result cache: 'use' returns the approved result of an identical earlier "
+        "request (same brand guidelines, prompt, template, params and seed) instead of "
+        "generating; 'refresh' generates anew and replaces the cached result.",
+    )
 
     class Config:
         json_schema_extra = {
@@ -47,6 +53,7 @@ class GenerateResponse(BaseModel):
     image_url: Optional[str] = None
     compliance_score: Optional[float] = None
     request_id: str
+    cached: bool = Field(default=False, description="Whether the result came from the result cache")
 
     class Config:
         json_schema_extra = {
@@ -59,6 +66,44 @@ class GenerateResponse(BaseModel):
         }
 
 
+class GenerateBatchRequest(BaseModel):
+    """Request schema for batch generation (many prompts for one brand)."""
+
+    brand_id: str = Field(description="Brand ID to use for every asset", min_length=1)
+    prompts: Optional[List[str]] = Field(None, description="One asset per prompt")
+    prompt: Optional[str] = Field(None, description="Single prompt generated `variations` times")
+    variations: Optional[int] = Field(None, ge=1, description="Number of variations of `prompt`")
+    template_id: Optional[str] = Field(None, description="Optional template ID applied to every asset")
+    idempotency_key: Optional[str] = Field(
+        None,
+        description="Client-provided key; repeating it returns the existing batch",
+        max_length=64,
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "brand_id": "brand-123",
+                "prompts": [
+                    "Instagram post announcing our summer sale",
+                    "Email header for the summer sale",
+                ],
+                "idempotency_key": "campaign-summer-2026",
+            }
+        }
+
+
+class GenerateBatchResponse(BaseModel):
+    """Response schema for batch generation."""
+
+    batch_id: str = Field(description="Parent job ID; poll /v1/jobs/{batch_id} for aggregate progress")
+    status: str
+    total: int
+    child_job_ids: List[str]
+    message: str
+    request_id: str
+
+
 # Brand Ingestion API Schemas
 class IngestBrandRequest(BaseModel):
     """Request schema for brand ingestion."""
@@ -160,6 +205,30 @@ class TemplateListResponse(BaseModel):
 
     templates: List[TemplateResponse]
     total: int
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if any")
+    request_id: str
+
+
+# Asset API Schemas
+class AssetListItem(BaseModel):
+    """Asset list item with summary information."""
+
+    asset_id: str
+    brand_id: str
+    job_id: str
+    prompt: str
+    image_url: str
+    compliance_score: Optional[float]
+    status: str
+    created_at: datetime
+
+
+class AssetListResponse(BaseModel):
+    """Response schema for asset list."""
+
+    assets: List[AssetListItem]
+    total: int
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if any")
     request_id: str
 
 
@@ -182,6 +251,26 @@ class FeedbackResponse(BaseModel):
     request_id: str
 
 
+class FeedbackListItem(BaseModel):
+    """Feedback list item."""
+
+    feedback_id: str
+    asset_id: str
+    brand_id: str
+    action: str
+    reason: Optional[str]
+    created_at: datetime
+
+
+class FeedbackListResponse(BaseModel):
+    """Response schema for feedback event list."""
+
+    feedback: List[FeedbackListItem]
+    total: int
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if any")
+    request_id: str
+
+
 class FeedbackStatsResponse(BaseModel):
     """Response schema for feedback statistics."""
 
@@ -203,8 +292,32 @@ class JobStatusResponse(BaseModel):
     compliance_score: Optional[float]
     violations: Optional[list] = None  # Violation details for needs_review status
     error: Optional[str]
+    queue_position: Optional[int] = None  # Waiting jobs ahead while the job is queued
+    eta_seconds: Optional[float] = None  # Estimated wait until a worker starts the job
+    batch: Optional[dict] = None  # Aggregate counts and per-child results for a batch job
+    created_at: datetime
+    updated_at: datetime
+    request_id: str
+
+
+class JobListItem(BaseModel):
+    """Job list item with summary information."""
+
+    job_id: str
+    brand_id: str
+    status: str
+    progress: float = Field(ge=0, le=100)
+    error: Optional[str]
     created_at: datetime
     updated_at: datetime
+
+
+class JobListResponse(BaseModel):
+    """Response schema for job list."""
+
+    jobs: List[JobListItem]
+    total: int
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if any")
     request_id: str
 
 
@@ -218,6 +331,24 @@ class HealthCheckResponse(BaseModel):
     api: str
     timestamp: datetime
     request_id: str
+    workflows: Optional[Dict[str, Any]] = Field(
+        None, description="Compiled workflows and their compile times in ms"
+    )
+    generation_queue: Optional[Dict[str, Any]] = Field(
+        None, description="Generation queue depth, running jobs and lag in seconds"
+    )
+    cancellations: Optional[Dict[str, Any]] = Field(
+        None, description="Job cancellations in this process: jobs stopped, stop latency and reclaimed seconds"
+    )
+    brand_cache: Optional[Dict[str, Any]] = Field(
+        None, description="Brand cache in this process: size, hits, misses, evictions and hit ratio"
+    )
+    result_cache: Optional[Dict[str, Any]] = Field(
+        None, description="Generation result cache in this process: hits, misses, refreshes and collapsed requests"
+    )
+    job_state: Optional[Dict[str, Any]] = Field(
+        None, description="Stored job state sizes in this process: average, largest, budget overruns and bytes saved"
+    )
 
 
 class CancelJobResponse(BaseModel):
@@ -3,18 +3,108 @@ WebSocket handlers for real-time brand compliance monitoring.
 
 Provides WebSocket endpoints for streaming compliance scores, reasoning logs,
 color analysis, and constraint updates during brand audit processes.
+
+Endpoints:
+- /ws/monitoring/{job_id}: one connection per job
+- /ws/jobs: one multiplexed connection that subscribes to many jobs, or to
+  every job of a brand, with subscribe/unsubscribe control messages
+  (see websocket_multiplexed_endpoint)
 """
 
 import json
 import asyncio
+import time
 import structlog
-from typing import Dict, Set, Optional
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Set, Optional
 from datetime import datetime
 from fastapi import WebSocket, WebSocketDisconnect
+from mobius.api.job_events import job_event_bus, job_event_log, job_event_sequencer
 from mobius.api.utils import generate_request_id
+from mobius.config import settings
 
 logger = structlog.get_logger()
 
+# Message types where only the latest queued message matters
+# (latest-status-wins for slow consumers)
+COALESCED_MESSAGE_TYPES = {"status_change", "compliance_score", "ping"}
+
+# Seconds without a client message before the server pings the connection
+HEARTBEAT_SECONDS = 30.0
+
+
+def _coalesce_key(message: dict, job_id: Optional[str] = None) -> Optional[str]:
+    """
+    Key under which a newer queued message replaces an older one.
+
+    One connection may follow several jobs, so status and score messages are
+    only replaced by ones for the same job; without a job they are never
+    replaced. Pings are per connection.
+
+    Args:
+        message: Outbound message
+        job_id: Job the message is about (defaults to its jobId)
+
+    Returns:
+        Coalesce key, or None if the message must be delivered
+    """
+    message_type = message.get("type")
+    if message_type not in COALESCED_MESSAGE_TYPES:
+        return None
+    job_id = job_id or message.get("jobId")
+    if job_id is None:
+        return message_type if message_type == "ping" else None
+    return f"{message_type}:{job_id}"
+
+
+class _OutboundMessage:
+    """A serialized message waiting in a connection's send queue."""
+
+    __slots__ = ("text", "coalesce_key", "enqueued_at")
+
+    def __init__(self, text: str, coalesce_key: Optional[str]):
+        self.text = text
+        self.coalesce_key = coalesce_key
+        self.enqueued_at = time.monotonic()
+
+
+class _ConnectionState:
+    """Send queue, writer task, subscriptions and lag metrics of one WebSocket connection."""
+
+    def __init__(self, websocket: WebSocket, job_id: Optional[str]):
+        self.websocket = websocket
+        # Job the connection was opened for (None for multiplexed connections)
+        self.job_id = job_id
+        self.jobs: Set[str] = set()
+        self.brands: Set[str] = set()
+        self.queue: Deque[_OutboundMessage] = deque()
+        # coalesce key -> message currently queued with that key
+        self.pending_by_key: Dict[str, _OutboundMessage] = {}
+        self.ready = asyncio.Event()
+        self.writer: Optional[asyncio.Task] = None
+
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+
+    def subscription_count(self) -> int:
+        return len(self.jobs) + len(self.brands)
+
+    def stats(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "subscriptions": self.subscription_count(),
+            "queued": len(self.queue),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "last_lag_ms": round(self.last_lag_ms, 2),
+            "max_lag_ms": round(self.max_lag_ms, 2),
+        }
+
+
 # Global connection manager for WebSocket connections
 class WebSocketConnectionManager:
     """
@@ -22,32 +112,73 @@ class WebSocketConnectionManager:
     
     Features:
     - Job-based connection grouping
+    - Brand subscriptions (every job of a brand) for multiplexed connections
     - Message broadcasting to job subscribers
     - Connection lifecycle management
     - Automatic cleanup on disconnect
+
+    A connection can subscribe to any number of jobs and brands (up to
+    max_subscriptions); every message carries its jobId, so one socket and
+    one heartbeat serve them all.
+
+    Sending never blocks the caller: each connection has a bounded outbound
+    queue drained by its own writer task, and a broadcast serializes the
+    message once and enqueues it for every subscriber. A slow consumer only
+    delays itself. Status-like messages replace a queued message of the same
+    type (latest-status-wins) and take its place at the back of the queue, so
+    a client never sees a status before messages that were sent ahead of it.
+    When a queue is full its oldest other message (e.g. a reasoning log) is
+    dropped.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        queue_size: Optional[int] = None,
+        send_timeout: Optional[float] = None,
+        max_subscriptions: Optional[int] = None,
+    ):
         # Dictionary mapping job_id to set of WebSocket connections
         self.job_connections: Dict[str, Set[WebSocket]] = {}
-        # Dictionary mapping WebSocket to job_id for cleanup
+        # Dictionary mapping brand_id to connections following all its jobs
+        self.brand_connections: Dict[str, Set[WebSocket]] = {}
+        # Dictionary mapping WebSocket to the job it was opened for
         self.connection_jobs: Dict[WebSocket, str] = {}
+        # Dictionary mapping WebSocket to its send queue, writer and subscriptions
+        self.connection_states: Dict[WebSocket, _ConnectionState] = {}
+        self.queue_size = queue_size or settings.websocket_send_queue_size
+        self.send_timeout = send_timeout or settings.websocket_send_timeout_seconds
+        self.max_subscriptions = max_subscriptions or settings.websocket_max_subscriptions
+        # job_id -> brand_id, for routing events to brand subscribers
+        self._job_brands: "OrderedDict[str, Optional[str]]" = OrderedDict()
         
-    async def connect(self, websocket: WebSocket, job_id: str):
-        """Accept WebSocket connection and add to job group."""
+    async def connect(self, websocket: WebSocket, job_id: Optional[str] = None):
+        """
+        Accept WebSocket connection and add to job group.
+
+        Args:
+            websocket: WebSocket connection
+            job_id: Job the connection monitors; None for a multiplexed
+                connection that subscribes with control messages
+        """
         await websocket.accept()
-        
+
+        state = _ConnectionState(websocket, job_id)
+        state.writer = asyncio.create_task(self._write_loop(state))
+        self.connection_states[websocket] = state
+
         # Add to job group
-        if job_id not in self.job_connections:
-            self.job_connections[job_id] = set()
-        
-        self.job_connections[job_id].add(websocket)
-        self.connection_jobs[websocket] = job_id
+        if job_id is not None:
+            self.connection_jobs[websocket] = job_id
+            self.subscribe_job(websocket, job_id)
+        connection_count = (
+            len(self.job_connections[job_id]) if job_id is not None
+            else self.get_total_connections()
+        )
         
         logger.info(
             "websocket_connected",
             job_id=job_id,
-            connection_count=len(self.job_connections[job_id])
+            connection_count=connection_count
         )
         
         # Send connection confirmation
@@ -57,62 +188,142 @@ class WebSocketConnectionManager:
             "timestamp": datetime.utcnow().isoformat(),
             "payload": {
                 "message": "WebSocket connected successfully",
-                "connection_count": len(self.job_connections[job_id])
+                "connection_count": connection_count
             }
         })
     
     def disconnect(self, websocket: WebSocket):
         """Remove WebSocket connection and cleanup."""
-        job_id = self.connection_jobs.get(websocket)
-        
-        if job_id and job_id in self.job_connections:
-            self.job_connections[job_id].discard(websocket)
-            
-            # Clean up empty job groups
-            if not self.job_connections[job_id]:
-                del self.job_connections[job_id]
-                
-        if websocket in self.connection_jobs:
-            del self.connection_jobs[websocket]
+        job_id = self.connection_jobs.pop(websocket, None)
+
+        state = self.connection_states.pop(websocket, None)
+        if state is not None:
+            for subscribed_job in state.jobs:
+                self._leave(self.job_connections, subscribed_job, websocket)
+            for brand_id in state.brands:
+                self._leave(self.brand_connections, brand_id, websocket)
+            if state.writer is not None and state.writer is not asyncio.current_task():
+                state.writer.cancel()
             
         logger.info(
             "websocket_disconnected",
             job_id=job_id,
             remaining_connections=len(self.job_connections.get(job_id, []))
         )
+
+    def subscribe_job(self, websocket: WebSocket, job_id: str) -> bool:
+        """
+        Route a job's messages to a connection.
+
+        Returns:
+            False if the connection is unknown or at max_subscriptions
+        """
+        state = self.connection_states.get(websocket)
+        if state is None:
+            return False
+        if job_id not in state.jobs:
+            if state.subscription_count() >= self.max_subscriptions:
+                return False
+            state.jobs.add(job_id)
+            self.job_connections.setdefault(job_id, set()).add(websocket)
+        return True
+
+    def unsubscribe_job(self, websocket: WebSocket, job_id: str) -> None:
+        """Stop routing a job's messages to a connection."""
+        state = self.connection_states.get(websocket)
+        if state is not None and job_id in state.jobs:
+            state.jobs.discard(job_id)
+            self._leave(self.job_connections, job_id, websocket)
+
+    def subscribe_brand(self, websocket: WebSocket, brand_id: str) -> bool:
+        """
+        Route the messages of every job of a brand to a connection.
+
+        Returns:
+            False if the connection is unknown or at max_subscriptions
+        """
+        state = self.connection_states.get(websocket)
+        if state is None:
+            return False
+        if brand_id not in state.brands:
+            if state.subscription_count() >= self.max_subscriptions:
+                return False
+            state.brands.add(brand_id)
+            self.brand_connections.setdefault(brand_id, set()).add(websocket)
+        return True
+
+    def unsubscribe_brand(self, websocket: WebSocket, brand_id: str) -> None:
+        """Stop routing a brand's job messages to a connection."""
+        state = self.connection_states.get(websocket)
+        if state is not None and brand_id in state.brands:
+            state.brands.discard(brand_id)
+            self._leave(self.brand_connections, brand_id, websocket)
     
     async def send_to_job(self, job_id: str, message: dict):
-        """Send message to all connections subscribed to a job."""
-        if job_id not in self.job_connections:
+        """
+        Send message to all connections subscribed to a job or its brand.
+
+        Returns as soon as the message is queued; see broadcast(). The job's
+        brand is only looked up while some connection follows a brand.
+        """
+        brand_id = await self._job_brand(job_id) if self.brand_connections else None
+        self.broadcast(job_id, message, brand_id)
+
+    def broadcast(self, job_id: str, message: dict, brand_id: Optional[str] = None) -> int:
+        """
+        Queue a message for every connection subscribed to a job.
+
+        The message is serialized once. Never blocks on network I/O.
+
+        Args:
+            job_id: Job whose subscribers receive the message
+            message: JSON-serializable message
+            brand_id: Brand of the job; its subscribers also receive the message
+
+        Returns:
+            Number of connections the message was queued for
+        """
+        connections = self.job_connections.get(job_id)
+        brand_subscribers = self.brand_connections.get(brand_id) if brand_id else None
+        if brand_subscribers:
+            connections = brand_subscribers | (connections or set())
+        if not connections:
             logger.debug("no_connections_for_job", job_id=job_id)
-            return
-        
-        # Create a copy of connections to avoid modification during iteration
-        connections = list(self.job_connections[job_id])
-        disconnected = []
-        
-        for websocket in connections:
-            try:
-                await self.send_to_connection(websocket, message)
-            except Exception as e:
-                logger.warning(
-                    "websocket_send_failed",
-                    job_id=job_id,
-                    error=str(e)
-                )
-                disconnected.append(websocket)
-        
-        # Clean up failed connections
-        for websocket in disconnected:
-            self.disconnect(websocket)
+            return 0
+
+        text = json.dumps(message)
+        coalesce_key = _coalesce_key(message, job_id)
+        for websocket in list(connections):
+            state = self.connection_states.get(websocket)
+            if state is not None:
+                self._enqueue(state, text, coalesce_key)
+        return len(connections)
     
     async def send_to_connection(self, websocket: WebSocket, message: dict):
-        """Send message to a specific WebSocket connection."""
-        try:
-            await websocket.send_text(json.dumps(message))
-        except Exception as e:
-            logger.error("websocket_message_send_failed", error=str(e))
-            raise
+        """Send message to a specific WebSocket connection (queued behind earlier messages)."""
+        state = self.connection_states.get(websocket)
+        if state is None:
+            # Not (or no longer) managed: send directly
+            try:
+                await websocket.send_text(json.dumps(message))
+            except Exception as e:
+                logger.error("websocket_message_send_failed", error=str(e))
+                raise
+            return
+
+        coalesce_key = _coalesce_key(message)
+        self._enqueue(state, json.dumps(message), coalesce_key)
+
+    async def drain(self, timeout: float = 5.0) -> None:
+        """Wait until every send queue is empty (used on shutdown and in tests)."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while any(state.queue for state in self.connection_states.values()):
+            if loop.time() >= deadline:
+                break
+            await asyncio.sleep(0.005)
+        # Let writers finish the send they popped last
+        await asyncio.sleep(0)
     
     def get_job_connection_count(self, job_id: str) -> int:
         """Get number of active connections for a job."""
@@ -120,16 +331,205 @@ class WebSocketConnectionManager:
     
     def get_total_connections(self) -> int:
         """Get total number of active connections."""
-        return sum(len(connections) for connections in self.job_connections.values())
+        return len(self.connection_states)
+
+    def get_connection_stats(self) -> dict:
+        """
+        Get per-connection send queue metrics.
+
+        Returns:
+            Dictionary with totals and a list of per-connection stats
+            (queued, sent, dropped, coalesced, last/max lag in ms, where lag
+            is the time a message waited in the queue)
+        """
+        connections = [state.stats() for state in self.connection_states.values()]
+        return {
+            "connections": len(connections),
+            "queued": sum(c["queued"] for c in connections),
+            "dropped": sum(c["dropped"] for c in connections),
+            "coalesced": sum(c["coalesced"] for c in connections),
+            "subscriptions": sum(c["subscriptions"] for c in connections),
+            "max_lag_ms": max((c["max_lag_ms"] for c in connections), default=0.0),
+            "per_connection": connections,
+        }
+
+    @staticmethod
+    def _leave(groups: Dict[str, Set[WebSocket]], key: str, websocket: WebSocket) -> None:
+        connections = groups.get(key)
+        if connections is not None:
+            connections.discard(websocket)
+            # Clean up empty groups
+            if not connections:
+                del groups[key]
+
+    async def _job_brand(self, job_id: str, max_jobs: int = 10000) -> Optional[str]:
+        """Get (and remember) the brand a job belongs to."""
+        if job_id in self._job_brands:
+            self._job_brands.move_to_end(job_id)
+            return self._job_brands[job_id]
+
+        from mobius.storage.jobs import JobStorage
+
+        try:
+            job = await JobStorage().get_job(job_id)
+        except Exception as e:
+            logger.warning("websocket_job_brand_lookup_failed", job_id=job_id, error=str(e))
+            return None
+        if job is None:
+            return None
+        self._job_brands[job_id] = job.brand_id
+        while len(self._job_brands) > max_jobs:
+            self._job_brands.popitem(last=False)
+        return job.brand_id
+
+    def _enqueue(self, state: _ConnectionState, text: str, coalesce_key: Optional[str]) -> None:
+        if coalesce_key is not None:
+            queued = state.pending_by_key.pop(coalesce_key, None)
+            if queued is not None:
+                # Move to the back: the newest status must follow every
+                # message queued before it (e.g. the logs leading up to
+                # "completed"). Lag is still measured from the first enqueue.
+                state.queue.remove(queued)
+                message = _OutboundMessage(text, coalesce_key)
+                message.enqueued_at = queued.enqueued_at
+                state.queue.append(message)
+                state.pending_by_key[coalesce_key] = message
+                state.coalesced += 1
+                state.ready.set()
+                return
+
+        if len(state.queue) >= self.queue_size:
+            # Drop the oldest non-status message; status messages are at most
+            # one per type and carry the state the client must end up with
+            dropped = next((m for m in state.queue if m.coalesce_key is None), state.queue[0])
+            state.queue.remove(dropped)
+            if dropped.coalesce_key is not None:
+                state.pending_by_key.pop(dropped.coalesce_key, None)
+            state.dropped += 1
+            if state.dropped == 1 or state.dropped % 100 == 0:
+                logger.warning(
+                    "websocket_slow_consumer",
+                    job_id=state.job_id,
+                    dropped=state.dropped,
+                    queued=len(state.queue),
+                )
+
+        message = _OutboundMessage(text, coalesce_key)
+        state.queue.append(message)
+        if coalesce_key is not None:
+            state.pending_by_key[coalesce_key] = message
+        state.ready.set()
+
+    async def _write_loop(self, state: _ConnectionState) -> None:
+        """Send queued messages to one connection until it fails or disconnects."""
+        while True:
+            if not state.queue:
+                state.ready.clear()
+                await state.ready.wait()
+                continue
+
+            message = state.queue.popleft()
+            if message.coalesce_key is not None:
+                state.pending_by_key.pop(message.coalesce_key, None)
+            try:
+                await asyncio.wait_for(
+                    state.websocket.send_text(message.text), timeout=self.send_timeout
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    "websocket_send_failed",
+                    job_id=state.job_id,
+                    error=str(e) or type(e).__name__
+                )
+                self.disconnect(state.websocket)
+                return
+
+            state.sent += 1
+            state.last_lag_ms = (time.monotonic() - message.enqueued_at) * 1000
+            state.max_lag_ms = max(state.max_lag_ms, state.last_lag_ms)
 
 # Global connection manager instance
 connection_manager = WebSocketConnectionManager()
 
+
+async def _deliver_to_local_connections(job_id: str, message: dict) -> None:
+    """Job event bus subscriber: buffer an event for replay and fan it out to this process's sockets."""
+    job_event_log.record(job_id, message)
+    await connection_manager.send_to_job(job_id, message)
+
+
+job_event_bus.subscribe(_deliver_to_local_connections)
+
+
+async def publish_job_event(job_id: str, message: dict) -> None:
+    """
+    Publish a job event to every process with sockets monitoring the job.
+
+    Workflows run in worker containers while clients are connected to web
+    containers, so events go through the job event bus rather than straight
+    to the local connection manager.
+
+    Each event is stamped with a per-job sequence number ("seq") that
+    clients send back as last_seq when they reconnect.
+
+    Args:
+        job_id: Job ID the event belongs to
+        message: WebSocket message
+    """
+    seq = await job_event_sequencer.next_seq(job_id)
+    if seq is not None:
+        message["seq"] = seq
+    await job_event_bus.publish(job_id, message)
+
+
+def _parse_last_seq(value) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+async def replay_job_events(websocket: WebSocket, job_id: str, last_seq: Optional[int]) -> bool:
+    """
+    Send a subscriber the buffered events it has not seen.
+
+    Args:
+        websocket: WebSocket connection
+        job_id: Job ID being monitored
+        last_seq: Last sequence number the client received, or None for a
+            new subscriber (all buffered events are sent)
+
+    Returns:
+        True if the client is now caught up from memory alone, False if it
+        also needs the job's current state from the database
+    """
+    missed = job_event_log.since(job_id, last_seq)
+    for message in missed or []:
+        await connection_manager.send_to_connection(websocket, message)
+
+    caught_up = last_seq is not None and missed is not None
+    logger.debug(
+        "websocket_events_replayed",
+        job_id=job_id,
+        last_seq=last_seq,
+        replayed=len(missed or []),
+        caught_up=caught_up,
+    )
+    return caught_up
+
+
 async def websocket_monitoring_endpoint(websocket: WebSocket, job_id: str):
     """
     WebSocket endpoint for real-time monitoring of a specific job.
     
-    URL: /ws/monitoring/{job_id}
+    URL: /ws/monitoring/{job_id}[?last_seq=<seq>]
+
+    A reconnecting client passes the last "seq" it received and is replayed
+    the events it missed from the per-job buffer; the database is only read
+    when the buffer cannot cover the gap (and for new subscribers, who get
+    the buffered history followed by the current job state).
     
     Handles:
     - Connection establishment and authentication
@@ -152,46 +552,18 @@ async def websocket_monitoring_endpoint(websocket: WebSocket, job_id: str):
     try:
         # Accept connection and add to manager
         await connection_manager.connect(websocket, job_id)
-        
-        # Send initial job status if available
-        await send_initial_job_status(websocket, job_id)
+
+        # Replay missed events (no await point between registering the
+        # connection and queueing the replay, so nothing is lost or repeated),
+        # then fall back to the stored job state if the buffer has a gap
+        last_seq = _parse_last_seq(websocket.query_params.get("last_seq"))
+        if not await replay_job_events(websocket, job_id, last_seq):
+            await send_initial_job_status(websocket, job_id)
         
         # Handle incoming messages (mainly heartbeat)
-        while True:
-            try:
-                # Wait for message with timeout
-                message = await asyncio.wait_for(
-                    websocket.receive_text(),
-                    timeout=30.0  # 30 second timeout
-                )
-                
-                # Parse and handle message
-                try:
-                    data = json.loads(message)
-                    await handle_websocket_message(websocket, job_id, data)
-                except json.JSONDecodeError:
-                    logger.warning(
-                        "invalid_websocket_message",
-                        job_id=job_id,
-                        message=message
-                    )
-                    await connection_manager.send_to_connection(websocket, {
-                        "type": "error",
-                        "jobId": job_id,
-                        "timestamp": datetime.utcnow().isoformat(),
-                        "payload": {
-                            "message": "Invalid JSON message format"
-                        }
-                    })
-                    
-            except asyncio.TimeoutError:
-                # Send ping to check connection health
-                await connection_manager.send_to_connection(websocket, {
-                    "type": "ping",
-                    "jobId": job_id,
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "payload": {}
-                })
+        await _receive_messages(
+            websocket, job_id, lambda data: handle_websocket_message(websocket, job_id, data)
+        )
                 
     except WebSocketDisconnect:
         logger.info("websocket_client_disconnected", job_id=job_id)
@@ -205,12 +577,101 @@ async def websocket_monitoring_endpoint(websocket: WebSocket, job_id: str):
         # Clean up connection
         connection_manager.disconnect(websocket)
 
+
+async def websocket_multiplexed_endpoint(websocket: WebSocket):
+    """
+    WebSocket endpoint for monitoring many jobs over one connection.
+
+    URL: /ws/jobs
+
+    The connection starts with no subscriptions. Control messages:
+    - {"type": "subscribe", "jobIds": [...], "brandIds": [...],
+      "lastSeq": {job_id: seq}}: follow jobs (each is replayed what it
+      missed, or sent its current state) and/or every job of a brand
+      (live events only); answered with "subscribed"
+    - {"type": "unsubscribe", "jobIds": [...], "brandIds": [...]}:
+      answered with "unsubscribed"
+    - {"type": "resume", "jobId": ..., "last_seq": ...} and {"type": "ping"}
+
+    Job messages are the same as on /ws/monitoring/{job_id} and carry their
+    jobId. One heartbeat covers every subscription.
+
+    Args:
+        websocket: FastAPI WebSocket connection
+    """
+    request_id = generate_request_id()
+    logger.info("websocket_multiplexed_connection_attempt", request_id=request_id)
+
+    try:
+        await connection_manager.connect(websocket)
+        await _receive_messages(
+            websocket, None, lambda data: handle_multiplexed_message(websocket, data)
+        )
+    except WebSocketDisconnect:
+        logger.info("websocket_client_disconnected", job_id=None)
+    except Exception as e:
+        logger.error("websocket_connection_error", job_id=None, error=str(e))
+    finally:
+        connection_manager.disconnect(websocket)
+
+
+async def _receive_messages(
+    websocket: WebSocket,
+    job_id: Optional[str],
+    handle: Callable[[dict], Awaitable[None]],
+) -> None:
+    """Hand client messages to handle until disconnect, pinging after HEARTBEAT_SECONDS of silence."""
+    while True:
+        try:
+            # Wait for message with timeout
+            message = await asyncio.wait_for(
+                websocket.receive_text(),
+                timeout=HEARTBEAT_SECONDS
+            )
+
+            # Parse and handle message
+            try:
+                data = json.loads(message)
+            except json.JSONDecodeError:
+                logger.warning(
+                    "invalid_websocket_message",
+                    job_id=job_id,
+                    message=message
+                )
+                await _send_error(websocket, job_id, "Invalid JSON message format")
+                continue
+            if not isinstance(data, dict):
+                await _send_error(websocket, job_id, "Messages must be JSON objects")
+                continue
+            await handle(data)
+
+        except asyncio.TimeoutError:
+            # Send ping to check connection health
+            await connection_manager.send_to_connection(websocket, {
+                "type": "ping",
+                "jobId": job_id,
+                "timestamp": datetime.utcnow().isoformat(),
+                "payload": {}
+            })
+
+
+async def _send_error(websocket: WebSocket, job_id: Optional[str], message: str) -> None:
+    await connection_manager.send_to_connection(websocket, {
+        "type": "error",
+        "jobId": job_id,
+        "timestamp": datetime.utcnow().isoformat(),
+        "payload": {
+            "message": message
+        }
+    })
+
 async def handle_websocket_message(websocket: WebSocket, job_id: str, data: dict):
     """
     Handle incoming WebSocket messages from client.
     
     Supports:
     - ping/pong for heartbeat
+    - resume with last_seq to replay missed events
     - subscription management
     - Client-side error reporting
     
@@ -230,17 +691,121 @@ async def handle_websocket_message(websocket: WebSocket, job_id: str, data: dict
             "payload": {}
         })
         
-    elif message_type == "subscribe":
-        # Handle subscription requests (future enhancement)
-        logger.info("websocket_subscribe_request", job_id=job_id, data=data)
-        
-    elif message_type == "unsubscribe":
-        # Handle unsubscription requests (future enhancement)
-        logger.info("websocket_unsubscribe_request", job_id=job_id, data=data)
+    elif message_type == "resume":
+        # Replay events after the client's last_seq (e.g. after a missed stretch)
+        if not await replay_job_events(websocket, job_id, _parse_last_seq(data.get("last_seq"))):
+            await send_initial_job_status(websocket, job_id)
+
+    elif message_type in ("subscribe", "unsubscribe"):
+        # Follow (or stop following) more jobs over this connection
+        await handle_subscription_message(websocket, data)
         
     else:
         logger.warning("unknown_websocket_message_type", job_id=job_id, type=message_type)
 
+
+async def handle_multiplexed_message(websocket: WebSocket, data: dict):
+    """
+    Handle incoming messages on a multiplexed connection (see websocket_multiplexed_endpoint).
+
+    Args:
+        websocket: WebSocket connection
+        data: Parsed JSON message from client
+    """
+    message_type = data.get("type")
+
+    if message_type == "ping":
+        await connection_manager.send_to_connection(websocket, {
+            "type": "pong",
+            "jobId": None,
+            "timestamp": datetime.utcnow().isoformat(),
+            "payload": {}
+        })
+
+    elif message_type in ("subscribe", "unsubscribe"):
+        await handle_subscription_message(websocket, data)
+
+    elif message_type == "resume":
+        job_id = data.get("jobId")
+        state = connection_manager.connection_states.get(websocket)
+        if state is None or job_id not in state.jobs:
+            await _send_error(websocket, job_id, "Not subscribed to this job")
+            return
+        if not await replay_job_events(websocket, job_id, _parse_last_seq(data.get("last_seq"))):
+            await send_initial_job_status(websocket, job_id)
+
+    else:
+        logger.warning("unknown_websocket_message_type", job_id=None, type=message_type)
+        await _send_error(websocket, None, f"Unknown message type: {message_type}")
+
+
+def _id_list(value: Any) -> List[str]:
+    """Normalize a control message's ID list (a string is a single ID)."""
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list):
+        return []
+    return [item for item in value if isinstance(item, str) and item]
+
+
+async def handle_subscription_message(websocket: WebSocket, data: dict):
+    """
+    Apply a subscribe/unsubscribe control message and acknowledge it.
+
+    Newly subscribed jobs are replayed the events after their lastSeq entry
+    (or sent their current state), exactly like a new per-job connection.
+    Subscriptions beyond the connection's limit are listed as rejected.
+
+    Args:
+        websocket: WebSocket connection
+        data: Control message with jobIds and/or brandIds (or jobId/brandId)
+    """
+    subscribe = data.get("type") == "subscribe"
+    job_ids = _id_list(data.get("jobIds", data.get("jobId")))
+    brand_ids = _id_list(data.get("brandIds", data.get("brandId")))
+    last_seqs = data.get("lastSeq") if isinstance(data.get("lastSeq"), dict) else {}
+
+    accepted_jobs, accepted_brands, rejected = [], [], []
+    for job_id in job_ids:
+        if not subscribe:
+            connection_manager.unsubscribe_job(websocket, job_id)
+            accepted_jobs.append(job_id)
+        elif connection_manager.subscribe_job(websocket, job_id):
+            accepted_jobs.append(job_id)
+        else:
+            rejected.append(job_id)
+    for brand_id in brand_ids:
+        if not subscribe:
+            connection_manager.unsubscribe_brand(websocket, brand_id)
+            accepted_brands.append(brand_id)
+        elif connection_manager.subscribe_brand(websocket, brand_id):
+            accepted_brands.append(brand_id)
+        else:
+            rejected.append(brand_id)
+
+    await connection_manager.send_to_connection(websocket, {
+        "type": "subscribed" if subscribe else "unsubscribed",
+        "jobId": None,
+        "timestamp": datetime.utcnow().isoformat(),
+        "payload": {
+            "jobIds": accepted_jobs,
+            "brandIds": accepted_brands,
+            "rejected": rejected,
+        }
+    })
+    logger.info(
+        "websocket_subscriptions_changed",
+        subscribe=subscribe,
+        job_count=len(accepted_jobs),
+        brand_count=len(accepted_brands),
+        rejected=len(rejected),
+    )
+
+    if subscribe:
+        for job_id in accepted_jobs:
+            if not await replay_job_events(websocket, job_id, _parse_last_seq(last_seqs.get(job_id))):
+                await send_initial_job_status(websocket, job_id)
+
 async def send_initial_job_status(websocket: WebSocket, job_id: str):
     """
     Send initial job status when client connects.
@@ -336,7 +901,7 @@ async def broadcast_compliance_scores(job_id: str, scores: dict):
         }
     }
     
-    await connection_manager.send_to_job(job_id, message)
+    await publish_job_event(job_id, message)
     logger.debug("compliance_scores_broadcasted", job_id=job_id)
 
 async def broadcast_reasoning_log(job_id: str, log_entry: dict):
@@ -360,7 +925,7 @@ async def broadcast_reasoning_log(job_id: str, log_entry: dict):
         }
     }
     
-    await connection_manager.send_to_job(job_id, message)
+    await publish_job_event(job_id, message)
     logger.debug("reasoning_log_broadcasted", job_id=job_id, step=log_entry.get("step"))
 
 async def broadcast_color_analysis(job_id: str, color_data: list):
@@ -378,7 +943,7 @@ async def broadcast_color_analysis(job_id: str, color_data: list):
         "payload": color_data
     }
     
-    await connection_manager.send_to_job(job_id, message)
+    await publish_job_event(job_id, message)
     logger.debug("color_analysis_broadcasted", job_id=job_id, color_count=len(color_data))
 
 async def broadcast_constraint_update(job_id: str, constraints: list):
@@ -396,7 +961,7 @@ async def broadcast_constraint_update(job_id: str, constraints: list):
         "payload": constraints
     }
     
-    await connection_manager.send_to_job(job_id, message)
+    await publish_job_event(job_id, message)
     logger.debug("constraint_update_broadcasted", job_id=job_id, constraint_count=len(constraints))
 
 async def broadcast_status_change(job_id: str, status: str, progress: float, current_step: str):
@@ -421,7 +986,7 @@ async def broadcast_status_change(job_id: str, status: str, progress: float, cur
         }
     }
     
-    await connection_manager.send_to_job(job_id, message)
+    await publish_job_event(job_id, message)
     logger.debug("status_change_broadcasted", job_id=job_id, status=status, progress=progress)
 
 # Utility functions for workflow integration
@@ -434,6 +999,20 @@ def get_job_connection_count(job_id: str) -> int:
     """Get number of active WebSocket connections for a job."""
     return connection_manager.get_job_connection_count(job_id)
 
+def job_has_listeners(job_id: str) -> bool:
+    """
+    Check whether events for a job may reach a client.
+
+    With a distributed job event bus the sockets live in other processes, so
+    events are always published; otherwise only when this process has a
+    connection for the job (or one following a brand).
+    """
+    return (
+        job_event_bus.distributed
+        or connection_manager.get_job_connection_count(job_id) > 0
+        or bool(connection_manager.brand_connections)
+    )
+
 def get_total_connection_count() -> int:
     """Get total number of active WebSocket connections."""
     return connection_manager.get_total_connections()
\ No newline at end of file
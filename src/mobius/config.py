@@ -47,6 +47,118 @@ class Settings(BaseSettings):
     neo4j_password: str = ""
     neo4j_database: str = "neo4j"
     graph_sync_enabled: bool = True
+    # Graph sync outbox drainer (see storage/graph_outbox.py)
+    graph_outbox_batch_size: int = 200
+    graph_outbox_poll_interval_seconds: float = 2.0
+    graph_outbox_retry_base_seconds: float = 5.0
+    graph_outbox_retry_max_seconds: float = 900.0
+    graph_outbox_retention_hours: int = 24
+    # How long a drainer holds claimed events before another may take them
+    graph_outbox_lease_seconds: int = 120
+    # Bulk graph backfill (see storage/graph_backfill.py)
+    graph_backfill_batch_size: int = 200
+    graph_backfill_concurrency: int = 4
+    graph_backfill_max_attempts: int = 3
+    # A run whose worker has not checkpointed for this long can be taken over
+    graph_backfill_lease_seconds: int = 300
+    # Durable generation job queue (see storage/job_queue.py)
+    generation_queue_concurrency: int = 4
+    generation_queue_lease_seconds: int = 120
+    generation_queue_heartbeat_seconds: float = 30.0
+    generation_queue_max_attempts: int = 3
+    generation_queue_poll_interval_seconds: float = 2.0
+    # Fair share (migration 014): running jobs one organization may hold unless
+    # generation_queue_shares says otherwise, and the share of a worker's slots
+    # batch jobs may take (the rest stay free for standard requests)
+    generation_queue_org_max_concurrency: int = 8
+    generation_queue_batch_share: float = 0.5
+    # Queue ETAs divide the queue position by the recent completion rate
+    generation_queue_eta_window_seconds: int = 600
+    generation_queue_default_job_seconds: float = 60.0
+    # Most prompts one /v1/generate/batch request may queue
+    generation_batch_max_size: int = 100
+    # Exact-request result cache (opt-in per request, see storage/result_cache.py):
+    # how long an approved result is served, and how long an unfinished run
+    # keeps absorbing identical requests
+    generation_result_cache_ttl_seconds: int = 86400
+    generation_result_cache_inflight_seconds: int = 900
+    # Deadline budget of one generation workflow run (see utils/deadline.py);
+    # every Gemini call and fetch in the run is sized to what is left of it
+    generation_deadline_seconds: float = 300.0
+    # Least budget worth starting a step with, and an image generation attempt
+    deadline_min_step_seconds: float = 5.0
+    generation_min_image_seconds: float = 20.0
+    # Budget the generate node leaves for the audit that follows it
+    generation_audit_reserve_seconds: float = 30.0
+    gemini_audit_timeout_seconds: float = 120.0
+    # Tweaks re-audit only the categories their instruction can affect and
+    # carry the previous audit's other category scores over (see nodes/audit.py)
+    tweak_delta_audit: bool = True
+    # Compact Job.state (see storage/job_state.py): size budget of a stored
+    # state, data URIs moved to storage from this size, audit records kept
+    # uncompressed in the row, and the codec of archived records
+    # ("zstd" when zstandard is installed, else "zlib"; or "none")
+    job_state_max_bytes: int = 65536
+    job_state_blob_min_bytes: int = 8192
+    job_state_inline_audits: int = 1
+    job_state_archive_codec: str = "zstd"
+    # Channel carrying job cancellations to generation and resume workers
+    # (see api/job_cancellation.py); uses the job_event_bus backend
+    job_cancel_channel: str = "mobius-job-cancel"
+    # Graph query result cache (per process, see storage/graph_cache.py)
+    graph_cache_max_size: int = 1024
+    graph_cache_ttl_seconds: int = 300
+    graph_cache_stale_seconds: int = 600
+    # Channel carrying cache invalidations from graph writers (e.g. the outbox
+    # drainer) to web containers; uses the job_event_bus backend
+    graph_cache_channel: str = "mobius-graph-cache"
+
+    # Pluggable backends for offline runs and benchmarks
+    # storage_backend: "supabase" | "memory" | "sqlite" (see storage/local.py)
+    storage_backend: str = "supabase"
+    local_sqlite_path: str = "mobius_local.db"
+    local_storage_public_url: str = "http://localhost:8000/local-storage"
+    # gemini_backend: "gemini" | "fake" (see tools/fake_gemini.py)
+    gemini_backend: str = "gemini"
+    fake_gemini_vision_median_ms: float = 12000
+    fake_gemini_vision_p95_ms: float = 30000
+    fake_gemini_reasoning_median_ms: float = 6000
+    fake_gemini_reasoning_p95_ms: float = 15000
+    fake_gemini_fast_median_ms: float = 800
+    fake_gemini_fast_p95_ms: float = 2000
+    fake_gemini_latency_scale: float = 1.0
+    fake_gemini_rate_limit_rate: float = 0.0
+    fake_gemini_audit_mean_score: float = 88.0
+    fake_gemini_seed: Optional[int] = None
+
+    # Brand cache (per process)
+    brand_cache_max_size: int = 256
+    brand_cache_ttl_seconds: int = 300
+    # In-process brand similarity index (full reload interval)
+    brand_similarity_refresh_seconds: int = 600
+
+    # WebSocket fan-out (see api/websocket_handlers.py)
+    websocket_send_queue_size: int = 256
+    websocket_send_timeout_seconds: float = 10.0
+    # Jobs plus brands one multiplexed connection may follow
+    websocket_max_subscriptions: int = 200
+    # Compile the LangGraph workflows when a web container starts (see graphs/registry.py)
+    workflow_warmup: bool = True
+    # Generation workflow checkpoints (see graphs/checkpoint.py):
+    # "none", "memory", "sqlite" or "postgres" (production; resumes cross containers)
+    workflow_checkpointer: str = "none"
+    workflow_checkpoint_db_url: Optional[str] = None
+    workflow_checkpoint_sqlite_path: str = "workflow_checkpoints.db"
+    # Cross-process job event bus (see api/job_events.py): "memory" or "supabase"
+    job_event_bus: str = "memory"
+    job_event_channel: str = "mobius-job-events"
+    # Private Realtime channels only admit the service role (migration 012)
+    job_event_private_channels: bool = True
+    # Per-job replay buffer for reconnecting WebSocket subscribers
+    job_event_seq_block_size: int = 100
+    job_event_replay_size: int = 500
+    job_event_replay_ttl_seconds: int = 3600
+    job_event_replay_grace_seconds: int = 300
     
     @field_validator("gemini_api_key")
     @classmethod
@@ -21,6 +21,36 @@ CATEGORY_WEIGHTS = {
     "layout": 0.25,  # Layout/composition impacts visual hierarchy
     "logo_usage": 0.20,  # Logo rules (when applicable)
 }
+# Overall score at which an audit approves the image (see the audit prompt)
+AUDIT_APPROVAL_SCORE = 95.0
+
+# Audit categories a tweak instruction can affect, by the words it uses
+# (see nodes/correct.py tweak_audit_scope). Tweaks matching none of them,
+# or any full-audit word, are audited in every category.
+TWEAK_AUDIT_KEYWORDS = {
+    "colors": (
+        "color", "colour", "background", "hue", "tint", "shade", "palette",
+        "contrast", "darker", "lighter", "brighter", "saturation", "red", "orange",
+        "yellow", "green", "blue", "purple", "pink", "black", "white", "gray",
+        "grey", "gold", "silver", "hex",
+    ),
+    "typography": (
+        "text", "headline", "heading", "title", "font", "typeface", "copy",
+        "wording", "word", "caption", "tagline", "slogan", "letter", "bold",
+        "italic", "spelling", "typo",
+    ),
+    "layout": (
+        "text", "headline", "heading", "title", "caption", "tagline", "move",
+        "position", "align", "center", "centre", "spacing", "margin", "padding",
+        "resize", "size", "bigger", "smaller", "larger", "crop", "layout",
+        "composition", "corner", "left", "right", "top", "bottom",
+    ),
+    "logo_usage": ("logo", "brand mark", "icon", "emblem", "wordmark"),
+}
+TWEAK_FULL_AUDIT_KEYWORDS = (
+    "redo", "regenerate", "start over", "from scratch", "completely",
+    "entire", "whole", "everything", "style", "scene", "replace the image",
+)
 
 # Job management
 DEFAULT_MAX_ATTEMPTS = 3
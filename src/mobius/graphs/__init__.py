@@ -5,5 +5,11 @@ This package contains workflow orchestration using LangGraph state machines.
 """
 
 from mobius.graphs.generation import create_generation_workflow, route_after_audit
+from mobius.graphs.registry import get_generation_workflow, workflow_registry
 
-__all__ = ["create_generation_workflow", "route_after_audit"]
+__all__ = [
+    "create_generation_workflow",
+    "get_generation_workflow",
+    "route_after_audit",
+    "workflow_registry",
+]
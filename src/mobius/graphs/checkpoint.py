@@ -0,0 +1,236 @@
+"""
+Durable checkpoints for the generation workflow.
+
+With checkpointing enabled the compiled generation graph saves its full
+state after every node under a thread keyed by job_id, and pauses before
+the "review" node once needs_review has persisted the review request.
+Review and tweak requests then apply the user's decision to the saved
+state and continue from the exact node the graph stopped at, instead of
+rebuilding a JobState from job.state and rerunning from generate.
+
+Backends (settings.workflow_checkpointer):
+    - "none":     no checkpoints; resumes rebuild state from job.state
+    - "memory":   InMemorySaver, process-local (tests and single-process dev)
+    - "sqlite":   AsyncSqliteSaver on settings.workflow_checkpoint_sqlite_path
+                  (requires langgraph-checkpoint-sqlite)
+    - "postgres": AsyncPostgresSaver on settings.workflow_checkpoint_db_url
+                  (requires langgraph-checkpoint-postgres); use this in
+                  production so a resume on another container finds the thread
+
+Usage:
+    from mobius.graphs.checkpoint import workflow_checkpointer
+
+    config = await workflow_checkpointer.thread_config(job_id)
+    final_state = await workflow.ainvoke(initial_state, config=config)
+
+    final_state = await workflow_checkpointer.resume(
+        workflow, job_id, {"user_decision": "regenerate"}
+    )
+"""
+
+import asyncio
+from typing import Any, Optional
+
+import structlog
+
+from mobius.config import settings
+
+logger = structlog.get_logger()
+
+CHECKPOINT_BACKENDS = ("none", "memory", "sqlite", "postgres")
+
+# The generation graph pauses before this node (see graphs/generation.py)
+REVIEW_NODE = "review"
+
+
+class WorkflowCheckpointer:
+    """
+    Builds the configured LangGraph checkpoint saver and resumes paused jobs.
+
+    The saver is created synchronously (workflows are compiled against it
+    in graphs/registry.py); connections are opened on first use by setup().
+    """
+
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        db_url: Optional[str] = None,
+        sqlite_path: Optional[str] = None,
+    ):
+        self.backend = (backend or settings.workflow_checkpointer).lower()
+        if self.backend not in CHECKPOINT_BACKENDS:
+            raise ValueError(
+                f"Unknown workflow checkpointer '{self.backend}'. "
+                f"Expected one of: {', '.join(CHECKPOINT_BACKENDS)}"
+            )
+        self.db_url = db_url or settings.workflow_checkpoint_db_url
+        self.sqlite_path = sqlite_path or settings.workflow_checkpoint_sqlite_path
+        self._saver: Any = None
+        self._pool: Any = None
+        self._ready = False
+        self._setup_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend != "none"
+
+    @property
+    def saver(self) -> Any:
+        """The checkpoint saver to compile workflows with (None when disabled)."""
+        if self.enabled and self._saver is None:
+            self._saver = self._create_saver()
+        return self._saver
+
+    def _create_saver(self) -> Any:
+        if self.backend == "memory":
+            from langgraph.checkpoint.memory import InMemorySaver
+
+            return InMemorySaver()
+
+        if self.backend == "sqlite":
+            try:
+                import aiosqlite
+                from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+            except ImportError as e:
+                raise RuntimeError(
+                    "workflow_checkpointer='sqlite' requires langgraph-checkpoint-sqlite. "
+                    "Install it with: pip install langgraph-checkpoint-sqlite"
+                ) from e
+            # The connection starts on first use (AsyncSqliteSaver.setup awaits it)
+            return AsyncSqliteSaver(aiosqlite.connect(self.sqlite_path))
+
+        try:
+            from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+            from psycopg.rows import dict_row
+            from psycopg_pool import AsyncConnectionPool
+        except ImportError as e:
+            raise RuntimeError(
+                "workflow_checkpointer='postgres' requires langgraph-checkpoint-postgres. "
+                "Install it with: pip install langgraph-checkpoint-postgres psycopg[binary] psycopg-pool"
+            ) from e
+        if not self.db_url:
+            raise RuntimeError(
+                "workflow_checkpointer='postgres' requires WORKFLOW_CHECKPOINT_DB_URL"
+            )
+        self._pool = AsyncConnectionPool(
+            self.db_url,
+            open=False,
+            kwargs={
+                "autocommit": True,
+                # The Supabase pooler (transaction mode) does not support prepared statements
+                "prepare_threshold": None,
+                "row_factory": dict_row,
+            },
+        )
+        return AsyncPostgresSaver(self._pool)
+
+    async def setup(self) -> None:
+        """Open connections and create checkpoint tables (once per process)."""
+        if self._ready or not self.enabled:
+            return
+        if self._setup_lock is None:
+            self._setup_lock = asyncio.Lock()
+        async with self._setup_lock:
+            if self._ready:
+                return
+            saver = self.saver
+            if self._pool is not None:
+                await self._pool.open()
+            if self.backend != "memory":
+                await saver.setup()
+            self._ready = True
+            logger.info("workflow_checkpointer_ready", backend=self.backend)
+
+    async def thread_config(self, job_id: str) -> dict:
+        """
+        Get the invoke config for a job's checkpoint thread.
+
+        Args:
+            job_id: Job UUID (used as the thread_id)
+
+        Returns:
+            RunnableConfig for ainvoke()/aget_state()
+        """
+        await self.setup()
+        return {"configurable": {"thread_id": job_id}}
+
+    async def get_state(self, workflow: Any, job_id: str) -> Optional[dict]:
+        """
+        Get the checkpointed workflow state of a job.
+
+        Args:
+            workflow: Compiled workflow the job ran on
+            job_id: Job UUID
+
+        Returns:
+            Saved state values, or None if the job has no checkpoint
+        """
+        if not self.enabled:
+            return None
+        snapshot = await workflow.aget_state(await self.thread_config(job_id))
+        return dict(snapshot.values) if snapshot.values else None
+
+    async def resume(
+        self,
+        workflow: Any,
+        job_id: str,
+        updates: dict,
+        as_node: Optional[str] = None,
+    ) -> Optional[dict]:
+        """
+        Apply updates to a job's checkpointed state and continue the workflow.
+
+        Without as_node the job must be paused for review; the updates are
+        applied on top of needs_review's output and the graph continues
+        through the review node's routing. With as_node the updates are
+        applied as that node's output and the graph continues along its
+        edges (used to re-enter a finished thread).
+
+        Args:
+            workflow: Compiled workflow the job ran on
+            job_id: Job UUID
+            updates: State values to apply (e.g. user_decision)
+            as_node: Node the updates are attributed to
+
+        Returns:
+            Final workflow state, or None if there is no checkpoint to resume
+            (the caller falls back to rebuilding state from job.state)
+        """
+        if not self.enabled:
+            return None
+
+        config = await self.thread_config(job_id)
+        snapshot = await workflow.aget_state(config)
+        if not snapshot.values:
+            logger.info("workflow_checkpoint_missing", job_id=job_id)
+            return None
+        if as_node is None:
+            if REVIEW_NODE not in snapshot.next:
+                logger.info(
+                    "workflow_checkpoint_not_paused",
+                    job_id=job_id,
+                    next_nodes=list(snapshot.next),
+                )
+                return None
+            as_node = "needs_review"
+
+        await workflow.aupdate_state(config, updates, as_node=as_node)
+        logger.info(
+            "workflow_resumed_from_checkpoint",
+            job_id=job_id,
+            as_node=as_node,
+            updated_keys=sorted(updates),
+        )
+        return await workflow.ainvoke(None, config=config)
+
+    async def close(self) -> None:
+        """Close checkpoint connections."""
+        if self._pool is not None:
+            await self._pool.close()
+        elif self.backend == "sqlite" and self._saver is not None and self._ready:
+            await self._saver.conn.close()
+        self._ready = False
+
+
+# Global workflow checkpointer instance
+workflow_checkpointer = WorkflowCheckpointer()
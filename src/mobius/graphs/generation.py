@@ -7,6 +7,7 @@ real-time WebSocket broadcasting for monitoring interfaces.
 """
 
 from typing import Literal, Optional
+import asyncio
 import uuid
 import structlog
 from datetime import datetime
@@ -20,10 +21,17 @@ from mobius.nodes.correct import correct_node
 from mobius.nodes.finalize import finalize_node
 from mobius.constants import DEFAULT_MAX_ATTEMPTS, DEFAULT_COMPLIANCE_THRESHOLD
 from mobius.config import settings
+from mobius.api.job_cancellation import JobCancelledError, job_cancellations
+from mobius.utils.deadline import deadline_node, new_deadline, remaining_seconds
+from mobius.graphs.checkpoint import workflow_checkpointer
+from mobius.graphs.registry import get_generation_workflow
 from datetime import timezone
 
 logger = structlog.get_logger()
 
+# Time past the deadline budget before a run is abandoned outright
+DEADLINE_GRACE_SECONDS = 10.0
+
 # WebSocket broadcasting functions
 async def broadcast_workflow_event(job_id: str, event_type: str, data: dict):
     """
@@ -39,11 +47,11 @@ async def broadcast_workflow_event(job_id: str, event_type: str, data: dict):
             broadcast_status_change,
             broadcast_compliance_scores,
             broadcast_reasoning_log,
-            get_job_connection_count
+            job_has_listeners
         )
         
-        # Only broadcast if there are active connections
-        if get_job_connection_count(job_id) > 0:
+        # Only broadcast if a client may be listening (locally or via the event bus)
+        if job_has_listeners(job_id):
             if event_type == "status_change":
                 await broadcast_status_change(
                     job_id=job_id,
@@ -63,11 +71,12 @@ async def broadcast_workflow_event(job_id: str, event_type: str, data: dict):
 
 async def needs_review_node(state: JobState) -> dict:
     """
-    Terminal node that pauses workflow for user review.
+    Node that requests user review before the workflow pauses.
 
     This node is reached when the compliance score is between 70-95%.
-    The workflow pauses here and waits for user decision via the review API endpoint.
-    Also updates job status in database to ensure review state is persisted.
+    It updates job status in database to ensure review state is persisted;
+    the workflow then pauses before the review node (with checkpointing
+    enabled) or ends, and waits for user decision via the review API endpoint.
 
     Args:
         state: Current job state
@@ -173,10 +182,41 @@ async def needs_review_node(state: JobState) -> dict:
         "status": "needs_review",
         "needs_review": True,
         "current_image_url": stored_image_url,  # Include CDN URL in state for subsequent operations
+        # Keep the generated bytes in the checkpoint so a tweak does not download them again
+        "image_data_uri": image_url if stored_image_url != image_url else None,
         "review_requested_at": datetime.now(timezone.utc).isoformat()
     }
 
 
+async def review_node(state: JobState) -> dict:
+    """
+    Apply the user's review decision to a paused workflow.
+
+    With checkpointing enabled the workflow is interrupted before this node;
+    the review API sets user_decision on the checkpointed state and resumes,
+    and route_after_review continues from here. Without a checkpointer the
+    workflow has no review node and ends at needs_review.
+
+    Args:
+        state: Current job state
+
+    Returns:
+        Updated state dict with the review request cleared once decided
+    """
+    if not state.get("user_decision"):
+        return {}
+
+    logger.info(
+        "review_decision_applied",
+        job_id=state.get("job_id"),
+        decision=state.get("user_decision")
+    )
+    return {
+        "needs_review": False,
+        "review_requested_at": None
+    }
+
+
 async def complete_node(state: JobState) -> dict:
     """
     Terminal node for successful completion.
@@ -438,16 +478,49 @@ def route_after_audit(state: JobState) -> Literal["correct", "finalize", "failed
     if state["attempt_count"] >= max_attempts:
         return "failed"
 
+    # Fail fast when the run's budget cannot fit another generate + audit
+    remaining = remaining_seconds(state.get("deadline_at"))
+    needed = settings.generation_min_image_seconds + settings.generation_audit_reserve_seconds
+    if remaining is not None and remaining < needed:
+        logger.info(
+            "routing_to_failed_deadline",
+            job_id=state.get("job_id"),
+            remaining_seconds=round(remaining, 1),
+            needed_seconds=needed,
+        )
+        return "failed"
+
     # Auto-correct if below threshold and attempts remain (only after user decision)
     return "correct"
 
 
-def create_generation_workflow():
+def route_after_review(state: JobState) -> Literal["generate", "finalize", "__end__"]:
+    """
+    Route a resumed workflow on the user's review decision.
+
+    Args:
+        state: Current job state
+
+    Returns:
+        "finalize" for approve, "generate" for tweak/regenerate (the review
+        API has already prepared the prompt), otherwise END
+    """
+    user_decision = state.get("user_decision")
+    if user_decision == "approve":
+        return "finalize"
+    if user_decision in ["tweak", "regenerate"]:
+        return "generate"
+    return END
+
+
+def create_generation_workflow(checkpointer=None):
     """
     Create the generation workflow with audit and correction loops.
     
     Workflow structure:
         generate -> audit -> [correct -> generate] (loop) or finalize -> complete/failed
+        audit -> needs_review -> (pause) -> review -> generate/finalize
+        (without a checkpointer: audit -> needs_review -> END)
     
     The workflow uses optimized image passing:
     - Generate node keeps image as base64 (no upload)
@@ -455,6 +528,12 @@ def create_generation_workflow():
     - Finalize node uploads to Supabase after successful audit
     - Broadcasts real-time updates via WebSocket
     
+    Args:
+        checkpointer: Optional LangGraph checkpoint saver (see graphs/checkpoint.py).
+            When given, state is saved per job thread and the workflow is
+            interrupted before the review node. Without one the workflow
+            ends at needs_review and the review API starts a new run.
+
     Returns:
         Compiled LangGraph workflow
         
@@ -464,11 +543,18 @@ def create_generation_workflow():
     
     workflow = StateGraph(JobState)
 
-    # Add nodes (some are now async for WebSocket broadcasting)
-    workflow.add_node("generate", generate_node)
-    workflow.add_node("audit", audit_node)
-    workflow.add_node("correct", correct_node)
+    # Add nodes (some are now async for WebSocket broadcasting). The nodes
+    # that call Gemini run under the run's deadline budget; generate leaves
+    # part of it for the audit
+    workflow.add_node(
+        "generate",
+        deadline_node(generate_node, reserve_seconds=settings.generation_audit_reserve_seconds),
+    )
+    workflow.add_node("audit", deadline_node(audit_node))
+    workflow.add_node("correct", deadline_node(correct_node))
     workflow.add_node("needs_review", needs_review_node)
+    if checkpointer is not None:
+        workflow.add_node("review", review_node)
     workflow.add_node("finalize", finalize_node)  # New node for final image upload
     workflow.add_node("complete", complete_node)
     workflow.add_node("failed", failed_node)
@@ -497,13 +583,30 @@ def create_generation_workflow():
     # Finalize uploads image then completes
     workflow.add_edge("finalize", "complete")
 
+    if checkpointer is not None:
+        # Review pauses the workflow until the review API resumes it with a decision
+        workflow.add_edge("needs_review", "review")
+        workflow.add_conditional_edges(
+            "review",
+            route_after_review,
+            {
+                "generate": "generate",
+                "finalize": "finalize",
+                END: END
+            }
+        )
+    else:
+        # Nothing to resume: a rebuilt state's user_decision must not loop the run
+        workflow.add_edge("needs_review", END)
+
     # Terminal nodes route to END after cleanup
     workflow.add_edge("complete", END)
     workflow.add_edge("failed", END)
-    # needs_review is also a terminal node (pauses workflow, waits for API call to resume)
     
-    logger.info("generation_workflow_created")
-    return workflow.compile()
+    logger.info("generation_workflow_created", checkpointed=checkpointer is not None)
+    if checkpointer is None:
+        return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer, interrupt_before=["review"])
 
 
 
@@ -571,6 +674,7 @@ async def run_generation_workflow(
         "webhook_url": webhook_url,
         "template_id": template_id,
         "generation_params": generation_params,
+        "deadline_at": new_deadline(),
     }
     
     try:
@@ -587,34 +691,47 @@ async def run_generation_workflow(
             "level": "info"
         })
 
-        # Create and run workflow with timeout and proper cleanup
-        workflow = create_generation_workflow()
+        # Run the process-wide compiled workflow with timeout and proper cleanup
+        workflow = get_generation_workflow()
+        config = await workflow_checkpointer.thread_config(job_id)
         
-        # Set a reasonable timeout for the entire workflow (5 minutes)
-        import asyncio
+        # Nodes size their steps to the deadline budget and fail fast, so the
+        # outer timeout (budget plus a grace period) only catches a step that
+        # overruns it. The run is registered by job_id so cancelling the job stops it
+        timeout_seconds = settings.generation_deadline_seconds + DEADLINE_GRACE_SECONDS
         try:
-            # Use asyncio.shield to prevent cancellation issues
             final_state = await asyncio.wait_for(
-                asyncio.shield(workflow.ainvoke(initial_state)), 
-                timeout=300.0  # 5 minutes
+                job_cancellations.run(job_id, workflow.ainvoke(initial_state, config=config)),
+                timeout=timeout_seconds
             )
         except asyncio.TimeoutError:
             logger.error(
                 "generation_workflow_timeout",
                 job_id=job_id,
                 brand_id=brand_id,
-                timeout_seconds=300
+                timeout_seconds=timeout_seconds
             )
-            raise Exception("Generation workflow timed out after 5 minutes")
-        except asyncio.CancelledError:
-            logger.warning(
+            raise Exception(f"Generation workflow timed out after {int(timeout_seconds)} seconds")
+        except JobCancelledError as e:
+            logger.info(
                 "generation_workflow_cancelled",
                 job_id=job_id,
-                brand_id=brand_id
+                brand_id=brand_id,
+                reason=e.reason,
             )
-            # Re-raise to let the caller handle it
-            raise
-        
+            return {
+                "job_id": job_id,
+                "brand_id": brand_id,
+                "status": "cancelled",
+                "current_image_url": None,
+                "is_approved": False,
+                "compliance_scores": [],
+                "attempt_count": 0,
+                "prompt": prompt,
+                "template_id": template_id,
+                "generation_params": generation_params,
+            }
+
         # Determine final status
         if final_state.get("is_approved"):
             status = "completed"
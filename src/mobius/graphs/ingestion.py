@@ -13,6 +13,7 @@ Includes error handling and validation loops for ambiguous data.
 from langgraph.graph import StateGraph, END
 from mobius.models.state import IngestionState
 from mobius.nodes import extract_text, extract_visual, structure
+from mobius.graphs.registry import get_ingestion_workflow
 import structlog
 
 logger = structlog.get_logger()
@@ -152,8 +153,8 @@ async def run_ingestion_workflow(
     }
 
     try:
-        # Create and run workflow
-        workflow = create_ingestion_workflow()
+        # Run the process-wide compiled workflow
+        workflow = get_ingestion_workflow()
         final_state = await workflow.ainvoke(initial_state)
 
         logger.info(
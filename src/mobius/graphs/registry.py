@@ -0,0 +1,158 @@
+"""
+Process-wide registry of compiled LangGraph workflows.
+
+Building a StateGraph and compiling it is pure setup work that does not
+depend on the job, so each workflow is compiled once per process and the
+compiled runnable is shared by every job (compiled graphs hold no per-run
+state; each ainvoke() gets its own).
+
+Workflows compile lazily on first use. Web containers warm the registry up
+at startup (settings.workflow_warmup) so the first resume or tweak request
+does not pay for it, and the compile time of each workflow is logged and
+reported by stats() (surfaced in /v1/health).
+
+Usage:
+    from mobius.graphs.registry import workflow_registry
+
+    workflow = workflow_registry.get("generation")
+    final_state = await workflow.ainvoke(initial_state)
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+GENERATION_WORKFLOW = "generation"
+INGESTION_WORKFLOW = "ingestion"
+
+
+def _create_generation_workflow() -> Any:
+    from mobius.graphs.checkpoint import workflow_checkpointer
+    from mobius.graphs.generation import create_generation_workflow
+
+    return create_generation_workflow(checkpointer=workflow_checkpointer.saver)
+
+
+def _create_ingestion_workflow() -> Any:
+    from mobius.graphs.ingestion import create_ingestion_workflow
+
+    return create_ingestion_workflow()
+
+
+class WorkflowRegistry:
+    """
+    Compiles each registered workflow once and hands out the compiled runnable.
+
+    Usage:
+        workflow_registry.register("generation", create_generation_workflow)
+        workflow = workflow_registry.get("generation")
+        workflow_registry.warm_up()      # compile everything now
+        workflow_registry.stats()        # compile times in ms
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._compiled: Dict[str, Any] = {}
+        self._compile_ms: Dict[str, float] = {}
+        # Compilation is synchronous; the lock only matters for threads
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        """
+        Register a workflow factory (replacing any compiled instance).
+
+        Args:
+            name: Workflow name
+            factory: Callable returning the compiled workflow
+        """
+        with self._lock:
+            self._factories[name] = factory
+            self._compiled.pop(name, None)
+            self._compile_ms.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        """
+        Get a compiled workflow, compiling it on first use.
+
+        Args:
+            name: Workflow name
+
+        Returns:
+            Compiled LangGraph workflow
+
+        Raises:
+            KeyError: If no workflow is registered under name
+        """
+        compiled = self._compiled.get(name)
+        if compiled is not None:
+            return compiled
+
+        with self._lock:
+            compiled = self._compiled.get(name)
+            if compiled is None:
+                factory = self._factories[name]
+                start = time.perf_counter()
+                compiled = factory()
+                self._compile_ms[name] = (time.perf_counter() - start) * 1000
+                self._compiled[name] = compiled
+                logger.info(
+                    "workflow_compiled",
+                    workflow=name,
+                    compile_ms=round(self._compile_ms[name], 2),
+                )
+        return compiled
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """
+        Compile workflows ahead of their first use.
+
+        Args:
+            names: Workflows to compile (defaults to every registered workflow)
+
+        Returns:
+            Compile time in ms per workflow
+        """
+        start = time.perf_counter()
+        for name in list(names if names is not None else self._factories):
+            self.get(name)
+        compile_ms = {name: round(ms, 2) for name, ms in self._compile_ms.items()}
+        logger.info(
+            "workflow_registry_warmed",
+            workflows=compile_ms,
+            total_ms=round((time.perf_counter() - start) * 1000, 2),
+        )
+        return compile_ms
+
+    def clear(self) -> None:
+        """Drop compiled workflows (they recompile on next use; useful for testing)."""
+        with self._lock:
+            self._compiled.clear()
+            self._compile_ms.clear()
+
+    def stats(self) -> dict:
+        """Get registered and compiled workflows with their compile times in ms."""
+        return {
+            "registered": sorted(self._factories),
+            "compiled": sorted(self._compiled),
+            "compile_ms": {name: round(ms, 2) for name, ms in self._compile_ms.items()},
+        }
+
+
+def get_generation_workflow() -> Any:
+    """Get the compiled generation workflow."""
+    return workflow_registry.get(GENERATION_WORKFLOW)
+
+
+def get_ingestion_workflow() -> Any:
+    """Get the compiled ingestion workflow."""
+    return workflow_registry.get(INGESTION_WORKFLOW)
+
+
+# Global workflow registry instance
+workflow_registry = WorkflowRegistry()
+workflow_registry.register(GENERATION_WORKFLOW, _create_generation_workflow)
+workflow_registry.register(INGESTION_WORKFLOW, _create_ingestion_workflow)
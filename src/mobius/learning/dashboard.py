@@ -13,6 +13,7 @@ import structlog
 from mobius.models.learning import LearningSettings, BrandPattern, PrivacyTier
 from mobius.storage.learning import LearningStorage
 from mobius.storage.brands import BrandStorage
+from mobius.storage.brand_cache import brand_cache
 from mobius.learning.shared import SharedLearningEngine
 
 logger = structlog.get_logger()
@@ -44,7 +45,7 @@ class LearningDashboard:
         logger.info("generating_dashboard_data", brand_id=brand_id)
         
         # Get brand
-        brand = await self.brand_storage.get_brand(brand_id)
+        brand = await brand_cache.get(brand_id, storage=self.brand_storage)
         if not brand:
             raise ValueError(f"Brand {brand_id} not found")
         
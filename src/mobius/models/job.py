@@ -25,6 +25,19 @@ class Job(BaseModel):
         None, max_length=64, description="Client-provided idempotency key"
     )
     error: Optional[str] = Field(None, description="Error message if job failed")
+    queued_at: Optional[datetime] = Field(
+        None, description="When the job was queued for a generation worker (cleared once it finishes)"
+    )
+    queue_priority: int = Field(
+        default=1, ge=0, le=2, description="Queue priority class (0 interactive, 1 standard, 2 batch)"
+    )
+    organization_id: Optional[str] = Field(
+        None, description="Organization of the brand (fair-share queue accounting)"
+    )
+    parent_job_id: Optional[str] = Field(None, description="Batch job this job belongs to")
+    result_cache_key: Optional[str] = Field(
+        None, max_length=64, description="Generation result cache key (requests that opted in)"
+    )
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     expires_at: datetime = Field(
@@ -42,6 +42,18 @@ class JobState(TypedDict, total=False):
     # Logo configuration preservation for tweaks
     original_had_logos: bool  # Whether the original generation included logos
 
+    # Categories the next audit re-scores after a tweak (None: full audit);
+    # set by correct_node, cleared by audit_node
+    audit_scope: Optional[List[str]]
+
+    # Deadline of the current workflow run (epoch seconds, see utils/deadline.py);
+    # set when the run starts or resumes
+    deadline_at: Optional[float]
+
+    # Data URI of the uploaded current_image_url, kept in workflow checkpoints
+    # so a resumed tweak does not download the image again (never persisted to jobs)
+    image_data_uri: Optional[str]
+
 
 class IngestionState(TypedDict):
     """State for the brand ingestion workflow."""
@@ -8,7 +8,7 @@ generated assets against brand guidelines and specific hex codes.
 Enhanced with real-time WebSocket broadcasting for monitoring interfaces.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 import structlog
 import time
@@ -19,7 +19,8 @@ from mobius.models.state import JobState
 from mobius.models.compliance import ComplianceScore, CategoryScore
 from mobius.tools.gemini import GeminiClient
 from mobius.storage.brands import BrandStorage
-from mobius.constants import CATEGORY_WEIGHTS
+from mobius.storage.brand_cache import brand_cache
+from mobius.constants import AUDIT_APPROVAL_SCORE, CATEGORY_WEIGHTS
 
 logger = structlog.get_logger()
 
@@ -37,11 +38,11 @@ async def broadcast_websocket_event(job_id: str, event_type: str, data: dict):
             broadcast_status_change,
             broadcast_compliance_scores,
             broadcast_reasoning_log,
-            get_job_connection_count
+            job_has_listeners
         )
         
-        # Only broadcast if there are active connections
-        if get_job_connection_count(job_id) > 0:
+        # Only broadcast if a client may be listening (locally or via the event bus)
+        if job_has_listeners(job_id):
             if event_type == "status_change":
                 await broadcast_status_change(
                     job_id=job_id,
@@ -66,8 +67,8 @@ def calculate_overall_score(categories: List[CategoryScore]) -> float:
     Uses CATEGORY_WEIGHTS to compute a weighted average. Categories not in
     CATEGORY_WEIGHTS are assigned equal weight from remaining allocation.
     
-    Note: This function is kept for backward compatibility with tests.
-    The GeminiClient.audit_compliance method now handles score calculation internally.
+    Note: Full audits get their overall score from GeminiClient.audit_compliance;
+    this is used to recompute it when a delta audit is merged (merge_delta_audit).
     """
     if not categories:
         return 0.0
@@ -88,6 +89,75 @@ def calculate_overall_score(categories: List[CategoryScore]) -> float:
     return 0.0
 
 
+def delta_audit_baseline(state: JobState) -> Optional[dict]:
+    """
+    Previous audit a tweak's delta audit can carry category scores over from.
+
+    Args:
+        state: Current job state (audit_scope set by correct_node)
+
+    Returns:
+        The latest compliance_scores record, or None when the next audit must
+        be a full one (no scope, no completed audit, or a failed audit)
+    """
+    scope = state.get("audit_scope")
+    scores = state.get("compliance_scores") or []
+    if not scope or not scores:
+        return None
+
+    previous = scores[-1] or {}
+    categories = previous.get("categories") or []
+    audited = {c.get("category") for c in categories}
+    if not audited or not audited.issuperset(CATEGORY_WEIGHTS):
+        return None
+    if any(
+        v.get("category") == "audit_error"
+        for c in categories for v in (c.get("violations") or [])
+    ):
+        return None
+    return previous
+
+
+def merge_delta_audit(
+    previous: dict,
+    delta: ComplianceScore,
+    scope: List[str],
+) -> ComplianceScore:
+    """
+    Combine a delta audit with the category scores it did not re-score.
+
+    Args:
+        previous: Full audit record the scores are carried over from
+        delta: Audit of the scoped categories only
+        scope: Categories the delta audit re-scored
+
+    Returns:
+        ComplianceScore over every category, with the overall score
+        recomputed from CATEGORY_WEIGHTS (a failed delta audit is returned
+        unchanged)
+    """
+    if any(v.category == "audit_error" for c in delta.categories for v in c.violations):
+        return delta
+
+    rescored = {c.category: c for c in delta.categories if c.category in scope}
+    categories = [
+        rescored.pop(c["category"], None) or CategoryScore.model_validate(c)
+        for c in previous.get("categories") or []
+    ]
+    categories.extend(rescored.values())
+
+    overall = round(calculate_overall_score(categories), 1)
+    return ComplianceScore(
+        overall_score=overall,
+        categories=categories,
+        approved=overall >= AUDIT_APPROVAL_SCORE,
+        summary=(
+            f"{delta.summary} (Re-audited {', '.join(scope)} after the tweak; "
+            f"other categories carried over from the previous audit.)"
+        ),
+    )
+
+
 async def audit_node(state: JobState) -> Dict[str, Any]:
     """
     Audit image for brand compliance using Reasoning Model with multimodal vision.
@@ -98,6 +168,10 @@ async def audit_node(state: JobState) -> Dict[str, Any]:
     - Uses full BrandGuidelines for comprehensive compliance checking
     - Broadcasts real-time compliance scores via WebSocket
     
+    After a tweak with an audit_scope (see correct_node), only the scoped
+    categories are re-scored and the previous audit's other categories are
+    carried over; without a usable previous audit it falls back to a full audit.
+    
     Requirements: 4.1, 4.2, 4.3, 4.4, 5.2, 5.3
     """
     operation_type = "audit_node"
@@ -142,8 +216,7 @@ async def audit_node(state: JobState) -> Dict[str, Any]:
         if not brand_id:
             raise ValueError("No brand_id found in state")
         
-        brand_storage = BrandStorage()
-        brand = await brand_storage.get_brand(brand_id)
+        brand = await brand_cache.get(brand_id, storage=BrandStorage())
         if not brand:
             raise ValueError(f"Brand not found: {brand_id}")
         
@@ -157,12 +230,30 @@ async def audit_node(state: JobState) -> Dict[str, Any]:
         # - Uses full BrandGuidelines for comprehensive auditing (Requirement 4.3)
         # - Returns structured ComplianceScore (Requirement 4.4)
         client = GeminiClient()
-        
-        # Call audit compliance directly
-        compliance = await client.audit_compliance(
-            image_uri=image_uri,
-            brand_guidelines=brand.guidelines
-        )
+
+        scope = state.get("audit_scope")
+        baseline = delta_audit_baseline(state)
+        if baseline is not None:
+            # Delta audit: re-score only what the tweak could have changed
+            delta = await client.audit_compliance(
+                image_uri=image_uri,
+                brand_guidelines=brand.guidelines,
+                categories=scope
+            )
+            compliance = merge_delta_audit(baseline, delta, scope)
+            logger.info(
+                "delta_audit",
+                job_id=job_id,
+                scope=scope,
+                carried_over=[c for c in CATEGORY_WEIGHTS if c not in scope],
+                operation_type=operation_type
+            )
+        else:
+            # Call audit compliance directly
+            compliance = await client.audit_compliance(
+                image_uri=image_uri,
+                brand_guidelines=brand.guidelines
+            )
 
         latency_ms = int((time.time() - start_time) * 1000)
         
@@ -191,10 +282,13 @@ async def audit_node(state: JobState) -> Dict[str, Any]:
             "level": "success" if compliance.approved else "warning"
         })
 
+        # One record shared by both lists (stored once, see storage/job_state.py)
+        audit_record = compliance.model_dump()
         return {
-            "audit_history": state.get("audit_history", []) + [compliance.model_dump()],
-            "compliance_scores": state.get("compliance_scores", []) + [compliance.model_dump()],
+            "audit_history": state.get("audit_history", []) + [audit_record],
+            "compliance_scores": state.get("compliance_scores", []) + [audit_record],
             "is_approved": compliance.approved,
+            "audit_scope": None,
             "status": "audited"
         }
 
@@ -221,5 +315,6 @@ async def audit_node(state: JobState) -> Dict[str, Any]:
         return {
             "audit_history": state.get("audit_history", []) + [error_compliance.model_dump()],
             "is_approved": False,
+            "audit_scope": None,
             "status": "audit_error"
         }
\ No newline at end of file
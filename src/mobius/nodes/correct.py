@@ -6,14 +6,50 @@ It applies fixes from audit feedback to improve the prompt for the next
 generation attempt.
 """
 
-from typing import Dict, Any
+import re
+from typing import Dict, Any, List, Optional
 import structlog
 
+from mobius.config import settings
+from mobius.constants import CATEGORY_WEIGHTS, TWEAK_AUDIT_KEYWORDS, TWEAK_FULL_AUDIT_KEYWORDS
 from mobius.models.state import JobState
 
 logger = structlog.get_logger()
 
 
+def _mentions(instruction: str, keyword: str) -> bool:
+    """Whether the instruction uses a keyword as a word (plurals and -ed/-ing forms included)."""
+    return re.search(rf"\b{re.escape(keyword)}(?:s|es|d|ed|ing)?\b", instruction) is not None
+
+
+def tweak_audit_scope(instruction: Optional[str]) -> Optional[List[str]]:
+    """
+    Audit categories a tweak instruction can affect.
+
+    Args:
+        instruction: The user's tweak instruction
+
+    Returns:
+        Affected categories in CATEGORY_WEIGHTS order, or None when the tweak
+        needs a full audit (no category recognized, a full-audit word such as
+        "redo", or every category affected)
+    """
+    if not instruction:
+        return None
+
+    text = instruction.lower()
+    if any(_mentions(text, keyword) for keyword in TWEAK_FULL_AUDIT_KEYWORDS):
+        return None
+
+    scope = [
+        category for category in CATEGORY_WEIGHTS
+        if any(_mentions(text, keyword) for keyword in TWEAK_AUDIT_KEYWORDS.get(category, ()))
+    ]
+    if not scope or len(scope) == len(CATEGORY_WEIGHTS):
+        return None
+    return scope
+
+
 async def correct_node(state: JobState) -> Dict[str, Any]:
     """
     Apply corrections from audit feedback to the prompt.
@@ -29,6 +65,7 @@ async def correct_node(state: JobState) -> Dict[str, Any]:
         Updated state dict with:
         - prompt: Enhanced prompt with correction applied (if available)
         - status: Updated to "correcting"
+        - audit_scope: Categories the tweak can affect (user tweaks only)
         
     Note:
         This node does not increment attempt_count - that happens in generate_node
@@ -53,16 +90,20 @@ async def correct_node(state: JobState) -> Dict[str, Any]:
             f"and only change what I've requested."
         )
 
+        audit_scope = tweak_audit_scope(user_instruction) if settings.tweak_delta_audit else None
+
         logger.info(
             "applying_user_tweak",
             job_id=state.get("job_id"),
             user_instruction=user_instruction,
-            correction_prompt=correction_prompt
+            correction_prompt=correction_prompt,
+            audit_scope=audit_scope
         )
 
         return {
             "prompt": correction_prompt,
             "user_tweak_instruction": None,  # Clear after use
+            "audit_scope": audit_scope,
             "status": "correcting",
             "original_had_logos": state.get("original_had_logos", False)  # Preserve logo config
         }
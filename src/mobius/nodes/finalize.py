@@ -89,6 +89,7 @@ async def finalize_node(state: JobState) -> Dict[str, Any]:
         # Return updated state with CDN URL
         return {
             "current_image_url": stored_image_url,
+            "image_data_uri": image_uri,  # Checkpointed bytes for later tweaks
             "status": "finalized",
             "original_had_logos": state.get("original_had_logos", False)  # Preserve logo config
         }
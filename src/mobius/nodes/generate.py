@@ -8,73 +8,42 @@ Compressed Digital Twin injected into the system prompt.
 Enhanced with real-time WebSocket broadcasting for monitoring interfaces.
 """
 
-from typing import Dict, Any, List
+from collections import OrderedDict
+from typing import Dict, Any, List, Tuple
 import structlog
 import time
 import asyncio
 import httpx
 
+from mobius.config import settings
 from mobius.models.state import JobState
 from mobius.tools.gemini import GeminiClient
 from mobius.storage.brands import BrandStorage
+from mobius.storage.brand_cache import brand_cache
 from mobius.utils.media import LogoRasterizer
 from mobius.models.brand import LogoRule, Brand
 from functools import lru_cache
 from typing import Optional
 from mobius.utils.performance import timer, performance_monitor
+from mobius.utils.deadline import step_timeout
 from datetime import datetime, timezone
 
 logger = structlog.get_logger()
 
-# Brand cache with TTL (5 minutes)
-_brand_cache: Dict[str, tuple[Brand, float]] = {}
-_cache_ttl = 300  # 5 minutes
-
 async def get_cached_brand(brand_id: str) -> Optional[Brand]:
     """
-    Get brand from cache or database with TTL-based caching.
-    
-    Reduces database queries for frequently accessed brands during generation.
-    Cache expires after 5 minutes to ensure data freshness.
-    
+    Get brand through the shared brand cache.
+
+    The brand is loaded from the database at most once per cache lifetime
+    and reused by the audit node and API handlers within the same process.
+
     Args:
         brand_id: Brand ID to fetch
-        
+
     Returns:
         Brand object or None if not found
     """
-    current_time = time.time()
-    
-    # Check cache first
-    if brand_id in _brand_cache:
-        brand, cached_at = _brand_cache[brand_id]
-        if current_time - cached_at < _cache_ttl:
-            logger.info(
-                "brand_cache_hit",
-                brand_id=brand_id,
-                cache_age_seconds=int(current_time - cached_at),
-                operation_type="brand_caching"
-            )
-            return brand
-        else:
-            # Cache expired, remove entry
-            del _brand_cache[brand_id]
-    
-    # Fetch from database
-    brand_storage = BrandStorage()
-    brand = await brand_storage.get_brand(brand_id)
-    
-    if brand:
-        # Cache the result
-        _brand_cache[brand_id] = (brand, current_time)
-        logger.info(
-            "brand_cached",
-            brand_id=brand_id,
-            cache_size=len(_brand_cache),
-            operation_type="brand_caching"
-        )
-    
-    return brand
+    return await brand_cache.get(brand_id, storage=BrandStorage())
 
 
 async def fetch_and_process_logos_parallel(
@@ -101,7 +70,8 @@ async def fetch_and_process_logos_parallel(
     
     # Create shared HTTP client for connection pooling
     async with httpx.AsyncClient(
-        timeout=60.0,  # Increased to 60 seconds for logo downloads
+        # 60 seconds for logo downloads, or what is left of the job's budget
+        timeout=step_timeout("logo_download", 60.0),
         limits=httpx.Limits(max_connections=5, max_keepalive_connections=3)
     ) as shared_client:
         
@@ -197,6 +167,74 @@ async def fetch_and_process_logos_parallel(
         
         return successful_logos
 
+# Processed logos per logo set, shared by the jobs of a batch (and any other
+# jobs for the same brand) that run in this process
+_LOGO_CACHE_MAX_SIZE = 32
+_logo_cache: "OrderedDict[Tuple[str, ...], Tuple[List[bytes], float]]" = OrderedDict()
+_logo_inflight: Dict[Tuple[str, ...], asyncio.Future] = {}
+
+
+async def get_processed_logos(
+    logos: List[LogoRule],
+    job_id: str,
+    operation_type: str
+) -> List[bytes]:
+    """
+    Get a brand's logos downloaded and prepared for the Vision Model.
+
+    Logos are fetched once per logo set and reused for brand_cache_ttl_seconds,
+    so the children of a batch share one download. Concurrent misses share a
+    single fetch. A set with a logo that failed is not cached.
+
+    Args:
+        logos: List of logo rules to process
+        job_id: Job ID for logging
+        operation_type: Operation type for logging
+
+    Returns:
+        List of processed logo bytes (successful ones only)
+    """
+    key = tuple(logo.url for logo in logos)
+    entry = _logo_cache.get(key)
+    if entry is not None and time.monotonic() - entry[1] < settings.brand_cache_ttl_seconds:
+        _logo_cache.move_to_end(key)
+        logger.info("logo_cache_hit", job_id=job_id, logo_count=len(entry[0]), operation_type=operation_type)
+        return entry[0]
+
+    inflight = _logo_inflight.get(key)
+    if inflight is not None:
+        try:
+            return await asyncio.shield(inflight)
+        except asyncio.CancelledError:
+            # The fetching job was cancelled, not us: fetch them ourselves
+            if inflight.cancelled():
+                return await get_processed_logos(logos, job_id, operation_type)
+            raise
+
+    future = asyncio.get_running_loop().create_future()
+    _logo_inflight[key] = future
+    try:
+        processed = await fetch_and_process_logos_parallel(logos, job_id=job_id, operation_type=operation_type)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Mark retrieved so an unawaited future does not log a warning
+        future.exception()
+        raise
+    else:
+        if len(processed) == len(logos):
+            _logo_cache[key] = (processed, time.monotonic())
+            _logo_cache.move_to_end(key)
+            while len(_logo_cache) > _LOGO_CACHE_MAX_SIZE:
+                _logo_cache.popitem(last=False)
+        future.set_result(processed)
+        return processed
+    finally:
+        _logo_inflight.pop(key, None)
+
+
 async def broadcast_websocket_event(job_id: str, event_type: str, data: dict):
     """
     Broadcast workflow events to WebSocket connections.
@@ -210,11 +248,11 @@ async def broadcast_websocket_event(job_id: str, event_type: str, data: dict):
         from mobius.api.websocket_handlers import (
             broadcast_status_change,
             broadcast_reasoning_log,
-            get_job_connection_count
+            job_has_listeners
         )
         
-        # Only broadcast if there are active connections
-        if get_job_connection_count(job_id) > 0:
+        # Only broadcast if a client may be listening (locally or via the event bus)
+        if job_has_listeners(job_id):
             if event_type == "status_change":
                 await broadcast_status_change(
                     job_id=job_id,
@@ -465,7 +503,7 @@ async def generate_node(state: JobState) -> Dict[str, Any]:
             )
 
             with timer("logo_processing_parallel", job_id=job_id):
-                logo_bytes_list = await fetch_and_process_logos_parallel(
+                logo_bytes_list = await get_processed_logos(
                     brand.guidelines.logos,
                     job_id=state.get("job_id"),
                     operation_type=operation_type
@@ -512,6 +550,11 @@ async def generate_node(state: JobState) -> Dict[str, Any]:
                 import httpx
                 import base64
                 
+                # Reuse the bytes checkpointed when the image was uploaded
+                image_data_uri = state.get("image_data_uri")
+                if image_data_uri and not previous_image_url.startswith("data:image"):
+                    previous_image_url = image_data_uri
+
                 # Handle data URI (base64 encoded image)
                 if previous_image_url.startswith("data:image"):
                     # Extract base64 data from data URI
@@ -526,7 +569,7 @@ async def generate_node(state: JobState) -> Dict[str, Any]:
                     )
                 else:
                     # Fetch from URL
-                    async with httpx.AsyncClient(timeout=30.0) as client:
+                    async with httpx.AsyncClient(timeout=step_timeout("previous_image_download", 30.0)) as client:
                         response = await client.get(previous_image_url)
                         response.raise_for_status()
                         previous_image_bytes = response.content
@@ -623,6 +666,7 @@ async def generate_node(state: JobState) -> Dict[str, Any]:
         # Return updated state with stored URL (CDN URL instead of base64)
         return {
             "current_image_url": stored_image_url,
+            "image_data_uri": None,  # Superseded by the new image
             "attempt_count": current_attempt,
             "session_id": session_id,
             "status": "generated",
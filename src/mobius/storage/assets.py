@@ -6,7 +6,7 @@ Provides CRUD operations for asset entities in Supabase.
 
 from mobius.models.asset import Asset
 from mobius.storage.database import get_supabase_client
-from mobius.storage.graph import graph_storage
+from mobius.storage.pagination import apply_keyset
 from typing import List, Optional
 from datetime import datetime, timezone
 import structlog
@@ -41,10 +41,8 @@ class AssetStorage:
         logger.info("asset_created", asset_id=asset.asset_id)
         created_asset = Asset.model_validate(result.data[0])
 
-        # Sync to Neo4j graph database (awaited to prevent connection cleanup race conditions)
-        # Graph sync is designed to fail gracefully and won't raise exceptions
-        await graph_storage.sync_asset(created_asset)
-
+        # Neo4j sync is queued in the same transaction by the graph sync outbox
+        # trigger (migration 009) and applied by GraphSyncDrainer
         return created_asset
 
     async def get_asset(self, asset_id: str) -> Optional[Asset]:
@@ -71,29 +69,26 @@ class AssetStorage:
         return None
 
     async def list_assets(
-        self, brand_id: str, limit: int = 100, offset: int = 0
+        self, brand_id: str, limit: int = 100, cursor: Optional[str] = None
     ) -> List[Asset]:
         """
-        List all assets for a brand.
+        List assets for a brand, newest first, using keyset pagination.
 
         Args:
             brand_id: UUID of the brand
             limit: Maximum number of assets to return
-            offset: Number of assets to skip
+            cursor: Optional cursor from the previous page
 
         Returns:
             List of Asset entities
+
+        Raises:
+            ValueError: If the cursor is malformed
         """
-        logger.debug("listing_assets", brand_id=brand_id, limit=limit, offset=offset)
+        logger.debug("listing_assets", brand_id=brand_id, limit=limit, has_cursor=bool(cursor))
 
-        result = (
-            self.client.table("assets")
-            .select("*")
-            .eq("brand_id", brand_id)
-            .order("created_at", desc=True)
-            .range(offset, offset + limit - 1)
-            .execute()
-        )
+        query = self.client.table("assets").select("*").eq("brand_id", brand_id)
+        result = apply_keyset(query, "asset_id", limit, cursor).execute()
 
         return [Asset.model_validate(a) for a in result.data]
 
@@ -0,0 +1,186 @@
+"""
+Shared in-process brand cache.
+
+Brands are read many times per generation job (generate, audit, handlers,
+dashboards) but change rarely. This cache keeps recently used brands in a
+bounded LRU with a TTL so one job loads its brand once.
+
+Design Principles:
+- PostgreSQL remains source of truth; entries expire after the TTL
+- BrandStorage writes invalidate the entry and bump its version, so a load
+  that started before the write can never repopulate the cache with stale data
+- Concurrent misses for the same brand share a single database load
+- Missing brands are not cached (a brand created later is visible immediately)
+
+The cache is per process. Writes made by another container are picked up
+when the TTL expires.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+import structlog
+
+from mobius.config import settings
+from mobius.models.brand import Brand
+
+if TYPE_CHECKING:
+    from mobius.storage.brands import BrandStorage
+
+logger = structlog.get_logger()
+
+
+class BrandCache:
+    """
+    Bounded LRU + TTL cache of Brand entities with single-flight loading.
+
+    Usage:
+        brand = await brand_cache.get(brand_id, storage=BrandStorage())
+    """
+
+    def __init__(self, max_size: int = 256, ttl_seconds: float = 300):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        # brand_id -> (brand, cached_at); ordered oldest -> most recently used
+        self._entries: "OrderedDict[str, Tuple[Brand, float]]" = OrderedDict()
+        # brand_id -> in-flight load shared by concurrent callers
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # brand_id -> version at which the brand was last invalidated
+        self._invalidated_at: Dict[str, int] = {}
+        self._version = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    async def get(
+        self, brand_id: str, storage: Optional["BrandStorage"] = None
+    ) -> Optional[Brand]:
+        """
+        Get a brand from the cache, loading it from storage on a miss.
+
+        Args:
+            brand_id: UUID of the brand
+            storage: BrandStorage used to load on a miss (defaults to a new instance)
+
+        Returns:
+            Brand if found, None otherwise
+        """
+        entry = self._entries.get(brand_id)
+        if entry is not None:
+            brand, cached_at = entry
+            if time.monotonic() - cached_at < self.ttl_seconds:
+                self._entries.move_to_end(brand_id)
+                self.hits += 1
+                logger.debug("brand_cache_hit", brand_id=brand_id)
+                return brand
+            del self._entries[brand_id]
+
+        inflight = self._inflight.get(brand_id)
+        if inflight is not None:
+            self.coalesced += 1
+            logger.debug("brand_cache_coalesced", brand_id=brand_id)
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # The loading caller was cancelled, not us: load it ourselves
+                if inflight.cancelled():
+                    return await self.get(brand_id, storage)
+                raise
+
+        self.misses += 1
+        logger.debug("brand_cache_miss", brand_id=brand_id)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[brand_id] = future
+        started_at = self._version
+
+        try:
+            if storage is None:
+                from mobius.storage.brands import BrandStorage
+
+                storage = BrandStorage()
+            brand = await storage.get_brand(brand_id)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited future does not log a warning
+            future.exception()
+            raise
+        else:
+            # Skip caching if the brand was written while we were loading
+            if brand is not None and self._invalidated_at.get(brand_id, -1) < started_at:
+                self._store(brand_id, brand)
+            future.set_result(brand)
+            return brand
+        finally:
+            self._inflight.pop(brand_id, None)
+            self._invalidated_at.pop(brand_id, None)
+
+    def invalidate(self, brand_id: str) -> None:
+        """
+        Drop a brand from the cache after it has been written.
+
+        Any load already in flight for the brand will still return to its
+        callers but will not be cached.
+
+        Args:
+            brand_id: UUID of the brand
+        """
+        self._version += 1
+        self._entries.pop(brand_id, None)
+        if brand_id in self._inflight:
+            self._invalidated_at[brand_id] = self._version
+        self.invalidations += 1
+        logger.debug("brand_cache_invalidated", brand_id=brand_id)
+
+    def clear(self) -> None:
+        """Drop all entries and reset metrics (useful for testing)."""
+        self._version += 1
+        for brand_id in self._inflight:
+            self._invalidated_at[brand_id] = self._version
+        self._entries.clear()
+        self.hits = self.misses = self.coalesced = 0
+        self.evictions = self.invalidations = 0
+
+    def stats(self) -> dict:
+        """
+        Get cache metrics.
+
+        Returns:
+            Dictionary with size, hit/miss counts and hit_ratio. Coalesced
+            callers waited on another caller's load and count as hits.
+        """
+        lookups = self.hits + self.coalesced + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
+
+    def _store(self, brand_id: str, brand: Brand) -> None:
+        """Insert a brand as most recently used, evicting the LRU entry if full."""
+        self._entries[brand_id] = (brand, time.monotonic())
+        self._entries.move_to_end(brand_id)
+        while len(self._entries) > self.max_size:
+            evicted_id, _ = self._entries.popitem(last=False)
+            self.evictions += 1
+            logger.debug("brand_cache_evicted", brand_id=evicted_id)
+
+
+# Global brand cache instance
+brand_cache = BrandCache(
+    max_size=settings.brand_cache_max_size,
+    ttl_seconds=settings.brand_cache_ttl_seconds,
+)
@@ -0,0 +1,634 @@
+"""
+In-process brand similarity and perceptual color index.
+
+find_similar_brands used to depend on Neo4j (empty when graph sync is
+disabled) and computed Jaccard similarity with per-pair Cypher aggregation.
+This index keeps every brand's palette in a sparse brand x color matrix built
+from PostgreSQL, so the similar brands of one brand are a single sparse
+matrix-vector product over all brands.
+
+The distinct colors of all palettes are also kept in a KD-tree over CIELAB
+coordinates, so "brands using a color" can match perceptually close colors
+(radius query by ΔE) instead of exact hex strings. Colors first seen after
+the tree was built wait in a small delta buffer that is searched linearly
+and merged into the tree once it holds COLOR_DELTA_MERGE_SIZE colors.
+
+Design Principles:
+- PostgreSQL remains source of truth; the index is loaded from the brands
+  table (color palettes only) and reloaded in the background after
+  brand_similarity_refresh_seconds so writes from other containers are picked
+  up; queries keep using the previous data meanwhile
+- Database reads run in a worker thread so loading never blocks the event loop
+- BrandStorage writes replace the changed brand's matrix row in place
+  (vectorized splice of the CSR arrays); the matrices are only rebuilt from
+  scratch on load or once enough removed rows have accumulated
+- Results match the Neo4j query: brands of other organizations sharing at
+  least min_shared_colors colors, ranked by Jaccard similarity
+- Weighted similarity uses each color's usage_weight (weighted Jaccard:
+  sum of minimum weights / sum of maximum weights)
+- Color distance is CIE76 ΔE (Euclidean distance in Lab space)
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import structlog
+from scipy import sparse
+from scipy.spatial import cKDTree
+
+from mobius.config import settings
+from mobius.models.brand import Brand
+from mobius.storage.database import get_supabase_client
+from mobius.utils.color import hex_to_lab, normalize_hex
+
+logger = structlog.get_logger()
+
+LOAD_PAGE_SIZE = 1000
+
+# New colors kept out of the KD-tree before it is rebuilt with them
+COLOR_DELTA_MERGE_SIZE = 256
+
+
+def _entry_from_brand(name: Any, organization_id: Any, colors: Optional[List[Any]]) -> Dict[str, Any]:
+    """
+    Build an index entry from a brand's colors (models or stored JSON).
+
+    Hex codes are normalized to "#RRGGBB" where possible. Palettes without
+    usage weights get equal weights so weighted similarity still works for
+    brands ingested before the 60-30-10 weighting existed.
+    """
+    palette: Dict[str, float] = {}
+    usages: Dict[str, Optional[str]] = {}
+    for color in colors or []:
+        if not isinstance(color, dict):
+            color = color.model_dump()
+        hex = color.get("hex")
+        if not hex:
+            continue
+        try:
+            hex = normalize_hex(hex)
+        except ValueError:
+            hex = hex.upper()
+        weight = float(color.get("usage_weight") or 0.0)
+        if hex not in palette or weight > palette[hex]:
+            palette[hex] = weight
+            usages[hex] = color.get("usage")
+
+    total = sum(palette.values())
+    if palette and total <= 0:
+        palette = {hex: 1.0 / len(palette) for hex in palette}
+    return {
+        "name": name,
+        "organization_id": str(organization_id),
+        "palette": palette,
+        "usages": usages,
+    }
+
+
+def _is_hex(hex: str) -> bool:
+    try:
+        normalize_hex(hex)
+        return True
+    except ValueError:
+        return False
+
+
+class BrandSimilarityIndex:
+    """
+    Sparse brand x color matrix for top-K palette similarity, plus a Lab-space
+    KD-tree of all palette colors for perceptual color search.
+
+    Usage:
+        similar = await brand_similarity_index.find_similar(brand_id, min_shared_colors=3)
+        nearby = await brand_similarity_index.find_brands_near_color("#0057B8", tolerance=5)
+        brand_similarity_index.upsert(brand)   # after a brand write
+    """
+
+    def __init__(self, refresh_seconds: float = 600):
+        self.refresh_seconds = refresh_seconds
+        # brand_id -> {"name", "organization_id", "palette": {hex: weight}, "usages": {hex: usage}}
+        self._brands: Dict[str, Dict[str, Any]] = {}
+        self._loaded_at: Optional[float] = None
+        self._load_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        # brand_id -> entry (None when removed) written while a load is running
+        self._changes_during_load: Optional[Dict[str, Optional[Dict[str, Any]]]] = None
+
+        # Built from _brands by _build(); None when a full rebuild is due
+        self._matrix: Optional[sparse.csr_matrix] = None
+        self._weights: Optional[sparse.csr_matrix] = None
+        # Row -> brand_id; None for rows of removed brands (emptied in place)
+        self._brand_ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._removed_rows = 0
+        self._columns: Dict[str, int] = {}
+        self._column_counts: Optional[np.ndarray] = None
+        self._org_codes: Optional[np.ndarray] = None
+        self._org_code_map: Dict[str, int] = {}
+        self._sizes: Optional[np.ndarray] = None
+        self._weight_sums: Optional[np.ndarray] = None
+        # KD-tree over the Lab coordinates of the colors in _tree_columns
+        self._color_tree: Optional[cKDTree] = None
+        self._tree_columns: Optional[np.ndarray] = None
+        self._tree_stale = True
+        # Colors added since the tree was built: columns and Lab coordinates
+        self._delta_columns: List[int] = []
+        self._delta_lab = np.empty((0, 3))
+        self._column_hexes: List[str] = []
+
+        self.loads = 0
+        self.builds = 0
+        self.row_updates = 0
+        self.tree_builds = 0
+
+    async def find_similar(
+        self,
+        brand_id: str,
+        min_shared_colors: int = 3,
+        limit: int = 5,
+        weighted: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find brands of other organizations with similar color palettes.
+
+        Args:
+            brand_id: UUID of the brand to compare against
+            min_shared_colors: Minimum number of colors in common
+            limit: Maximum number of brands to return
+            weighted: Rank by usage_weight-weighted Jaccard instead of Jaccard
+
+        Returns:
+            List of dictionaries with similar_brand_id, similar_brand_name,
+            shared_colors, shared_color_count and similarity_score, best first
+        """
+        await self._ensure_loaded()
+        self._build()
+
+        row = self._rows.get(brand_id)
+        if row is None or self._matrix is None:
+            return []
+
+        subject = self._brands[brand_id]["palette"]
+        columns = np.fromiter(
+            (self._columns[hex] for hex in subject), dtype=np.int64, count=len(subject)
+        )
+        if not len(columns):
+            return []
+
+        vector = np.zeros(self._matrix.shape[1])
+        vector[columns] = 1.0
+        shared = self._matrix @ vector
+
+        if weighted:
+            subject_weights = np.zeros(self._matrix.shape[1])
+            subject_weights[columns] = [subject[hex] for hex in subject]
+            overlap = self._weights[:, columns].tocoo()
+            shared_weight = np.bincount(
+                overlap.row,
+                weights=np.minimum(overlap.data, subject_weights[columns][overlap.col]),
+                minlength=len(self._brand_ids),
+            )
+            union = self._weight_sums[row] + self._weight_sums - shared_weight
+        else:
+            shared_weight = shared
+            union = self._sizes[row] + self._sizes - shared
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.where(union > 0, shared_weight / union, 0.0)
+
+        eligible = (shared >= max(min_shared_colors, 1)) & (
+            self._org_codes != self._org_codes[row]
+        )
+        eligible[row] = False
+        candidates = np.flatnonzero(eligible)
+        if not len(candidates):
+            return []
+
+        if len(candidates) > limit:
+            top = np.argpartition(-scores[candidates], limit - 1)[:limit]
+            candidates = candidates[top]
+        # Score descending, brand_id as a stable tie-breaker
+        order = sorted(candidates, key=lambda i: (-scores[i], self._brand_ids[i]))
+
+        results = []
+        for i in order:
+            other_id = self._brand_ids[i]
+            other = self._brands[other_id]
+            shared_colors = [hex for hex in subject if hex in other["palette"]]
+            results.append({
+                "similar_brand_id": other_id,
+                "similar_brand_name": other["name"],
+                "shared_colors": shared_colors,
+                "shared_color_count": len(shared_colors),
+                "similarity_score": float(scores[i]),
+            })
+        return results
+
+    async def find_brands_near_color(
+        self, hex: str, tolerance: float, limit: int = 100, offset: int = 0
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Find brands using a color within a perceptual distance of hex.
+
+        Args:
+            hex: Color to search for ("#RRGGBB")
+            tolerance: Maximum ΔE (CIE76); 0 matches the exact color only
+            limit: Maximum number of brands to return
+            offset: Number of matching brands to skip (for paging)
+
+        Returns:
+            Tuple of (page of dictionaries with brand_id, brand_name,
+            matched_hex, delta_e, usage and usage_weight, one per brand (its
+            closest color), closest first; total number of matching brands)
+
+        Raises:
+            ValueError: If hex is not a valid color
+        """
+        target = hex_to_lab([hex])[0]
+        await self._ensure_loaded()
+        self._build()
+        self._build_color_tree()
+
+        columns, distances = self._colors_within(target, tolerance)
+        if not len(columns):
+            return [], 0
+        matches = self._weights[:, columns].tocoo()
+
+        # Closest matching color per brand
+        best: Dict[int, int] = {}
+        for row, position in zip(matches.row, matches.col):
+            if row not in best or distances[position] < distances[best[row]]:
+                best[row] = position
+
+        results = []
+        for row, position in best.items():
+            brand_id = self._brand_ids[row]
+            entry = self._brands[brand_id]
+            matched_hex = self._column_hexes[columns[position]]
+            results.append({
+                "brand_id": brand_id,
+                "brand_name": entry["name"],
+                "matched_hex": matched_hex,
+                "delta_e": round(float(distances[position]), 3),
+                "usage": entry["usages"].get(matched_hex),
+                "usage_weight": entry["palette"][matched_hex],
+            })
+        results.sort(key=lambda r: (r["delta_e"], -r["usage_weight"], r["brand_id"]))
+        return results[offset:offset + limit], len(results)
+
+    async def nearest_colors(self, hex: str, k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Find the k brand colors perceptually closest to hex.
+
+        Args:
+            hex: Color to search for ("#RRGGBB")
+            k: Number of colors to return
+
+        Returns:
+            List of dictionaries with hex, delta_e and brand_count, closest first
+
+        Raises:
+            ValueError: If hex is not a valid color
+        """
+        target = hex_to_lab([hex])[0]
+        await self._ensure_loaded()
+        self._build()
+        self._build_color_tree()
+        if k < 1:
+            return []
+
+        columns, distances = self._nearest(target, k)
+        return [
+            {
+                "hex": self._column_hexes[column],
+                "delta_e": round(float(distance), 3),
+                "brand_count": int(self._column_counts[column]),
+            }
+            for column, distance in zip(columns, distances)
+        ]
+
+    def upsert(self, brand: Brand) -> None:
+        """Add or replace a brand's palette (no-op until the index is loaded)."""
+        if brand.deleted_at:
+            self.remove(brand.brand_id)
+            return
+        colors = brand.guidelines.colors if brand.guidelines else []
+        self._apply(brand.brand_id, _entry_from_brand(brand.name, brand.organization_id, colors))
+
+    def remove(self, brand_id: str) -> None:
+        """Drop a brand from the index."""
+        self._apply(brand_id, None)
+
+    def clear(self) -> None:
+        """Drop all data; the next query reloads from the database."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        self._brands = {}
+        self._loaded_at = None
+        self._changes_during_load = None
+        self._matrix = None
+
+    def stats(self) -> dict:
+        """Get index size and load/build counters."""
+        return {
+            "brands": len(self._brands),
+            "colors": len(self._columns),
+            "indexed_colors": self._color_tree.n if self._color_tree is not None else 0,
+            "delta_colors": len(self._delta_columns),
+            "non_zeros": int(self._matrix.nnz) if self._matrix is not None else None,
+            "removed_rows": self._removed_rows,
+            "loads": self.loads,
+            "builds": self.builds,
+            "row_updates": self.row_updates,
+            "tree_builds": self.tree_builds,
+            "age_seconds": (
+                time.monotonic() - self._loaded_at if self._loaded_at is not None else None
+            ),
+        }
+
+    async def _ensure_loaded(self) -> None:
+        if self._is_fresh():
+            return
+        if self._loaded_at is not None:
+            # Serve the current data while a single background load refreshes it
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = asyncio.create_task(self._refresh())
+            return
+        async with self._load_lock:
+            # Another caller may have loaded while we waited
+            if self._loaded_at is None:
+                await self._load()
+
+    async def _refresh(self) -> None:
+        async with self._load_lock:
+            if self._is_fresh():
+                return
+            try:
+                await self._load()
+            except Exception as e:
+                # Keep serving the loaded data; the next query retries
+                logger.warning("brand_similarity_index_refresh_failed", error=str(e))
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._loaded_at is not None
+            and time.monotonic() - self._loaded_at < self.refresh_seconds
+        )
+
+    async def _load(self) -> None:
+        """Load every non-deleted brand's palette from the database."""
+        start = time.perf_counter()
+        client = get_supabase_client()
+        brands: Dict[str, Dict[str, Any]] = {}
+        last_id = None
+        # Writes made while loading are applied on top of the loaded data
+        self._changes_during_load = {}
+
+        try:
+            while True:
+                # Only the colors are read, not the whole guidelines document
+                query = (
+                    client.table("brands")
+                    .select("brand_id, name, organization_id, colors:guidelines->colors")
+                    .is_("deleted_at", "null")
+                )
+                if last_id is not None:
+                    query = query.gt("brand_id", last_id)
+                query = query.order("brand_id").limit(LOAD_PAGE_SIZE)
+                # The Supabase client is synchronous; keep the event loop free
+                rows = (await asyncio.to_thread(query.execute)).data
+                for row in rows:
+                    brands[str(row["brand_id"])] = _entry_from_brand(
+                        row.get("name"), row.get("organization_id"), row.get("colors")
+                    )
+                if len(rows) < LOAD_PAGE_SIZE:
+                    break
+                last_id = rows[-1]["brand_id"]
+
+            for brand_id, entry in self._changes_during_load.items():
+                if entry is None:
+                    brands.pop(brand_id, None)
+                else:
+                    brands[brand_id] = entry
+        finally:
+            self._changes_during_load = None
+
+        self._brands = brands
+        self._loaded_at = time.monotonic()
+        self._matrix = None
+        self.loads += 1
+        logger.info(
+            "brand_similarity_index_loaded",
+            brand_count=len(brands),
+            duration_ms=round((time.perf_counter() - start) * 1000, 2),
+        )
+
+    def _apply(self, brand_id: str, entry: Optional[Dict[str, Any]]) -> None:
+        """Record a brand write (entry None removes the brand)."""
+        if self._changes_during_load is not None:
+            self._changes_during_load[brand_id] = entry
+        if self._loaded_at is None:
+            return
+
+        if entry is None:
+            if self._brands.pop(brand_id, None) is None:
+                return
+        else:
+            self._brands[brand_id] = entry
+        if self._matrix is not None:
+            self._replace_row(brand_id, entry)
+
+    def _build(self) -> None:
+        """Rebuild the sparse matrices from the palettes if a full rebuild is due."""
+        if self._matrix is not None:
+            return
+
+        brand_ids = list(self._brands)
+        columns: Dict[str, int] = {}
+        rows, cols, weights = [], [], []
+        org_codes: Dict[str, int] = {}
+        brand_orgs = np.empty(len(brand_ids), dtype=np.int64)
+
+        for row, brand_id in enumerate(brand_ids):
+            entry = self._brands[brand_id]
+            brand_orgs[row] = org_codes.setdefault(entry["organization_id"], len(org_codes))
+            for hex, weight in entry["palette"].items():
+                rows.append(row)
+                cols.append(columns.setdefault(hex, len(columns)))
+                weights.append(weight)
+
+        shape = (len(brand_ids), max(len(columns), 1))
+        self._weights = sparse.csr_matrix(
+            (np.asarray(weights, dtype=np.float64), (rows, cols)), shape=shape
+        )
+        self._weights.sort_indices()
+        self._matrix = self._binary(self._weights)
+        self._brand_ids = brand_ids
+        self._rows = {brand_id: row for row, brand_id in enumerate(brand_ids)}
+        self._removed_rows = 0
+        self._columns = columns
+        self._column_hexes = list(columns)
+        self._column_counts = np.bincount(
+            np.asarray(cols, dtype=np.int64), minlength=len(columns)
+        )
+        self._org_codes = brand_orgs
+        self._org_code_map = org_codes
+        self._sizes = np.diff(self._matrix.indptr).astype(np.float64)
+        self._weight_sums = np.asarray(self._weights.sum(axis=1)).ravel()
+        self._tree_stale = True
+        self.builds += 1
+
+    def _replace_row(self, brand_id: str, entry: Optional[Dict[str, Any]]) -> None:
+        """
+        Replace one brand's row of the built matrices in place.
+
+        The row's column indices and weights are spliced into the CSR arrays
+        with vectorized copies (O(non-zeros) memory moves, no Python loop
+        over brands). A removed brand's row is emptied and left behind; once
+        a quarter of the rows are empty the next query rebuilds.
+        """
+        row = self._rows.get(brand_id)
+        indptr = self._weights.indptr
+        if row is None:
+            if entry is None:
+                return
+            row = len(self._brand_ids)
+            self._brand_ids.append(brand_id)
+            self._rows[brand_id] = row
+            indptr = np.append(indptr, indptr[-1])
+            self._org_codes = np.append(self._org_codes, -1)
+            self._sizes = np.append(self._sizes, 0.0)
+            self._weight_sums = np.append(self._weight_sums, 0.0)
+
+        palette = entry["palette"] if entry is not None else {}
+        new_hexes = [hex for hex in palette if hex not in self._columns]
+        for hex in new_hexes:
+            self._columns[hex] = len(self._columns)
+            self._column_hexes.append(hex)
+        if new_hexes:
+            self._column_counts = np.append(self._column_counts, np.zeros(len(new_hexes), dtype=np.int64))
+            self._add_delta_colors(new_hexes)
+
+        cols = np.fromiter((self._columns[hex] for hex in palette), dtype=np.int64, count=len(palette))
+        order = np.argsort(cols)
+        cols = cols[order].astype(self._weights.indices.dtype)
+        weights = np.fromiter(palette.values(), dtype=np.float64, count=len(palette))[order]
+
+        start, end = indptr[row], indptr[row + 1]
+        self._column_counts[self._weights.indices[start:end]] -= 1
+        self._column_counts[cols] += 1
+        indices = np.concatenate([self._weights.indices[:start], cols, self._weights.indices[end:]])
+        data = np.concatenate([self._weights.data[:start], weights, self._weights.data[end:]])
+        indptr = indptr.copy()
+        indptr[row + 1:] += len(cols) - (end - start)
+
+        shape = (len(self._brand_ids), max(len(self._columns), 1))
+        self._weights = sparse.csr_matrix((data, indices, indptr), shape=shape)
+        self._matrix = self._binary(self._weights)
+        self._sizes[row] = len(cols)
+        self._weight_sums[row] = weights.sum()
+        self.row_updates += 1
+
+        if entry is not None:
+            organization_id = entry["organization_id"]
+            self._org_codes[row] = self._org_code_map.setdefault(
+                organization_id, len(self._org_code_map)
+            )
+            return
+
+        # Removed: the empty row shares no colors, so it is never a candidate
+        del self._rows[brand_id]
+        self._brand_ids[row] = None
+        self._org_codes[row] = -1
+        self._removed_rows += 1
+        if self._removed_rows > max(64, len(self._brand_ids) // 4):
+            self._matrix = None
+
+    @staticmethod
+    def _binary(weights: sparse.csr_matrix) -> sparse.csr_matrix:
+        """Same sparsity pattern as weights with every stored value set to 1."""
+        return sparse.csr_matrix(
+            (np.ones(len(weights.data)), weights.indices, weights.indptr), shape=weights.shape
+        )
+
+    def _add_delta_colors(self, hexes: List[str]) -> None:
+        """Queue new colors for linear search until the tree is rebuilt with them."""
+        if self._tree_stale:
+            # The next query builds the tree with every column anyway
+            return
+        valid = [hex for hex in hexes if _is_hex(hex)]
+        if not valid:
+            return
+        self._delta_columns.extend(self._columns[hex] for hex in valid)
+        self._delta_lab = np.vstack([self._delta_lab, hex_to_lab(valid)])
+        if len(self._delta_columns) >= COLOR_DELTA_MERGE_SIZE:
+            self._tree_stale = True
+
+    def _build_color_tree(self) -> None:
+        """Rebuild the KD-tree with every color if it is missing or the delta is full."""
+        if not self._tree_stale:
+            return
+
+        # Colors stored with malformed hex codes cannot be placed in Lab space
+        hexes = self._column_hexes
+        valid = [column for column, hex in enumerate(hexes) if _is_hex(hex)]
+        self._tree_columns = np.asarray(valid, dtype=np.int64)
+        self._color_tree = (
+            cKDTree(hex_to_lab([hexes[column] for column in valid])) if valid else None
+        )
+        self._delta_columns = []
+        self._delta_lab = np.empty((0, 3))
+        self._tree_stale = False
+        self.tree_builds += 1
+
+    def _colors_within(self, target: np.ndarray, tolerance: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Columns and ΔE of the colors within tolerance (tree plus delta buffer)."""
+        # Small epsilon so colors exactly on the boundary are included
+        radius = tolerance + 1e-9
+        columns, distances = [], []
+        if self._color_tree is not None:
+            positions = self._color_tree.query_ball_point(target, r=radius)
+            if positions:
+                columns.append(self._tree_columns[positions])
+                distances.append(np.linalg.norm(self._color_tree.data[positions] - target, axis=1))
+        if self._delta_columns:
+            delta = np.linalg.norm(self._delta_lab - target, axis=1)
+            within = delta <= radius
+            columns.append(np.asarray(self._delta_columns, dtype=np.int64)[within])
+            distances.append(delta[within])
+        if not columns:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        return np.concatenate(columns), np.concatenate(distances)
+
+    def _nearest(self, target: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Columns and ΔE of the k closest colors any brand uses, closest first."""
+        columns, distances = [], []
+        if self._color_tree is not None:
+            # Colors no brand uses any more stay in the tree until the next
+            # rebuild, so ask for enough neighbours to skip them
+            unused = int((self._column_counts[self._tree_columns] == 0).sum())
+            tree_distances, positions = self._color_tree.query(
+                target, k=min(k + unused, self._color_tree.n)
+            )
+            columns.append(self._tree_columns[np.atleast_1d(positions)])
+            distances.append(np.atleast_1d(tree_distances))
+        if self._delta_columns:
+            columns.append(np.asarray(self._delta_columns, dtype=np.int64))
+            distances.append(np.linalg.norm(self._delta_lab - target, axis=1))
+        if not columns:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        columns, distances = np.concatenate(columns), np.concatenate(distances)
+        used = self._column_counts[columns] > 0
+        columns, distances = columns[used], distances[used]
+        order = np.argsort(distances, kind="stable")[:k]
+        return columns[order], distances[order]
+
+
+# Global brand similarity index instance
+brand_similarity_index = BrandSimilarityIndex(
+    refresh_seconds=settings.brand_similarity_refresh_seconds,
+)
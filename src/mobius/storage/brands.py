@@ -6,8 +6,9 @@ Provides CRUD operations for brand entities in Supabase.
 
 from mobius.models.brand import Brand
 from mobius.storage.database import get_supabase_client
-from mobius.storage.graph import graph_storage
-from typing import List, Optional
+from mobius.storage.brand_cache import brand_cache
+from mobius.storage.brand_similarity import brand_similarity_index
+from typing import Dict, List, Optional
 from datetime import datetime, timezone
 import structlog
 
@@ -40,12 +41,12 @@ class BrandStorage:
         result = self.client.table("brands").insert(data).execute()
 
         logger.info("brand_created", brand_id=brand.brand_id)
+        brand_cache.invalidate(brand.brand_id)
         created_brand = Brand.model_validate(result.data[0])
+        brand_similarity_index.upsert(created_brand)
 
-        # Sync to Neo4j graph database (awaited to prevent connection cleanup race conditions)
-        # Graph sync is designed to fail gracefully and won't raise exceptions
-        await graph_storage.sync_brand(created_brand)
-
+        # Neo4j sync is queued in the same transaction by the graph sync outbox
+        # trigger (migration 009) and applied by GraphSyncDrainer
         return created_brand
 
     async def get_brand(self, brand_id: str) -> Optional[Brand]:
@@ -134,11 +135,9 @@ class BrandStorage:
             raise ValueError(f"Brand {brand_id} not found")
 
         logger.info("brand_updated", brand_id=brand_id)
+        brand_cache.invalidate(brand_id)
         updated_brand = Brand.model_validate(result.data[0])
-
-        # Sync to Neo4j graph database (awaited to prevent connection cleanup race conditions)
-        # Graph sync is designed to fail gracefully and won't raise exceptions
-        await graph_storage.sync_brand(updated_brand)
+        brand_similarity_index.upsert(updated_brand)
 
         return updated_brand
 
@@ -171,8 +170,42 @@ class BrandStorage:
             raise ValueError(f"Brand {brand_id} not found")
 
         logger.info("brand_soft_deleted", brand_id=brand_id)
+        brand_cache.invalidate(brand_id)
+        brand_similarity_index.remove(brand_id)
         return True
 
+    async def get_brand_stats(self, brand_ids: List[str]) -> Dict[str, dict]:
+        """
+        Get precomputed asset statistics for a set of brands.
+
+        Reads the brand_stats aggregate (maintained incrementally by a trigger
+        on assets), so the cost is one primary-key lookup per brand regardless
+        of how many assets each brand has.
+
+        Args:
+            brand_ids: UUIDs of the brands
+
+        Returns:
+            Dictionary mapping brand_id to asset_count, avg_compliance_score
+            and last_activity. Brands without assets are omitted.
+        """
+        if not brand_ids:
+            return {}
+
+        logger.debug("fetching_brand_stats", brand_count=len(brand_ids))
+
+        result = (
+            self.client.table("brand_stats")
+            .select(
+                "brand_id, asset_count, scored_asset_count, "
+                "compliance_score_sum, last_activity"
+            )
+            .in_("brand_id", brand_ids)
+            .execute()
+        )
+
+        return {row["brand_id"]: _format_brand_stats(row) for row in result.data}
+
     async def get_brand_with_stats(self, brand_id: str) -> Optional[dict]:
         """
         Get brand with computed statistics.
@@ -192,26 +225,23 @@ class BrandStorage:
         if not brand:
             return None
 
-        # Get asset count and average compliance score
-        assets_result = (
-            self.client.table("assets")
-            .select("compliance_score")
-            .eq("brand_id", brand_id)
-            .execute()
-        )
-
-        asset_count = len(assets_result.data)
-        avg_score = 0.0
-        if asset_count > 0:
-            scores = [
-                a["compliance_score"]
-                for a in assets_result.data
-                if a.get("compliance_score") is not None
-            ]
-            avg_score = sum(scores) / len(scores) if scores else 0.0
+        stats = (await self.get_brand_stats([brand_id])).get(brand_id)
 
         return {
             **brand.model_dump(),
-            "asset_count": asset_count,
-            "avg_compliance_score": avg_score,
+            "asset_count": stats["asset_count"] if stats else 0,
+            "avg_compliance_score": stats["avg_compliance_score"] if stats else 0.0,
+            "last_activity": stats["last_activity"] if stats else None,
         }
+
+
+def _format_brand_stats(row: dict) -> dict:
+    """Convert a raw brand_stats row into asset_count/avg_compliance_score/last_activity."""
+    scored = row.get("scored_asset_count") or 0
+    score_sum = row.get("compliance_score_sum") or 0.0
+
+    return {
+        "asset_count": row.get("asset_count") or 0,
+        "avg_compliance_score": score_sum / scored if scored > 0 else 0.0,
+        "last_activity": row.get("last_activity"),
+    }
@@ -25,6 +25,9 @@ def get_supabase_client() -> Client:
 
     The config.py Settings class validates the URL and warns if pooler is not used.
 
+    When settings.storage_backend is "memory" or "sqlite", returns the in-process
+    LocalSupabaseClient instead (see storage/local.py).
+
     Returns:
         Client: Configured Supabase client instance
 
@@ -33,6 +36,11 @@ def get_supabase_client() -> Client:
     """
     global _client
 
+    if settings.storage_backend in ("memory", "sqlite"):
+        from mobius.storage.local import get_local_client
+
+        return get_local_client()
+
     if _client is None:
         if not settings.supabase_url or not settings.supabase_key:
             raise ValueError(
@@ -6,7 +6,7 @@ Provides CRUD operations for feedback entities in Supabase.
 
 from pydantic import BaseModel
 from mobius.storage.database import get_supabase_client
-from mobius.storage.graph import graph_storage
+from mobius.storage.pagination import apply_keyset
 from typing import List, Optional
 from datetime import datetime
 import structlog
@@ -38,7 +38,7 @@ class FeedbackStorage:
         Create a new feedback entry.
 
         The database trigger will automatically update the brand's
-        feedback_count and learning_active flag.
+        feedback counters and learning_active flag in the same transaction.
 
         Args:
             asset_id: UUID of the asset
@@ -71,17 +71,8 @@ class FeedbackStorage:
         logger.info("feedback_created", feedback_id=result.data[0]["feedback_id"])
         created_feedback = Feedback.model_validate(result.data[0])
 
-        # Sync to Neo4j graph database (awaited to prevent connection cleanup race conditions)
-        # Graph sync is designed to fail gracefully and won't raise exceptions
-        await graph_storage.sync_feedback(
-            feedback_id=created_feedback.feedback_id,
-            asset_id=asset_id,
-            brand_id=brand_id,
-            action=action,
-            reason=reason,
-            timestamp=created_feedback.created_at.isoformat()
-        )
-
+        # Neo4j sync is queued in the same transaction by the graph sync outbox
+        # trigger (migration 009) and applied by GraphSyncDrainer
         return created_feedback
 
     async def get_feedback(self, feedback_id: str) -> Optional[Feedback]:
@@ -108,30 +99,29 @@ class FeedbackStorage:
         return None
 
     async def list_feedback_by_brand(
-        self, brand_id: str, limit: int = 100, offset: int = 0
+        self, brand_id: str, limit: int = 100, cursor: Optional[str] = None
     ) -> List[Feedback]:
         """
-        List all feedback for a brand.
+        List feedback for a brand, newest first, using keyset pagination.
 
         Args:
             brand_id: UUID of the brand
             limit: Maximum number of feedback entries to return
-            offset: Number of entries to skip
+            cursor: Optional cursor from the previous page
 
         Returns:
             List of Feedback entities
-        """
-        logger.debug("listing_feedback_by_brand", brand_id=brand_id, limit=limit)
 
-        result = (
-            self.client.table("feedback")
-            .select("*")
-            .eq("brand_id", brand_id)
-            .order("created_at", desc=True)
-            .range(offset, offset + limit - 1)
-            .execute()
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        logger.debug(
+            "listing_feedback_by_brand", brand_id=brand_id, limit=limit, has_cursor=bool(cursor)
         )
 
+        query = self.client.table("feedback").select("*").eq("brand_id", brand_id)
+        result = apply_keyset(query, "feedback_id", limit, cursor).execute()
+
         return [Feedback.model_validate(f) for f in result.data]
 
     async def list_feedback_by_asset(self, asset_id: str) -> List[Feedback]:
@@ -161,6 +151,8 @@ class FeedbackStorage:
         Get feedback statistics for a brand.
 
         Returns total approvals, rejections, and learning_active status.
+        Reads the per-brand counters maintained by the feedback trigger,
+        so this is a single-row lookup regardless of feedback volume.
 
         Args:
             brand_id: UUID of the brand
@@ -170,33 +162,18 @@ class FeedbackStorage:
         """
         logger.debug("fetching_feedback_stats", brand_id=brand_id)
 
-        # Get all feedback for the brand
         result = (
-            self.client.table("feedback")
-            .select("action")
-            .eq("brand_id", brand_id)
-            .execute()
-        )
-
-        approvals = sum(1 for f in result.data if f["action"] == "approve")
-        rejections = sum(1 for f in result.data if f["action"] == "reject")
-        total = len(result.data)
-
-        # Get learning_active status from brand
-        brand_result = (
             self.client.table("brands")
-            .select("learning_active")
+            .select("feedback_count, approval_count, rejection_count, learning_active")
             .eq("brand_id", brand_id)
             .execute()
         )
 
-        learning_active = (
-            brand_result.data[0]["learning_active"] if brand_result.data else False
-        )
+        counters = result.data[0] if result.data else {}
 
         return {
-            "total_feedback": total,
-            "approvals": approvals,
-            "rejections": rejections,
-            "learning_active": learning_active,
+            "total_feedback": counters.get("feedback_count") or 0,
+            "approvals": counters.get("approval_count") or 0,
+            "rejections": counters.get("rejection_count") or 0,
+            "learning_active": bool(counters.get("learning_active", False)),
         }
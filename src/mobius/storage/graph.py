@@ -1,25 +1,35 @@
 """
 Graph database storage layer using Neo4j.
 
-Maintains dual-write synchronization between PostgreSQL (source of truth)
-and Neo4j (relationship queries).
+Maintains synchronization between PostgreSQL (source of truth) and Neo4j
+(relationship queries). Writes are queued in the graph sync outbox and
+applied asynchronously by GraphSyncDrainer (see graph_outbox.py).
 """
 
 import asyncio
+import hashlib
 import ssl
-from typing import Any, Dict, List, Optional
-from neo4j import AsyncGraphDatabase, AsyncDriver, AsyncSession
+import uuid
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from neo4j import AsyncGraphDatabase, AsyncDriver, AsyncManagedTransaction
 from neo4j.exceptions import ServiceUnavailable
 import structlog
 import certifi
 
 from mobius.config import settings
-from mobius.models.brand import Brand, Color
+from mobius.models.brand import Brand
 from mobius.models.asset import Asset
 from mobius.models.template import Template
+from mobius.storage.graph_cache import GraphQueryCache
+
+if TYPE_CHECKING:
+    from mobius.api.job_events import JobEventBus
 
 logger = structlog.get_logger()
 
+# Key of graph cache invalidation events on the invalidation bus
+GRAPH_CACHE_EVENT_KEY = "graph_cache"
+
 
 class GraphStorage:
     """
@@ -30,10 +40,22 @@ class GraphStorage:
     - Neo4j is read-optimized for graph queries
     - Sync failures are logged but don't block PostgreSQL writes
     - All graph operations are idempotent (safe to retry)
+    - Query results are cached and invalidated by the writes that affect them
     """
 
     def __init__(self):
         """Initialize Neo4j driver connection."""
+        self.query_cache = GraphQueryCache(
+            max_size=settings.graph_cache_max_size,
+            ttl_seconds=settings.graph_cache_ttl_seconds,
+            stale_seconds=settings.graph_cache_stale_seconds,
+        )
+        # brand_id -> hex colors last written for the brand (for pairing invalidation)
+        self._brand_palettes: Dict[str, Set[str]] = {}
+        # Carries invalidated tags to other processes (see attach_invalidation_bus)
+        self.invalidation_bus = None
+        self._origin = uuid.uuid4().hex
+
         if not settings.neo4j_uri:
             logger.warning("neo4j_not_configured", message="Neo4j URI not set, graph features disabled")
             self.driver = None
@@ -95,87 +117,33 @@ class GraphStorage:
         - (Brand)-[:HAS_CONTEXTUAL_RULE]->(ContextualRule)
         - (Brand)-[:HAS_LOGO {variant, url}]->(Brand) [self-loop]
 
+        All writes run in one managed write transaction (retried by the driver
+        on transient errors) with one UNWIND query per entity type, so a brand
+        (or a batch of brands via write_brands) costs a handful of round trips
+        regardless of how many rules it has.
+
         Idempotent: Safe to call multiple times for same brand.
         """
         if not self._is_enabled():
             return
 
-        try:
-            async with self.driver.session() as session:
-                # MERGE Brand node (create or update)
-                await session.run(
-                    """
-                    MERGE (b:Brand {brand_id: $brand_id})
-                    SET b.organization_id = $organization_id,
-                        b.name = $name,
-                        b.learning_active = $learning_active,
-                        b.feedback_count = $feedback_count,
-                        b.created_at = datetime($created_at),
-                        b.updated_at = datetime($updated_at)
-                    """,
-                    brand_id=brand.brand_id,
-                    organization_id=brand.organization_id,
-                    name=brand.name,
-                    learning_active=brand.learning_active,
-                    feedback_count=brand.feedback_count,
-                    created_at=brand.created_at,
-                    updated_at=brand.updated_at
-                )
+        if not brand.guidelines:
+            logger.warning("brand_has_no_guidelines", brand_id=brand.brand_id)
 
-                if not brand.guidelines:
-                    logger.warning("brand_has_no_guidelines", brand_id=brand.brand_id)
-                    return
-
-                # Sync Colors (Visual DNA)
-                if brand.guidelines.colors:
-                    for color in brand.guidelines.colors:
-                        await self._sync_color_relationship(
-                            session, brand.brand_id, color
-                        )
-
-                # Sync Identity Core (THE MOAT - Strategic positioning)
-                if brand.guidelines.identity_core:
-                    await self._sync_identity_core(
-                        session, brand.brand_id, brand.guidelines.identity_core
-                    )
-
-                # Sync Typography (Visual DNA)
-                if brand.guidelines.typography:
-                    for typo in brand.guidelines.typography:
-                        await self._sync_typography(
-                            session, brand.brand_id, typo
-                        )
-
-                # Sync Brand Rules (Governance)
-                if brand.guidelines.rules:
-                    for rule in brand.guidelines.rules:
-                        await self._sync_rule(
-                            session, brand.brand_id, rule
-                        )
-
-                # Sync Contextual Rules (MOAT - Channel-specific governance)
-                if brand.guidelines.contextual_rules:
-                    for ctx_rule in brand.guidelines.contextual_rules:
-                        await self._sync_contextual_rule(
-                            session, brand.brand_id, ctx_rule
-                        )
-
-                # Sync Asset Graph (MOAT - Asset inventory)
-                if brand.guidelines.asset_graph:
-                    await self._sync_asset_graph(
-                        session, brand.brand_id, brand.guidelines.asset_graph
-                    )
+        try:
+            await self.write_brands([brand])
 
-                logger.info(
-                    "brand_synced_to_graph",
-                    brand_id=brand.brand_id,
-                    color_count=len(brand.guidelines.colors) if brand.guidelines.colors else 0,
-                    has_identity_core=brand.guidelines.identity_core is not None,
-                    typography_count=len(brand.guidelines.typography) if brand.guidelines.typography else 0,
-                    rule_count=len(brand.guidelines.rules) if brand.guidelines.rules else 0,
-                    contextual_rule_count=len(brand.guidelines.contextual_rules) if brand.guidelines.contextual_rules else 0,
-                    has_asset_graph=brand.guidelines.asset_graph is not None
-                )
+            guidelines = brand.guidelines
+            logger.info(
+                "brand_synced_to_graph",
+                brand_id=brand.brand_id,
+                color_count=len(guidelines.colors) if guidelines and guidelines.colors else 0,
+                has_identity_core=bool(guidelines and guidelines.identity_core),
+                typography_count=len(guidelines.typography) if guidelines and guidelines.typography else 0,
+                rule_count=len(guidelines.rules) if guidelines and guidelines.rules else 0,
+                contextual_rule_count=len(guidelines.contextual_rules) if guidelines and guidelines.contextual_rules else 0,
+                has_asset_graph=bool(guidelines and guidelines.asset_graph)
+            )
 
         except Exception as e:
             # Log error but don't fail the main operation
@@ -186,226 +154,6 @@ class GraphStorage:
                 error=str(e)
             )
 
-    async def _sync_color_relationship(
-        self, session: AsyncSession, brand_id: str, color: Color
-    ) -> None:
-        """
-        Sync individual Color node and Brand → Color relationship.
-
-        Creates:
-        - (:Color) node with hex as primary key
-        - (Brand)-[:OWNS_COLOR {usage, usage_weight}]->(Color)
-        """
-        await session.run(
-            """
-            MATCH (b:Brand {brand_id: $brand_id})
-            MERGE (c:Color {hex: $hex})
-            SET c.name = $name
-            MERGE (b)-[r:OWNS_COLOR]->(c)
-            SET r.usage = $usage,
-                r.usage_weight = $usage_weight,
-                r.context = $context
-            """,
-            brand_id=brand_id,
-            hex=color.hex,
-            name=color.name,
-            usage=color.usage,
-            usage_weight=color.usage_weight,
-            context=color.context
-        )
-
-    async def _sync_identity_core(
-        self, session: AsyncSession, brand_id: str, identity_core: Any
-    ) -> None:
-        """
-        Sync Identity Core (THE MOAT - Strategic positioning).
-        
-        Creates:
-        - (:Archetype) node (shared across brands)
-        - (Brand)-[:HAS_ARCHETYPE]->(Archetype)
-        - (Brand)-[:HAS_VOICE_VECTOR {dimension, score}]->(Brand) [self-loop for each vector]
-        - (Brand)-[:FORBIDS {constraint}]->(Brand) [self-loop for each negative constraint]
-        """
-        # Sync Archetype
-        if identity_core.archetype:
-            await session.run(
-                """
-                MATCH (b:Brand {brand_id: $brand_id})
-                MERGE (a:Archetype {name: $archetype})
-                MERGE (b)-[:HAS_ARCHETYPE]->(a)
-                """,
-                brand_id=brand_id,
-                archetype=identity_core.archetype
-            )
-        
-        # Sync Voice Vectors (self-loops)
-        if identity_core.voice_vectors:
-            for dimension, score in identity_core.voice_vectors.items():
-                await session.run(
-                    """
-                    MATCH (b:Brand {brand_id: $brand_id})
-                    MERGE (b)-[v:HAS_VOICE_VECTOR {dimension: $dimension}]->(b)
-                    SET v.score = $score
-                    """,
-                    brand_id=brand_id,
-                    dimension=dimension,
-                    score=score
-                )
-        
-        # Sync Negative Constraints (self-loops)
-        if identity_core.negative_constraints:
-            for constraint in identity_core.negative_constraints:
-                await session.run(
-                    """
-                    MATCH (b:Brand {brand_id: $brand_id})
-                    MERGE (b)-[f:FORBIDS {constraint: $constraint}]->(b)
-                    """,
-                    brand_id=brand_id,
-                    constraint=constraint
-                )
-
-    async def _sync_typography(
-        self, session: AsyncSession, brand_id: str, typography: Any
-    ) -> None:
-        """
-        Sync Typography node and relationship.
-        
-        Creates:
-        - (:Typography) node with family as primary key
-        - (Brand)-[:USES_TYPOGRAPHY {usage}]->(Typography)
-        """
-        await session.run(
-            """
-            MATCH (b:Brand {brand_id: $brand_id})
-            MERGE (t:Typography {family: $family})
-            SET t.weights = $weights,
-                t.usage_description = $usage
-            MERGE (b)-[r:USES_TYPOGRAPHY]->(t)
-            SET r.usage = $usage
-            """,
-            brand_id=brand_id,
-            family=typography.family,
-            weights=typography.weights,
-            usage=typography.usage
-        )
-
-    async def _sync_rule(
-        self, session: AsyncSession, brand_id: str, rule: Any
-    ) -> None:
-        """
-        Sync Brand Rule node and relationship.
-        
-        Creates:
-        - (:Rule) node with unique ID
-        - (Brand)-[:HAS_RULE]->(Rule)
-        """
-        # Generate a stable rule_id from brand_id + instruction hash
-        import hashlib
-        rule_id = hashlib.md5(f"{brand_id}:{rule.instruction}".encode()).hexdigest()
-        
-        await session.run(
-            """
-            MATCH (b:Brand {brand_id: $brand_id})
-            MERGE (r:Rule {rule_id: $rule_id})
-            SET r.category = $category,
-                r.instruction = $instruction,
-                r.severity = $severity,
-                r.negative_constraint = $negative_constraint
-            MERGE (b)-[:HAS_RULE]->(r)
-            """,
-            brand_id=brand_id,
-            rule_id=rule_id,
-            category=rule.category,
-            instruction=rule.instruction,
-            severity=rule.severity,
-            negative_constraint=rule.negative_constraint
-        )
-
-    async def _sync_contextual_rule(
-        self, session: AsyncSession, brand_id: str, contextual_rule: Any
-    ) -> None:
-        """
-        Sync Contextual Rule node and relationship (MOAT - Channel-specific governance).
-        
-        Creates:
-        - (:ContextualRule) node with unique ID
-        - (Brand)-[:HAS_CONTEXTUAL_RULE]->(ContextualRule)
-        """
-        # Generate a stable rule_id from brand_id + context + rule hash
-        import hashlib
-        rule_id = hashlib.md5(f"{brand_id}:{contextual_rule.context}:{contextual_rule.rule}".encode()).hexdigest()
-        
-        await session.run(
-            """
-            MATCH (b:Brand {brand_id: $brand_id})
-            MERGE (cr:ContextualRule {rule_id: $rule_id})
-            SET cr.context = $context,
-                cr.rule = $rule,
-                cr.priority = $priority,
-                cr.applies_to = $applies_to
-            MERGE (b)-[:HAS_CONTEXTUAL_RULE]->(cr)
-            """,
-            brand_id=brand_id,
-            rule_id=rule_id,
-            context=contextual_rule.context,
-            rule=contextual_rule.rule,
-            priority=contextual_rule.priority,
-            applies_to=contextual_rule.applies_to
-        )
-
-    async def _sync_asset_graph(
-        self, session: AsyncSession, brand_id: str, asset_graph: Any
-    ) -> None:
-        """
-        Sync Asset Graph (MOAT - Asset inventory).
-        
-        Creates:
-        - (Brand)-[:HAS_LOGO {variant, url}]->(Brand) [self-loop for each logo variant]
-        - (Brand)-[:HAS_TEMPLATE {name, url}]->(Brand) [self-loop for each template]
-        - (Brand)-[:HAS_PATTERN {name, url}]->(Brand) [self-loop for each pattern]
-        """
-        # Sync Logo variants
-        if asset_graph.logos:
-            for variant, url in asset_graph.logos.items():
-                await session.run(
-                    """
-                    MATCH (b:Brand {brand_id: $brand_id})
-                    MERGE (b)-[l:HAS_LOGO {variant: $variant}]->(b)
-                    SET l.url = $url
-                    """,
-                    brand_id=brand_id,
-                    variant=variant,
-                    url=url
-                )
-        
-        # Sync Templates
-        if asset_graph.templates:
-            for name, url in asset_graph.templates.items():
-                await session.run(
-                    """
-                    MATCH (b:Brand {brand_id: $brand_id})
-                    MERGE (b)-[t:HAS_TEMPLATE {name: $name}]->(b)
-                    SET t.url = $url
-                    """,
-                    brand_id=brand_id,
-                    name=name,
-                    url=url
-                )
-        
-        # Sync Patterns
-        if asset_graph.patterns:
-            for name, url in asset_graph.patterns.items():
-                await session.run(
-                    """
-                    MATCH (b:Brand {brand_id: $brand_id})
-                    MERGE (b)-[p:HAS_PATTERN {name: $name}]->(b)
-                    SET p.url = $url
-                    """,
-                    brand_id=brand_id,
-                    name=name,
-                    url=url
-                )
-
     async def sync_asset(self, asset: Asset) -> None:
         """
         Create or update Asset node and link to Brand.
@@ -416,31 +164,22 @@ class GraphStorage:
 
         Future: Could extract colors from asset and create USES_COLOR edges
         """
-        if not self._is_enabled():
+        await self.sync_assets([asset])
+
+    async def sync_assets(self, assets: List[Asset]) -> None:
+        """
+        Create or update many Asset nodes in one UNWIND write transaction.
+
+        Same graph shape as sync_asset. Used by backfills to sync assets in
+        batches instead of one round trip per asset.
+        """
+        if not self._is_enabled() or not assets:
             return
 
         try:
-            async with self.driver.session() as session:
-                await session.run(
-                    """
-                    MATCH (b:Brand {brand_id: $brand_id})
-                    MERGE (a:Asset {asset_id: $asset_id})
-                    SET a.prompt = $prompt,
-                        a.image_url = $image_url,
-                        a.compliance_score = $compliance_score,
-                        a.status = $status,
-                        a.created_at = datetime($created_at)
-                    MERGE (b)-[:GENERATED_ASSET]->(a)
-                    """,
-                    brand_id=asset.brand_id,
-                    asset_id=asset.asset_id,
-                    prompt=asset.prompt,
-                    image_url=asset.image_url,
-                    compliance_score=asset.compliance_score,
-                    status=asset.status,
-                    created_at=asset.created_at.isoformat()
-                )
+            await self.write_assets(assets)
 
+            for asset in assets:
                 logger.info(
                     "asset_synced_to_graph",
                     asset_id=asset.asset_id,
@@ -451,7 +190,8 @@ class GraphStorage:
             logger.error(
                 "graph_sync_failed",
                 entity="asset",
-                asset_id=asset.asset_id,
+                asset_id=assets[0].asset_id if len(assets) == 1 else None,
+                asset_count=len(assets),
                 error=str(e)
             )
 
@@ -471,32 +211,21 @@ class GraphStorage:
             return
 
         try:
-            async with self.driver.session() as session:
-                await session.run(
-                    """
-                    MATCH (a:Asset {asset_id: $asset_id})
-                    MATCH (b:Brand {brand_id: $brand_id})
-                    CREATE (a)-[:RECEIVED_FEEDBACK {
-                        feedback_id: $feedback_id,
-                        action: $action,
-                        reason: $reason,
-                        timestamp: datetime($timestamp)
-                    }]->(a)
-                    """,
-                    feedback_id=feedback_id,
-                    asset_id=asset_id,
-                    brand_id=brand_id,
-                    action=action,
-                    reason=reason,
-                    timestamp=timestamp
-                )
-
-                logger.info(
-                    "feedback_synced_to_graph",
-                    feedback_id=feedback_id,
-                    asset_id=asset_id,
-                    action=action
-                )
+            await self.write_feedback([{
+                "feedback_id": feedback_id,
+                "asset_id": asset_id,
+                "brand_id": brand_id,
+                "action": action,
+                "reason": reason,
+                "timestamp": timestamp,
+            }])
+
+            logger.info(
+                "feedback_synced_to_graph",
+                feedback_id=feedback_id,
+                asset_id=asset_id,
+                action=action
+            )
 
         except Exception as e:
             logger.error(
@@ -515,39 +244,22 @@ class GraphStorage:
         - (Brand)-[:HAS_TEMPLATE]->(Template)
         - (Template)-[:BASED_ON_ASSET]->(Asset) if source_asset_id exists
         """
-        if not self._is_enabled():
+        await self.sync_templates([template])
+
+    async def sync_templates(self, templates: List[Template]) -> None:
+        """
+        Create or update many Template nodes in one UNWIND write transaction.
+
+        Same graph shape as sync_template; the source asset link is created in
+        the same statement.
+        """
+        if not self._is_enabled() or not templates:
             return
 
         try:
-            async with self.driver.session() as session:
-                await session.run(
-                    """
-                    MATCH (b:Brand {brand_id: $brand_id})
-                    MERGE (t:Template {template_id: $template_id})
-                    SET t.name = $name,
-                        t.description = $description,
-                        t.created_at = datetime($created_at)
-                    MERGE (b)-[:HAS_TEMPLATE]->(t)
-                    """,
-                    brand_id=template.brand_id,
-                    template_id=template.template_id,
-                    name=template.name,
-                    description=template.description,
-                    created_at=template.created_at.isoformat()
-                )
-
-                # Link to source asset if exists
-                if template.source_asset_id:
-                    await session.run(
-                        """
-                        MATCH (t:Template {template_id: $template_id})
-                        MATCH (a:Asset {asset_id: $source_asset_id})
-                        MERGE (t)-[:BASED_ON_ASSET]->(a)
-                        """,
-                        template_id=template.template_id,
-                        source_asset_id=template.source_asset_id
-                    )
+            await self.write_templates(templates)
 
+            for template in templates:
                 logger.info(
                     "template_synced_to_graph",
                     template_id=template.template_id,
@@ -558,11 +270,89 @@ class GraphStorage:
             logger.error(
                 "graph_sync_failed",
                 entity="template",
-                template_id=template.template_id,
+                template_id=templates[0].template_id if len(templates) == 1 else None,
+                template_count=len(templates),
                 error=str(e)
             )
 
+    # --- BATCH WRITE METHODS (raise on failure) ---
+    #
+    # The sync_* methods above swallow errors so a graph outage never fails a
+    # caller. The write_* methods raise instead; the graph sync outbox uses
+    # them so failed events stay queued and are retried. They return the ids
+    # of the entities actually written: a row whose parent node (brand or
+    # asset) is missing from the graph matches nothing and is left out.
+
+    async def write_brands(self, brands: List[Brand]) -> Set[str]:
+        """Write brands and their MOAT structure in one write transaction."""
+        written = await self._execute_write(_brand_sync_statements(brands))
+        await self._invalidate_for_brands(brands)
+        return written
+
+    async def write_assets(self, assets: List[Asset]) -> Set[str]:
+        """Write Asset nodes and GENERATED_ASSET edges in one write transaction."""
+        written = await self._execute_write([_asset_sync_statement(assets)] if assets else [])
+        await self._invalidate_pairings_for_brands({asset.brand_id for asset in assets})
+        return written
+
+    async def write_templates(self, templates: List[Template]) -> Set[str]:
+        """Write Template nodes and their edges in one write transaction."""
+        return await self._execute_write(
+            [_template_sync_statement(templates)] if templates else []
+        )
+
+    async def write_feedback(self, feedback: List[Dict[str, Any]]) -> Set[str]:
+        """
+        Write RECEIVED_FEEDBACK edges in one write transaction.
+
+        Each item has feedback_id, asset_id, brand_id, action, reason and
+        timestamp (ISO string), and optionally brand_feedback_count and
+        brand_learning_active to refresh the brand's counters. Edges are
+        merged on feedback_id so retries do not duplicate them.
+        """
+        written = await self._execute_write(
+            [_feedback_sync_statement(feedback)] if feedback else []
+        )
+        await self._invalidate_pairings_for_brands({str(item["brand_id"]) for item in feedback})
+        return written
+
+    async def delete_brands(self, brand_ids: List[str]) -> None:
+        """
+        Remove soft-deleted brands with the assets, templates and rules they own.
+
+        Shared nodes (colors, typography, archetypes) are kept.
+        """
+        await self._execute_write([_brand_delete_statement(brand_ids)] if brand_ids else [])
+        for brand_id in brand_ids:
+            self._brand_palettes.pop(brand_id, None)
+        await self._invalidate_tags(
+            {f"brand:{brand_id}" for brand_id in brand_ids} | {"pairings:*"}
+        )
+
+    async def delete_templates(self, template_ids: List[str]) -> None:
+        """Remove soft-deleted Template nodes and their edges."""
+        await self._execute_write(
+            [_template_delete_statement(template_ids)] if template_ids else []
+        )
+
+    async def _execute_write(self, statements: List["Statement"]) -> Set[str]:
+        """
+        Run statements in one managed write transaction (no-op if disabled).
+
+        Returns:
+            entity_id values returned by the statements
+        """
+        if not self._is_enabled() or not statements:
+            return set()
+
+        async with self.driver.session() as session:
+            return await session.execute_write(_run_statements, statements)
+
     # --- GRAPH QUERY METHODS (Read-only) ---
+    #
+    # Results are served from self.query_cache (see graph_cache.py). Each
+    # result is tagged with the brands and colors it depends on, and the
+    # write_* methods invalidate exactly those tags.
 
     async def get_brand_colors(self, brand_id: str) -> List[Dict[str, Any]]:
         """
@@ -584,8 +374,9 @@ class GraphStorage:
             return []
 
         try:
-            async with self.driver.session() as session:
-                result = await session.run(
+            return await self.query_cache.get(
+                ("brand_colors", brand_id),
+                loader=lambda: self._read(
                     """
                     MATCH (b:Brand {brand_id: $brand_id})-[r:OWNS_COLOR]->(c:Color)
                     RETURN c.hex as hex,
@@ -596,9 +387,9 @@ class GraphStorage:
                     ORDER BY r.usage_weight DESC
                     """,
                     brand_id=brand_id
-                )
-
-                return [dict(record) async for record in result]
+                ),
+                tags=lambda colors: {f"brand:{brand_id}"},
+            )
 
         except Exception as e:
             logger.error(
@@ -628,8 +419,9 @@ class GraphStorage:
             return []
 
         try:
-            async with self.driver.session() as session:
-                result = await session.run(
+            return await self.query_cache.get(
+                ("brands_using_color", hex),
+                loader=lambda: self._read(
                     """
                     MATCH (b:Brand)-[r:OWNS_COLOR]->(c:Color {hex: $hex})
                     RETURN b.brand_id as brand_id,
@@ -639,9 +431,13 @@ class GraphStorage:
                     ORDER BY r.usage_weight DESC
                     """,
                     hex=hex
-                )
-
-                return [dict(record) async for record in result]
+                ),
+                # Listed brands cover renames and removals of the color;
+                # the color tag covers brands that start using it
+                tags=lambda brands: {f"color:{hex}"} | {
+                    f"brand:{row['brand_id']}" for row in brands
+                },
+            )
 
         except Exception as e:
             logger.error(
@@ -682,10 +478,11 @@ class GraphStorage:
             return []
 
         try:
-            async with self.driver.session() as session:
-                # Note: Requires USES_COLOR edges (future enhancement)
-                # For MVP, return empty list until we extract colors from assets
-                result = await session.run(
+            # Note: Requires USES_COLOR edges (future enhancement)
+            # For MVP, return empty list until we extract colors from assets
+            return await self.query_cache.get(
+                ("color_pairings", hex, min_sample_count),
+                loader=lambda: self._read(
                     """
                     MATCH (c1:Color {hex: $hex})<-[:USES_COLOR]-(a:Asset)-[:USES_COLOR]->(c2:Color)
                     WHERE c1.hex <> c2.hex
@@ -701,9 +498,9 @@ class GraphStorage:
                     """,
                     hex=hex,
                     min_sample_count=min_sample_count
-                )
-
-                return [dict(record) async for record in result]
+                ),
+                tags=lambda pairings: {f"pairings:{hex}", "pairings:*"},
+            )
 
         except Exception as e:
             logger.error(
@@ -735,33 +532,44 @@ class GraphStorage:
         if not self._is_enabled():
             return []
 
-        try:
-            async with self.driver.session() as session:
-                result = await session.run(
-                    """
-                    MATCH (b1:Brand {brand_id: $brand_id})-[:OWNS_COLOR]->(c:Color)<-[:OWNS_COLOR]-(b2:Brand)
-                    WHERE b1.organization_id <> b2.organization_id
-                    WITH b1, b2, COLLECT(c.hex) as shared_colors
-                    WHERE SIZE(shared_colors) >= $min_shared_colors
-                    MATCH (b1)-[:OWNS_COLOR]->(all_b1_colors:Color)
-                    MATCH (b2)-[:OWNS_COLOR]->(all_b2_colors:Color)
-                    WITH b2, shared_colors,
-                         SIZE(shared_colors) as shared_count,
-                         COUNT(DISTINCT all_b1_colors) as b1_total,
-                         COUNT(DISTINCT all_b2_colors) as b2_total
-                    RETURN b2.brand_id as similar_brand_id,
-                           b2.name as similar_brand_name,
-                           shared_colors,
-                           shared_count as shared_color_count,
-                           toFloat(shared_count) / (b1_total + b2_total - shared_count) as similarity_score
-                    ORDER BY similarity_score DESC
-                    LIMIT 5
-                    """,
-                    brand_id=brand_id,
-                    min_shared_colors=min_shared_colors
-                )
+        async def load() -> Dict[str, Any]:
+            # The brand's own palette decides which other brands can become
+            # similar, so it is part of the entry's dependencies
+            palette = await self.get_brand_colors(brand_id)
+            similar = await self._read(
+                """
+                MATCH (b1:Brand {brand_id: $brand_id})-[:OWNS_COLOR]->(c:Color)<-[:OWNS_COLOR]-(b2:Brand)
+                WHERE b1.organization_id <> b2.organization_id
+                WITH b1, b2, COLLECT(c.hex) as shared_colors
+                WHERE SIZE(shared_colors) >= $min_shared_colors
+                MATCH (b1)-[:OWNS_COLOR]->(all_b1_colors:Color)
+                MATCH (b2)-[:OWNS_COLOR]->(all_b2_colors:Color)
+                WITH b2, shared_colors,
+                     SIZE(shared_colors) as shared_count,
+                     COUNT(DISTINCT all_b1_colors) as b1_total,
+                     COUNT(DISTINCT all_b2_colors) as b2_total
+                RETURN b2.brand_id as similar_brand_id,
+                       b2.name as similar_brand_name,
+                       shared_colors,
+                       shared_count as shared_color_count,
+                       toFloat(shared_count) / (b1_total + b2_total - shared_count) as similarity_score
+                ORDER BY similarity_score DESC
+                LIMIT 5
+                """,
+                brand_id=brand_id,
+                min_shared_colors=min_shared_colors
+            )
+            return {"palette": [c["hex"] for c in palette], "similar": similar}
 
-                return [dict(record) async for record in result]
+        try:
+            result = await self.query_cache.get(
+                ("similar_brands", brand_id, min_shared_colors),
+                loader=load,
+                tags=lambda result: {f"brand:{brand_id}"}
+                | {f"color:{hex}" for hex in result["palette"]}
+                | {f"brand:{row['similar_brand_id']}" for row in result["similar"]},
+            )
+            return result["similar"]
 
         except Exception as e:
             logger.error(
@@ -772,6 +580,438 @@ class GraphStorage:
             )
             return []
 
+    async def _read(self, query: str, **parameters: Any) -> List[Dict[str, Any]]:
+        """Run a read query and return its records as dictionaries (raises on failure)."""
+        async with self.driver.session() as session:
+            result = await session.run(query, **parameters)
+            return [dict(record) async for record in result]
+
+    # --- CROSS-PROCESS INVALIDATION ---
+    #
+    # Writes mostly happen in the graph sync drainer, while the cached reads
+    # are served by the web containers. Each write publishes the tags it
+    # invalidated on the invalidation bus, and every process evicts them on
+    # receipt.
+
+    def attach_invalidation_bus(self, bus: "JobEventBus") -> None:
+        """
+        Share cache invalidations with other processes.
+
+        Tags invalidated by writes here are published on the bus, and tags
+        published by other processes evict the matching entries here.
+
+        Args:
+            bus: Event bus on a channel of its own (see create_graph_cache_bus)
+        """
+        self.invalidation_bus = bus
+        bus.subscribe(self._on_cache_invalidation)
+
+    async def _on_cache_invalidation(self, key: str, message: dict) -> None:
+        """Bus handler: evict tags invalidated by another process."""
+        if key != GRAPH_CACHE_EVENT_KEY or message.get("origin") == self._origin:
+            return
+        self.query_cache.invalidate_tags(message.get("tags") or [])
+
+    async def _invalidate_tags(self, tags: Set[str]) -> None:
+        """Invalidate tags here and in every process on the invalidation bus."""
+        if not tags:
+            return
+        self.query_cache.invalidate_tags(tags)
+        if self.invalidation_bus is not None:
+            await self.invalidation_bus.publish(
+                GRAPH_CACHE_EVENT_KEY, {"tags": sorted(tags), "origin": self._origin}
+            )
+
+    async def _invalidate_for_brands(self, brands: List[Brand]) -> None:
+        """Invalidate cached queries affected by writing these brands."""
+        tags = set()
+        for brand in brands:
+            tags.add(f"brand:{brand.brand_id}")
+            colors = brand.guidelines.colors if brand.guidelines else []
+            new_palette = {color.hex for color in colors or []}
+            # Colors the brand dropped affect find_brands_using_color too; they
+            # are covered by the brand tag on entries that listed the brand
+            tags |= {f"color:{hex}" for hex in new_palette}
+            self._brand_palettes[brand.brand_id] = new_palette
+        await self._invalidate_tags(tags)
+
+    async def _invalidate_pairings_for_brands(self, brand_ids: Iterable[str]) -> None:
+        """Invalidate color pairings affected by new assets or feedback of these brands."""
+        brand_ids = set(brand_ids)
+        unknown = [brand_id for brand_id in brand_ids if brand_id not in self._brand_palettes]
+        if unknown:
+            # Brands not written by this process: read their palettes so only
+            # the affected pairing entries are dropped
+            try:
+                for row in await self._read(
+                    """
+                    UNWIND $brand_ids AS brand_id
+                    OPTIONAL MATCH (:Brand {brand_id: brand_id})-[:OWNS_COLOR]->(c:Color)
+                    RETURN brand_id, collect(c.hex) AS palette
+                    """,
+                    brand_ids=unknown,
+                ):
+                    self._brand_palettes[row["brand_id"]] = set(row["palette"])
+            except Exception as e:
+                logger.warning("graph_palette_lookup_failed", brand_count=len(unknown), error=str(e))
+
+        tags = set()
+        for brand_id in brand_ids:
+            palette = self._brand_palettes.get(brand_id)
+            if palette is None:
+                # Palette still unknown: drop every pairing entry
+                tags = {"pairings:*"}
+                break
+            tags |= {f"pairings:{hex}" for hex in palette}
+        await self._invalidate_tags(tags)
+
+def create_graph_cache_bus() -> "JobEventBus":
+    """Create the bus carrying graph cache invalidations (settings.graph_cache_channel)."""
+    from mobius.api.job_events import create_job_event_bus
+
+    return create_job_event_bus(channel=settings.graph_cache_channel)
+
+
+# --- SYNC STATEMENT BUILDERS ---
+
+# (cypher, parameters) pairs executed in order inside one write transaction
+Statement = Tuple[str, Dict[str, Any]]
+
+
+async def _run_statements(tx: AsyncManagedTransaction, statements: List[Statement]) -> Set[str]:
+    """
+    Transaction function for session.execute_write.
+
+    Runs each statement and collects the entity_id column of the statements
+    that return one. The driver may call this more than once when retrying a
+    transient failure, so it must stay free of side effects outside the
+    transaction.
+    """
+    written: Set[str] = set()
+    for query, parameters in statements:
+        result = await tx.run(query, parameters)
+        for record in await result.data():
+            if record.get("entity_id") is not None:
+                written.add(str(record["entity_id"]))
+    return written
+
+
+def _stable_id(*parts: str) -> str:
+    """Stable node id for rules (md5 of the identifying fields)."""
+    return hashlib.md5(":".join(parts).encode()).hexdigest()
+
+
+def _brand_sync_statements(brands: List[Brand]) -> List[Statement]:
+    """
+    Build the batched statements that sync brands and their MOAT structure.
+
+    One UNWIND statement per node/relationship type across the whole batch
+    (each row carries its brand_id), so a batch costs the same handful of
+    round trips whether it holds one brand or hundreds. Types no brand in
+    the batch has are skipped entirely.
+    """
+    statements: List[Statement] = []
+    rows: Dict[str, List[Dict[str, Any]]] = {}
+
+    def add(query: str, new_rows: Iterable[Dict[str, Any]]) -> None:
+        rows.setdefault(query, []).extend(new_rows)
+
+    for brand in brands:
+        _collect_brand_rows(brand, add)
+
+    for query, query_rows in rows.items():
+        if query_rows:
+            statements.append((query, {"rows": query_rows}))
+    return statements
+
+
+_BRAND_NODE_QUERY = """
+    UNWIND $rows AS row
+    MERGE (b:Brand {brand_id: row.brand_id})
+    SET b.organization_id = row.organization_id,
+        b.name = row.name,
+        b.learning_active = row.learning_active,
+        b.feedback_count = row.feedback_count,
+        b.created_at = datetime(row.created_at),
+        b.updated_at = datetime(row.updated_at)
+    RETURN row.brand_id AS entity_id
+    """
+
+_COLOR_QUERY = """
+    UNWIND $rows AS row
+    MATCH (b:Brand {brand_id: row.brand_id})
+    MERGE (c:Color {hex: row.hex})
+    SET c.name = row.name
+    MERGE (b)-[r:OWNS_COLOR]->(c)
+    SET r.usage = row.usage,
+        r.usage_weight = row.usage_weight,
+        r.context = row.context
+    """
+
+_ARCHETYPE_QUERY = """
+    UNWIND $rows AS row
+    MATCH (b:Brand {brand_id: row.brand_id})
+    MERGE (a:Archetype {name: row.name})
+    MERGE (b)-[:HAS_ARCHETYPE]->(a)
+    """
+
+_VOICE_VECTOR_QUERY = """
+    UNWIND $rows AS row
+    MATCH (b:Brand {brand_id: row.brand_id})
+    MERGE (b)-[v:HAS_VOICE_VECTOR {dimension: row.dimension}]->(b)
+    SET v.score = row.score
+    """
+
+_FORBIDS_QUERY = """
+    UNWIND $rows AS row
+    MATCH (b:Brand {brand_id: row.brand_id})
+    MERGE (b)-[:FORBIDS {constraint: row.constraint}]->(b)
+    """
+
+_TYPOGRAPHY_QUERY = """
+    UNWIND $rows AS row
+    MATCH (b:Brand {brand_id: row.brand_id})
+    MERGE (t:Typography {family: row.family})
+    SET t.weights = row.weights,
+        t.usage_description = row.usage
+    MERGE (b)-[r:USES_TYPOGRAPHY]->(t)
+    SET r.usage = row.usage
+    """
+
+_RULE_QUERY = """
+    UNWIND $rows AS row
+    MATCH (b:Brand {brand_id: row.brand_id})
+    MERGE (r:Rule {rule_id: row.rule_id})
+    SET r.category = row.category,
+        r.instruction = row.instruction,
+        r.severity = row.severity,
+        r.negative_constraint = row.negative_constraint
+    MERGE (b)-[:HAS_RULE]->(r)
+    """
+
+_CONTEXTUAL_RULE_QUERY = """
+    UNWIND $rows AS row
+    MATCH (b:Brand {brand_id: row.brand_id})
+    MERGE (cr:ContextualRule {rule_id: row.rule_id})
+    SET cr.context = row.context,
+        cr.rule = row.rule,
+        cr.priority = row.priority,
+        cr.applies_to = row.applies_to
+    MERGE (b)-[:HAS_CONTEXTUAL_RULE]->(cr)
+    """
+
+# Asset Graph self-loops; the relationship type is fixed per statement
+# because Cypher cannot parameterize it
+_ASSET_GRAPH_QUERIES = {
+    rel_type: f"""
+    UNWIND $rows AS row
+    MATCH (b:Brand {{brand_id: row.brand_id}})
+    MERGE (b)-[rel:{rel_type} {{{key}: row.key}}]->(b)
+    SET rel.url = row.url
+    """
+    for rel_type, key in (("HAS_LOGO", "variant"), ("HAS_TEMPLATE", "name"), ("HAS_PATTERN", "name"))
+}
+
+
+def _collect_brand_rows(brand: Brand, add: Callable[[str, Iterable[Dict[str, Any]]], None]) -> None:
+    """Add one brand's rows to the batch statements (see _brand_sync_statements)."""
+    brand_id = brand.brand_id
+    add(_BRAND_NODE_QUERY, [{
+        "brand_id": brand_id,
+        "organization_id": brand.organization_id,
+        "name": brand.name,
+        "learning_active": brand.learning_active,
+        "feedback_count": brand.feedback_count,
+        "created_at": brand.created_at,
+        "updated_at": brand.updated_at,
+    }])
+
+    guidelines = brand.guidelines
+    if not guidelines:
+        return
+
+    # Colors (Visual DNA)
+    add(_COLOR_QUERY, (
+        {
+            "brand_id": brand_id,
+            "hex": color.hex,
+            "name": color.name,
+            "usage": color.usage,
+            "usage_weight": color.usage_weight,
+            "context": color.context,
+        }
+        for color in guidelines.colors or []
+    ))
+
+    # Identity Core (THE MOAT - Strategic positioning)
+    identity_core = guidelines.identity_core
+    if identity_core:
+        if identity_core.archetype:
+            add(_ARCHETYPE_QUERY, [{"brand_id": brand_id, "name": identity_core.archetype}])
+        add(_VOICE_VECTOR_QUERY, (
+            {"brand_id": brand_id, "dimension": dimension, "score": score}
+            for dimension, score in (identity_core.voice_vectors or {}).items()
+        ))
+        add(_FORBIDS_QUERY, (
+            {"brand_id": brand_id, "constraint": c}
+            for c in identity_core.negative_constraints or []
+        ))
+
+    # Typography (Visual DNA)
+    add(_TYPOGRAPHY_QUERY, (
+        {"brand_id": brand_id, "family": typo.family, "weights": typo.weights, "usage": typo.usage}
+        for typo in guidelines.typography or []
+    ))
+
+    # Brand Rules (Governance)
+    add(_RULE_QUERY, (
+        {
+            "brand_id": brand_id,
+            "rule_id": _stable_id(brand_id, rule.instruction),
+            "category": rule.category,
+            "instruction": rule.instruction,
+            "severity": rule.severity,
+            "negative_constraint": rule.negative_constraint,
+        }
+        for rule in guidelines.rules or []
+    ))
+
+    # Contextual Rules (MOAT - Channel-specific governance)
+    add(_CONTEXTUAL_RULE_QUERY, (
+        {
+            "brand_id": brand_id,
+            "rule_id": _stable_id(brand_id, ctx_rule.context, ctx_rule.rule),
+            "context": ctx_rule.context,
+            "rule": ctx_rule.rule,
+            "priority": ctx_rule.priority,
+            "applies_to": ctx_rule.applies_to,
+        }
+        for ctx_rule in guidelines.contextual_rules or []
+    ))
+
+    # Asset Graph (MOAT - Asset inventory)
+    asset_graph = guidelines.asset_graph
+    if asset_graph:
+        for rel_type, entries in (
+            ("HAS_LOGO", asset_graph.logos),
+            ("HAS_TEMPLATE", asset_graph.templates),
+            ("HAS_PATTERN", asset_graph.patterns),
+        ):
+            add(_ASSET_GRAPH_QUERIES[rel_type], (
+                {"brand_id": brand_id, "key": k, "url": url} for k, url in (entries or {}).items()
+            ))
+
+
+def _asset_sync_statement(assets: List[Asset]) -> Statement:
+    """UNWIND statement merging Asset nodes and their GENERATED_ASSET edges."""
+    return (
+        """
+        UNWIND $rows AS row
+        MATCH (b:Brand {brand_id: row.brand_id})
+        MERGE (a:Asset {asset_id: row.asset_id})
+        SET a.prompt = row.prompt,
+            a.image_url = row.image_url,
+            a.compliance_score = row.compliance_score,
+            a.status = row.status,
+            a.created_at = datetime(row.created_at)
+        MERGE (b)-[:GENERATED_ASSET]->(a)
+        RETURN row.asset_id AS entity_id
+        """,
+        {"rows": [
+            {
+                "brand_id": asset.brand_id,
+                "asset_id": asset.asset_id,
+                "prompt": asset.prompt,
+                "image_url": asset.image_url,
+                "compliance_score": asset.compliance_score,
+                "status": asset.status,
+                "created_at": asset.created_at.isoformat(),
+            }
+            for asset in assets
+        ]},
+    )
+
+
+def _template_sync_statement(templates: List[Template]) -> Statement:
+    """UNWIND statement merging Template nodes, HAS_TEMPLATE and BASED_ON_ASSET edges."""
+    return (
+        """
+        UNWIND $rows AS row
+        MATCH (b:Brand {brand_id: row.brand_id})
+        MERGE (t:Template {template_id: row.template_id})
+        SET t.name = row.name,
+            t.description = row.description,
+            t.created_at = datetime(row.created_at)
+        MERGE (b)-[:HAS_TEMPLATE]->(t)
+        WITH t, row
+        OPTIONAL MATCH (a:Asset {asset_id: row.source_asset_id})
+        FOREACH (_ IN CASE WHEN a IS NULL THEN [] ELSE [1] END |
+            MERGE (t)-[:BASED_ON_ASSET]->(a))
+        // A template whose source asset is not in the graph yet is incomplete
+        WITH row, a
+        WHERE row.source_asset_id IS NULL OR a IS NOT NULL
+        RETURN row.template_id AS entity_id
+        """,
+        {"rows": [
+            {
+                "brand_id": template.brand_id,
+                "template_id": template.template_id,
+                "name": template.name,
+                "description": template.description,
+                "created_at": template.created_at.isoformat(),
+                "source_asset_id": template.source_asset_id,
+            }
+            for template in templates
+        ]},
+    )
+
+
+def _feedback_sync_statement(feedback: List[Dict[str, Any]]) -> Statement:
+    """UNWIND statement merging RECEIVED_FEEDBACK self-loops on assets."""
+    return (
+        """
+        UNWIND $rows AS row
+        MATCH (a:Asset {asset_id: row.asset_id})
+        MATCH (b:Brand {brand_id: row.brand_id})
+        MERGE (a)-[f:RECEIVED_FEEDBACK {feedback_id: row.feedback_id}]->(a)
+        SET f.action = row.action,
+            f.reason = row.reason,
+            f.timestamp = datetime(row.timestamp),
+            b.feedback_count = coalesce(row.brand_feedback_count, b.feedback_count),
+            b.learning_active = coalesce(row.brand_learning_active, b.learning_active)
+        RETURN row.feedback_id AS entity_id
+        """,
+        {"rows": [dict(item) for item in feedback]},
+    )
+
+
+def _brand_delete_statement(brand_ids: List[str]) -> Statement:
+    """Statement removing brands and the nodes only they own."""
+    return (
+        """
+        UNWIND $ids AS id
+        MATCH (b:Brand {brand_id: id})
+        OPTIONAL MATCH (b)-[:GENERATED_ASSET|HAS_TEMPLATE|HAS_RULE|HAS_CONTEXTUAL_RULE]->(n)
+        WHERE n <> b
+        WITH b, collect(n) AS owned
+        FOREACH (n IN owned | DETACH DELETE n)
+        DETACH DELETE b
+        """,
+        {"ids": list(brand_ids)},
+    )
+
+
+def _template_delete_statement(template_ids: List[str]) -> Statement:
+    """Statement removing Template nodes."""
+    return (
+        """
+        UNWIND $ids AS id
+        MATCH (t:Template {template_id: id})
+        DETACH DELETE t
+        """,
+        {"ids": list(template_ids)},
+    )
+
 
 # Global instance
 graph_storage = GraphStorage()
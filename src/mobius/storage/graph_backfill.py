@@ -0,0 +1,439 @@
+"""
+Parallel, checkpointed bulk backfill of PostgreSQL data into Neo4j.
+
+Used by scripts/backfill_graph_database.py for full resyncs and by the API
+for a per-organization resync. Rows are streamed with keyset pagination on
+the primary key and written as UNWIND batches (GraphStorage.write_*) by a
+bounded pool of concurrent writers.
+
+Design Principles:
+- Memory is bounded: at most `concurrency` pages are held at once
+- Entity types are backfilled in dependency order (brands, assets,
+  templates, feedback) so relationships find their endpoints
+- Progress is checkpointed in graph_backfill_runs (migration 010). The
+  cursor only advances past a page once it and every earlier page are
+  written, so a resumed run never skips rows; pages written out of order
+  before a failure are simply written again (all writes are MERGEs)
+- A run is leased to one worker (claim_graph_backfill_run). Every checkpoint
+  renews the lease and is conditional on still holding it, so a worker
+  whose lease was taken over stops instead of writing alongside the new one
+- Per-organization runs read dependent rows brand by brand, so no request
+  carries the organization's full list of brand IDs
+- Failed batches are retried with exponential backoff before the run is
+  marked failed
+- Throughput (rows per second) is logged and returned per entity type
+"""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+import structlog
+
+from mobius.config import settings
+from mobius.storage.database import get_supabase_client
+from mobius.storage.graph import GraphStorage, graph_storage
+from mobius.storage.graph_outbox import ENTITY_TABLES, write_entities
+
+logger = structlog.get_logger()
+
+# Dependency order: brands before their assets, assets before templates based
+# on them and feedback on them
+ENTITY_ORDER = ("brand", "asset", "template", "feedback")
+
+# Entity types whose tables are soft-deleted
+_SOFT_DELETED = {"brand", "template"}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class GraphBackfillLeaseError(RuntimeError):
+    """Another worker holds the backfill run's lease."""
+
+
+class GraphBackfillRuns:
+    """Storage operations for the graph_backfill_runs table."""
+
+    def __init__(self, lease_seconds: Optional[int] = None):
+        self.client = get_supabase_client()
+        self.lease_seconds = lease_seconds or settings.graph_backfill_lease_seconds
+
+    async def get_run(self, run_id: str) -> Optional[dict]:
+        """
+        Get a backfill run.
+
+        Args:
+            run_id: Run identifier
+
+        Returns:
+            Run row if found, None otherwise
+        """
+        result = (
+            self.client.table("graph_backfill_runs")
+            .select("*")
+            .eq("run_id", run_id)
+            .execute()
+        )
+        return result.data[0] if result.data else None
+
+    async def claim_run(
+        self, run_id: str, organization_id: Optional[str], owner: str
+    ) -> Optional[dict]:
+        """
+        Take the lease on a backfill run, creating the run if it does not exist.
+
+        Args:
+            run_id: Run identifier
+            organization_id: Organization of a new per-org run
+            owner: Lease owner token (claiming again with the same owner renews it)
+
+        Returns:
+            Run row if the lease was taken, None if another owner holds it
+        """
+        result = self.client.rpc("claim_graph_backfill_run", {
+            "p_run_id": run_id,
+            "p_organization_id": organization_id,
+            "p_owner": owner,
+            "p_lease_seconds": self.lease_seconds,
+        }).execute()
+        return result.data[0] if result.data else None
+
+    async def save_run(self, run: dict, release: bool = False) -> dict:
+        """
+        Update a leased backfill run and renew (or release) its lease.
+
+        Args:
+            run: Run row; its lease_owner must still hold the lease
+            release: Clear the lease (the run has ended)
+
+        Returns:
+            Updated run row
+
+        Raises:
+            GraphBackfillLeaseError: If the lease was taken over by another owner
+        """
+        owner = run["lease_owner"]
+        run["updated_at"] = _now()
+        if release:
+            run.update({"lease_owner": None, "leased_until": None})
+        else:
+            run["leased_until"] = (
+                datetime.now(timezone.utc) + timedelta(seconds=self.lease_seconds)
+            ).isoformat()
+        result = (
+            self.client.table("graph_backfill_runs")
+            .update(run)
+            .eq("run_id", run["run_id"])
+            .eq("lease_owner", owner)
+            .execute()
+        )
+        if not result.data:
+            raise GraphBackfillLeaseError(f"Lost the lease on backfill run {run['run_id']}")
+        return result.data[0]
+
+
+class GraphBackfill:
+    """
+    Streams entities from PostgreSQL into Neo4j.
+
+    Usage:
+        backfill = GraphBackfill(concurrency=8)
+        summary = await backfill.run()                           # resumes run "full"
+        summary = await backfill.run(organization_id=org_id)    # per-org resync
+    """
+
+    def __init__(
+        self,
+        graph: Optional[GraphStorage] = None,
+        runs: Optional[GraphBackfillRuns] = None,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+    ):
+        self.graph = graph or graph_storage
+        self.runs = runs or GraphBackfillRuns()
+        self.client = get_supabase_client()
+        self.batch_size = batch_size or settings.graph_backfill_batch_size
+        self.concurrency = concurrency or settings.graph_backfill_concurrency
+        self.max_attempts = max_attempts or settings.graph_backfill_max_attempts
+
+    async def run(
+        self,
+        run_id: Optional[str] = None,
+        organization_id: Optional[str] = None,
+        entity_types: Sequence[str] = ENTITY_ORDER,
+        dry_run: bool = False,
+        restart: bool = False,
+        lease_owner: Optional[str] = None,
+    ) -> dict:
+        """
+        Backfill entities, resuming the run from its checkpoint.
+
+        Args:
+            run_id: Run identifier (defaults to "full" or "org-<organization_id>")
+            organization_id: Only backfill this organization's brands and their data
+            entity_types: Entity types to backfill (kept in dependency order)
+            dry_run: Count rows without writing to Neo4j or saving progress
+            restart: Ignore an existing checkpoint and start from the beginning
+            lease_owner: Lease owner token the run was claimed with (e.g. by
+                the resync API); a new one is generated if not given
+
+        Returns:
+            Summary with run_id, status and, per entity type, rows synced in
+            this invocation, seconds and rows per second
+
+        Raises:
+            RuntimeError: If Neo4j is not configured (unless dry_run)
+            GraphBackfillLeaseError: If another worker holds (or takes over) the run
+            Exception: If a batch still fails after max_attempts (progress is kept)
+        """
+        if not dry_run and not self.graph._is_enabled():
+            raise RuntimeError("Neo4j is not configured; nothing to backfill into")
+
+        run_id = run_id or (f"org-{organization_id}" if organization_id else "full")
+        run = None
+        if not dry_run:
+            lease_owner = lease_owner or uuid.uuid4().hex
+            run = await self.runs.claim_run(run_id, organization_id, lease_owner)
+            if run is None:
+                raise GraphBackfillLeaseError(f"Backfill run {run_id} is already in progress")
+        if run is None or restart or run.get("status") == "completed":
+            run = {
+                "run_id": run_id,
+                "organization_id": (run or {}).get("organization_id") or organization_id,
+                "progress": {},
+                "started_at": _now(),
+                "completed_at": None,
+                "lease_owner": lease_owner,
+            }
+        organization_id = run.get("organization_id") or organization_id
+        run.update({"status": "running", "last_error": None})
+        if not dry_run:
+            run = await self.runs.save_run(run)
+
+        logger.info(
+            "graph_backfill_started",
+            run_id=run_id,
+            organization_id=organization_id,
+            dry_run=dry_run,
+            resumed={k: v.get("cursor") for k, v in run["progress"].items()},
+        )
+
+        summary: Dict[str, Any] = {"run_id": run_id, "dry_run": dry_run, "entities": {}}
+        brand_ids = await self._organization_brand_ids(organization_id) if organization_id else None
+
+        try:
+            for entity_type in ENTITY_ORDER:
+                if entity_type not in entity_types:
+                    continue
+                progress = run["progress"].setdefault(
+                    entity_type, {"cursor": None, "done": False, "synced": 0}
+                )
+                if progress["done"]:
+                    continue
+                if brand_ids is not None and not brand_ids:
+                    progress["done"] = True
+                    continue
+                summary["entities"][entity_type] = await self._backfill_entity(
+                    run, entity_type, brand_ids, organization_id, dry_run
+                )
+        except Exception as e:
+            run.update({"status": "failed", "last_error": str(e)[:1000]})
+            # A run taken over by another worker is theirs to record
+            if not dry_run and not isinstance(e, GraphBackfillLeaseError):
+                await self.runs.save_run(run, release=True)
+            logger.error("graph_backfill_failed", run_id=run_id, error=str(e))
+            raise
+
+        run.update({"status": "completed", "completed_at": _now()})
+        if not dry_run:
+            await self.runs.save_run(run, release=True)
+
+        summary["status"] = "completed"
+        summary["progress"] = run["progress"]
+        logger.info("graph_backfill_completed", run_id=run_id, entities=summary["entities"])
+        return summary
+
+    async def _backfill_entity(
+        self,
+        run: dict,
+        entity_type: str,
+        brand_ids: Optional[List[str]],
+        organization_id: Optional[str],
+        dry_run: bool,
+    ) -> dict:
+        """Stream one entity type through the writer pool, checkpointing in order."""
+        progress = run["progress"][entity_type]
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+        # page number -> (cursor after the page, row count) of written pages not yet checkpointed
+        written: Dict[int, tuple] = {}
+        next_page = 0
+        synced = 0
+        start = time.perf_counter()
+
+        async def read() -> None:
+            page = 0
+            async for rows, cursor in self._pages(
+                entity_type, progress["cursor"], brand_ids, organization_id
+            ):
+                await queue.put((page, rows, cursor))
+                page += 1
+            for _ in range(self.concurrency):
+                await queue.put(None)
+
+        async def write() -> None:
+            nonlocal next_page, synced
+            while (item := await queue.get()) is not None:
+                page, rows, cursor = item
+                if not dry_run:
+                    await self._write_with_retry(entity_type, rows)
+                written[page] = (cursor, len(rows))
+
+                # Advance the checkpoint over every contiguous written page
+                advanced = False
+                while next_page in written:
+                    cursor, count = written.pop(next_page)
+                    progress["cursor"] = cursor
+                    progress["synced"] += count
+                    synced += count
+                    next_page += 1
+                    advanced = True
+                if advanced and not dry_run:
+                    await self.runs.save_run(run)
+                if advanced:
+                    elapsed = time.perf_counter() - start
+                    logger.info(
+                        "graph_backfill_progress",
+                        run_id=run["run_id"],
+                        entity_type=entity_type,
+                        synced=synced,
+                        per_second=round(synced / elapsed, 1) if elapsed else None,
+                    )
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(read())
+                for _ in range(self.concurrency):
+                    group.create_task(write())
+        except BaseExceptionGroup as group_error:
+            # Surface the first underlying failure (e.g. the batch that gave up)
+            raise group_error.exceptions[0]
+
+        progress["done"] = True
+        if not dry_run:
+            await self.runs.save_run(run)
+
+        elapsed = time.perf_counter() - start
+        return {
+            "synced": synced,
+            "seconds": round(elapsed, 3),
+            "per_second": round(synced / elapsed, 1) if elapsed else None,
+        }
+
+    async def _pages(
+        self,
+        entity_type: str,
+        cursor: Any,
+        brand_ids: Optional[List[str]],
+        organization_id: Optional[str],
+    ) -> AsyncIterator[Tuple[List[dict], Any]]:
+        """Yield (rows, cursor after them) pages in primary key order, starting after cursor."""
+        if brand_ids is not None and entity_type != "brand":
+            async for page in self._brand_pages(entity_type, cursor, brand_ids):
+                yield page
+            return
+
+        table, id_column = ENTITY_TABLES[entity_type]
+        while True:
+            query = self.client.table(table).select("*")
+            if entity_type in _SOFT_DELETED:
+                query = query.is_("deleted_at", "null")
+            if organization_id:
+                query = query.eq("organization_id", organization_id)
+            if cursor is not None:
+                query = query.gt(id_column, cursor)
+
+            rows = query.order(id_column).limit(self.batch_size).execute().data
+            if rows:
+                cursor = str(rows[-1][id_column])
+                yield rows, cursor
+            if len(rows) < self.batch_size:
+                return
+
+    async def _brand_pages(
+        self, entity_type: str, cursor: Optional[List[str]], brand_ids: List[str]
+    ) -> AsyncIterator[Tuple[List[dict], List[str]]]:
+        """
+        Yield pages of the given brands' rows, one brand at a time.
+
+        Rows are read in (brand_id, primary key) order and the rows of
+        consecutive brands are packed into full batches; the cursor is the
+        [brand_id, primary key] of the last row.
+        """
+        table, id_column = ENTITY_TABLES[entity_type]
+        start_brand, start_key = cursor or (None, None)
+        batch: List[dict] = []
+        for brand_id in brand_ids:
+            if start_brand is not None and brand_id < start_brand:
+                continue
+            key = start_key if brand_id == start_brand else None
+            while True:
+                query = self.client.table(table).select("*").eq("brand_id", brand_id)
+                if entity_type in _SOFT_DELETED:
+                    query = query.is_("deleted_at", "null")
+                if key is not None:
+                    query = query.gt(id_column, key)
+
+                limit = self.batch_size - len(batch)
+                rows = query.order(id_column).limit(limit).execute().data
+                batch.extend(rows)
+                if len(batch) == self.batch_size:
+                    yield batch, [brand_id, str(batch[-1][id_column])]
+                    batch = []
+                if len(rows) < limit:
+                    break
+                key = str(rows[-1][id_column])
+        if batch:
+            yield batch, [str(batch[-1]["brand_id"]), str(batch[-1][id_column])]
+
+    async def _write_with_retry(self, entity_type: str, rows: List[dict]) -> None:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                await write_entities(self.graph, entity_type, rows)
+                return
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    raise
+                delay = 2 ** (attempt - 1)
+                logger.warning(
+                    "graph_backfill_batch_retry",
+                    entity_type=entity_type,
+                    row_count=len(rows),
+                    attempt=attempt,
+                    retry_in_seconds=delay,
+                    error=str(e),
+                )
+                await asyncio.sleep(delay)
+
+    async def _organization_brand_ids(self, organization_id: str) -> List[str]:
+        """Get the IDs of an organization's brands in order (scopes asset/template/feedback reads)."""
+        brand_ids: List[str] = []
+        cursor = None
+        while True:
+            query = (
+                self.client.table("brands")
+                .select("brand_id")
+                .eq("organization_id", organization_id)
+                .is_("deleted_at", "null")
+            )
+            if cursor is not None:
+                query = query.gt("brand_id", cursor)
+            rows = query.order("brand_id").limit(1000).execute().data
+            brand_ids.extend(str(row["brand_id"]) for row in rows)
+            if len(rows) < 1000:
+                return brand_ids
+            cursor = brand_ids[-1]
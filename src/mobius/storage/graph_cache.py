@@ -0,0 +1,233 @@
+"""
+Result cache for Neo4j relationship queries.
+
+Graph query results (brand colors, brands using a color, similar brands,
+color pairings) only change when a brand, asset or feedback sync is written,
+but every API call used to run the Cypher query again. This cache keeps
+results in a bounded LRU keyed by query name and parameters.
+
+Design Principles:
+- Each entry carries tags naming what it depends on ("brand:<id>",
+  "color:<hex>", "pairings:<hex>"); graph writes invalidate exactly the tags
+  they touch, and a load that overlaps an invalidation is not cached
+- Within ttl_seconds an entry is served as-is; for a further stale_seconds it
+  is served immediately while a single background load refreshes it
+  (stale-while-revalidate); after that callers wait for a fresh load
+- Concurrent misses for the same key share one query
+- Failed queries are never cached
+
+The cache is per process. Writes applied by another process (e.g. the graph
+sync drainer) publish the tags they invalidate over the graph cache bus
+(GraphStorage.attach_invalidation_bus); processes that are not attached pick
+them up when entries expire.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+Loader = Callable[[], Awaitable[Any]]
+TagsFn = Callable[[Any], Iterable[str]]
+
+
+class GraphQueryCache:
+    """
+    Bounded LRU + TTL cache of graph query results with tag invalidation.
+
+    Usage:
+        colors = await cache.get(
+            ("brand_colors", brand_id),
+            loader=lambda: self._query_brand_colors(brand_id),
+            tags=lambda result: {f"brand:{brand_id}"},
+        )
+        cache.invalidate_tags({f"brand:{brand_id}"})
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 300, stale_seconds: float = 600):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        # key -> (value, cached_at, tags); ordered oldest -> most recently used
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, Set[str]]]" = OrderedDict()
+        # tag -> keys of entries carrying it
+        self._tag_index: Dict[str, Set[Hashable]] = {}
+        # key -> in-flight load shared by concurrent callers
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        # tag -> version at which it was last invalidated (only kept while loads are in flight)
+        self._invalidated_at: Dict[str, int] = {}
+        self._version = 0
+        self._refresh_tasks: Set[asyncio.Task] = set()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    async def get(self, key: Hashable, loader: Loader, tags: TagsFn) -> Any:
+        """
+        Get a query result, loading it on a miss.
+
+        Args:
+            key: Hashable key of the query and its parameters
+            loader: Coroutine function running the query (may raise)
+            tags: Function mapping a result to the tags it depends on
+
+        Returns:
+            Cached or freshly loaded result
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, cached_at, _ = entry
+            age = time.monotonic() - cached_at
+            if age < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            if age < self.ttl_seconds + self.stale_seconds:
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                if key not in self._inflight:
+                    self._start_refresh(key, loader, tags)
+                return value
+            self._remove(key)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        return await self._load(key, loader, tags)
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """
+        Drop every entry carrying any of the tags.
+
+        Loads in flight whose result carries one of the tags still return to
+        their callers but are not cached.
+
+        Args:
+            tags: Tags touched by a graph write
+
+        Returns:
+            Number of entries dropped
+        """
+        tags = set(tags)
+        if not tags:
+            return 0
+
+        self._version += 1
+        keys = set()
+        for tag in tags:
+            keys |= self._tag_index.get(tag, set())
+            if self._inflight:
+                self._invalidated_at[tag] = self._version
+        for key in keys:
+            self._remove(key)
+
+        self.invalidations += len(keys)
+        logger.debug("graph_cache_invalidated", tags=sorted(tags), entries=len(keys))
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop all entries and reset metrics (useful for testing)."""
+        self._version += 1
+        self._entries.clear()
+        self._tag_index.clear()
+        if self._inflight:
+            # Nothing loading now may be cached
+            self._invalidated_at["*"] = self._version
+        self.hits = self.stale_hits = self.misses = self.coalesced = 0
+        self.evictions = self.invalidations = 0
+
+    def stats(self) -> dict:
+        """
+        Get cache metrics.
+
+        Returns:
+            Dictionary with size and hit/miss counts. hit_ratio counts fresh,
+            stale and coalesced lookups as served from memory.
+        """
+        served = self.hits + self.stale_hits + self.coalesced
+        lookups = served + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": served / lookups if lookups else 0.0,
+        }
+
+    async def _load(self, key: Hashable, loader: Loader, tags: TagsFn) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        started_at = self._version
+
+        try:
+            value = await loader()
+            entry_tags = set(tags(value))
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Mark retrieved so an unawaited future does not log a warning
+                future.exception()
+            raise
+        else:
+            invalidated = max(
+                (self._invalidated_at.get(tag, -1) for tag in entry_tags | {"*"}), default=-1
+            )
+            if invalidated <= started_at:
+                self._store(key, value, entry_tags)
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+            if not self._inflight:
+                self._invalidated_at.clear()
+
+    def _start_refresh(self, key: Hashable, loader: Loader, tags: TagsFn) -> None:
+        async def refresh() -> None:
+            try:
+                await self._load(key, loader, tags)
+            except Exception as e:
+                # Keep serving the stale entry; the next lookup retries
+                logger.warning("graph_cache_refresh_failed", key=str(key), error=str(e))
+
+        task = asyncio.create_task(refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    def _store(self, key: Hashable, value: Any, tags: Set[str]) -> None:
+        self._remove(key)
+        self._entries[key] = (value, time.monotonic(), tags)
+        for tag in tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_size:
+            evicted = next(iter(self._entries))
+            self._remove(evicted)
+            self.evictions += 1
+
+    def _remove(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        for tag in entry[2]:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+        return entry[0]
@@ -0,0 +1,469 @@
+"""
+Graph sync outbox and background drainer.
+
+Neo4j synchronization runs off the request path. Database triggers
+(migration 009) insert a graph_sync_outbox event in the same transaction as
+every brand, asset, template and feedback write that changes a column the
+graph mirrors, so a committed write always has a pending sync.
+GraphSyncDrainer applies pending events to Neo4j.
+
+Design Principles:
+- PostgreSQL remains source of truth; events carry only the entity id and the
+  drainer re-reads the current row, so re-applying an event is harmless
+- Soft-deletes (deleted_at set) queue a delete event that removes the nodes
+- Events of a brand are applied in commit order; once one fails, that brand's
+  later events wait for it (a brand must exist before its assets)
+- Drainers claim events with a lease (claim_graph_sync_events), so
+  overlapping drainers never apply the same brand's events concurrently
+- Consecutive events of the same type are written as one UNWIND batch
+- An event counts as applied only if Neo4j reports the entity written; rows
+  whose parent node is missing are retried like any other failure
+- Failed events are retried with capped exponential backoff and never
+  dropped; they are only deleted after being applied (see purge_processed)
+- Backlog size and lag (age of the oldest pending event) are reported so a
+  stalled drainer is visible
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set
+
+import structlog
+
+from mobius.config import settings
+from mobius.models.asset import Asset
+from mobius.models.brand import Brand
+from mobius.models.template import Template
+from mobius.storage.database import get_supabase_client
+from mobius.storage.graph import GraphStorage, graph_storage
+
+logger = structlog.get_logger()
+
+# entity_type -> (table, primary key column)
+ENTITY_TABLES = {
+    "brand": ("brands", "brand_id"),
+    "asset": ("assets", "asset_id"),
+    "template": ("templates", "template_id"),
+    "feedback": ("feedback", "feedback_id"),
+}
+
+
+def _parse_timestamp(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+
+
+class GraphSyncOutbox:
+    """Storage operations for the graph_sync_outbox table."""
+
+    def __init__(self):
+        self.client = get_supabase_client()
+
+    async def claim_pending(self, limit: int, lease_seconds: Optional[int] = None) -> List[dict]:
+        """
+        Claim the oldest due events for this drainer, in commit order.
+
+        Brands with an event backing off after a failure or leased to another
+        drainer are skipped entirely (server-side, see
+        claim_graph_sync_events), so their later events cannot overtake it.
+
+        Args:
+            limit: Maximum number of events
+            lease_seconds: How long the events are held (defaults to
+                graph_outbox_lease_seconds)
+
+        Returns:
+            List of outbox rows, ordered by event_id
+        """
+        result = self.client.rpc("claim_graph_sync_events", {
+            "p_limit": limit,
+            "p_lease_seconds": lease_seconds or settings.graph_outbox_lease_seconds,
+        }).execute()
+        return sorted(result.data or [], key=lambda row: row["event_id"])
+
+    async def load_entities(
+        self, entity_type: str, entity_ids: List[str], columns: str = "*"
+    ) -> Dict[str, dict]:
+        """
+        Load the current rows for a batch of events.
+
+        Args:
+            entity_type: brand, asset, template or feedback
+            entity_ids: Primary keys to load
+            columns: Columns to select (must include the primary key)
+
+        Returns:
+            Dictionary of primary key -> row (ids no longer present are omitted)
+        """
+        table, id_column = ENTITY_TABLES[entity_type]
+        result = (
+            self.client.table(table)
+            .select(columns)
+            .in_(id_column, list(entity_ids))
+            .execute()
+        )
+        return {str(row[id_column]): row for row in result.data}
+
+    async def mark_processed(self, event_ids: List[int]) -> None:
+        """Mark events as applied."""
+        if not event_ids:
+            return
+        (
+            self.client.table("graph_sync_outbox")
+            .update({
+                "processed_at": datetime.now(timezone.utc).isoformat(),
+                "last_error": None,
+                "leased_until": None,
+            })
+            .in_("event_id", event_ids)
+            .execute()
+        )
+
+    async def release(self, event_ids: List[int]) -> None:
+        """Return claimed events that were not attempted to the queue."""
+        if not event_ids:
+            return
+        (
+            self.client.table("graph_sync_outbox")
+            .update({"leased_until": None})
+            .in_("event_id", event_ids)
+            .execute()
+        )
+
+    async def mark_failed(self, events: List[dict], error: str) -> None:
+        """
+        Record a failed attempt and schedule the next one.
+
+        Backoff doubles with each attempt up to graph_outbox_retry_max_seconds.
+        """
+        now = datetime.now(timezone.utc)
+        for event in events:
+            attempts = (event.get("attempts") or 0) + 1
+            delay = min(
+                settings.graph_outbox_retry_base_seconds * 2 ** (attempts - 1),
+                settings.graph_outbox_retry_max_seconds,
+            )
+            (
+                self.client.table("graph_sync_outbox")
+                .update({
+                    "attempts": attempts,
+                    "next_attempt_at": (now + timedelta(seconds=delay)).isoformat(),
+                    "last_error": error[:1000],
+                    "leased_until": None,
+                })
+                .eq("event_id", event["event_id"])
+                .execute()
+            )
+
+    async def purge_processed(self, older_than_hours: Optional[int] = None) -> int:
+        """
+        Delete applied events older than the retention window.
+
+        Returns:
+            Number of events deleted
+        """
+        hours = settings.graph_outbox_retention_hours if older_than_hours is None else older_than_hours
+        cutoff = (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
+        result = (
+            self.client.table("graph_sync_outbox")
+            .delete()
+            .lt("processed_at", cutoff)
+            .execute()
+        )
+        return len(result.data)
+
+    async def get_backlog_stats(self) -> dict:
+        """
+        Get outbox backlog metrics.
+
+        Returns:
+            Dictionary with backlog (pending events), retrying (pending events
+            that have failed at least once), oldest_pending_at and lag_seconds
+        """
+        pending = (
+            self.client.table("graph_sync_outbox")
+            .select("event_id", count="exact")
+            .is_("processed_at", "null")
+            .limit(1)
+            .execute()
+        )
+        retrying = (
+            self.client.table("graph_sync_outbox")
+            .select("event_id", count="exact")
+            .is_("processed_at", "null")
+            .gt("attempts", 0)
+            .limit(1)
+            .execute()
+        )
+        oldest = (
+            self.client.table("graph_sync_outbox")
+            .select("created_at")
+            .is_("processed_at", "null")
+            .order("event_id")
+            .limit(1)
+            .execute()
+        ).data
+
+        oldest_at = _parse_timestamp(oldest[0]["created_at"]) if oldest else None
+        return {
+            "backlog": pending.count or 0,
+            "retrying": retrying.count or 0,
+            "oldest_pending_at": oldest_at.isoformat() if oldest_at else None,
+            "lag_seconds": (
+                (datetime.now(timezone.utc) - oldest_at).total_seconds() if oldest_at else 0.0
+            ),
+        }
+
+
+class GraphSyncDrainer:
+    """
+    Applies graph_sync_outbox events to Neo4j.
+
+    Usage:
+        drainer = GraphSyncDrainer()
+        await drainer.drain_once()             # one batch
+        await drainer.run(duration_seconds=55)  # poll until the deadline
+    """
+
+    def __init__(
+        self,
+        outbox: Optional[GraphSyncOutbox] = None,
+        graph: Optional[GraphStorage] = None,
+        batch_size: Optional[int] = None,
+    ):
+        self.outbox = outbox or GraphSyncOutbox()
+        self.graph = graph or graph_storage
+        self.batch_size = batch_size or settings.graph_outbox_batch_size
+
+        self.processed_total = 0
+        self.failed_total = 0
+        self.last_lag_seconds = 0.0
+
+    async def drain_once(self) -> dict:
+        """
+        Apply one batch of pending events.
+
+        Returns:
+            Dictionary with processed, failed and deferred (held behind a
+            failure in this batch) event counts and lag_seconds (age of the
+            oldest event applied in this batch)
+        """
+        summary = {"processed": 0, "failed": 0, "deferred": 0, "lag_seconds": 0.0}
+
+        # Without Neo4j, events stay queued and are applied once it is configured
+        if not self.graph._is_enabled():
+            return summary
+
+        events = await self.outbox.claim_pending(self.batch_size)
+        if not events:
+            self.last_lag_seconds = 0.0
+            return summary
+
+        now = datetime.now(timezone.utc)
+        # Brands that failed earlier in this batch
+        blocked_brands = set()
+        deferred = []
+
+        index = 0
+        while index < len(events):
+            key = _batch_key(events[index])
+            batch = []
+            while index < len(events) and _batch_key(events[index]) == key:
+                event = events[index]
+                if str(event["brand_id"]) in blocked_brands:
+                    deferred.append(event["event_id"])
+                else:
+                    batch.append(event)
+                index += 1
+
+            if not batch:
+                continue
+
+            entity_type, operation = key
+            try:
+                applied = await self._apply(entity_type, operation, batch)
+            except Exception as e:
+                blocked_brands.update(str(event["brand_id"]) for event in batch)
+                await self.outbox.mark_failed(batch, str(e))
+                summary["failed"] += len(batch)
+                logger.warning(
+                    "graph_outbox_batch_failed",
+                    entity_type=entity_type,
+                    operation=operation,
+                    event_count=len(batch),
+                    error=str(e),
+                )
+                continue
+
+            done = [event for event in batch if str(event["entity_id"]) in applied]
+            missed = [event for event in batch if str(event["entity_id"]) not in applied]
+            if missed:
+                # MATCH on a parent node that is not in the graph writes nothing
+                blocked_brands.update(str(event["brand_id"]) for event in missed)
+                await self.outbox.mark_failed(missed, "Parent node not found in graph")
+                summary["failed"] += len(missed)
+                logger.warning(
+                    "graph_outbox_events_not_written",
+                    entity_type=entity_type,
+                    entity_ids=[str(event["entity_id"]) for event in missed],
+                )
+
+            if done:
+                await self.outbox.mark_processed([event["event_id"] for event in done])
+                summary["processed"] += len(done)
+                oldest = min(_parse_timestamp(event["created_at"]) for event in done)
+                summary["lag_seconds"] = max(summary["lag_seconds"], (now - oldest).total_seconds())
+
+        # Held behind a failure; the brand is now backing off, so they are
+        # claimed again with it once the retry is due
+        await self.outbox.release(deferred)
+        summary["deferred"] = len(deferred)
+
+        self.processed_total += summary["processed"]
+        self.failed_total += summary["failed"]
+        self.last_lag_seconds = summary["lag_seconds"]
+
+        logger.info("graph_outbox_drained", batch_size=len(events), **summary)
+        return summary
+
+    async def run(
+        self,
+        duration_seconds: Optional[float] = None,
+        poll_interval_seconds: Optional[float] = None,
+        stop_event: Optional[asyncio.Event] = None,
+    ) -> None:
+        """
+        Drain continuously until the deadline or stop_event.
+
+        Full batches are followed immediately by the next batch; otherwise the
+        drainer sleeps for the poll interval.
+
+        Args:
+            duration_seconds: Stop after this long (None runs until stopped)
+            poll_interval_seconds: Sleep between polls when the outbox is drained
+            stop_event: Optional event that stops the loop when set
+        """
+        interval = poll_interval_seconds or settings.graph_outbox_poll_interval_seconds
+        loop = asyncio.get_running_loop()
+        deadline = None if duration_seconds is None else loop.time() + duration_seconds
+
+        while not (stop_event and stop_event.is_set()):
+            if deadline is not None and loop.time() >= deadline:
+                break
+            try:
+                summary = await self.drain_once()
+            except Exception as e:
+                # Outbox unavailable (e.g. database blip); try again next poll
+                logger.error("graph_outbox_drain_failed", error=str(e))
+                summary = {"processed": 0}
+
+            if summary["processed"] + summary.get("failed", 0) < self.batch_size:
+                try:
+                    await asyncio.wait_for(
+                        stop_event.wait() if stop_event else asyncio.sleep(interval),
+                        timeout=interval,
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+    def stats(self) -> dict:
+        """Get drainer counters since start."""
+        return {
+            "processed_total": self.processed_total,
+            "failed_total": self.failed_total,
+            "last_lag_seconds": self.last_lag_seconds,
+        }
+
+    async def _apply(self, entity_type: str, operation: str, events: List[dict]) -> Set[str]:
+        """
+        Apply a batch of same-type events to Neo4j.
+
+        Returns:
+            IDs of the entities whose events are done: written, deleted, or
+            with nothing left to sync
+        """
+        entity_ids = list(dict.fromkeys(str(event["entity_id"]) for event in events))
+        if operation == "delete":
+            await delete_entities(self.graph, entity_type, entity_ids)
+            return set(entity_ids)
+
+        rows = await self.outbox.load_entities(entity_type, entity_ids)
+        # Rows removed or soft-deleted since the event was queued have nothing
+        # to upsert (a soft-delete queues its own delete event)
+        live = [
+            rows[entity_id] for entity_id in entity_ids
+            if entity_id in rows and not rows[entity_id].get("deleted_at")
+        ]
+        done = set(entity_ids) - {str(row[ENTITY_TABLES[entity_type][1]]) for row in live}
+        if not live:
+            return done
+
+        if entity_type == "feedback":
+            # Brand counters are not synced on their own (see migration 009)
+            brands = await self.outbox.load_entities(
+                "brand",
+                list({str(row["brand_id"]) for row in live}),
+                columns="brand_id,feedback_count,learning_active",
+            )
+            live = [{**row, "brand": brands.get(str(row["brand_id"]))} for row in live]
+
+        return done | await write_entities(self.graph, entity_type, live)
+
+
+def _batch_key(event: dict) -> tuple:
+    return event["entity_type"], event.get("operation") or "upsert"
+
+
+async def write_entities(graph: GraphStorage, entity_type: str, rows: List[dict]) -> Set[str]:
+    """
+    Write database rows of one entity type to Neo4j as a single batch.
+
+    Args:
+        graph: GraphStorage to write through (raises on failure)
+        entity_type: brand, asset, template or feedback
+        rows: Rows as returned by Supabase (feedback rows may carry their
+            brand's counters under "brand")
+
+    Returns:
+        IDs of the entities written (rows whose parent is missing are omitted)
+    """
+    if entity_type == "brand":
+        return await graph.write_brands([Brand.model_validate(row) for row in rows])
+    elif entity_type == "asset":
+        return await graph.write_assets([Asset.model_validate(row) for row in rows])
+    elif entity_type == "template":
+        return await graph.write_templates([Template.model_validate(row) for row in rows])
+    elif entity_type == "feedback":
+        return await graph.write_feedback([
+            {
+                "feedback_id": str(row["feedback_id"]),
+                "asset_id": str(row["asset_id"]),
+                "brand_id": str(row["brand_id"]),
+                "action": row["action"],
+                "reason": row.get("reason"),
+                "timestamp": _parse_timestamp(row["created_at"]).isoformat(),
+                "brand_feedback_count": (row.get("brand") or {}).get("feedback_count"),
+                "brand_learning_active": (row.get("brand") or {}).get("learning_active"),
+            }
+            for row in rows
+        ])
+    else:
+        raise ValueError(f"Unknown graph sync entity type: {entity_type}")
+
+
+async def delete_entities(graph: GraphStorage, entity_type: str, entity_ids: List[str]) -> None:
+    """
+    Remove soft-deleted entities from Neo4j.
+
+    Args:
+        graph: GraphStorage to write through (raises on failure)
+        entity_type: brand or template (the tables with deleted_at)
+        entity_ids: Primary keys to remove
+    """
+    if entity_type == "brand":
+        await graph.delete_brands(entity_ids)
+    elif entity_type == "template":
+        await graph.delete_templates(entity_ids)
+    else:
+        raise ValueError(f"Graph sync entity type cannot be deleted: {entity_type}")
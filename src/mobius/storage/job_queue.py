@@ -0,0 +1,558 @@
+"""
+Durable generation job queue and workers.
+
+Generation jobs are queued on the jobs table itself (migration 013): a job
+is created with queued_at set and stays queued until a worker finishes it.
+GenerationWorker claims waiting jobs in batches (claim_generation_jobs,
+FOR UPDATE SKIP LOCKED), holds each with a lease that a heartbeat renews
+while the workflow runs, and releases it when the job is done.
+
+Claims follow a fair-share order (migration 014): priority class first
+(interactive, standard, batch), then organizations in proportion to their
+weight in generation_queue_shares counting the jobs they already run, then
+brands round-robin, then age. An organization is held at its concurrency
+cap, and batch jobs may only take generation_queue_batch_share of a
+worker's slots, so a large campaign queues behind everyone else's single
+requests instead of in front of them.
+
+Design Principles:
+- The job row is the queue entry, so a job that exists is never lost with
+  the process that accepted it; recycled containers only cost a lease
+- Any number of workers claim concurrently; SKIP LOCKED hands every job to
+  exactly one of them, so throughput scales with workers
+- A worker that dies stops renewing its leases; the reaper
+  (requeue_expired_generation_jobs) returns those jobs to the queue and
+  fails jobs that have been claimed generation_queue_max_attempts times
+- A worker that loses a lease stops running the job, and every lease
+  write is conditional on the owner, so a slow worker cannot clobber the
+  worker that took the job over
+- A cancelled job stops as soon as the cancellation reaches its worker
+  (api/job_cancellation.py), or at the next heartbeat, and frees its slot
+- Queue depth and lag (age of the oldest waiting job) are reported so a
+  stalled queue is visible, and every waiting job has a position and ETA
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+import structlog
+
+from mobius.api.job_cancellation import JobCancelledError, job_cancellations
+from mobius.config import settings
+from mobius.storage.database import get_supabase_client
+from mobius.storage.job_state import compact_job_state, expand_job_state
+
+logger = structlog.get_logger()
+
+# Queue priority classes (jobs.queue_priority); lower is claimed first.
+# Review and tweak continuations a user is waiting on run as soon as they are
+# submitted, outside the queue; INTERACTIVE is for queued work of that kind.
+PRIORITY_INTERACTIVE = 0
+PRIORITY_STANDARD = 1
+PRIORITY_BATCH = 2
+
+
+def _parse_timestamp(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+
+
+class GenerationJobQueue:
+    """Queue operations on the jobs table."""
+
+    def __init__(self):
+        self.client = get_supabase_client()
+
+    async def claim(
+        self,
+        owner: str,
+        limit: int,
+        lease_seconds: Optional[int] = None,
+        max_priority: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        Claim the next waiting jobs in fair-share order for a worker.
+
+        Args:
+            owner: Worker identifier the leases are taken for
+            limit: Maximum number of jobs
+            lease_seconds: How long the jobs are held without a heartbeat
+                (defaults to generation_queue_lease_seconds)
+            max_priority: Only claim jobs of this priority class or a more
+                urgent one (None claims any)
+
+        Returns:
+            List of job rows in claim order
+        """
+        result = self.client.rpc("claim_generation_jobs", {
+            "p_owner": owner,
+            "p_limit": limit,
+            "p_lease_seconds": lease_seconds or settings.generation_queue_lease_seconds,
+            "p_max_priority": max_priority,
+            "p_org_max_concurrency": settings.generation_queue_org_max_concurrency,
+        }).execute()
+        return result.data or []
+
+    async def heartbeat(self, job_id: str, owner: str, lease_seconds: Optional[int] = None) -> Optional[dict]:
+        """
+        Renew a job's lease.
+
+        Returns:
+            The job row (its status shows a cancellation that did not reach the
+            worker otherwise), or None if the worker no longer holds the lease
+        """
+        now = datetime.now(timezone.utc)
+        seconds = lease_seconds or settings.generation_queue_lease_seconds
+        result = (
+            self.client.table("jobs")
+            .update({
+                "leased_until": (now + timedelta(seconds=seconds)).isoformat(),
+                "heartbeat_at": now.isoformat(),
+            })
+            .eq("job_id", job_id)
+            .eq("lease_owner", owner)
+            .execute()
+        )
+        return result.data[0] if result.data else None
+
+    async def complete(self, job_id: str, owner: str, updates: Optional[dict] = None) -> bool:
+        """
+        Remove a finished job from the queue and release its lease.
+
+        Args:
+            job_id: Job UUID
+            owner: Worker holding the lease
+            updates: Other job fields to write in the same update
+
+        Returns:
+            False if the worker no longer held the lease (nothing was written)
+        """
+        if updates and updates.get("state"):
+            updates = {**updates, "state": await compact_job_state(updates["state"], job_id)}
+        result = (
+            self.client.table("jobs")
+            .update({
+                **(updates or {}),
+                "queued_at": None,
+                "lease_owner": None,
+                "leased_until": None,
+                "queue_finished_at": datetime.now(timezone.utc).isoformat(),
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+            })
+            .eq("job_id", job_id)
+            .eq("lease_owner", owner)
+            .execute()
+        )
+        return bool(result.data)
+
+    async def requeue_expired(self, max_attempts: Optional[int] = None) -> dict:
+        """
+        Return jobs whose lease expired to the queue (the reaper).
+
+        Args:
+            max_attempts: Claims after which an expired job is failed instead
+                (defaults to generation_queue_max_attempts)
+
+        Returns:
+            Dictionary with requeued and failed job counts
+        """
+        result = self.client.rpc("requeue_expired_generation_jobs", {
+            "p_max_attempts": max_attempts or settings.generation_queue_max_attempts,
+        }).execute()
+        rows = result.data or []
+        requeued = [str(row["job_id"]) for row in rows if row["requeued"]]
+        failed = [str(row["job_id"]) for row in rows if not row["requeued"]]
+        if rows:
+            logger.warning(
+                "generation_queue_leases_expired",
+                requeued_job_ids=requeued,
+                failed_job_ids=failed,
+            )
+        return {"requeued": len(requeued), "failed": len(failed)}
+
+    async def get_position(self, job_id: str) -> Optional[dict]:
+        """
+        Get where a waiting job stands in the queue.
+
+        The ETA divides the number of jobs that start first by the rate at
+        which jobs finished over generation_queue_eta_window_seconds (or by
+        one worker's rate at generation_queue_default_job_seconds per job
+        when nothing finished recently).
+
+        Args:
+            job_id: Job UUID
+
+        Returns:
+            Dictionary with queue_position (waiting jobs ahead) and
+            eta_seconds (estimated wait until a worker starts the job), or
+            None if the job is not waiting
+        """
+        position = self.client.rpc("generation_queue_position", {
+            "p_job_id": job_id,
+            "p_org_max_concurrency": settings.generation_queue_org_max_concurrency,
+        }).execute().data
+        if position is None:
+            return None
+
+        window = settings.generation_queue_eta_window_seconds
+        since = datetime.now(timezone.utc) - timedelta(seconds=window)
+        finished = (
+            self.client.table("jobs")
+            .select("job_id", count="exact")
+            .gte("queue_finished_at", since.isoformat())
+            .limit(1)
+            .execute()
+        ).count or 0
+        if finished:
+            jobs_per_second = finished / window
+        else:
+            jobs_per_second = (
+                settings.generation_queue_concurrency / settings.generation_queue_default_job_seconds
+            )
+        return {
+            "queue_position": int(position),
+            "eta_seconds": round((int(position) + 1) / jobs_per_second, 1),
+        }
+
+    async def get_stats(self) -> dict:
+        """
+        Get queue depth metrics.
+
+        Returns:
+            Dictionary with depth (jobs waiting for a worker), running (jobs
+            leased to a worker), oldest_queued_at and lag_seconds
+        """
+        waiting = (
+            self.client.table("jobs")
+            .select("job_id", count="exact")
+            .not_.is_("queued_at", "null")
+            .is_("lease_owner", "null")
+            .limit(1)
+            .execute()
+        )
+        running = (
+            self.client.table("jobs")
+            .select("job_id", count="exact")
+            .not_.is_("queued_at", "null")
+            .not_.is_("lease_owner", "null")
+            .limit(1)
+            .execute()
+        )
+        oldest = (
+            self.client.table("jobs")
+            .select("queued_at")
+            .not_.is_("queued_at", "null")
+            .is_("lease_owner", "null")
+            .order("queued_at")
+            .limit(1)
+            .execute()
+        ).data
+
+        oldest_at = _parse_timestamp(oldest[0]["queued_at"]) if oldest else None
+        return {
+            "depth": waiting.count or 0,
+            "running": running.count or 0,
+            "oldest_queued_at": oldest_at.isoformat() if oldest_at else None,
+            "lag_seconds": (
+                (datetime.now(timezone.utc) - oldest_at).total_seconds() if oldest_at else 0.0
+            ),
+        }
+
+
+# generation_params keys that are not workflow arguments: generate_handler
+# repeats the prompt (passed on its own), and a batch child's variation number
+# only tells identical prompts apart
+JOB_ONLY_PARAMS = ("prompt", "variation")
+
+
+async def run_generation_job(job: dict) -> dict:
+    """
+    Run the generation workflow for a claimed job and record the result.
+
+    Args:
+        job: Job row returned by the claim
+
+    Returns:
+        Job fields to write when the job leaves the queue (status, progress, state)
+    """
+    from mobius.graphs.generation import run_generation_workflow
+    from mobius.storage.jobs import JobStorage
+
+    job_id = str(job["job_id"])
+    brand_id = str(job["brand_id"])
+    state = expand_job_state(job.get("state")) or {}
+    prompt = state.get("prompt")
+    template_id = state.get("template_id")
+    generation_params = state.get("generation_params") or {}
+
+    workflow_params = {k: v for k, v in generation_params.items() if k not in JOB_ONLY_PARAMS}
+
+    await JobStorage().update_job(job_id, {
+        "status": "processing",
+        "progress": 10.0,
+        "state": {**state, "started_at": datetime.now(timezone.utc).isoformat()},
+    })
+
+    final_state = await run_generation_workflow(
+        brand_id=brand_id,
+        prompt=prompt,
+        job_id=job_id,
+        webhook_url=job.get("webhook_url"),
+        template_id=template_id,
+        **workflow_params,
+    )
+
+    status = final_state.get("status", "completed")
+    if status == "cancelled":
+        return {"status": "cancelled"}
+
+    image_url = final_state.get("current_image_url") or final_state.get("image_uri")
+    updates = {
+        "status": status,
+        # needs_review is 75%, completed/failed is 100%
+        "progress": 75.0 if status == "needs_review" else 100.0,
+        "state": {
+            "prompt": prompt,
+            "brand_id": brand_id,
+            "generation_params": generation_params,
+            "template_id": template_id,
+            "compliance_scores": final_state.get("compliance_scores", []),
+            "is_approved": final_state.get("is_approved", False),
+            "attempt_count": final_state.get("attempt_count", 0),
+            "image_uri": image_url,
+            "completed_at": datetime.now(timezone.utc).isoformat(),
+            # Preserve logo configuration for tweaks
+            "original_had_logos": final_state.get("original_had_logos"),
+        },
+    }
+    if final_state.get("error"):
+        updates["error"] = final_state["error"]
+        updates["state"]["error"] = final_state["error"]
+    return updates
+
+
+class GenerationWorker:
+    """
+    Claims queued generation jobs and runs them with a heartbeat.
+
+    Usage:
+        worker = GenerationWorker()
+        await worker.run_once()                 # claim one batch
+        await worker.run(until_empty=True)      # work until the queue is empty
+        worker.start()                          # same, in the background of this process
+    """
+
+    def __init__(
+        self,
+        queue: Optional[GenerationJobQueue] = None,
+        owner: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        lease_seconds: Optional[int] = None,
+        heartbeat_seconds: Optional[float] = None,
+        handler: Optional[Callable[[dict], Awaitable[dict]]] = None,
+    ):
+        self._queue = queue
+        self.owner = owner or f"generation-{uuid.uuid4().hex[:12]}"
+        self.concurrency = concurrency or settings.generation_queue_concurrency
+        self.lease_seconds = lease_seconds or settings.generation_queue_lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds or settings.generation_queue_heartbeat_seconds
+        self.handler = handler or run_generation_job
+        # Slots batch jobs may hold; the rest stay free for standard requests
+        self.batch_slots = max(1, int(self.concurrency * settings.generation_queue_batch_share))
+
+        self._running: Dict[str, asyncio.Task] = {}
+        self._running_batch: Set[str] = set()
+        self._lost_leases: Set[str] = set()
+        self._wakeup = asyncio.Event()
+        self._loop_task: Optional[asyncio.Task] = None
+
+        self.claimed_total = 0
+        self.completed_total = 0
+        self.failed_total = 0
+        self.cancelled_total = 0
+        self.lease_lost_total = 0
+
+    @property
+    def queue(self) -> GenerationJobQueue:
+        # Created on first use so importing the module needs no database client
+        if self._queue is None:
+            self._queue = GenerationJobQueue()
+        return self._queue
+
+    async def run_once(self) -> int:
+        """
+        Claim as many jobs as there are free slots and start them.
+
+        Standard and interactive jobs may take every free slot; batch jobs
+        only the free part of batch_slots.
+
+        Returns:
+            Number of jobs claimed
+        """
+        free = self.concurrency - len(self._running)
+        if free <= 0:
+            return 0
+
+        jobs = await self.queue.claim(
+            self.owner, free, self.lease_seconds, max_priority=PRIORITY_STANDARD
+        )
+        batch_free = min(free - len(jobs), self.batch_slots - len(self._running_batch))
+        if batch_free > 0:
+            jobs += await self.queue.claim(self.owner, batch_free, self.lease_seconds)
+
+        for job in jobs:
+            job_id = str(job["job_id"])
+            if job.get("queue_priority", PRIORITY_STANDARD) >= PRIORITY_BATCH:
+                self._running_batch.add(job_id)
+            self._running[job_id] = asyncio.create_task(
+                self._process(job), name=f"generation_{job_id}"
+            )
+        self.claimed_total += len(jobs)
+        if jobs:
+            logger.info(
+                "generation_jobs_claimed",
+                owner=self.owner,
+                job_ids=[str(job["job_id"]) for job in jobs],
+                running=len(self._running),
+            )
+        return len(jobs)
+
+    async def run(
+        self,
+        duration_seconds: Optional[float] = None,
+        poll_interval_seconds: Optional[float] = None,
+        stop_event: Optional[asyncio.Event] = None,
+        until_empty: bool = False,
+    ) -> None:
+        """
+        Claim and run jobs until the deadline, stop_event, or an empty queue.
+
+        Expired leases are reaped when the loop starts and then once per
+        lease period. Jobs still running when the loop stops are awaited so
+        their results are recorded and their leases released.
+
+        Args:
+            duration_seconds: Stop claiming after this long (None runs until stopped)
+            poll_interval_seconds: Sleep between polls while no slot or job is free
+            stop_event: Optional event that stops the loop when set
+            until_empty: Stop once nothing is queued or running
+        """
+        interval = poll_interval_seconds or settings.generation_queue_poll_interval_seconds
+        loop = asyncio.get_running_loop()
+        deadline = None if duration_seconds is None else loop.time() + duration_seconds
+        next_reap = loop.time()
+
+        try:
+            while not (stop_event and stop_event.is_set()):
+                if deadline is not None and loop.time() >= deadline:
+                    break
+                try:
+                    if loop.time() >= next_reap:
+                        await self.queue.requeue_expired()
+                        next_reap = loop.time() + self.lease_seconds
+                    claimed = await self.run_once()
+                except Exception as e:
+                    # Queue unavailable (e.g. database blip); try again next poll
+                    logger.error("generation_queue_poll_failed", owner=self.owner, error=str(e))
+                    claimed = 0
+
+                if claimed:
+                    continue
+                # Checked without awaiting, so a job queued by start() is never missed
+                if until_empty and not self._running and not self._wakeup.is_set():
+                    break
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+        finally:
+            if self._running:
+                await asyncio.gather(*self._running.values(), return_exceptions=True)
+
+    def start(self) -> None:
+        """
+        Work through the queue in the background of this process.
+
+        Call after queueing a job; starts the loop if it is not running and
+        otherwise wakes it. The loop exits once the queue is empty.
+        """
+        self._wakeup.set()
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(
+                self.run(until_empty=True), name=f"generation_worker_{self.owner}"
+            )
+
+    def stats(self) -> dict:
+        """Get worker counters since start."""
+        return {
+            "owner": self.owner,
+            "running": len(self._running),
+            "running_batch": len(self._running_batch),
+            "claimed_total": self.claimed_total,
+            "completed_total": self.completed_total,
+            "failed_total": self.failed_total,
+            "cancelled_total": self.cancelled_total,
+            "lease_lost_total": self.lease_lost_total,
+        }
+
+    async def _process(self, job: dict) -> None:
+        job_id = str(job["job_id"])
+        # Registered by job_id so cancelling the job frees the slot at once
+        run = asyncio.create_task(job_cancellations.run(job_id, self.handler(job)))
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, run))
+        try:
+            updates = await run
+            self.completed_total += 1
+        except JobCancelledError:
+            self.cancelled_total += 1
+            updates = {"status": "cancelled"}
+        except asyncio.CancelledError:
+            if job_id not in self._lost_leases:
+                raise
+            # Another worker owns the job now; leave the row to it
+            self._lost_leases.discard(job_id)
+            return
+        except Exception as e:
+            self.failed_total += 1
+            logger.error("generation_job_failed", job_id=job_id, owner=self.owner, error=str(e))
+            updates = {"status": "failed", "error": str(e)}
+        finally:
+            heartbeat.cancel()
+            self._running.pop(job_id, None)
+            self._running_batch.discard(job_id)
+            self._wakeup.set()
+
+        try:
+            if not await self.queue.complete(job_id, self.owner, updates):
+                logger.warning("generation_job_lease_lost_on_complete", job_id=job_id, owner=self.owner)
+        except Exception as e:
+            # The lease expires and the reaper requeues the job
+            logger.error("generation_job_release_failed", job_id=job_id, owner=self.owner, error=str(e))
+
+    async def _heartbeat(self, job_id: str, run: asyncio.Task) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                held = await self.queue.heartbeat(job_id, self.owner, self.lease_seconds)
+            except Exception as e:
+                # Keep running; the lease survives until it expires
+                logger.warning("generation_job_heartbeat_failed", job_id=job_id, error=str(e))
+                continue
+            if held and held.get("status") == "cancelled":
+                # Cancelled while the cancellation bus was unavailable
+                job_cancellations.cancel_local(job_id)
+                return
+            if not held:
+                self.lease_lost_total += 1
+                self._lost_leases.add(job_id)
+                logger.warning("generation_job_lease_lost", job_id=job_id, owner=self.owner)
+                run.cancel()
+                return
+
+
+# Process-local worker for API processes that run jobs themselves (app_local)
+generation_worker = GenerationWorker()
@@ -0,0 +1,338 @@
+"""
+Compact persistence format for Job.state.
+
+Job.state is stored as JSONB and re-read on every status poll, but the
+workflow state written to it repeats itself: audit_node puts the same audit
+record in both audit_history and compliance_scores, generation_params repeats
+the prompt, and an image whose upload failed stays inline as a base64 data
+URI. JobStorage compacts the state on every write and expands it on every
+read, so callers keep seeing the workflow's shape.
+
+Compact format (marked by "_format": 2):
+- audits: unique audit records, oldest first; audit_refs maps audit_history
+  and compliance_scores to indexes into it
+- archived_audits: records of earlier attempts, compressed (zstd when the
+  zstandard package is installed, zlib otherwise) and base64-encoded; indexes
+  count archived records first
+- shared: generation_params keys left out because they equal the top-level
+  value (e.g. the prompt)
+- Image data URIs above job_state_blob_min_bytes are uploaded to the assets
+  bucket and replaced by their URL; checkpoint-only keys are dropped
+
+A state over job_state_max_bytes first has all audits archived, then its
+blob-sized strings truncated, then loses the archived history, and finally
+has its largest strings truncated. Sizes and budget overruns are counted in
+job_state_metrics.
+"""
+
+import base64
+import json
+import zlib
+from typing import Any, Dict, List, Optional
+
+import structlog
+
+from mobius.config import settings
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+logger = structlog.get_logger()
+
+STATE_FORMAT = 2
+
+# Lists of audit records kept once in "audits"
+AUDIT_KEYS = ("audit_history", "compliance_scores")
+
+# Workflow keys that only belong in checkpoints (see models/state.py)
+CHECKPOINT_ONLY_KEYS = ("image_data_uri", "deadline_at")
+
+TRUNCATED_MARKER = "...[truncated {} bytes]"
+
+
+class JobStateMetrics:
+    """Sizes of job states written by this process."""
+
+    def __init__(self):
+        self.writes = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.max_bytes = 0
+        self.over_budget = 0
+        self.blobs_moved = 0
+        self.blob_failures = 0
+        self.archived_records = 0
+
+    def record(self, bytes_in: int, bytes_out: int) -> None:
+        self.writes += 1
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+        self.max_bytes = max(self.max_bytes, bytes_out)
+
+    def clear(self) -> None:
+        """Reset metrics (useful for testing)."""
+        self.__init__()
+
+    def stats(self) -> dict:
+        """
+        Get state size metrics.
+
+        Returns:
+            Dictionary with write count, average and largest stored size,
+            the share of bytes saved, budget overruns and blob moves
+        """
+        return {
+            "writes": self.writes,
+            "avg_bytes": self.bytes_out // self.writes if self.writes else 0,
+            "max_bytes": self.max_bytes,
+            "budget_bytes": settings.job_state_max_bytes,
+            "saved_ratio": round(1 - self.bytes_out / self.bytes_in, 3) if self.bytes_in else 0.0,
+            "over_budget": self.over_budget,
+            "blobs_moved": self.blobs_moved,
+            "blob_failures": self.blob_failures,
+            "archived_records": self.archived_records,
+        }
+
+
+def state_size(state: Optional[dict]) -> int:
+    """Size of a state as stored (bytes of its JSON encoding)."""
+    if not state:
+        return 0
+    return len(json.dumps(state, separators=(",", ":"), default=str).encode("utf-8"))
+
+
+def is_compact(state: Optional[dict]) -> bool:
+    """Whether a state is in the compact format."""
+    return bool(state) and state.get("_format") == STATE_FORMAT
+
+
+async def compact_job_state(state: Optional[dict], job_id: Optional[str] = None) -> Optional[dict]:
+    """
+    Compact a workflow state for storage on the job row.
+
+    Args:
+        state: Job state as the workflow and handlers use it (compact states
+            are accepted and re-compacted)
+        job_id: Job the state belongs to (names uploaded blobs)
+
+    Returns:
+        State in the compact format
+    """
+    if not state:
+        return state
+
+    state = expand_job_state(state)
+    bytes_in = state_size(state)
+    compact: Dict[str, Any] = {
+        key: value for key, value in state.items()
+        if key not in CHECKPOINT_ONLY_KEYS and key not in AUDIT_KEYS
+    }
+    compact["_format"] = STATE_FORMAT
+
+    _share_generation_params(compact)
+    if job_id:
+        await _move_blobs(compact, job_id)
+
+    records, refs = _index_audits(state)
+    if records:
+        inline = max(0, settings.job_state_inline_audits)
+        _store_audits(compact, records, refs, inline=inline)
+
+    size = state_size(compact)
+    if size > settings.job_state_max_bytes:
+        size = _enforce_budget(compact, records, refs, job_id, size)
+
+    job_state_metrics.record(bytes_in, size)
+    return compact
+
+
+def expand_job_state(state: Optional[dict]) -> Optional[dict]:
+    """
+    Expand a stored state back into the workflow's shape.
+
+    States written before the compact format are returned unchanged.
+
+    Args:
+        state: Job state as stored on the job row
+
+    Returns:
+        Job state with audit_history, compliance_scores and generation_params restored
+    """
+    if not is_compact(state):
+        return state
+
+    expanded = dict(state)
+    del expanded["_format"]
+    # Records of a dropped archive still take up their indexes
+    records = (
+        [None] * expanded.pop("archived_audits_dropped", 0)
+        + _decode_archive(expanded.pop("archived_audits", None))
+        + expanded.pop("audits", [])
+    )
+    for key, indexes in (expanded.pop("audit_refs", None) or {}).items():
+        expanded[key] = [records[i] for i in indexes if records[i] is not None]
+    shared = expanded.pop("shared", None)
+    if shared:
+        params = dict(expanded.get("generation_params") or {})
+        for key in shared:
+            params[key] = expanded.get(key)
+        expanded["generation_params"] = params
+    return expanded
+
+
+def _index_audits(state: dict) -> tuple:
+    """Unique audit records (oldest first) and each audit list's indexes into them."""
+    records: List[dict] = []
+    positions: Dict[str, int] = {}
+    refs: Dict[str, List[int]] = {}
+    for key in AUDIT_KEYS:
+        if key not in state:
+            continue
+        indexes = []
+        for record in state.get(key) or []:
+            fingerprint = json.dumps(record, sort_keys=True, default=str)
+            if fingerprint not in positions:
+                positions[fingerprint] = len(records)
+                records.append(record)
+            indexes.append(positions[fingerprint])
+        refs[key] = indexes
+    return records, refs
+
+
+def _store_audits(compact: dict, records: List[dict], refs: Dict[str, List[int]], inline: int) -> None:
+    """Keep the latest `inline` records in the row and archive the rest."""
+    split = max(0, len(records) - inline)
+    compact.pop("archived_audits", None)
+    if split:
+        compact["archived_audits"] = _encode_archive(records[:split])
+        job_state_metrics.archived_records += split
+    compact["audits"] = records[split:]
+    compact["audit_refs"] = refs
+
+
+def _share_generation_params(compact: dict) -> None:
+    """Leave out generation_params values equal to the top-level value."""
+    params = compact.get("generation_params")
+    if not isinstance(params, dict):
+        return
+    shared = [key for key, value in params.items() if key in compact and compact[key] == value]
+    if shared:
+        compact["generation_params"] = {k: v for k, v in params.items() if k not in shared}
+        compact["shared"] = shared
+
+
+async def _move_blobs(compact: dict, job_id: str) -> None:
+    """Upload large image data URIs and keep their URLs instead."""
+    from mobius.storage.files import FileStorage
+
+    for key, value in list(compact.items()):
+        if not (isinstance(value, str) and value.startswith("data:image")):
+            continue
+        if len(value) < settings.job_state_blob_min_bytes:
+            continue
+        try:
+            compact[key] = await FileStorage().upload_generated_image(
+                image_data_uri=value,
+                job_id=job_id,
+                attempt=compact.get("attempt_count") or 1,
+            )
+            job_state_metrics.blobs_moved += 1
+            logger.info("job_state_blob_moved", job_id=job_id, key=key, size_bytes=len(value))
+        except Exception as e:
+            # Stays inline; the budget below may still truncate it
+            job_state_metrics.blob_failures += 1
+            logger.warning("job_state_blob_move_failed", job_id=job_id, key=key, error=str(e))
+
+
+def _enforce_budget(
+    compact: dict,
+    records: List[dict],
+    refs: Dict[str, List[int]],
+    job_id: Optional[str],
+    size: int,
+) -> int:
+    """Shrink a state over job_state_max_bytes; returns its new size."""
+    budget = settings.job_state_max_bytes
+    job_state_metrics.over_budget += 1
+    original_size = size
+
+    # 1. Archive every audit record, including the latest
+    if compact.get("audits"):
+        _store_audits(compact, records, refs, inline=0)
+        size = state_size(compact)
+
+    # 2. Truncate strings big enough to have been blobs (e.g. a traceback)
+    size = _truncate_strings(compact, size, budget, min_length=settings.job_state_blob_min_bytes)
+
+    # 3. Drop the archived history (its indexes then resolve to nothing)
+    if size > budget and "archived_audits" in compact:
+        dropped = compact.pop("archived_audits")
+        compact["archived_audits_dropped"] = dropped.get("count", 0)
+        size = state_size(compact)
+
+    # 4. Truncate whatever strings are left
+    size = _truncate_strings(compact, size, budget, min_length=0)
+
+    logger.warning(
+        "job_state_over_budget",
+        job_id=job_id,
+        size_bytes=original_size,
+        compacted_bytes=size,
+        budget_bytes=budget,
+    )
+    return size
+
+
+def _truncate_strings(compact: dict, size: int, budget: int, min_length: int) -> int:
+    """Cut the largest top-level strings until the state fits; returns its new size."""
+    while size > budget:
+        key, value = max(
+            ((k, v) for k, v in compact.items() if isinstance(v, str)),
+            key=lambda item: len(item[1]),
+            default=(None, ""),
+        )
+        marker = TRUNCATED_MARKER.format(len(value))
+        if key is None or len(value) <= max(min_length, len(marker)):
+            break
+        keep = max(0, len(value) - (size - budget) - len(marker))
+        compact[key] = value[:keep] + marker
+        size = state_size(compact)
+    return size
+
+
+def _encode_archive(records: List[dict]) -> dict:
+    raw = json.dumps(records, separators=(",", ":"), default=str).encode("utf-8")
+    codec = settings.job_state_archive_codec
+    if codec == "zstd" and not ZSTD_AVAILABLE:
+        codec = "zlib"
+    if codec == "zstd":
+        data = zstandard.ZstdCompressor(level=3).compress(raw)
+    elif codec == "zlib":
+        data = zlib.compress(raw, 6)
+    else:
+        return {"codec": "none", "count": len(records), "records": records}
+    return {"codec": codec, "count": len(records), "data": base64.b64encode(data).decode("ascii")}
+
+
+def _decode_archive(archive: Optional[dict]) -> List[dict]:
+    if not archive:
+        return []
+    codec = archive.get("codec")
+    if codec == "none":
+        return list(archive.get("records") or [])
+    data = base64.b64decode(archive["data"])
+    if codec == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("Job state archive is zstd-compressed but zstandard is not installed")
+        raw = zstandard.ZstdDecompressor().decompress(data)
+    else:
+        raw = zlib.decompress(data)
+    return json.loads(raw)
+
+
+# Global state size metrics
+job_state_metrics = JobStateMetrics()
@@ -6,6 +6,8 @@ Provides CRUD operations for job entities in Supabase.
 
 from mobius.models.job import Job
 from mobius.storage.database import get_supabase_client
+from mobius.storage.job_state import compact_job_state, expand_job_state
+from mobius.storage.pagination import apply_keyset
 from typing import List, Optional
 from datetime import datetime, timezone
 import structlog
@@ -13,6 +15,13 @@ import structlog
 logger = structlog.get_logger()
 
 
+def _job_from_row(row: dict) -> Job:
+    """Build a Job from a jobs row, expanding its compact state."""
+    if row.get("state"):
+        row = {**row, "state": expand_job_state(row["state"])}
+    return Job.model_validate(row)
+
+
 class JobStorage:
     """Storage operations for job entities."""
 
@@ -41,10 +50,34 @@ class JobStorage:
 
         # Serialize with mode='json' to convert datetime to ISO strings
         data = job.model_dump(mode='json')
+        data["state"] = await compact_job_state(data["state"], job.job_id)
         result = self.client.table("jobs").insert(data).execute()
 
         logger.info("job_created", job_id=job.job_id)
-        return Job.model_validate(result.data[0])
+        return _job_from_row(result.data[0])
+
+    async def create_jobs(self, jobs: List[Job]) -> List[Job]:
+        """
+        Create several jobs with a single insert.
+
+        Args:
+            jobs: Job entities to create
+
+        Returns:
+            List of created jobs
+        """
+        if not jobs:
+            return []
+
+        logger.info("creating_jobs", count=len(jobs), brand_ids=sorted({j.brand_id for j in jobs}))
+
+        data = [job.model_dump(mode='json') for job in jobs]
+        for row in data:
+            row["state"] = await compact_job_state(row["state"], row["job_id"])
+        result = self.client.table("jobs").insert(data).execute()
+
+        logger.info("jobs_created", count=len(result.data))
+        return [_job_from_row(j) for j in result.data]
 
     async def get_job(self, job_id: str) -> Optional[Job]:
         """
@@ -63,7 +96,7 @@ class JobStorage:
         )
 
         if result.data:
-            return Job.model_validate(result.data[0])
+            return _job_from_row(result.data[0])
         return None
 
     async def get_by_idempotency_key(self, idempotency_key: str) -> Optional[Job]:
@@ -96,35 +129,75 @@ class JobStorage:
                 idempotency_key=idempotency_key,
                 job_id=result.data[0]["job_id"],
             )
-            return Job.model_validate(result.data[0])
+            return _job_from_row(result.data[0])
 
         return None
 
+    async def find_by_result_cache_key(
+        self,
+        cache_key: str,
+        statuses: List[str],
+        updated_since: Optional[datetime] = None,
+        created_since: Optional[datetime] = None,
+    ) -> Optional[Job]:
+        """
+        Retrieve the most recently updated job with a result cache key.
+
+        Args:
+            cache_key: Key from storage.result_cache.result_cache_key()
+            statuses: Job statuses to match
+            updated_since: Only jobs updated after this time
+            created_since: Only jobs created after this time
+
+        Returns:
+            Job if found, None otherwise
+        """
+        query = (
+            self.client.table("jobs")
+            .select("*")
+            .eq("result_cache_key", cache_key)
+            .in_("status", statuses)
+            .gt("expires_at", datetime.now(timezone.utc).isoformat())
+        )
+        if updated_since is not None:
+            query = query.gt("updated_at", updated_since.isoformat())
+        if created_since is not None:
+            query = query.gt("created_at", created_since.isoformat())
+
+        result = query.order("updated_at", desc=True).limit(1).execute()
+
+        if result.data:
+            return _job_from_row(result.data[0])
+        return None
+
     async def list_jobs(
         self,
         brand_id: Optional[str] = None,
         status: Optional[str] = None,
         limit: int = 100,
-        offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> List[Job]:
         """
-        List jobs with optional filtering.
+        List jobs with optional filtering, newest first, using keyset pagination.
 
         Args:
             brand_id: Optional UUID of the brand to filter by
             status: Optional status to filter by
             limit: Maximum number of jobs to return
-            offset: Number of jobs to skip
+            cursor: Optional cursor from the previous page
 
         Returns:
             List of Job entities
+
+        Raises:
+            ValueError: If the cursor is malformed
         """
         logger.debug(
             "listing_jobs",
             brand_id=brand_id,
             status=status,
             limit=limit,
-            offset=offset,
+            has_cursor=bool(cursor),
         )
 
         query = self.client.table("jobs").select("*")
@@ -135,11 +208,60 @@ class JobStorage:
         if status:
             query = query.eq("status", status)
 
+        result = apply_keyset(query, "job_id", limit, cursor).execute()
+
+        return [_job_from_row(j) for j in result.data]
+
+    async def list_child_jobs(self, parent_job_id: str) -> List[Job]:
+        """
+        List the child jobs of a batch in request order.
+
+        Args:
+            parent_job_id: UUID of the batch (parent) job
+
+        Returns:
+            List of child Job entities, ordered by state.batch_index
+        """
+        logger.debug("listing_child_jobs", parent_job_id=parent_job_id)
+
+        result = (
+            self.client.table("jobs")
+            .select("*")
+            .eq("parent_job_id", parent_job_id)
+            .execute()
+        )
+
+        children = [_job_from_row(j) for j in result.data]
+        return sorted(children, key=lambda j: (j.state or {}).get("batch_index", 0))
+
+    async def cancel_children(self, parent_job_id: str) -> List[str]:
+        """
+        Cancel the child jobs of a batch that have not finished.
+
+        Waiting children leave the queue; running children keep their lease
+        until their worker stops them (see api/job_cancellation.py).
+
+        Args:
+            parent_job_id: UUID of the batch (parent) job
+
+        Returns:
+            IDs of the child jobs cancelled
+        """
         result = (
-            query.order("created_at", desc=True).range(offset, offset + limit - 1).execute()
+            self.client.table("jobs")
+            .update({
+                "status": "cancelled",
+                "queued_at": None,
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+            })
+            .eq("parent_job_id", parent_job_id)
+            .in_("status", ["pending", "processing"])
+            .execute()
         )
 
-        return [Job.model_validate(j) for j in result.data]
+        job_ids = [str(row["job_id"]) for row in result.data]
+        logger.info("child_jobs_cancelled", parent_job_id=parent_job_id, count=len(job_ids))
+        return job_ids
 
     async def update_job(self, job_id: str, updates: dict) -> Job:
         """
@@ -159,6 +281,8 @@ class JobStorage:
 
         # Add updated_at timestamp
         updates["updated_at"] = datetime.now(timezone.utc).isoformat()
+        if updates.get("state"):
+            updates["state"] = await compact_job_state(updates["state"], job_id)
 
         result = (
             self.client.table("jobs").update(updates).eq("job_id", job_id).execute()
@@ -168,7 +292,7 @@ class JobStorage:
             raise ValueError(f"Job {job_id} not found")
 
         logger.info("job_updated", job_id=job_id)
-        return Job.model_validate(result.data[0])
+        return _job_from_row(result.data[0])
 
     async def delete_job(self, job_id: str) -> bool:
         """
@@ -216,4 +340,4 @@ class JobStorage:
             .execute()
         )
 
-        return [Job.model_validate(j) for j in result.data]
+        return [_job_from_row(j) for j in result.data]
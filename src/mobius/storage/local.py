@@ -0,0 +1,1037 @@
+"""
+In-process storage backends for offline development and benchmarks.
+
+Provides a drop-in replacement for the Supabase client covering the subset of
+the PostgREST query builder and Storage API that the storage classes use, so
+BrandStorage, JobStorage, etc. run unchanged against:
+
+- "memory": rows and files held in process memory (fastest, non-persistent)
+- "sqlite": rows and files persisted in a single SQLite file
+
+Selected with settings.storage_backend (see database.get_supabase_client).
+
+Equality and IN filters on a table's primary key, brand_id or organization_id
+are answered from an index (dict indexes in memory, json_extract expression
+indexes in SQLite), so per-brand and per-organization queries only decode the
+matching rows. Other filters and ordering are evaluated in Python over the
+candidate rows, which is not a model of Postgres query costs.
+The triggers that maintain brand_stats, the brand feedback counters and the
+graph sync outbox (migrations 006, 007 and 009) are emulated so reads see
+the same aggregates and queued events, and the database functions called
+through client.rpc() are implemented in Python (see LocalSupabaseClient._rpc_*).
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import structlog
+
+from mobius.config import settings
+
+logger = structlog.get_logger()
+
+
+# Primary key per table (mirrors supabase/migrations)
+PRIMARY_KEYS = {
+    "brands": "brand_id",
+    "assets": "asset_id",
+    "jobs": "job_id",
+    "templates": "template_id",
+    "feedback": "feedback_id",
+    "brand_stats": "brand_id",
+    "learning_settings": "brand_id",
+    "brand_patterns": "pattern_id",
+    "industry_patterns": "pattern_id",
+    "learning_audit_log": "log_id",
+    "graph_sync_outbox": "event_id",
+    "graph_backfill_runs": "run_id",
+    "generation_queue_shares": "organization_id",
+}
+
+# Secondary columns with an index in every table that has them
+INDEXED_COLUMNS = ("brand_id", "organization_id")
+
+# Tables whose writes enqueue a graph sync event (migration 009)
+_GRAPH_SYNC_ENTITIES = {
+    "brands": ("brand", "brand_id"),
+    "assets": ("asset", "asset_id"),
+    "templates": ("template", "template_id"),
+    "feedback": ("feedback", "feedback_id"),
+}
+
+# Columns whose update enqueues a graph sync event (the triggers' WHEN
+# clauses); feedback is only synced on insert
+_GRAPH_SYNC_COLUMNS = {
+    "brands": ("organization_id", "name", "guidelines", "deleted_at"),
+    "assets": ("brand_id", "prompt", "image_url", "compliance_score", "status", "created_at"),
+    "templates": (
+        "brand_id", "name", "description", "source_asset_id", "created_at", "deleted_at",
+    ),
+    "feedback": (),
+}
+
+# Column defaults applied on insert (besides the generated primary key)
+_TIMESTAMP_DEFAULTS = {
+    "learning_audit_log": ("timestamp",),
+    "feedback": ("created_at",),
+    "graph_backfill_runs": ("started_at", "updated_at"),
+}
+
+_ROW_DEFAULTS = {
+    "brands": {
+        "feedback_count": 0,
+        "approval_count": 0,
+        "rejection_count": 0,
+        "learning_active": False,
+        "needs_review": [],
+        "deleted_at": None,
+    },
+    "jobs": {
+        "progress": 0.0,
+        "webhook_attempts": 0,
+        "event_seq": 0,
+        "queued_at": None,
+        "lease_owner": None,
+        "leased_until": None,
+        "heartbeat_at": None,
+        "queue_attempts": 0,
+        "queue_priority": 1,
+        "organization_id": None,
+        "queue_finished_at": None,
+        "parent_job_id": None,
+        "result_cache_key": None,
+    },
+    "templates": {"deleted_at": None},
+    "graph_backfill_runs": {
+        "progress": {},
+        "last_error": None,
+        "completed_at": None,
+        "lease_owner": None,
+        "leased_until": None,
+    },
+    "graph_sync_outbox": {
+        "operation": "upsert",
+        "attempts": 0,
+        "last_error": None,
+        "leased_until": None,
+        "processed_at": None,
+    },
+}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _normalize(row: dict) -> dict:
+    """Round-trip through JSON so stored rows look like PostgREST responses."""
+    return json.loads(json.dumps(row, default=_json_default))
+
+
+# ---------------------------------------------------------------------------
+# Row stores
+# ---------------------------------------------------------------------------
+
+
+class MemoryStore:
+    """Rows and files held in process memory."""
+
+    def __init__(self):
+        self._tables: Dict[str, Dict[str, dict]] = {}
+        # table -> column -> value -> primary keys of rows with that value
+        self._indexes: Dict[str, Dict[str, Dict[str, Set[str]]]] = {}
+        self._files: Dict[Tuple[str, str], Tuple[bytes, str, str]] = {}
+        self.lock = threading.RLock()
+
+    def rows(self, table: str) -> List[dict]:
+        return [dict(r) for r in self._tables.get(table, {}).values()]
+
+    def rows_where(self, table: str, column: str, values: Iterable[Any]) -> List[dict]:
+        """Rows whose indexed column (INDEXED_COLUMNS) equals one of values."""
+        index = self._indexes.get(table, {}).get(column, {})
+        rows = self._tables.get(table, {})
+        pks = set()
+        for value in values:
+            pks |= index.get(str(value), set())
+        return [dict(rows[pk]) for pk in pks]
+
+    def get(self, table: str, pk: str) -> Optional[dict]:
+        row = self._tables.get(table, {}).get(pk)
+        return dict(row) if row is not None else None
+
+    def put(self, table: str, pk: str, row: dict) -> None:
+        self.remove(table, pk)
+        self._tables.setdefault(table, {})[pk] = dict(row)
+        indexes = self._indexes.setdefault(table, {})
+        for column in INDEXED_COLUMNS:
+            if row.get(column) is not None:
+                indexes.setdefault(column, {}).setdefault(str(row[column]), set()).add(pk)
+
+    def remove(self, table: str, pk: str) -> None:
+        old = self._tables.get(table, {}).pop(pk, None)
+        if old is None:
+            return
+        indexes = self._indexes.get(table, {})
+        for column in INDEXED_COLUMNS:
+            if old.get(column) is not None:
+                pks = indexes.get(column, {}).get(str(old[column]))
+                if pks is not None:
+                    pks.discard(pk)
+                    if not pks:
+                        del indexes[column][str(old[column])]
+
+    def put_file(self, bucket: str, path: str, data: bytes, content_type: str) -> None:
+        self._files[(bucket, path)] = (data, content_type, _now())
+
+    def get_file(self, bucket: str, path: str) -> Optional[Tuple[bytes, str]]:
+        entry = self._files.get((bucket, path))
+        return (entry[0], entry[1]) if entry else None
+
+    def remove_file(self, bucket: str, path: str) -> None:
+        self._files.pop((bucket, path), None)
+
+    def list_files(self, bucket: str, prefix: str) -> List[Tuple[str, int, str, str]]:
+        return [
+            (path, len(data), content_type, created_at)
+            for (b, path), (data, content_type, created_at) in self._files.items()
+            if b == bucket and path.startswith(prefix)
+        ]
+
+
+class SQLiteStore:
+    """Rows (as JSON documents) and files persisted in a SQLite database."""
+
+    def __init__(self, path: str):
+        self.lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rows ("
+            "tbl TEXT NOT NULL, pk TEXT NOT NULL, data TEXT NOT NULL, PRIMARY KEY (tbl, pk))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "bucket TEXT NOT NULL, path TEXT NOT NULL, data BLOB NOT NULL, "
+            "content_type TEXT, created_at TEXT, PRIMARY KEY (bucket, path))"
+        )
+        for column in INDEXED_COLUMNS:
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_rows_{column} "
+                f"ON rows (tbl, json_extract(data, '$.{column}'))"
+            )
+
+    def rows(self, table: str) -> List[dict]:
+        cur = self._conn.execute("SELECT data FROM rows WHERE tbl = ?", (table,))
+        return [json.loads(data) for (data,) in cur.fetchall()]
+
+    def rows_where(self, table: str, column: str, values: Iterable[Any]) -> List[dict]:
+        """Rows whose indexed column (INDEXED_COLUMNS) equals one of values."""
+        if column not in INDEXED_COLUMNS:
+            raise ValueError(f"Column is not indexed: {column}")
+        values = [str(value) for value in values]
+        if not values:
+            return []
+        placeholders = ", ".join("?" for _ in values)
+        cur = self._conn.execute(
+            f"SELECT data FROM rows WHERE tbl = ? "
+            f"AND json_extract(data, '$.{column}') IN ({placeholders})",
+            (table, *values),
+        )
+        return [json.loads(data) for (data,) in cur.fetchall()]
+
+    def get(self, table: str, pk: str) -> Optional[dict]:
+        cur = self._conn.execute("SELECT data FROM rows WHERE tbl = ? AND pk = ?", (table, pk))
+        found = cur.fetchone()
+        return json.loads(found[0]) if found else None
+
+    def put(self, table: str, pk: str, row: dict) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO rows (tbl, pk, data) VALUES (?, ?, ?)",
+            (table, pk, json.dumps(row)),
+        )
+
+    def remove(self, table: str, pk: str) -> None:
+        self._conn.execute("DELETE FROM rows WHERE tbl = ? AND pk = ?", (table, pk))
+
+    def put_file(self, bucket: str, path: str, data: bytes, content_type: str) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO files (bucket, path, data, content_type, created_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (bucket, path, data, content_type, _now()),
+        )
+
+    def get_file(self, bucket: str, path: str) -> Optional[Tuple[bytes, str]]:
+        cur = self._conn.execute(
+            "SELECT data, content_type FROM files WHERE bucket = ? AND path = ?", (bucket, path)
+        )
+        found = cur.fetchone()
+        return (bytes(found[0]), found[1]) if found else None
+
+    def remove_file(self, bucket: str, path: str) -> None:
+        self._conn.execute("DELETE FROM files WHERE bucket = ? AND path = ?", (bucket, path))
+
+    def list_files(self, bucket: str, prefix: str) -> List[Tuple[str, int, str, str]]:
+        cur = self._conn.execute(
+            "SELECT path, LENGTH(data), content_type, created_at FROM files "
+            "WHERE bucket = ? AND substr(path, 1, ?) = ?",
+            (bucket, len(prefix), prefix),
+        )
+        return cur.fetchall()
+
+
+# ---------------------------------------------------------------------------
+# Filter evaluation
+# ---------------------------------------------------------------------------
+
+
+def _coerce(a: Any, b: Any) -> Tuple[Any, Any]:
+    """Make a stored value and a filter value comparable."""
+    if isinstance(a, bool) or isinstance(b, bool):
+        return a, b
+    if isinstance(a, (int, float)) and isinstance(b, str):
+        try:
+            return a, float(b)
+        except ValueError:
+            return str(a), b
+    if isinstance(a, str) and isinstance(b, str) and "T" in a and "T" in b:
+        try:
+            return (
+                datetime.fromisoformat(a.replace("Z", "+00:00")),
+                datetime.fromisoformat(b.replace("Z", "+00:00")),
+            )
+        except ValueError:
+            pass
+    return a, b
+
+
+def _like(value: Any, pattern: str, case_insensitive: bool) -> bool:
+    if value is None:
+        return False
+    regex = "^" + ".*".join(re.escape(part) for part in pattern.split("%")) + "$"
+    return re.match(regex, str(value), re.IGNORECASE if case_insensitive else 0) is not None
+
+
+def _compare(op: str, value: Any, operand: Any) -> bool:
+    if op == "is":
+        if operand in (None, "null"):
+            return value is None
+        return value is (operand in (True, "true"))
+    if op == "in":
+        return value in operand or str(value) in [str(o) for o in operand]
+    if op in ("like", "ilike"):
+        return _like(value, operand, op == "ilike")
+    if value is None:
+        return False
+    left, right = _coerce(value, operand)
+    try:
+        if op == "eq":
+            return left == right or str(left) == str(right)
+        if op == "neq":
+            return not (left == right or str(left) == str(right))
+        if op == "lt":
+            return left < right
+        if op == "lte":
+            return left <= right
+        if op == "gt":
+            return left > right
+        if op == "gte":
+            return left >= right
+    except TypeError:
+        return False
+    raise ValueError(f"Unsupported filter operator: {op}")
+
+
+def _split_top_level(text: str) -> List[str]:
+    """Split on commas that are not inside parentheses or double quotes."""
+    parts, depth, quoted, current = [], 0, False, []
+    for ch in text:
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        if ch == "," and depth == 0 and not quoted:
+            parts.append("".join(current).strip())
+            current = []
+        else:
+            current.append(ch)
+    if current:
+        parts.append("".join(current).strip())
+    return parts
+
+
+def _parse_logic(expression: str, conjunction: str) -> Callable[[dict], bool]:
+    """Compile a PostgREST logic expression such as or_() arguments into a predicate."""
+    predicates = []
+    for term in _split_top_level(expression):
+        group = re.match(r"^(and|or)\((.*)\)$", term)
+        if group:
+            predicates.append(_parse_logic(group.group(2), group.group(1)))
+            continue
+        column, op, raw = term.split(".", 2)
+        value = raw[1:-1] if raw.startswith('"') and raw.endswith('"') else raw
+        predicates.append(lambda row, c=column, o=op, v=value: _compare(o, row.get(c), v))
+
+    if conjunction == "and":
+        return lambda row: all(p(row) for p in predicates)
+    return lambda row: any(p(row) for p in predicates)
+
+
+# ---------------------------------------------------------------------------
+# Query builder
+# ---------------------------------------------------------------------------
+
+
+class LocalResponse:
+    """Mimics the postgrest APIResponse (data + count)."""
+
+    def __init__(self, data: List[dict], count: Optional[int] = None):
+        self.data = data
+        self.count = len(data) if count is None and isinstance(data, list) else count
+
+
+class LocalRPC:
+    """Mimics a postgrest rpc() call (executes a Python stand-in for the function)."""
+
+    def __init__(self, client: "LocalSupabaseClient", name: str, params: dict):
+        self._client = client
+        self._name = name
+        self._params = params
+
+    def execute(self) -> LocalResponse:
+        function = getattr(self._client, f"_rpc_{self._name}", None)
+        if function is None:
+            raise ValueError(f"Unsupported database function: {self._name}")
+        with self._client.store.lock:
+            data = function(**self._params)
+        return LocalResponse(data, count=len(data) if isinstance(data, list) else None)
+
+
+class LocalQuery:
+    """Chainable query builder compatible with the postgrest-py subset used in Mobius."""
+
+    def __init__(self, client: "LocalSupabaseClient", table: str):
+        self._client = client
+        self._table = table
+        self._action = "select"
+        self._columns = "*"
+        self._payload: Any = None
+        self._filters: List[Callable[[dict], bool]] = []
+        self._order: List[Tuple[str, bool]] = []
+        self._limit: Optional[int] = None
+        self._offset = 0
+        self._count: Optional[str] = None
+        self._negate_next = False
+        # (column, values) of an equality filter answerable from an index
+        self._index_lookup: Optional[Tuple[str, List[Any]]] = None
+
+    # Actions
+
+    def select(self, columns: str = "*", count: Optional[str] = None, **kwargs) -> "LocalQuery":
+        self._columns = columns
+        self._count = count
+        return self
+
+    def insert(self, payload: Any, **kwargs) -> "LocalQuery":
+        self._action, self._payload = "insert", payload
+        return self
+
+    def upsert(self, payload: Any, **kwargs) -> "LocalQuery":
+        self._action, self._payload = "upsert", payload
+        return self
+
+    def update(self, payload: dict, **kwargs) -> "LocalQuery":
+        self._action, self._payload = "update", payload
+        return self
+
+    def delete(self, **kwargs) -> "LocalQuery":
+        self._action = "delete"
+        return self
+
+    # Filters
+
+    @property
+    def not_(self) -> "LocalQuery":
+        """Negate the next filter (postgrest-py ``.not_.in_(...)``)."""
+        self._negate_next = True
+        return self
+
+    def _filter(self, column: str, op: str, value: Any) -> "LocalQuery":
+        negate, self._negate_next = self._negate_next, False
+        self._filters.append(lambda row: _compare(op, row.get(column), value) != negate)
+        if not negate and op in ("eq", "in") and self._prefer_index(column):
+            self._index_lookup = (column, value if op == "in" else [value])
+        return self
+
+    def _prefer_index(self, column: str) -> bool:
+        """Whether an index on column narrows better than the current lookup."""
+        is_pk = column == PRIMARY_KEYS.get(self._table, "id")
+        if self._index_lookup is None:
+            return is_pk or column in INDEXED_COLUMNS
+        return is_pk
+
+    def eq(self, column: str, value: Any) -> "LocalQuery":
+        return self._filter(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> "LocalQuery":
+        return self._filter(column, "neq", value)
+
+    def gt(self, column: str, value: Any) -> "LocalQuery":
+        return self._filter(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> "LocalQuery":
+        return self._filter(column, "gte", value)
+
+    def lt(self, column: str, value: Any) -> "LocalQuery":
+        return self._filter(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> "LocalQuery":
+        return self._filter(column, "lte", value)
+
+    def is_(self, column: str, value: Any) -> "LocalQuery":
+        return self._filter(column, "is", value)
+
+    def in_(self, column: str, values: List[Any]) -> "LocalQuery":
+        return self._filter(column, "in", list(values))
+
+    def like(self, column: str, pattern: str) -> "LocalQuery":
+        return self._filter(column, "like", pattern)
+
+    def ilike(self, column: str, pattern: str) -> "LocalQuery":
+        return self._filter(column, "ilike", pattern)
+
+    def or_(self, filters: str, **kwargs) -> "LocalQuery":
+        self._filters.append(_parse_logic(filters, "or"))
+        return self
+
+    # Modifiers
+
+    def order(self, column: str, desc: bool = False, **kwargs) -> "LocalQuery":
+        self._order.append((column, desc))
+        return self
+
+    def limit(self, size: int, **kwargs) -> "LocalQuery":
+        self._limit = size
+        return self
+
+    def range(self, start: int, end: int, **kwargs) -> "LocalQuery":
+        self._offset = start
+        self._limit = end - start + 1
+        return self
+
+    def execute(self) -> LocalResponse:
+        with self._client.store.lock:
+            if self._action == "select":
+                matching = self._matching()
+                return LocalResponse(
+                    self._project(self._page(matching)),
+                    count=len(matching) if self._count else None,
+                )
+            if self._action in ("insert", "upsert"):
+                return LocalResponse(self._client._insert(self._table, self._payload, self._action == "upsert"))
+            if self._action == "update":
+                return LocalResponse(self._client._update(self._table, self._matching(), self._payload))
+            if self._action == "delete":
+                return LocalResponse(self._client._delete(self._table, self._matching()))
+        raise ValueError(f"Unsupported action: {self._action}")
+
+    def _matching(self) -> List[dict]:
+        return [r for r in self._candidates() if all(f(r) for f in self._filters)]
+
+    def _candidates(self) -> List[dict]:
+        """Rows that may match: an index lookup when a filter allows it, else the table."""
+        store = self._client.store
+        if self._index_lookup is None:
+            return store.rows(self._table)
+        column, values = self._index_lookup
+        if column == PRIMARY_KEYS.get(self._table, "id"):
+            found = (store.get(self._table, str(value)) for value in dict.fromkeys(values))
+            return [row for row in found if row is not None]
+        return store.rows_where(self._table, column, values)
+
+    def _page(self, rows: List[dict]) -> List[dict]:
+        # Stable multi-key sort: apply keys from last to first; NULLs sort last
+        for column, desc in reversed(self._order):
+            present = [r for r in rows if r.get(column) is not None]
+            missing = [r for r in rows if r.get(column) is None]
+            present.sort(key=lambda r: _coerce(r[column], r[column])[0], reverse=desc)
+            rows = present + missing
+        end = None if self._limit is None else self._offset + self._limit
+        return rows[self._offset:end]
+
+    def _project(self, rows: List[dict]) -> List[dict]:
+        columns = _split_top_level(self._columns)
+        if columns == ["*"]:
+            return rows
+
+        projected = []
+        for row in rows:
+            out: Optional[dict] = {}
+            for column in columns:
+                embed = re.match(r"^(\w+)(!inner)?\((.*)\)$", column)
+                json_path = re.match(r"^(?:(\w+):)?(\w+)((?:->>?\w+)+)$", column)
+                if column == "*":
+                    out.update(row)
+                elif json_path:
+                    # alias:column->key->>key (PostgREST JSON path selection)
+                    alias, base, path = json_path.groups()
+                    value = row.get(base)
+                    keys = re.findall(r"->>?(\w+)", path)
+                    for key in keys:
+                        value = value.get(key) if isinstance(value, dict) else None
+                    if path.rsplit("->", 1)[-1].startswith(">") and value is not None:
+                        value = value if isinstance(value, str) else json.dumps(value)
+                    out[alias or keys[-1]] = value
+                elif embed:
+                    name, inner, embed_columns = embed.groups()
+                    key = PRIMARY_KEYS.get(name, f"{name}_id")
+                    related = self._client.store.get(name, str(row.get(key)))
+                    if related is None and inner:
+                        out = None
+                        break
+                    wanted = [c.strip() for c in embed_columns.split(",")]
+                    out[name] = (
+                        None if related is None
+                        else related if wanted == ["*"]
+                        else {c: related.get(c) for c in wanted}
+                    )
+                else:
+                    out[column] = row.get(column)
+            if out is not None:
+                projected.append(out)
+        return projected
+
+
+# ---------------------------------------------------------------------------
+# Storage buckets
+# ---------------------------------------------------------------------------
+
+
+class LocalBucket:
+    """Mimics the storage3 bucket file API (upload/get_public_url/remove/list)."""
+
+    def __init__(self, client: "LocalSupabaseClient", bucket: str):
+        self._client = client
+        self._bucket = bucket
+
+    def upload(self, path: str, file: bytes, file_options: Optional[dict] = None) -> dict:
+        content_type = (file_options or {}).get("content-type", "application/octet-stream")
+        with self._client.store.lock:
+            self._client.store.put_file(self._bucket, path, bytes(file), content_type)
+        return {"path": path, "Key": f"{self._bucket}/{path}"}
+
+    def download(self, path: str) -> bytes:
+        found = self._client.store.get_file(self._bucket, path)
+        if found is None:
+            raise FileNotFoundError(f"{self._bucket}/{path}")
+        return found[0]
+
+    def get_public_url(self, path: str, options: Optional[dict] = None) -> str:
+        return f"{settings.local_storage_public_url.rstrip('/')}/{self._bucket}/{path}"
+
+    def remove(self, paths: List[str]) -> List[dict]:
+        with self._client.store.lock:
+            for path in paths:
+                self._client.store.remove_file(self._bucket, path)
+        return [{"name": p} for p in paths]
+
+    def list(self, path: Optional[str] = None, options: Optional[dict] = None) -> List[dict]:
+        prefix = f"{path.rstrip('/')}/" if path else ""
+        return [
+            {
+                "name": full_path[len(prefix):],
+                "id": full_path,
+                "created_at": created_at,
+                "metadata": {"size": size, "mimetype": content_type},
+            }
+            for full_path, size, content_type, created_at in self._client.store.list_files(
+                self._bucket, prefix
+            )
+        ]
+
+
+class _LocalStorageAPI:
+    def __init__(self, client: "LocalSupabaseClient"):
+        self._client = client
+
+    def from_(self, bucket: str) -> LocalBucket:
+        return LocalBucket(self._client, bucket)
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+
+class LocalSupabaseClient:
+    """
+    Supabase client stand-in backed by a MemoryStore or SQLiteStore.
+
+    Usage:
+        client = LocalSupabaseClient(MemoryStore())
+        client.table("brands").select("*").eq("brand_id", brand_id).execute()
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.storage = _LocalStorageAPI(self)
+        self._outbox_seq: Optional[int] = None
+
+    def table(self, name: str) -> LocalQuery:
+        return LocalQuery(self, name)
+
+    def rpc(self, name: str, params: Optional[dict] = None) -> LocalRPC:
+        return LocalRPC(self, name, params or {})
+
+    # Database functions (called with store.lock held)
+
+    def _rpc_reserve_job_event_seqs(self, p_job_id: str, p_count: int) -> Optional[int]:
+        """Emulates reserve_job_event_seqs (migration 011)."""
+        job = self.store.get("jobs", str(p_job_id))
+        if job is None:
+            return None
+        job["event_seq"] = (job.get("event_seq") or 0) + max(int(p_count), 1)
+        self.store.put("jobs", str(p_job_id), job)
+        return job["event_seq"]
+
+    def _rpc_claim_graph_sync_events(self, p_limit: int, p_lease_seconds: int) -> List[dict]:
+        """Emulates claim_graph_sync_events (migration 009)."""
+        now = datetime.now(timezone.utc)
+
+        def after_now(value: Any) -> bool:
+            return bool(value) and datetime.fromisoformat(str(value).replace("Z", "+00:00")) > now
+
+        pending = sorted(
+            (r for r in self.store.rows("graph_sync_outbox") if r.get("processed_at") is None),
+            key=lambda r: int(r["event_id"]),
+        )
+        blocked = {
+            r["brand_id"] for r in pending
+            if after_now(r.get("next_attempt_at")) or after_now(r.get("leased_until"))
+        }
+        lease = (now + timedelta(seconds=p_lease_seconds)).isoformat()
+        claimed = []
+        for row in pending:
+            if len(claimed) >= p_limit:
+                break
+            if row["brand_id"] in blocked:
+                continue
+            row["leased_until"] = lease
+            self.store.put("graph_sync_outbox", str(row["event_id"]), row)
+            claimed.append(row)
+        return claimed
+
+    def _rpc_claim_graph_backfill_run(
+        self, p_run_id: str, p_organization_id: Optional[str], p_owner: str, p_lease_seconds: int
+    ) -> List[dict]:
+        """Emulates claim_graph_backfill_run (migration 010)."""
+        now = datetime.now(timezone.utc)
+        lease = (now + timedelta(seconds=p_lease_seconds)).isoformat()
+        run = self.store.get("graph_backfill_runs", str(p_run_id))
+        if run is None:
+            return self._insert("graph_backfill_runs", {
+                "run_id": p_run_id,
+                "organization_id": p_organization_id,
+                "status": "pending",
+                "lease_owner": p_owner,
+                "leased_until": lease,
+            }, upsert=False)
+
+        leased_until = run.get("leased_until")
+        held = (
+            run.get("lease_owner") is not None
+            and run["lease_owner"] != p_owner
+            and leased_until is not None
+            and datetime.fromisoformat(str(leased_until).replace("Z", "+00:00")) >= now
+        )
+        if held:
+            return []
+        run.update({"lease_owner": p_owner, "leased_until": lease, "updated_at": _now()})
+        self.store.put("graph_backfill_runs", str(p_run_id), run)
+        return [run]
+
+    def _rpc_rank_generation_queue(self, p_org_max_concurrency: Optional[int] = None) -> List[dict]:
+        """Emulates rank_generation_queue (migration 014)."""
+        jobs = [r for r in self.store.rows("jobs") if r.get("queued_at")]
+        running_orgs: Dict[Any, int] = {}
+        running_brands: Dict[Any, int] = {}
+        for job in jobs:
+            if job.get("lease_owner") is not None:
+                org = job.get("organization_id")
+                running_orgs[org] = running_orgs.get(org, 0) + 1
+                running_brands[job["brand_id"]] = running_brands.get(job["brand_id"], 0) + 1
+
+        waiting = sorted(
+            (r for r in jobs if r.get("lease_owner") is None and r.get("status") == "pending"),
+            key=lambda r: (r.get("queue_priority", 1), r["queued_at"]),
+        )
+        brand_slots: Dict[str, float] = {}
+        for job in waiting:
+            brand_id = job["brand_id"]
+            running_brands[brand_id] = running_brands.get(brand_id, 0) + 1
+            brand_slots[job["job_id"]] = running_brands[brand_id]
+
+        ranked = []
+        for job in sorted(
+            waiting,
+            key=lambda r: (r.get("queue_priority", 1), brand_slots[r["job_id"]], r["queued_at"]),
+        ):
+            org = job.get("organization_id")
+            running_orgs[org] = running_orgs.get(org, 0) + 1
+            share = self.store.get("generation_queue_shares", str(org)) if org else None
+            weight = (share or {}).get("weight") or 1
+            cap = (share or {}).get("max_concurrency") or p_org_max_concurrency
+            ranked.append({
+                "job_id": job["job_id"],
+                "queue_priority": job.get("queue_priority", 1),
+                "claimable": cap is None or running_orgs[org] <= cap,
+                "_order": (
+                    job.get("queue_priority", 1),
+                    running_orgs[org] / weight,
+                    brand_slots[job["job_id"]],
+                    job["queued_at"],
+                ),
+            })
+
+        ranked.sort(key=lambda r: r.pop("_order"))
+        for position, row in enumerate(ranked):
+            row["queue_position"] = position
+        return ranked
+
+    def _rpc_claim_generation_jobs(
+        self,
+        p_owner: str,
+        p_limit: int,
+        p_lease_seconds: int,
+        p_max_priority: Optional[int] = None,
+        p_org_max_concurrency: Optional[int] = None,
+    ) -> List[dict]:
+        """Emulates claim_generation_jobs (migration 014)."""
+        now = datetime.now(timezone.utc)
+        candidates = [
+            r for r in self._rpc_rank_generation_queue(p_org_max_concurrency)
+            if r["claimable"] and (p_max_priority is None or r["queue_priority"] <= p_max_priority)
+        ]
+        claimed = []
+        for candidate in candidates[:p_limit]:
+            job = self.store.get("jobs", str(candidate["job_id"]))
+            job.update({
+                "lease_owner": p_owner,
+                "leased_until": (now + timedelta(seconds=p_lease_seconds)).isoformat(),
+                "heartbeat_at": now.isoformat(),
+                "queue_attempts": (job.get("queue_attempts") or 0) + 1,
+                "updated_at": now.isoformat(),
+            })
+            self.store.put("jobs", str(job["job_id"]), job)
+            claimed.append(job)
+        return claimed
+
+    def _rpc_generation_queue_position(
+        self, p_job_id: str, p_org_max_concurrency: Optional[int] = None
+    ) -> Optional[int]:
+        """Emulates generation_queue_position (migration 014)."""
+        for row in self._rpc_rank_generation_queue(p_org_max_concurrency):
+            if str(row["job_id"]) == str(p_job_id):
+                return row["queue_position"]
+        return None
+
+    def _rpc_requeue_expired_generation_jobs(self, p_max_attempts: int) -> List[dict]:
+        """Emulates requeue_expired_generation_jobs (migration 013)."""
+        now = datetime.now(timezone.utc)
+        reaped = []
+        for job in self.store.rows("jobs"):
+            leased_until = job.get("leased_until")
+            if not (job.get("queued_at") and job.get("lease_owner") and leased_until):
+                continue
+            if datetime.fromisoformat(str(leased_until).replace("Z", "+00:00")) >= now:
+                continue
+            requeued = (job.get("queue_attempts") or 0) < p_max_attempts
+            job.update({"lease_owner": None, "leased_until": None, "updated_at": now.isoformat()})
+            if requeued:
+                job["status"] = "pending"
+            else:
+                job.update({
+                    "status": "failed",
+                    "queued_at": None,
+                    "error": f"Worker lease expired after {job.get('queue_attempts')} attempts",
+                })
+            self.store.put("jobs", str(job["job_id"]), job)
+            reaped.append({"job_id": job["job_id"], "requeued": requeued})
+        return reaped
+
+    # Writes (called with store.lock held)
+
+    def _insert(self, table: str, payload: Any, upsert: bool) -> List[dict]:
+        pk_column = PRIMARY_KEYS.get(table, "id")
+        inserted = []
+        for data in payload if isinstance(payload, list) else [payload]:
+            row = {**_ROW_DEFAULTS.get(table, {}), **_normalize(data)}
+            row.setdefault(pk_column, str(uuid.uuid4()))
+            for column in _TIMESTAMP_DEFAULTS.get(table, ("created_at", "updated_at")):
+                if row.get(column) is None:
+                    row[column] = _now()
+            if table == "jobs" and row.get("expires_at") is None:
+                row["expires_at"] = (datetime.now(timezone.utc) + timedelta(hours=24)).isoformat()
+
+            pk = str(row[pk_column])
+            old = self.store.get(table, pk)
+            if old is not None:
+                if not upsert:
+                    raise Exception(
+                        f'duplicate key value violates unique constraint "{table}_pkey"'
+                    )
+                row = {**old, **row}
+            self.store.put(table, pk, row)
+            self._after_write(table, old, row)
+            inserted.append(row)
+        return inserted
+
+    def _update(self, table: str, rows: List[dict], updates: dict) -> List[dict]:
+        pk_column = PRIMARY_KEYS.get(table, "id")
+        changes = _normalize(updates)
+        updated = []
+        for old in rows:
+            row = {**old, **changes}
+            self.store.put(table, str(row[pk_column]), row)
+            self._after_write(table, old, row)
+            updated.append(row)
+        return updated
+
+    def _delete(self, table: str, rows: List[dict]) -> List[dict]:
+        pk_column = PRIMARY_KEYS.get(table, "id")
+        for old in rows:
+            self.store.remove(table, str(old[pk_column]))
+            self._after_write(table, old, None)
+        return rows
+
+    # Trigger emulation
+
+    def _after_write(self, table: str, old: Optional[dict], new: Optional[dict]) -> None:
+        if table == "assets":
+            self._apply_brand_stats(old, new)
+        elif table == "feedback" and (old is None) != (new is None):
+            self._apply_feedback_counters(new or old, 1 if new else -1)
+
+        if table in _GRAPH_SYNC_ENTITIES and new is not None and (
+            old is None
+            or any(old.get(column) != new.get(column) for column in _GRAPH_SYNC_COLUMNS[table])
+        ):
+            self._enqueue_graph_sync(table, new)
+
+    def _apply_brand_stats(self, old: Optional[dict], new: Optional[dict]) -> None:
+        """Emulates assets_brand_stats_trigger (migration 006)."""
+        for row, sign in ((old, -1), (new, 1)):
+            if row is None:
+                continue
+            brand_id = str(row["brand_id"])
+            stats = self.store.get("brand_stats", brand_id) or {
+                "brand_id": brand_id,
+                "asset_count": 0,
+                "scored_asset_count": 0,
+                "compliance_score_sum": 0.0,
+                "last_activity": None,
+            }
+            score = row.get("compliance_score")
+            stats["asset_count"] = max(stats["asset_count"] + sign, 0)
+            if score is not None:
+                stats["scored_asset_count"] = max(stats["scored_asset_count"] + sign, 0)
+                stats["compliance_score_sum"] += sign * score
+            if sign > 0:
+                activity = [v for v in (stats["last_activity"], row.get("created_at")) if v]
+            else:
+                # Like the trigger, only rescan when an asset leaves the brand
+                activity = [
+                    a["created_at"] for a in self.store.rows_where("assets", "brand_id", [brand_id])
+                    if a.get("created_at")
+                ]
+            stats["last_activity"] = (
+                max(activity, key=lambda v: _coerce(v, v)[0]) if activity else None
+            )
+            stats["updated_at"] = _now()
+            self.store.put("brand_stats", brand_id, stats)
+
+    def _apply_feedback_counters(self, row: dict, delta: int) -> None:
+        """Emulates feedback_learning_trigger (migration 007)."""
+        from mobius.constants import LEARNING_ACTIVATION_THRESHOLD
+
+        brand = self.store.get("brands", str(row["brand_id"]))
+        if brand is None:
+            return
+        brand["feedback_count"] = max((brand.get("feedback_count") or 0) + delta, 0)
+        counter = {"approve": "approval_count", "reject": "rejection_count"}.get(row.get("action"))
+        if counter:
+            brand[counter] = max((brand.get(counter) or 0) + delta, 0)
+        brand["learning_active"] = brand["feedback_count"] >= LEARNING_ACTIVATION_THRESHOLD
+        self.store.put("brands", str(brand["brand_id"]), brand)
+
+    def _enqueue_graph_sync(self, table: str, row: dict) -> None:
+        """Emulates enqueue_graph_sync (migration 009)."""
+        if self._outbox_seq is None:
+            self._outbox_seq = max(
+                (int(r["event_id"]) for r in self.store.rows("graph_sync_outbox")), default=0
+            )
+        self._outbox_seq += 1
+        entity_type, id_column = _GRAPH_SYNC_ENTITIES[table]
+        now = _now()
+        self.store.put("graph_sync_outbox", str(self._outbox_seq), {
+            **_ROW_DEFAULTS["graph_sync_outbox"],
+            "event_id": self._outbox_seq,
+            "entity_type": entity_type,
+            "entity_id": str(row[id_column]),
+            "brand_id": str(row["brand_id"]),
+            "operation": "delete" if row.get("deleted_at") else "upsert",
+            "next_attempt_at": now,
+            "created_at": now,
+        })
+
+
+_local_client: Optional[LocalSupabaseClient] = None
+
+
+def get_local_client() -> LocalSupabaseClient:
+    """
+    Get the process-wide local client for settings.storage_backend.
+
+    Returns:
+        LocalSupabaseClient backed by memory or SQLite
+
+    Raises:
+        ValueError: If storage_backend is not "memory" or "sqlite"
+    """
+    global _local_client
+
+    if _local_client is None:
+        backend = settings.storage_backend
+        if backend == "memory":
+            store = MemoryStore()
+        elif backend == "sqlite":
+            store = SQLiteStore(settings.local_sqlite_path)
+        else:
+            raise ValueError(f"Unsupported local storage backend: {backend}")
+
+        _local_client = LocalSupabaseClient(store)
+        logger.info(
+            "local_storage_backend_initialized",
+            backend=backend,
+            sqlite_path=settings.local_sqlite_path if backend == "sqlite" else None,
+        )
+
+    return _local_client
+
+
+def reset_local_client() -> None:
+    """Drop the process-wide local client (memory data is discarded)."""
+    global _local_client
+    _local_client = None
@@ -0,0 +1,109 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Listings are ordered by (created_at DESC, <id> DESC). A cursor encodes the
+(created_at, id) of the last row of a page, and the next page starts strictly
+after that position. Each page is therefore a bounded range scan on a
+(…, created_at, id) index, so page N costs the same as page 1, unlike
+OFFSET-based paging which must skip every preceding row.
+
+Cursors are opaque to clients: URL-safe base64 of a small JSON document.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple, Union
+
+
+def encode_cursor(created_at: Union[datetime, str], row_id: str) -> str:
+    """
+    Encode a keyset position as an opaque cursor.
+
+    Args:
+        created_at: Creation timestamp of the last row on the page
+        row_id: Primary key of the last row on the page
+
+    Returns:
+        Opaque URL-safe cursor string
+    """
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    payload = json.dumps({"c": created_at, "i": str(row_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Decode an opaque cursor back into its keyset position.
+
+    Args:
+        cursor: Cursor previously returned by encode_cursor
+
+    Returns:
+        Tuple of (created_at ISO timestamp, row id)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        created_at = payload["c"]
+        row_id = payload["i"]
+        # Reject anything that is not a timestamp so it cannot alter the filter
+        datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor!r}") from e
+
+    if not isinstance(row_id, str) or not row_id or any(c in row_id for c in ',()"'):
+        raise ValueError(f"Invalid pagination cursor: {cursor!r}")
+
+    return created_at, row_id
+
+
+def apply_keyset(query: Any, id_column: str, limit: int, cursor: Optional[str] = None) -> Any:
+    """
+    Apply keyset ordering, cursor filter and page size to a PostgREST query.
+
+    Args:
+        query: Supabase query builder with filters already applied
+        id_column: Primary key column used as the ordering tie-breaker
+        limit: Page size
+        cursor: Optional cursor from a previous page
+
+    Returns:
+        Query builder ready to execute
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    query = query.order("created_at", desc=True).order(id_column, desc=True)
+
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.or_(
+            f'created_at.lt."{created_at}",'
+            f'and(created_at.eq."{created_at}",{id_column}.lt."{row_id}")'
+        )
+
+    return query.limit(limit)
+
+
+def next_cursor(items: Sequence[Any], id_attr: str, limit: int) -> Optional[str]:
+    """
+    Build the cursor for the page following ``items``.
+
+    Args:
+        items: Rows (models) of the current page, in keyset order
+        id_attr: Name of the primary key attribute on each item
+        limit: Page size that was requested
+
+    Returns:
+        Cursor for the next page, or None if this was the last page
+    """
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(last.created_at, getattr(last, id_attr))
@@ -0,0 +1,252 @@
+"""
+Exact-request generation result cache.
+
+Teams resubmit the same prompt for the same brand (duplicate clicks, retries,
+templated automations). A request that opts in (cache="use") is keyed by the
+brand's guidelines version, the normalized prompt, template_id, the
+generation params and seed; if an approved job with that key finished within
+the TTL, its asset and compliance score are returned without running the
+workflow. cache="refresh" skips the lookup and runs a new generation, which
+then becomes the cached result for later requests.
+
+Identical requests that arrive while one is still running are collapsed onto
+that run (single-flight): within a process they share one call, and across
+processes a request that finds a pending or processing job with its key
+returns that job instead of starting another.
+
+Design Principles:
+- The jobs table is the cache (jobs.result_cache_key, migration 016); only
+  completed jobs are served, so a hit is always an approved asset
+- Editing the brand changes its updated_at and so every key for the brand
+- Tweaking a job clears its key: the tweaked image no longer matches the prompt
+- Requests without cache (the default) are neither served nor stored
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import unicodedata
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import structlog
+
+from mobius.config import settings
+from mobius.models.brand import Brand
+
+if TYPE_CHECKING:
+    from mobius.models.job import Job
+    from mobius.storage.jobs import JobStorage
+
+logger = structlog.get_logger()
+
+# Values of the cache request parameter
+CACHE_OFF = "off"
+CACHE_USE = "use"
+CACHE_REFRESH = "refresh"
+CACHE_MODES = (CACHE_OFF, CACHE_USE, CACHE_REFRESH)
+
+# Job statuses of a run identical requests can be collapsed onto
+INFLIGHT_STATUSES = ["pending", "processing"]
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Normalize a prompt for cache keys.
+
+    Unicode is NFC-normalized and runs of whitespace collapse to one space;
+    case and punctuation are kept because they can change the generated image.
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", prompt)).strip()
+
+
+def result_cache_key(
+    brand: Brand,
+    generation_params: Dict[str, Any],
+    template_id: Optional[str] = None,
+) -> str:
+    """
+    Key of a generation request in the result cache.
+
+    Args:
+        brand: Brand the asset is generated for (its updated_at versions the guidelines)
+        generation_params: Generation params including the prompt and any seed,
+            after template defaults were applied
+        template_id: Template the request used
+
+    Returns:
+        SHA-256 hex digest of the request
+    """
+    params = dict(generation_params)
+    prompt = params.pop("prompt", "") or ""
+    seed = params.pop("seed", None)
+    payload = {
+        "brand_id": brand.brand_id,
+        "guidelines_version": brand.updated_at,
+        "prompt": normalize_prompt(prompt),
+        "template_id": template_id,
+        "params": params,
+        "seed": seed,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def cached_compliance_score(job: "Job") -> Optional[float]:
+    """Final compliance score recorded in a job's state."""
+    scores = (job.state or {}).get("compliance_scores") or []
+    if not scores:
+        return None
+    return scores[-1].get("overall_score")
+
+
+class GenerationResultCache:
+    """
+    Lookups and single-flight for the generation result cache.
+
+    Usage:
+        key = result_cache_key(brand, generation_params, template_id)
+        job = await result_cache.lookup(key, storage=JobStorage())
+        response, collapsed = await result_cache.single_flight(key, start_generation)
+    """
+
+    def __init__(self, ttl_seconds: float = 86400, inflight_seconds: float = 900):
+        self.ttl_seconds = ttl_seconds
+        self.inflight_seconds = inflight_seconds
+        # cache key -> call shared by identical requests in this process
+        self._flights: Dict[str, asyncio.Future] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.collapsed = 0
+
+    async def lookup(self, cache_key: str, storage: Optional["JobStorage"] = None) -> Optional["Job"]:
+        """
+        Find the latest approved job for a key that finished within the TTL.
+
+        Args:
+            cache_key: Key from result_cache_key()
+            storage: JobStorage to query (defaults to a new instance)
+
+        Returns:
+            The completed job with an image, or None on a miss
+        """
+        storage = storage or _job_storage()
+        since = datetime.now(timezone.utc) - timedelta(seconds=self.ttl_seconds)
+        job = await storage.find_by_result_cache_key(cache_key, ["completed"], updated_since=since)
+        if job is None or not (job.state or {}).get("image_uri"):
+            self.misses += 1
+            logger.debug("result_cache_miss", cache_key=cache_key)
+            return None
+        self.hits += 1
+        logger.info("result_cache_hit", cache_key=cache_key, job_id=job.job_id)
+        return job
+
+    async def find_inflight(self, cache_key: str, storage: Optional["JobStorage"] = None) -> Optional["Job"]:
+        """
+        Find a pending or processing job for a key started by any process.
+
+        Jobs created longer than inflight_seconds ago are ignored, so a run
+        whose process died does not absorb identical requests until it expires.
+
+        Args:
+            cache_key: Key from result_cache_key()
+            storage: JobStorage to query (defaults to a new instance)
+
+        Returns:
+            The in-flight job, or None
+        """
+        storage = storage or _job_storage()
+        since = datetime.now(timezone.utc) - timedelta(seconds=self.inflight_seconds)
+        job = await storage.find_by_result_cache_key(cache_key, INFLIGHT_STATUSES, created_since=since)
+        if job is not None:
+            self.collapsed += 1
+            logger.info("result_cache_request_collapsed", cache_key=cache_key, job_id=job.job_id)
+        return job
+
+    async def single_flight(
+        self, cache_key: str, call: Callable[[], Awaitable[dict]]
+    ) -> Tuple[dict, bool]:
+        """
+        Run call() once for all identical requests in flight in this process.
+
+        Args:
+            cache_key: Key from result_cache_key()
+            call: Starts the generation and returns its response
+
+        Returns:
+            (response, collapsed): collapsed is True for callers that waited
+            on another caller's run
+        """
+        flight = self._flights.get(cache_key)
+        if flight is not None:
+            self.collapsed += 1
+            logger.info("result_cache_request_collapsed", cache_key=cache_key)
+            try:
+                return await asyncio.shield(flight), True
+            except asyncio.CancelledError:
+                # The leading caller was cancelled, not us: run it ourselves
+                if flight.cancelled():
+                    return await self.single_flight(cache_key, call)
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._flights[cache_key] = future
+        try:
+            response = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited future does not log a warning
+            future.exception()
+            raise
+        else:
+            future.set_result(response)
+            return response, False
+        finally:
+            self._flights.pop(cache_key, None)
+
+    def record_refresh(self, cache_key: str) -> None:
+        """Count a request that bypassed the lookup with cache=refresh."""
+        self.refreshes += 1
+        logger.info("result_cache_refresh", cache_key=cache_key)
+
+    def clear(self) -> None:
+        """Reset metrics (useful for testing)."""
+        self.hits = self.misses = self.refreshes = self.collapsed = 0
+
+    def stats(self) -> dict:
+        """
+        Get cache metrics for this process.
+
+        Returns:
+            Dictionary with hit/miss/refresh/collapsed counts and hit_ratio
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "collapsed": self.collapsed,
+            "inflight": len(self._flights),
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def _job_storage() -> "JobStorage":
+    from mobius.storage.jobs import JobStorage
+
+    return JobStorage()
+
+
+# Global result cache instance
+result_cache = GenerationResultCache(
+    ttl_seconds=settings.generation_result_cache_ttl_seconds,
+    inflight_seconds=settings.generation_result_cache_inflight_seconds,
+)
@@ -6,7 +6,7 @@ Provides CRUD operations for template entities in Supabase.
 
 from mobius.models.template import Template
 from mobius.storage.database import get_supabase_client
-from mobius.storage.graph import graph_storage
+from mobius.storage.pagination import apply_keyset
 from typing import List, Optional
 from datetime import datetime, timezone
 import structlog
@@ -46,10 +46,8 @@ class TemplateStorage:
         logger.info("template_created", template_id=template.template_id)
         created_template = Template.model_validate(result.data[0])
 
-        # Sync to Neo4j graph database (awaited to prevent connection cleanup race conditions)
-        # Graph sync is designed to fail gracefully and won't raise exceptions
-        await graph_storage.sync_template(created_template)
-
+        # Neo4j sync is queued in the same transaction by the graph sync outbox
+        # trigger (migration 009) and applied by GraphSyncDrainer
         return created_template
 
     async def get_template(self, template_id: str) -> Optional[Template]:
@@ -76,28 +74,34 @@ class TemplateStorage:
             return Template.model_validate(result.data[0])
         return None
 
-    async def list_templates(self, brand_id: str, limit: int = 100) -> List[Template]:
+    async def list_templates(
+        self, brand_id: str, limit: int = 100, cursor: Optional[str] = None
+    ) -> List[Template]:
         """
-        List all templates for a brand.
+        List templates for a brand, newest first, using keyset pagination.
 
         Args:
             brand_id: UUID of the brand
             limit: Maximum number of templates to return
+            cursor: Optional cursor from the previous page
 
         Returns:
             List of Template entities
+
+        Raises:
+            ValueError: If the cursor is malformed
         """
-        logger.debug("listing_templates", brand_id=brand_id, limit=limit)
+        logger.debug(
+            "listing_templates", brand_id=brand_id, limit=limit, has_cursor=bool(cursor)
+        )
 
-        result = (
+        query = (
             self.client.table("templates")
             .select("*")
             .eq("brand_id", brand_id)
             .is_("deleted_at", "null")
-            .order("created_at", desc=True)
-            .limit(limit)
-            .execute()
         )
+        result = apply_keyset(query, "template_id", limit, cursor).execute()
 
         return [Template.model_validate(t) for t in result.data]
 
@@ -0,0 +1,300 @@
+"""
+Latency-modelled fake Gemini client for offline runs and benchmarks.
+
+Implements the public GeminiClient interface without network access:
+generation returns a canned PNG tinted with the brand's primary color, audits
+return plausible ComplianceScores, and ingestion calls return canned
+guidelines. Every call sleeps for a latency drawn from a log-normal
+distribution (configured by median and p95) and can fail with a simulated
+429 at a configurable rate, so workflow throughput and retry behaviour can be
+measured without a Gemini quota.
+
+Selected with settings.gemini_backend = "fake"; GeminiClient() then returns
+an instance of this class, so nodes need no changes.
+"""
+
+import asyncio
+import base64
+import io
+import math
+import random
+import time
+from typing import Any, Dict, List, Optional, Type
+
+import structlog
+from google.api_core import exceptions as google_exceptions
+from pydantic import BaseModel
+
+from mobius.config import settings
+from mobius.models.brand import BrandGuidelines, Color, CompressedDigitalTwin, Typography
+
+logger = structlog.get_logger()
+
+# z-score of the 95th percentile of a standard normal distribution
+_Z_95 = 1.6449
+
+
+class LatencyModel:
+    """
+    Log-normal latency distribution parameterised by median and p95.
+
+    Args:
+        median_ms: Median latency in milliseconds
+        p95_ms: 95th percentile latency in milliseconds (>= median_ms)
+        rng: Random number generator
+        scale: Multiplier applied to every sample (e.g. 0.01 for fast runs)
+    """
+
+    def __init__(self, median_ms: float, p95_ms: float, rng: random.Random, scale: float = 1.0):
+        self.mu = math.log(max(median_ms, 1e-3))
+        self.sigma = max(math.log(max(p95_ms, median_ms) / max(median_ms, 1e-3)) / _Z_95, 0.0)
+        self.rng = rng
+        self.scale = scale
+
+    def sample_seconds(self) -> float:
+        """Draw one latency sample in seconds."""
+        return self.rng.lognormvariate(self.mu, self.sigma) * self.scale / 1000
+
+
+class FakeGeminiClient:
+    """
+    Drop-in GeminiClient replacement with canned responses and modelled latency.
+
+    Latency profiles:
+    - vision: generate_image
+    - reasoning: audit_compliance, analyze_*, extract_*
+    - fast: optimize_prompt
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.rng = random.Random(settings.fake_gemini_seed if seed is None else seed)
+        scale = settings.fake_gemini_latency_scale
+        self.latency = {
+            "vision": LatencyModel(
+                settings.fake_gemini_vision_median_ms, settings.fake_gemini_vision_p95_ms,
+                self.rng, scale,
+            ),
+            "reasoning": LatencyModel(
+                settings.fake_gemini_reasoning_median_ms, settings.fake_gemini_reasoning_p95_ms,
+                self.rng, scale,
+            ),
+            "fast": LatencyModel(
+                settings.fake_gemini_fast_median_ms, settings.fake_gemini_fast_p95_ms,
+                self.rng, scale,
+            ),
+        }
+        self.rate_limit_rate = settings.fake_gemini_rate_limit_rate
+        self.active_sessions: Dict[str, Any] = {}
+        self.session_created_at: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+
+        logger.info(
+            "fake_gemini_client_initialized",
+            rate_limit_rate=self.rate_limit_rate,
+            latency_scale=scale,
+            operation_type="client_initialization",
+        )
+
+    async def _call(self, profile: str, operation_type: str, model_name: str) -> None:
+        """Sleep for a sampled latency, then raise a 429 at the configured rate."""
+        self.calls[operation_type] = self.calls.get(operation_type, 0) + 1
+        await asyncio.sleep(self.latency[profile].sample_seconds())
+        if self.rng.random() < self.rate_limit_rate:
+            logger.warning(
+                "fake_gemini_rate_limited", model_name=model_name, operation_type=operation_type
+            )
+            raise google_exceptions.ResourceExhausted(f"429 Resource exhausted for {model_name}")
+
+    # Sessions
+
+    def get_or_create_session(self, job_id: str, system_prompt: str) -> Any:
+        if job_id not in self.active_sessions:
+            self.active_sessions[job_id] = {"system_prompt": system_prompt}
+            self.session_created_at[job_id] = time.time()
+        return self.active_sessions[job_id]
+
+    def clear_session(self, job_id: str) -> None:
+        self.active_sessions.pop(job_id, None)
+        self.session_created_at.pop(job_id, None)
+
+    # Generation
+
+    async def optimize_prompt(
+        self, user_prompt: str, compressed_twin: CompressedDigitalTwin, has_logo: bool = False
+    ) -> str:
+        try:
+            await self._call("fast", "prompt_optimization", settings.prompt_optimization_model)
+        except google_exceptions.ResourceExhausted:
+            # Real client falls back to the original prompt on any failure
+            return user_prompt
+        colors = ", ".join(compressed_twin.primary_colors[:2])
+        return f"{user_prompt}. Use brand colors {colors}." if colors else user_prompt
+
+    async def generate_image(
+        self,
+        prompt: str,
+        compressed_twin: CompressedDigitalTwin,
+        logo_bytes: list = None,
+        original_prompt: str = None,
+        job_id: Optional[str] = None,
+        continue_conversation: bool = False,
+        previous_image_bytes: bytes = None,
+        **generation_params,
+    ) -> Dict[str, str]:
+        model_name = settings.vision_model
+        max_attempts = 2  # Mirrors GeminiClient.generate_image
+        last_error: Optional[Exception] = None
+
+        for attempt in range(1, max_attempts + 1):
+            try:
+                await self._call("vision", "image_generation", model_name)
+                session_id = job_id if job_id is not None and continue_conversation else None
+                if session_id:
+                    self.get_or_create_session(job_id, prompt)
+                color = (compressed_twin.primary_colors or ["#808080"])[0]
+                return {"image_uri": _canned_image_uri(color), "session_id": session_id}
+            except google_exceptions.ResourceExhausted as e:
+                last_error = e
+                if attempt < max_attempts:
+                    await asyncio.sleep(1.0 * settings.fake_gemini_latency_scale)
+
+        raise Exception(
+            f"Image generation failed after {max_attempts} attempts: "
+            f"Rate limit exceeded for {model_name}. Please retry after 60 seconds. ({last_error})"
+        )
+
+    # Auditing
+
+    async def audit_compliance(
+        self,
+        image_uri: str,
+        brand_guidelines: BrandGuidelines,
+        categories: Optional[List[str]] = None,
+    ) -> Any:
+        from mobius.models.compliance import CategoryScore, ComplianceScore, Severity, Violation
+
+        audited = categories or ["colors", "typography", "layout", "logo_usage"]
+
+        try:
+            await self._call("reasoning", "compliance_audit", settings.reasoning_model)
+        except google_exceptions.ResourceExhausted as e:
+            # Same graceful degradation as GeminiClient.audit_compliance
+            violation = Violation(
+                category="audit_error",
+                description=f"Compliance audit failed: {e}",
+                severity=Severity.CRITICAL,
+                fix_suggestion="Manual review required - automated audit could not complete",
+            )
+            return ComplianceScore(
+                overall_score=0.0,
+                categories=[
+                    CategoryScore(category=c, score=0.0, passed=False, violations=[violation])
+                    for c in audited
+                ],
+                approved=False,
+                summary=f"Audit failed with error: {e}. Manual review required.",
+            )
+
+        threshold = settings.compliance_threshold * 100
+        scores = []
+        for category in audited:
+            score = min(max(self.rng.gauss(settings.fake_gemini_audit_mean_score, 6.0), 0.0), 100.0)
+            violations = []
+            if score < threshold:
+                violations.append(
+                    Violation(
+                        category=category,
+                        description=f"Simulated {category} deviation from brand guidelines",
+                        severity=Severity.MEDIUM,
+                        fix_suggestion=f"Adjust {category} to match the brand guidelines",
+                    )
+                )
+            scores.append(
+                CategoryScore(
+                    category=category, score=round(score, 1), passed=score >= threshold,
+                    violations=violations,
+                )
+            )
+
+        overall = sum(c.score for c in scores) / len(scores)
+        return ComplianceScore(
+            overall_score=round(overall, 1),
+            categories=scores,
+            approved=overall >= threshold,
+            summary="Simulated audit (fake Gemini backend)",
+        )
+
+    # Analysis and ingestion
+
+    async def analyze_image(
+        self,
+        image_url: str,
+        prompt: str,
+        response_format: str = "text",
+        response_schema: Optional[Type[BaseModel]] = None,
+    ) -> Any:
+        await self._call("reasoning", "image_analysis", settings.reasoning_model)
+        return {} if response_format == "json" else "Simulated image analysis"
+
+    async def analyze_pdf(
+        self,
+        pdf_bytes: bytes,
+        prompt: str,
+        response_format: str = "json",
+        response_schema: Optional[Type[BaseModel]] = None,
+    ) -> Any:
+        await self._call("reasoning", "pdf_analysis", settings.reasoning_model)
+        if response_format != "json":
+            return "Simulated PDF analysis"
+        return {
+            "colors": ["#0057B8", "#FFD700"],
+            "fonts": ["Helvetica Neue"],
+            "logo_rules": ["Keep clear space around the logo"],
+            "visual_patterns": ["Generous whitespace"],
+        }
+
+    async def extract_compressed_guidelines(self, pdf_bytes: bytes) -> CompressedDigitalTwin:
+        await self._call("reasoning", "compressed_extraction", settings.reasoning_model)
+        return CompressedDigitalTwin(
+            primary_colors=["#0057B8"],
+            secondary_colors=["#FFD700"],
+            neutral_colors=["#FFFFFF", "#1A1A1A"],
+            font_families=["Helvetica Neue"],
+            visual_dos=["Use generous whitespace"],
+            visual_donts=["Do not distort the logo"],
+            logo_placement="top-left",
+            logo_min_size="100px width",
+        )
+
+    async def extract_brand_guidelines(
+        self, pdf_bytes: bytes, extracted_text: Optional[str] = None
+    ) -> BrandGuidelines:
+        await self._call("reasoning", "guidelines_extraction", settings.reasoning_model)
+        return BrandGuidelines(
+            colors=[
+                Color(name="Brand Blue", hex="#0057B8", usage="primary"),
+                Color(name="Brand Gold", hex="#FFD700", usage="secondary"),
+                Color(name="White", hex="#FFFFFF", usage="neutral"),
+            ],
+            typography=[Typography(family="Helvetica Neue", weights=["400", "700"], usage="All text")],
+        )
+
+
+_image_cache: Dict[str, str] = {}
+
+
+def _canned_image_uri(hex_color: str) -> str:
+    """Return a small PNG data URI filled with the given color (cached per color)."""
+    if hex_color not in _image_cache:
+        from PIL import Image
+
+        try:
+            image = Image.new("RGB", (256, 256), hex_color)
+        except ValueError:
+            image = Image.new("RGB", (256, 256), "#808080")
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        _image_cache[hex_color] = "data:image/png;base64," + base64.b64encode(
+            buffer.getvalue()
+        ).decode("ascii")
+    return _image_cache[hex_color]
@@ -9,8 +9,10 @@ import google.generativeai as genai
 from google.generativeai.types import GenerationConfig
 from google.api_core import exceptions as google_exceptions
 from mobius.config import settings
+from mobius.constants import AUDIT_APPROVAL_SCORE, CATEGORY_WEIGHTS
 from mobius.models.brand import BrandGuidelines
-from typing import Optional, Dict, Any, Type
+from mobius.utils.deadline import DeadlineExceeded, step_timeout
+from typing import Optional, Dict, Any, List, Type
 from pydantic import BaseModel
 import structlog
 import json
@@ -21,6 +23,26 @@ import httpx
 logger = structlog.get_logger()
 
 
+async def _call_async(target: Any, method: str, *args, **kwargs) -> Any:
+    """
+    Call the SDK's async variant of a Gemini method when it has one.
+
+    The async variants (generate_content_async, send_message_async) await the
+    request on the event loop, so cancelling the job abandons it at once; the
+    synchronous call blocks the loop until Gemini answers. Targets without an
+    async variant (e.g. test doubles) get the synchronous call.
+
+    Args:
+        target: Model or chat session
+        method: Synchronous method name ("generate_content" or "send_message")
+        *args, **kwargs: Passed to the method
+    """
+    call_async = getattr(target, f"{method}_async", None)
+    if asyncio.iscoroutinefunction(call_async):
+        return await call_async(*args, **kwargs)
+    return getattr(target, method)(*args, **kwargs)
+
+
 class GeminiClient:
     """
     Client for Google Gemini API with dual-model architecture.
@@ -30,8 +52,18 @@ class GeminiClient:
     - Vision Model (gemini-3-pro-image-preview): Image generation
     
     Enhanced with HTTP connection pooling for improved performance.
+
+    When settings.gemini_backend is "fake", instantiating GeminiClient returns
+    a FakeGeminiClient (see tools/fake_gemini.py) instead.
     """
 
+    def __new__(cls, *args, **kwargs):
+        if cls is GeminiClient and settings.gemini_backend == "fake":
+            from mobius.tools.fake_gemini import FakeGeminiClient
+
+            return FakeGeminiClient()
+        return super().__new__(cls)
+
     def __init__(self):
         """Initialize Gemini client with reasoning, vision, and fast optimization models."""
         genai.configure(api_key=settings.gemini_api_key)
@@ -760,10 +792,11 @@ Return ONLY the optimized prompt, no explanations or preamble."""
                 )
                 return result.text.strip()
             
-            # 15 second timeout - if it takes longer, fall back to original prompt
+            # 15 second timeout (less if the job's budget is nearly spent) -
+            # if it takes longer, fall back to original prompt
             optimized_prompt = await asyncio.wait_for(
                 call_optimization_model(),
-                timeout=15.0
+                timeout=step_timeout("prompt_optimization", 15.0)
             )
 
             latency_ms = int((time.time() - start_time) * 1000)
@@ -947,10 +980,15 @@ Return ONLY the optimized prompt, no explanations or preamble."""
         # Retry loop with exponential backoff and increased timeouts
         last_exception = None
         for attempt in range(1, max_attempts + 1):
+            # Reasonable timeout progression: 3min, 6min (180s, 360s), capped by
+            # the job's remaining budget; raises DeadlineExceeded (no retry)
+            # when too little is left for another attempt
+            timeout = step_timeout(
+                "image_generation",
+                base_timeout * (2 ** (attempt - 1)),
+                min_seconds=settings.generation_min_image_seconds,
+            )
             try:
-                # Reasonable timeout progression: 3min, 6min (180s, 360s)
-                timeout = base_timeout * (2 ** (attempt - 1))
-                
                 logger.info(
                     "image_generation_attempt",
                     attempt=attempt,
@@ -971,17 +1009,27 @@ Return ONLY the optimized prompt, no explanations or preamble."""
                         is_correction=continue_conversation,
                         operation_type=operation_type
                     )
-                    # Direct call without threading to avoid executor shutdown
-                    result = session.send_message(
-                        content_parts,
-                        generation_config=generation_config,
+                    # Async call: cancelling the job abandons the request
+                    result = await asyncio.wait_for(
+                        _call_async(
+                            session,
+                            "send_message",
+                            content_parts,
+                            generation_config=generation_config,
+                        ),
+                        timeout=timeout,
                     )
                 else:
                     # Direct generation for new conversations
-                    # Direct call without threading to avoid executor shutdown
-                    result = self.vision_model.generate_content(
-                        content_parts,
-                        generation_config=generation_config,
+                    # Async call: cancelling the job abandons the request
+                    result = await asyncio.wait_for(
+                        _call_async(
+                            self.vision_model,
+                            "generate_content",
+                            content_parts,
+                            generation_config=generation_config,
+                        ),
+                        timeout=timeout,
                     )
                 
                 # Extract image URI from response
@@ -1224,7 +1272,8 @@ Return ONLY the optimized prompt, no explanations or preamble."""
     async def audit_compliance(
         self,
         image_uri: str,
-        brand_guidelines: BrandGuidelines
+        brand_guidelines: BrandGuidelines,
+        categories: Optional[List[str]] = None
     ) -> "ComplianceScore":
         """
         Audit image compliance using Reasoning Model with multimodal vision.
@@ -1239,6 +1288,8 @@ Return ONLY the optimized prompt, no explanations or preamble."""
         Args:
             image_uri: URI reference to the generated image (can be URL or data URI)
             brand_guidelines: Full brand guidelines for comprehensive auditing
+            categories: Only score these categories (delta audit after a tweak);
+                None scores every category
             
         Returns:
             ComplianceScore with category breakdowns and violation details
@@ -1250,17 +1301,20 @@ Return ONLY the optimized prompt, no explanations or preamble."""
         operation_type = "compliance_audit"
         start_time = time.time()
         
+        audited_categories = list(categories or CATEGORY_WEIGHTS)
+
         logger.info(
             "auditing_compliance_start",
             image_uri=image_uri[:100] if image_uri else None,
             model_name=model_name,
+            categories=audited_categories,
             operation_type=operation_type
         )
         
         try:
             # Build audit prompt with full brand guidelines context
             logger.info("building_audit_prompt", operation_type=operation_type)
-            audit_prompt = self._build_audit_prompt(brand_guidelines)
+            audit_prompt = self._build_audit_prompt(brand_guidelines, categories)
             logger.info("audit_prompt_built", prompt_length=len(audit_prompt), operation_type=operation_type)
 
             # Estimate input token count
@@ -1302,7 +1356,7 @@ Return ONLY the optimized prompt, no explanations or preamble."""
                 import httpx
                 logger.info("falling_back_to_image_download", operation_type=operation_type)
                 
-                async with httpx.AsyncClient(timeout=120.0) as client:
+                async with httpx.AsyncClient(timeout=step_timeout("audit_image_download", 120.0)) as client:
                     response = await client.get(image_uri)
                     response.raise_for_status()
                     image_data = response.content
@@ -1338,10 +1392,16 @@ Return ONLY the optimized prompt, no explanations or preamble."""
             # Generate compliance audit using reasoning model with multimodal input
             logger.info("calling_reasoning_model_for_audit", image_size_bytes=len(image_data), operation_type=operation_type)
             
-            # Direct call without threading to avoid executor shutdown
-            result = self.reasoning_model.generate_content(
-                [audit_prompt, {"mime_type": mime_type, "data": image_data}],
-                generation_config=generation_config,
+            # Async call: cancelling the job abandons the request; bounded
+            # by the job's remaining budget
+            result = await asyncio.wait_for(
+                _call_async(
+                    self.reasoning_model,
+                    "generate_content",
+                    [audit_prompt, {"mime_type": mime_type, "data": image_data}],
+                    generation_config=generation_config,
+                ),
+                timeout=step_timeout("compliance_audit", settings.gemini_audit_timeout_seconds),
             )
             
             logger.info("reasoning_model_audit_complete", response_length=len(result.text), operation_type=operation_type)
@@ -1401,7 +1461,11 @@ Return ONLY the optimized prompt, no explanations or preamble."""
             )
             
             return compliance_score
-            
+
+        except DeadlineExceeded:
+            # Out of budget is not a compliance result; the workflow fails the job
+            raise
+
         except Exception as e:
             # Graceful degradation: return partial compliance score with error annotations
             latency_ms = int((time.time() - start_time) * 1000)
@@ -1423,7 +1487,7 @@ Return ONLY the optimized prompt, no explanations or preamble."""
                 fix_suggestion="Manual review required - automated audit could not complete"
             )
             
-            # Create error category for each standard category
+            # Create error category for each audited category
             error_categories = [
                 CategoryScore(
                     category=cat,
@@ -1431,7 +1495,7 @@ Return ONLY the optimized prompt, no explanations or preamble."""
                     passed=False,
                     violations=[error_violation]
                 )
-                for cat in ["colors", "typography", "layout", "logo_usage"]
+                for cat in audited_categories
             ]
             
             partial_score = ComplianceScore(
@@ -1451,19 +1515,34 @@ Return ONLY the optimized prompt, no explanations or preamble."""
             
             return partial_score
     
-    def _build_audit_prompt(self, brand_guidelines: BrandGuidelines) -> str:
+    def _build_audit_prompt(
+        self,
+        brand_guidelines: BrandGuidelines,
+        categories: Optional[List[str]] = None
+    ) -> str:
         """
         Build audit prompt with full brand guidelines context.
         
         Creates a comprehensive prompt that provides the Reasoning Model with
-        complete brand guidelines for thorough compliance checking.
+        complete brand guidelines for thorough compliance checking. A delta
+        audit (categories given) only carries the guideline sections and
+        instructions of those categories; governance rules are always kept.
         
         Args:
             brand_guidelines: Full brand guidelines
+            categories: Categories to score; None for every category
             
         Returns:
             Audit prompt string with complete brand context
         """
+        category_instructions = {
+            "colors": "Check if colors match approved palette and usage guidelines",
+            "typography": "Verify font families match approved list",
+            "layout": "Assess composition, spacing, and visual hierarchy",
+            "logo_usage": "Check logo placement, sizing, and background compliance",
+        }
+        scope = [c for c in (categories or category_instructions) if c in category_instructions]
+
         prompt_parts = [
             "You are a brand compliance auditor. Analyze this image against the brand guidelines below.",
             "Provide detailed compliance scores for each category with specific violations.",
@@ -1473,7 +1552,7 @@ Return ONLY the optimized prompt, no explanations or preamble."""
         ]
         
         # Add color guidelines
-        if brand_guidelines.colors:
+        if brand_guidelines.colors and "colors" in scope:
             prompt_parts.append("### Colors:")
             for color in brand_guidelines.colors:
                 usage_info = f" (usage: {color.usage})" if color.usage else ""
@@ -1482,7 +1561,7 @@ Return ONLY the optimized prompt, no explanations or preamble."""
             prompt_parts.append("")
         
         # Add typography guidelines
-        if brand_guidelines.typography:
+        if brand_guidelines.typography and "typography" in scope:
             prompt_parts.append("### Typography:")
             for typo in brand_guidelines.typography:
                 weights_info = f" (weights: {', '.join(typo.weights)})" if typo.weights else ""
@@ -1492,7 +1571,7 @@ Return ONLY the optimized prompt, no explanations or preamble."""
             prompt_parts.append("")
         
         # Add logo guidelines
-        if brand_guidelines.logos:
+        if brand_guidelines.logos and "logo_usage" in scope:
             prompt_parts.append("### Logo Guidelines:")
             for logo in brand_guidelines.logos:
                 prompt_parts.append(f"- {logo.variant_name}")
@@ -1504,8 +1583,8 @@ Return ONLY the optimized prompt, no explanations or preamble."""
                     prompt_parts.append(f"  Forbidden backgrounds: {', '.join(logo.forbidden_backgrounds)}")
             prompt_parts.append("")
         
-        # Add voice guidelines
-        if brand_guidelines.voice:
+        # Add voice guidelines (judged with the image's text)
+        if brand_guidelines.voice and "typography" in scope:
             prompt_parts.append("### Brand Voice:")
             if brand_guidelines.voice.adjectives:
                 prompt_parts.append(f"- Adjectives: {', '.join(brand_guidelines.voice.adjectives)}")
@@ -1529,11 +1608,15 @@ Return ONLY the optimized prompt, no explanations or preamble."""
         prompt_parts.extend([
             "## Audit Instructions:",
             "",
-            "Evaluate the image across these categories:",
-            "1. **colors**: Check if colors match approved palette and usage guidelines",
-            "2. **typography**: Verify font families match approved list",
-            "3. **layout**: Assess composition, spacing, and visual hierarchy",
-            "4. **logo_usage**: Check logo placement, sizing, and background compliance",
+            "Evaluate the image across these categories:"
+            if categories is None else
+            "Evaluate the image ONLY in these categories (the others are scored separately):",
+        ])
+        prompt_parts.extend(
+            f"{i}. **{category}**: {category_instructions[category]}"
+            for i, category in enumerate(scope, start=1)
+        )
+        prompt_parts.extend([
             "",
             "## CRITICAL CONTEXT RULES (Apply Visual Intelligence):",
             "- On **metallic, reflective, or 3D surfaces** (bottles, cans, packaging), technical contrast ratios may be lower due to lighting and environmental reflections",
@@ -1558,7 +1641,7 @@ Return ONLY the optimized prompt, no explanations or preamble."""
             "- **Apply contextual leniency** as described above before flagging violations",
             "",
             "Calculate overall_score as weighted average of categories.",
-            "Set approved=true if overall_score >= 95.",
+            f"Set approved=true if overall_score >= {AUDIT_APPROVAL_SCORE:g}.",
             "Provide a summary of the overall assessment with contextual notes.",
         ])
         
@@ -0,0 +1,70 @@
+"""
+Color space conversion utilities.
+
+Converts sRGB hex codes to CIELAB (D65 white point) so perceptual color
+difference is the Euclidean distance between Lab coordinates (CIE76 ΔE).
+A ΔE of about 2.3 is the just-noticeable difference.
+"""
+
+import re
+from typing import Iterable
+
+import numpy as np
+
+HEX_PATTERN = re.compile(r"^#?([0-9A-Fa-f]{6})$")
+
+# Linear sRGB -> XYZ (D65)
+_SRGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+_D65_WHITE = np.array([0.95047, 1.0, 1.08883])
+
+
+def normalize_hex(hex: str) -> str:
+    """
+    Normalize a hex color to "#RRGGBB" upper case.
+
+    Args:
+        hex: Color code with or without leading "#"
+
+    Returns:
+        Normalized hex code
+
+    Raises:
+        ValueError: If the code is not a 6-digit hex color
+    """
+    match = HEX_PATTERN.match(hex.strip())
+    if not match:
+        raise ValueError(f"Invalid hex color: {hex}")
+    return f"#{match.group(1).upper()}"
+
+
+def hex_to_lab(hexes: Iterable[str]) -> np.ndarray:
+    """
+    Convert hex colors to CIELAB.
+
+    Args:
+        hexes: Hex codes ("#RRGGBB" or "RRGGBB")
+
+    Returns:
+        Array of shape (n, 3) with L*, a*, b* per color
+    """
+    codes = [normalize_hex(hex)[1:] for hex in hexes]
+    if not codes:
+        return np.empty((0, 3))
+
+    rgb = np.array(
+        [[int(code[i:i + 2], 16) for i in (0, 2, 4)] for code in codes], dtype=np.float64
+    ) / 255.0
+    linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    xyz = linear @ _SRGB_TO_XYZ.T / _D65_WHITE
+
+    epsilon, kappa = 216 / 24389, 24389 / 27
+    f = np.where(xyz > epsilon, np.cbrt(xyz), (kappa * xyz + 16) / 116)
+    return np.column_stack([
+        116 * f[:, 1] - 16,
+        500 * (f[:, 0] - f[:, 1]),
+        200 * (f[:, 1] - f[:, 2]),
+    ])
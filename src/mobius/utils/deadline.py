@@ -0,0 +1,157 @@
+"""
+Deadline budgets for generation workflow runs.
+
+Every workflow run gets one deadline (JobState.deadline_at, epoch seconds so
+it survives checkpoints and container hops). The generate, audit and correct
+nodes bind it while they run (deadline_node), and the Gemini calls and HTTP
+fetches inside them size their timeouts with step_timeout(): a step gets its
+usual timeout or whatever budget is left, whichever is smaller, and fails
+fast with DeadlineExceeded when too little is left to be worth starting.
+
+Usage:
+    state["deadline_at"] = new_deadline()
+
+    workflow.add_node("generate", deadline_node(generate_node, reserve_seconds=30))
+
+    timeout = step_timeout("logo_download", 60.0)
+    async with httpx.AsyncClient(timeout=timeout) as client:
+        ...
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Awaitable, Callable, Iterator, Optional
+
+import structlog
+
+from mobius.config import settings
+
+logger = structlog.get_logger()
+
+# Deadline (epoch seconds) of the node running in this context
+_current_deadline: ContextVar[Optional[float]] = ContextVar("mobius_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a step cannot finish before the run's deadline."""
+
+    def __init__(self, step: str, remaining_seconds: float):
+        super().__init__(
+            f"Not enough time left for {step}: {max(0.0, remaining_seconds):.1f}s of the job's budget remain"
+        )
+        self.step = step
+        self.remaining_seconds = remaining_seconds
+
+
+def new_deadline(seconds: Optional[float] = None) -> float:
+    """
+    Deadline for a workflow run starting now.
+
+    Args:
+        seconds: Budget for the run (defaults to generation_deadline_seconds)
+
+    Returns:
+        Deadline as epoch seconds, for JobState.deadline_at
+    """
+    return time.time() + (seconds if seconds is not None else settings.generation_deadline_seconds)
+
+
+def remaining_seconds(deadline_at: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds left before a deadline.
+
+    Args:
+        deadline_at: Deadline as epoch seconds (defaults to the bound deadline)
+
+    Returns:
+        Seconds left (negative once passed), or None when there is no deadline
+    """
+    if deadline_at is None:
+        deadline_at = _current_deadline.get()
+    if deadline_at is None:
+        return None
+    return deadline_at - time.time()
+
+
+@contextmanager
+def bind_deadline(deadline_at: Optional[float], reserve_seconds: float = 0.0) -> Iterator[None]:
+    """
+    Make a deadline the one step_timeout() consults within the block.
+
+    Args:
+        deadline_at: Deadline as epoch seconds; None leaves the current one
+        reserve_seconds: Budget held back for the steps after this block
+            (e.g. the audit after generation)
+    """
+    if deadline_at is None:
+        yield
+        return
+    token = _current_deadline.set(deadline_at - reserve_seconds)
+    try:
+        yield
+    finally:
+        _current_deadline.reset(token)
+
+
+def step_timeout(step: str, timeout: float, min_seconds: Optional[float] = None) -> float:
+    """
+    Timeout for one step of a run, capped by the run's remaining budget.
+
+    Args:
+        step: Step name for errors and logs (e.g. "image_generation")
+        timeout: The step's own timeout in seconds
+        min_seconds: Least budget worth starting the step with
+            (defaults to deadline_min_step_seconds)
+
+    Returns:
+        Timeout in seconds (the step's own timeout when no deadline is bound)
+
+    Raises:
+        DeadlineExceeded: If less than min_seconds of the budget remain
+    """
+    remaining = remaining_seconds()
+    if remaining is None:
+        return timeout
+    minimum = settings.deadline_min_step_seconds if min_seconds is None else min_seconds
+    if remaining < minimum:
+        logger.warning("deadline_step_skipped", step=step, remaining_seconds=round(remaining, 1))
+        raise DeadlineExceeded(step, remaining)
+    return min(timeout, remaining)
+
+
+def deadline_node(
+    node: Callable[[dict], Awaitable[dict]],
+    reserve_seconds: float = 0.0,
+) -> Callable[[dict], Awaitable[dict]]:
+    """
+    Wrap a workflow node so it runs under the run's deadline.
+
+    The node fails fast with DeadlineExceeded when the budget has run out
+    before it starts; otherwise state["deadline_at"] is bound while it runs.
+    States without a deadline run the node unchanged.
+
+    Args:
+        node: Async node function taking the JobState
+        reserve_seconds: Budget the node must leave for the nodes after it
+    """
+    name = getattr(node, "__name__", "node")
+
+    @wraps(node)
+    async def run(state: dict) -> dict:
+        deadline_at = state.get("deadline_at")
+        if deadline_at is not None:
+            remaining = remaining_seconds(deadline_at) - reserve_seconds
+            if remaining < settings.deadline_min_step_seconds:
+                logger.warning(
+                    "deadline_node_skipped",
+                    job_id=state.get("job_id"),
+                    node=name,
+                    remaining_seconds=round(remaining, 1),
+                )
+                raise DeadlineExceeded(name, remaining)
+        with bind_deadline(deadline_at, reserve_seconds):
+            return await node(state)
+
+    return run
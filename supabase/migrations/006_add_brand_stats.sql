@@ -0,0 +1,120 @@
+-- Migration 006: Brand Statistics Aggregate
+-- Creates brand_stats table maintained incrementally by a trigger on assets
+-- Replaces per-request aggregation over every asset row in list_brands
+
+-- brand_stats table
+-- One row per brand that has at least one asset. Average compliance score is
+-- stored as a running sum + count so it can be adjusted without rescanning assets.
+CREATE TABLE IF NOT EXISTS brand_stats (
+    brand_id UUID PRIMARY KEY REFERENCES brands(brand_id) ON DELETE CASCADE,
+    asset_count INT NOT NULL DEFAULT 0 CHECK (asset_count >= 0),
+    scored_asset_count INT NOT NULL DEFAULT 0 CHECK (scored_asset_count >= 0),
+    compliance_score_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    last_activity TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Recomputing last_activity when the newest asset is removed uses the
+-- (brand_id, created_at DESC, asset_id DESC) index from migration 008
+
+-- Apply a delta to a brand's statistics row (upsert)
+CREATE OR REPLACE FUNCTION apply_brand_stats_delta(
+    p_brand_id UUID,
+    p_asset_delta INT,
+    p_scored_delta INT,
+    p_score_delta DOUBLE PRECISION,
+    p_activity TIMESTAMPTZ
+)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO brand_stats (
+        brand_id, asset_count, scored_asset_count, compliance_score_sum, last_activity
+    )
+    VALUES (
+        p_brand_id,
+        GREATEST(p_asset_delta, 0),
+        GREATEST(p_scored_delta, 0),
+        GREATEST(p_score_delta, 0),
+        p_activity
+    )
+    ON CONFLICT (brand_id) DO UPDATE
+    SET
+        asset_count = GREATEST(brand_stats.asset_count + p_asset_delta, 0),
+        scored_asset_count = GREATEST(brand_stats.scored_asset_count + p_scored_delta, 0),
+        compliance_score_sum = brand_stats.compliance_score_sum + p_score_delta,
+        last_activity = GREATEST(brand_stats.last_activity, p_activity),
+        updated_at = NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+-- Trigger to keep brand_stats in sync with assets
+CREATE OR REPLACE FUNCTION update_brand_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Remove the old row's contribution
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_brand_stats_delta(
+            OLD.brand_id,
+            -1,
+            CASE WHEN OLD.compliance_score IS NULL THEN 0 ELSE -1 END,
+            -COALESCE(OLD.compliance_score, 0),
+            NULL
+        );
+    END IF;
+
+    -- Add the new row's contribution
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM apply_brand_stats_delta(
+            NEW.brand_id,
+            1,
+            CASE WHEN NEW.compliance_score IS NULL THEN 0 ELSE 1 END,
+            COALESCE(NEW.compliance_score, 0),
+            NEW.created_at
+        );
+    END IF;
+
+    -- last_activity can only move backwards when an asset leaves a brand or
+    -- its created_at moves; recompute it from the (brand_id, created_at)
+    -- index in that case
+    IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND (
+        OLD.brand_id <> NEW.brand_id OR OLD.created_at IS DISTINCT FROM NEW.created_at
+    )) THEN
+        UPDATE brand_stats
+        SET last_activity = (
+            SELECT MAX(created_at) FROM assets WHERE brand_id = OLD.brand_id
+        )
+        WHERE brand_id = OLD.brand_id;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS assets_brand_stats_trigger ON assets;
+CREATE TRIGGER assets_brand_stats_trigger
+AFTER INSERT OR UPDATE OF brand_id, compliance_score, created_at OR DELETE ON assets
+FOR EACH ROW
+EXECUTE FUNCTION update_brand_stats();
+
+-- Backfill statistics for existing assets
+INSERT INTO brand_stats (
+    brand_id, asset_count, scored_asset_count, compliance_score_sum, last_activity
+)
+SELECT
+    brand_id,
+    COUNT(*),
+    COUNT(compliance_score),
+    COALESCE(SUM(compliance_score), 0),
+    MAX(created_at)
+FROM assets
+GROUP BY brand_id
+ON CONFLICT (brand_id) DO UPDATE
+SET
+    asset_count = EXCLUDED.asset_count,
+    scored_asset_count = EXCLUDED.scored_asset_count,
+    compliance_score_sum = EXCLUDED.compliance_score_sum,
+    last_activity = EXCLUDED.last_activity,
+    updated_at = NOW();
+
+COMMENT ON TABLE brand_stats IS
+'Per-brand asset statistics (count, compliance score sum, last activity) maintained incrementally by assets_brand_stats_trigger. Read by list_brands instead of aggregating asset rows.';
@@ -0,0 +1,74 @@
+-- Migration 007: Feedback Counters
+-- Replaces the COUNT(*)-based feedback trigger with incremental per-brand counters
+-- so feedback submission and feedback statistics are O(1) regardless of history size
+
+-- Per-action counters alongside the existing brands.feedback_count
+ALTER TABLE brands
+ADD COLUMN IF NOT EXISTS approval_count INT NOT NULL DEFAULT 0,
+ADD COLUMN IF NOT EXISTS rejection_count INT NOT NULL DEFAULT 0;
+
+-- Incremental trigger: adjusts counters and decides learning activation in the
+-- same transaction as the feedback insert/delete.
+-- Threshold must match LEARNING_ACTIVATION_THRESHOLD in mobius/constants.py.
+CREATE OR REPLACE FUNCTION update_learning_active()
+RETURNS TRIGGER AS $$
+DECLARE
+    learning_threshold CONSTANT INT := 50;
+    delta INT;
+    target_brand UUID;
+    target_action VARCHAR(20);
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        delta := 1;
+        target_brand := NEW.brand_id;
+        target_action := NEW.action;
+    ELSE
+        delta := -1;
+        target_brand := OLD.brand_id;
+        target_action := OLD.action;
+    END IF;
+
+    UPDATE brands
+    SET
+        feedback_count = GREATEST(feedback_count + delta, 0),
+        approval_count = GREATEST(
+            approval_count + CASE WHEN target_action = 'approve' THEN delta ELSE 0 END, 0
+        ),
+        rejection_count = GREATEST(
+            rejection_count + CASE WHEN target_action = 'reject' THEN delta ELSE 0 END, 0
+        ),
+        learning_active = (feedback_count + delta) >= learning_threshold
+    WHERE brand_id = target_brand;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS feedback_learning_trigger ON feedback;
+CREATE TRIGGER feedback_learning_trigger
+AFTER INSERT OR DELETE ON feedback
+FOR EACH ROW
+EXECUTE FUNCTION update_learning_active();
+
+-- Backfill counters from existing feedback
+UPDATE brands b
+SET
+    feedback_count = s.total,
+    approval_count = s.approvals,
+    rejection_count = s.rejections,
+    learning_active = s.total >= 50
+FROM (
+    SELECT
+        brand_id,
+        COUNT(*) AS total,
+        COUNT(*) FILTER (WHERE action = 'approve') AS approvals,
+        COUNT(*) FILTER (WHERE action = 'reject') AS rejections
+    FROM feedback
+    GROUP BY brand_id
+) s
+WHERE b.brand_id = s.brand_id;
+
+COMMENT ON COLUMN brands.approval_count IS
+'Number of approve feedback events, maintained incrementally by feedback_learning_trigger.';
+COMMENT ON COLUMN brands.rejection_count IS
+'Number of reject feedback events, maintained incrementally by feedback_learning_trigger.';
@@ -0,0 +1,27 @@
+-- Migration 008: Keyset Pagination Indexes
+-- Listings page on (created_at DESC, <id> DESC) with a cursor instead of OFFSET.
+-- These composite indexes let every page be served as a bounded index range scan,
+-- so page N costs the same as page 1.
+
+-- Jobs: unfiltered, per-brand and per-status listings
+CREATE INDEX IF NOT EXISTS idx_jobs_created_keyset
+ON jobs(created_at DESC, job_id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_brand_created_keyset
+ON jobs(brand_id, created_at DESC, job_id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created_keyset
+ON jobs(status, created_at DESC, job_id DESC);
+
+-- Assets: per-brand asset library
+CREATE INDEX IF NOT EXISTS idx_assets_brand_created_keyset
+ON assets(brand_id, created_at DESC, asset_id DESC);
+
+-- Templates: per-brand, excluding soft-deleted rows
+CREATE INDEX IF NOT EXISTS idx_templates_brand_created_keyset
+ON templates(brand_id, created_at DESC, template_id DESC)
+WHERE deleted_at IS NULL;
+
+-- Feedback: per-brand event history
+CREATE INDEX IF NOT EXISTS idx_feedback_brand_created_keyset
+ON feedback(brand_id, created_at DESC, feedback_id DESC);
@@ -0,0 +1,163 @@
+-- Migration 009: Graph Sync Outbox
+-- Moves Neo4j synchronization off the request path. Triggers enqueue a sync
+-- event in the same transaction as the brand/asset/template/feedback write, and
+-- a background drainer (mobius/storage/graph_outbox.py) applies the events to
+-- Neo4j in batches, retrying failures until they succeed.
+
+-- One row per pending or recently applied sync. Events only identify the
+-- entity; the drainer re-reads the current row, so applying an event twice or
+-- out of date is harmless.
+CREATE TABLE IF NOT EXISTS graph_sync_outbox (
+    event_id BIGSERIAL PRIMARY KEY,
+    entity_type VARCHAR(20) NOT NULL
+        CHECK (entity_type IN ('brand', 'asset', 'template', 'feedback')),
+    entity_id UUID NOT NULL,
+    brand_id UUID NOT NULL,
+    -- 'delete' when the row was soft-deleted (deleted_at set)
+    operation VARCHAR(10) NOT NULL DEFAULT 'upsert'
+        CHECK (operation IN ('upsert', 'delete')),
+    attempts INT NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    -- Set while a drainer holds the event (see claim_graph_sync_events)
+    leased_until TIMESTAMPTZ,
+    last_error TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    processed_at TIMESTAMPTZ
+);
+
+-- Drainer claims pending events in commit order
+CREATE INDEX IF NOT EXISTS idx_graph_sync_outbox_pending
+ON graph_sync_outbox(event_id)
+WHERE processed_at IS NULL;
+
+-- Retention cleanup of applied events
+CREATE INDEX IF NOT EXISTS idx_graph_sync_outbox_processed
+ON graph_sync_outbox(processed_at)
+WHERE processed_at IS NOT NULL;
+
+-- Enqueue a sync event for the written row. Which updates qualify is decided
+-- by the WHEN clause of each trigger below.
+CREATE OR REPLACE FUNCTION enqueue_graph_sync()
+RETURNS TRIGGER AS $$
+DECLARE
+    entity UUID;
+    op VARCHAR(10);
+BEGIN
+    entity := CASE TG_ARGV[0]
+        WHEN 'brand' THEN NEW.brand_id
+        WHEN 'asset' THEN NEW.asset_id
+        WHEN 'template' THEN NEW.template_id
+        WHEN 'feedback' THEN NEW.feedback_id
+    END;
+
+    -- Assets and feedback have no deleted_at column
+    op := CASE WHEN to_jsonb(NEW) ->> 'deleted_at' IS NULL THEN 'upsert' ELSE 'delete' END;
+
+    INSERT INTO graph_sync_outbox (entity_type, entity_id, brand_id, operation)
+    VALUES (TG_ARGV[0], entity, NEW.brand_id, op);
+
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Updates queue an event only when a column the graph mirrors changes.
+-- Keep these lists in sync with the sync statements in storage/graph.py.
+DROP TRIGGER IF EXISTS brands_graph_sync_trigger ON brands;
+DROP TRIGGER IF EXISTS brands_graph_sync_insert_trigger ON brands;
+CREATE TRIGGER brands_graph_sync_insert_trigger
+AFTER INSERT ON brands
+FOR EACH ROW
+EXECUTE FUNCTION enqueue_graph_sync('brand');
+
+DROP TRIGGER IF EXISTS brands_graph_sync_update_trigger ON brands;
+CREATE TRIGGER brands_graph_sync_update_trigger
+AFTER UPDATE OF organization_id, name, guidelines, deleted_at ON brands
+FOR EACH ROW
+WHEN (
+    (OLD.organization_id, OLD.name, OLD.guidelines, OLD.deleted_at)
+    IS DISTINCT FROM (NEW.organization_id, NEW.name, NEW.guidelines, NEW.deleted_at)
+)
+EXECUTE FUNCTION enqueue_graph_sync('brand');
+
+DROP TRIGGER IF EXISTS assets_graph_sync_trigger ON assets;
+DROP TRIGGER IF EXISTS assets_graph_sync_insert_trigger ON assets;
+CREATE TRIGGER assets_graph_sync_insert_trigger
+AFTER INSERT ON assets
+FOR EACH ROW
+EXECUTE FUNCTION enqueue_graph_sync('asset');
+
+DROP TRIGGER IF EXISTS assets_graph_sync_update_trigger ON assets;
+CREATE TRIGGER assets_graph_sync_update_trigger
+AFTER UPDATE OF brand_id, prompt, image_url, compliance_score, status, created_at ON assets
+FOR EACH ROW
+WHEN (
+    (OLD.brand_id, OLD.prompt, OLD.image_url, OLD.compliance_score, OLD.status, OLD.created_at)
+    IS DISTINCT FROM
+    (NEW.brand_id, NEW.prompt, NEW.image_url, NEW.compliance_score, NEW.status, NEW.created_at)
+)
+EXECUTE FUNCTION enqueue_graph_sync('asset');
+
+DROP TRIGGER IF EXISTS templates_graph_sync_trigger ON templates;
+DROP TRIGGER IF EXISTS templates_graph_sync_insert_trigger ON templates;
+CREATE TRIGGER templates_graph_sync_insert_trigger
+AFTER INSERT ON templates
+FOR EACH ROW
+EXECUTE FUNCTION enqueue_graph_sync('template');
+
+DROP TRIGGER IF EXISTS templates_graph_sync_update_trigger ON templates;
+CREATE TRIGGER templates_graph_sync_update_trigger
+AFTER UPDATE OF brand_id, name, description, source_asset_id, created_at, deleted_at ON templates
+FOR EACH ROW
+WHEN (
+    (OLD.brand_id, OLD.name, OLD.description, OLD.source_asset_id, OLD.created_at, OLD.deleted_at)
+    IS DISTINCT FROM
+    (NEW.brand_id, NEW.name, NEW.description, NEW.source_asset_id, NEW.created_at, NEW.deleted_at)
+)
+EXECUTE FUNCTION enqueue_graph_sync('template');
+
+DROP TRIGGER IF EXISTS feedback_graph_sync_trigger ON feedback;
+CREATE TRIGGER feedback_graph_sync_trigger
+AFTER INSERT ON feedback
+FOR EACH ROW
+EXECUTE FUNCTION enqueue_graph_sync('feedback');
+
+-- Claim up to p_limit due events for one drainer, in commit order.
+-- A brand's events are only handed out while none of its pending events is
+-- backing off after a failure or leased to another drainer, so each brand is
+-- applied in order by one drainer at a time. Claims are serialized with an
+-- advisory lock (they are short) and leased for p_lease_seconds; events of a
+-- drainer that dies become claimable again once the lease expires.
+CREATE OR REPLACE FUNCTION claim_graph_sync_events(p_limit INT, p_lease_seconds INT)
+RETURNS SETOF graph_sync_outbox AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('claim_graph_sync_events'));
+
+    RETURN QUERY
+    WITH blocked AS (
+        SELECT DISTINCT brand_id
+        FROM graph_sync_outbox
+        WHERE processed_at IS NULL
+          AND (next_attempt_at > NOW() OR leased_until > NOW())
+    ),
+    claimable AS (
+        SELECT event_id
+        FROM graph_sync_outbox
+        WHERE processed_at IS NULL
+          AND brand_id NOT IN (SELECT brand_id FROM blocked)
+        ORDER BY event_id
+        LIMIT p_limit
+        FOR UPDATE SKIP LOCKED
+    ),
+    claimed AS (
+        UPDATE graph_sync_outbox o
+        SET leased_until = NOW() + make_interval(secs => p_lease_seconds)
+        FROM claimable
+        WHERE o.event_id = claimable.event_id
+        RETURNING o.*
+    )
+    SELECT * FROM claimed ORDER BY event_id;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON TABLE graph_sync_outbox IS
+'Transactional outbox of Neo4j sync events, drained by the graph sync drainer';
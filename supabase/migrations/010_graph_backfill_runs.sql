@@ -0,0 +1,61 @@
+-- Migration 010: Graph Backfill Runs
+-- Persists progress of bulk Neo4j backfills (mobius/storage/graph_backfill.py)
+-- so an interrupted backfill resumes from its last checkpoint instead of
+-- starting over. A run is leased to one worker at a time, so starting a run
+-- that is already in progress does not start a second writer on it.
+
+-- One row per backfill run. progress holds, per entity type, the keyset
+-- cursor (last primary key written, with every earlier row also written),
+-- whether the entity type is done, and how many rows were synced.
+CREATE TABLE IF NOT EXISTS graph_backfill_runs (
+    run_id VARCHAR(100) PRIMARY KEY,
+    organization_id UUID,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'running', 'completed', 'failed')),
+    progress JSONB NOT NULL DEFAULT '{}'::jsonb,
+    last_error TEXT,
+    started_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    completed_at TIMESTAMPTZ,
+    -- Worker holding the run; renewed on every checkpoint, cleared when the
+    -- run ends
+    lease_owner VARCHAR(64),
+    leased_until TIMESTAMPTZ
+);
+
+-- Lookup of runs for an organization (per-org resync from the API)
+CREATE INDEX IF NOT EXISTS idx_graph_backfill_runs_org
+ON graph_backfill_runs(organization_id, started_at DESC);
+
+-- Takes the lease on a run (creating the run if needed) unless another
+-- worker holds an unexpired lease; returns no row in that case. Reclaiming
+-- with the same owner renews the lease (the API claims a run, then the
+-- worker it spawns claims it again with the same owner). The run's status
+-- and progress are left to the worker, which restarts completed runs.
+CREATE OR REPLACE FUNCTION claim_graph_backfill_run(
+    p_run_id VARCHAR,
+    p_organization_id UUID,
+    p_owner VARCHAR,
+    p_lease_seconds INT
+)
+RETURNS SETOF graph_backfill_runs AS $$
+BEGIN
+    RETURN QUERY
+    INSERT INTO graph_backfill_runs AS r (run_id, organization_id, status, lease_owner, leased_until)
+    VALUES (
+        p_run_id, p_organization_id, 'pending', p_owner,
+        NOW() + make_interval(secs => p_lease_seconds)
+    )
+    ON CONFLICT (run_id) DO UPDATE
+    SET lease_owner = EXCLUDED.lease_owner,
+        leased_until = EXCLUDED.leased_until,
+        updated_at = NOW()
+    WHERE r.lease_owner IS NULL
+       OR r.lease_owner = p_owner
+       OR r.leased_until < NOW()
+    RETURNING r.*;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON TABLE graph_backfill_runs IS
+'Checkpointed progress of bulk PostgreSQL -> Neo4j backfills';
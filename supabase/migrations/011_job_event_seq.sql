@@ -0,0 +1,22 @@
+-- Migration 011: Job Event Sequence
+-- Per-job sequence numbers for live WebSocket events (mobius/api/job_events.py).
+-- A job's events are published by several worker containers over its life
+-- (generation, then resume/tweak workers), so numbering comes from the job
+-- row rather than any one process. Publishers reserve blocks of numbers to
+-- avoid a round trip per event.
+
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS event_seq BIGINT NOT NULL DEFAULT 0;
+
+-- Reserve p_count sequence numbers for a job.
+-- Returns the last number of the reserved block (the block is
+-- result - p_count + 1 .. result), or NULL if the job does not exist.
+CREATE OR REPLACE FUNCTION reserve_job_event_seqs(p_job_id UUID, p_count INT)
+RETURNS BIGINT AS $$
+    UPDATE jobs
+    SET event_seq = event_seq + GREATEST(p_count, 1)
+    WHERE job_id = p_job_id
+    RETURNING event_seq;
+$$ LANGUAGE sql;
+
+COMMENT ON COLUMN jobs.event_seq IS
+'Last live event sequence number reserved for the job (see reserve_job_event_seqs)';
@@ -0,0 +1,34 @@
+-- Migration 012: Private Realtime Channels
+-- Job events and graph cache invalidations (mobius/api/job_events.py) are
+-- broadcast on private Supabase Realtime channels. Realtime authorizes joins
+-- to private channels, and REST broadcasts to them, with RLS policies on
+-- realtime.messages.
+--
+-- Only the backend, connecting with the service role key, may receive or
+-- send on the Mobius channels. No policy grants anon or authenticated
+-- clients access, so a browser holding the public anon key cannot join them
+-- and read other organizations' job events.
+
+ALTER TABLE realtime.messages ENABLE ROW LEVEL SECURITY;
+
+-- The service role bypasses RLS; these policies make the intended access
+-- explicit and keep it if the backend moves to a dedicated role.
+DROP POLICY IF EXISTS "mobius_backend_receives_events" ON realtime.messages;
+CREATE POLICY "mobius_backend_receives_events"
+ON realtime.messages
+FOR SELECT
+TO service_role
+USING (
+    realtime.messages.extension = 'broadcast'
+    AND realtime.topic() IN ('mobius-job-events', 'mobius-graph-cache')
+);
+
+DROP POLICY IF EXISTS "mobius_backend_sends_events" ON realtime.messages;
+CREATE POLICY "mobius_backend_sends_events"
+ON realtime.messages
+FOR INSERT
+TO service_role
+WITH CHECK (
+    realtime.messages.extension = 'broadcast'
+    AND realtime.topic() IN ('mobius-job-events', 'mobius-graph-cache')
+);
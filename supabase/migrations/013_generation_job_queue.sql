@@ -0,0 +1,90 @@
+-- Migration 013: Generation Job Queue
+-- Turns the jobs table into a durable queue for generation workers
+-- (mobius/storage/job_queue.py). A job is queued when it is created and stays
+-- queued until a worker finishes it, so a worker container that is recycled
+-- mid-run no longer strands the job: its lease expires and the reaper puts
+-- it back in the queue (or fails it once it has used up its attempts).
+
+-- Set while the job waits for or runs on a worker; cleared when it finishes
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS queued_at TIMESTAMPTZ;
+-- Worker holding the job; the lease is renewed by the worker's heartbeat
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS lease_owner VARCHAR(64);
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS leased_until TIMESTAMPTZ;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMPTZ;
+-- Number of times the job has been claimed
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS queue_attempts INT NOT NULL DEFAULT 0;
+
+-- Workers claim waiting jobs oldest first
+CREATE INDEX IF NOT EXISTS idx_jobs_queue_waiting
+ON jobs(queued_at)
+WHERE queued_at IS NOT NULL AND lease_owner IS NULL;
+
+-- The reaper scans leases
+CREATE INDEX IF NOT EXISTS idx_jobs_queue_leased
+ON jobs(leased_until)
+WHERE queued_at IS NOT NULL AND lease_owner IS NOT NULL;
+
+-- Claim up to p_limit waiting jobs for one worker, oldest first. Rows locked
+-- by a concurrent claim are skipped rather than waited on, so any number of
+-- workers can claim at once without handing out a job twice.
+CREATE OR REPLACE FUNCTION claim_generation_jobs(p_owner VARCHAR, p_limit INT, p_lease_seconds INT)
+RETURNS SETOF jobs AS $$
+BEGIN
+    RETURN QUERY
+    WITH claimable AS (
+        SELECT job_id
+        FROM jobs
+        WHERE queued_at IS NOT NULL
+          AND lease_owner IS NULL
+          AND status = 'pending'
+        ORDER BY queued_at
+        LIMIT p_limit
+        FOR UPDATE SKIP LOCKED
+    ),
+    claimed AS (
+        UPDATE jobs j
+        SET lease_owner = p_owner,
+            leased_until = NOW() + make_interval(secs => p_lease_seconds),
+            heartbeat_at = NOW(),
+            queue_attempts = j.queue_attempts + 1,
+            updated_at = NOW()
+        FROM claimable
+        WHERE j.job_id = claimable.job_id
+        RETURNING j.*
+    )
+    SELECT * FROM claimed ORDER BY queued_at;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Reaper: return jobs whose lease expired (their worker died) to the queue,
+-- or fail them once they have been claimed p_max_attempts times.
+CREATE OR REPLACE FUNCTION requeue_expired_generation_jobs(p_max_attempts INT)
+RETURNS TABLE(job_id UUID, requeued BOOLEAN) AS $$
+BEGIN
+    RETURN QUERY
+    WITH expired AS (
+        SELECT j.job_id
+        FROM jobs j
+        WHERE j.queued_at IS NOT NULL
+          AND j.lease_owner IS NOT NULL
+          AND j.leased_until < NOW()
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE jobs j
+    SET lease_owner = NULL,
+        leased_until = NULL,
+        status = CASE WHEN j.queue_attempts < p_max_attempts THEN 'pending' ELSE 'failed' END,
+        queued_at = CASE WHEN j.queue_attempts < p_max_attempts THEN j.queued_at END,
+        error = CASE
+            WHEN j.queue_attempts < p_max_attempts THEN j.error
+            ELSE 'Worker lease expired after ' || j.queue_attempts || ' attempts'
+        END,
+        updated_at = NOW()
+    FROM expired
+    WHERE j.job_id = expired.job_id
+    RETURNING j.job_id, j.queued_at IS NOT NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON COLUMN jobs.queued_at IS
+'When the job was queued for a generation worker; NULL once it has finished';
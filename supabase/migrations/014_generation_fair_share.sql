@@ -0,0 +1,139 @@
+-- Migration 014: Fair-Share Generation Queue
+-- Replaces the oldest-first claim from migration 013 with a priority-aware,
+-- weighted fair-share order (mobius/storage/job_queue.py), so one
+-- organization queueing a large campaign cannot starve everyone else:
+--   1. Priority class first: 0 interactive, 1 standard generate, 2 batch
+--   2. Then organizations in proportion to their weight, counting the jobs
+--      they already have running (weighted fair queuing)
+--   3. Then brands within an organization round-robin
+--   4. Then oldest first
+-- An organization never holds more than its concurrency cap of running jobs.
+
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS queue_priority SMALLINT NOT NULL DEFAULT 1;
+-- Copied from the brand when the job is queued so claims need no join
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS organization_id UUID;
+-- When a worker finished the job; the throughput behind queue ETAs
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS queue_finished_at TIMESTAMPTZ;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_queue_finished
+ON jobs(queue_finished_at)
+WHERE queue_finished_at IS NOT NULL;
+
+-- Per-organization share of the workers; organizations without a row get
+-- weight 1 and the default cap passed by the workers
+CREATE TABLE IF NOT EXISTS generation_queue_shares (
+    organization_id UUID PRIMARY KEY,
+    weight REAL NOT NULL DEFAULT 1 CHECK (weight > 0),
+    max_concurrency INT CHECK (max_concurrency > 0),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Waiting jobs in the order workers will claim them. queue_position is the
+-- number of waiting jobs ahead; claimable is false while the job's
+-- organization is at its concurrency cap.
+CREATE OR REPLACE FUNCTION rank_generation_queue(p_org_max_concurrency INT DEFAULT NULL)
+RETURNS TABLE(job_id UUID, queue_priority SMALLINT, queue_position BIGINT, claimable BOOLEAN) AS $$
+    WITH running AS (
+        SELECT j.organization_id, j.brand_id, COUNT(*) AS n
+        FROM jobs j
+        WHERE j.queued_at IS NOT NULL AND j.lease_owner IS NOT NULL
+        GROUP BY j.organization_id, j.brand_id
+    ),
+    org_running AS (
+        SELECT r.organization_id, SUM(r.n) AS n
+        FROM running r
+        GROUP BY r.organization_id
+    ),
+    waiting AS (
+        SELECT j.job_id, j.organization_id, j.queue_priority, j.queued_at,
+               COALESCE(r.n, 0) + ROW_NUMBER() OVER (
+                   PARTITION BY j.brand_id ORDER BY j.queue_priority, j.queued_at
+               ) AS brand_slot
+        FROM jobs j
+        LEFT JOIN running r ON r.brand_id = j.brand_id
+        WHERE j.queued_at IS NOT NULL
+          AND j.lease_owner IS NULL
+          AND j.status = 'pending'
+    ),
+    ranked AS (
+        SELECT w.*,
+               COALESCE(o.n, 0) + ROW_NUMBER() OVER (
+                   PARTITION BY w.organization_id
+                   ORDER BY w.queue_priority, w.brand_slot, w.queued_at
+               ) AS org_slot,
+               COALESCE(s.weight, 1) AS weight,
+               COALESCE(s.max_concurrency, p_org_max_concurrency) AS cap
+        FROM waiting w
+        LEFT JOIN org_running o ON o.organization_id IS NOT DISTINCT FROM w.organization_id
+        LEFT JOIN generation_queue_shares s ON s.organization_id = w.organization_id
+    )
+    SELECT ranked.job_id,
+           ranked.queue_priority,
+           ROW_NUMBER() OVER (
+               ORDER BY ranked.queue_priority, ranked.org_slot / ranked.weight,
+                        ranked.brand_slot, ranked.queued_at
+           ) - 1,
+           ranked.cap IS NULL OR ranked.org_slot <= ranked.cap
+    FROM ranked;
+$$ LANGUAGE sql STABLE;
+
+-- Claim up to p_limit claimable jobs in fair-share order. Claims are
+-- serialized with an advisory lock so concurrent workers see each other's
+-- running jobs and the organization caps hold exactly; the lock is held
+-- only for the claim itself.
+DROP FUNCTION IF EXISTS claim_generation_jobs(VARCHAR, INT, INT);
+CREATE OR REPLACE FUNCTION claim_generation_jobs(
+    p_owner VARCHAR,
+    p_limit INT,
+    p_lease_seconds INT,
+    p_max_priority INT DEFAULT NULL,
+    p_org_max_concurrency INT DEFAULT NULL
+)
+RETURNS SETOF jobs AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('claim_generation_jobs'));
+
+    RETURN QUERY
+    WITH candidates AS (
+        SELECT r.job_id, r.queue_position
+        FROM rank_generation_queue(p_org_max_concurrency) r
+        WHERE r.claimable
+          AND (p_max_priority IS NULL OR r.queue_priority <= p_max_priority)
+    ),
+    claimable AS (
+        SELECT j.job_id, c.queue_position
+        FROM jobs j
+        JOIN candidates c ON c.job_id = j.job_id
+        ORDER BY c.queue_position
+        LIMIT p_limit
+        FOR UPDATE OF j SKIP LOCKED
+    ),
+    claimed AS (
+        UPDATE jobs j
+        SET lease_owner = p_owner,
+            leased_until = NOW() + make_interval(secs => p_lease_seconds),
+            heartbeat_at = NOW(),
+            queue_attempts = j.queue_attempts + 1,
+            updated_at = NOW()
+        FROM claimable
+        WHERE j.job_id = claimable.job_id
+        RETURNING j.*
+    )
+    SELECT claimed.* FROM claimed
+    JOIN claimable ON claimable.job_id = claimed.job_id
+    ORDER BY claimable.queue_position;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Number of waiting jobs ahead of one job (NULL if it is not waiting)
+CREATE OR REPLACE FUNCTION generation_queue_position(p_job_id UUID, p_org_max_concurrency INT DEFAULT NULL)
+RETURNS BIGINT AS $$
+    SELECT r.queue_position
+    FROM rank_generation_queue(p_org_max_concurrency) r
+    WHERE r.job_id = p_job_id;
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON COLUMN jobs.queue_priority IS
+'Generation queue priority class: 0 interactive, 1 standard, 2 batch';
+COMMENT ON TABLE generation_queue_shares IS
+'Per-organization weight and concurrency cap for the generation queue';
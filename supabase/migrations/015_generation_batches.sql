@@ -0,0 +1,15 @@
+-- Migration 015: Generation Batches
+-- A batch request (/v1/generate/batch) creates one parent job plus one child
+-- job per prompt. Children are ordinary queued generation jobs (migrations
+-- 013 and 014, batch priority class); the parent is never queued and reports
+-- the aggregate progress and results of its children.
+
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS parent_job_id UUID
+    REFERENCES jobs(job_id) ON DELETE SET NULL;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_parent
+ON jobs(parent_job_id)
+WHERE parent_job_id IS NOT NULL;
+
+COMMENT ON COLUMN jobs.parent_job_id IS
+'Batch job this job was created for; NULL for standalone jobs and batch parents';
@@ -0,0 +1,15 @@
+-- Migration 016: Generation Result Cache
+-- Generation requests that opt into the result cache (cache = 'use' or
+-- 'refresh') store a key derived from the brand's guidelines version, the
+-- normalized prompt, template, generation params and seed. A later identical
+-- request is answered with the latest completed job for the key, and one
+-- arriving while a job for the key is pending or processing returns that job.
+
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS result_cache_key TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_result_cache_key
+ON jobs(result_cache_key, status, updated_at DESC)
+WHERE result_cache_key IS NOT NULL;
+
+COMMENT ON COLUMN jobs.result_cache_key IS
+'SHA-256 key of the generation request for the result cache; NULL when the request did not opt in or the job was tweaked';
@@ -10,6 +10,7 @@ from unittest.mock import Mock
 from datetime import datetime, timezone
 from hypothesis import settings, Verbosity
 from mobius.models.brand import Brand, BrandGuidelines, Color, Typography, LogoRule
+from mobius.storage.brand_cache import brand_cache
 
 
 # Configure Hypothesis profiles for different test environments
@@ -34,6 +35,14 @@ else:
     settings.load_profile("dev")
 
 
+@pytest.fixture(autouse=True)
+def clear_brand_cache():
+    """Isolate tests from brands cached by earlier tests."""
+    brand_cache.clear()
+    yield
+    brand_cache.clear()
+
+
 @pytest.fixture
 def mock_supabase():
     """Mock Supabase client for unit tests."""
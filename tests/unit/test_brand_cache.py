@@ -0,0 +1,155 @@
+"""
+Unit tests for the shared brand cache.
+
+Tests hits, TTL expiry, LRU eviction, single-flight loading and
+invalidation on brand writes.
+"""
+
+import asyncio
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock, patch
+from mobius.models.brand import Brand, BrandGuidelines
+from mobius.storage.brand_cache import BrandCache
+from mobius.storage.brands import BrandStorage
+
+
+def make_brand(brand_id: str, name: str = "Test Brand") -> Brand:
+    return Brand(
+        brand_id=brand_id,
+        organization_id="org-1",
+        name=name,
+        guidelines=BrandGuidelines(),
+        created_at=datetime.now(timezone.utc).isoformat(),
+        updated_at=datetime.now(timezone.utc).isoformat(),
+    )
+
+
+def make_storage(*brands) -> Mock:
+    storage = Mock()
+    storage.get_brand = AsyncMock(side_effect=list(brands))
+    return storage
+
+
+@pytest.mark.asyncio
+async def test_second_get_is_served_from_cache():
+    """Test that a cached brand is not reloaded."""
+    cache = BrandCache()
+    storage = make_storage(make_brand("brand-1"))
+
+    first = await cache.get("brand-1", storage=storage)
+    second = await cache.get("brand-1", storage=storage)
+
+    assert first is second
+    storage.get_brand.assert_awaited_once_with("brand-1")
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hit_ratio"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_missing_brand_is_not_cached():
+    """Test that a miss returning None is retried on the next lookup."""
+    cache = BrandCache()
+    storage = make_storage(None, make_brand("brand-1"))
+
+    assert await cache.get("brand-1", storage=storage) is None
+    assert (await cache.get("brand-1", storage=storage)).brand_id == "brand-1"
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_is_reloaded():
+    """Test that entries older than the TTL are reloaded."""
+    cache = BrandCache(ttl_seconds=0)
+    storage = make_storage(make_brand("brand-1", "Old"), make_brand("brand-1", "New"))
+
+    await cache.get("brand-1", storage=storage)
+    brand = await cache.get("brand-1", storage=storage)
+
+    assert brand.name == "New"
+    assert storage.get_brand.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entry_is_evicted():
+    """Test that the cache stays within max_size by evicting the LRU entry."""
+    cache = BrandCache(max_size=2)
+    storage = Mock()
+    storage.get_brand = AsyncMock(side_effect=lambda brand_id: make_brand(brand_id))
+
+    await cache.get("brand-1", storage=storage)
+    await cache.get("brand-2", storage=storage)
+    await cache.get("brand-1", storage=storage)  # brand-2 is now LRU
+    await cache.get("brand-3", storage=storage)
+
+    assert cache.stats()["size"] == 2
+    assert cache.stats()["evictions"] == 1
+    await cache.get("brand-1", storage=storage)
+    assert storage.get_brand.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    """Test that concurrent misses for one brand trigger a single load."""
+    cache = BrandCache()
+    release = asyncio.Event()
+
+    async def slow_get_brand(brand_id):
+        await release.wait()
+        return make_brand(brand_id)
+
+    storage = Mock()
+    storage.get_brand = AsyncMock(side_effect=slow_get_brand)
+
+    tasks = [asyncio.create_task(cache.get("brand-1", storage=storage)) for _ in range(10)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert storage.get_brand.await_count == 1
+    assert all(r is results[0] for r in results)
+    assert cache.stats()["coalesced"] == 9
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_load_prevents_stale_caching():
+    """Test that a write during an in-flight load keeps the old value out of the cache."""
+    cache = BrandCache()
+    release = asyncio.Event()
+    names = iter(["Before", "After"])
+
+    async def slow_get_brand(brand_id):
+        name = next(names)
+        if name == "Before":
+            await release.wait()
+        return make_brand(brand_id, name)
+
+    storage = Mock()
+    storage.get_brand = AsyncMock(side_effect=slow_get_brand)
+
+    task = asyncio.create_task(cache.get("brand-1", storage=storage))
+    await asyncio.sleep(0)
+    cache.invalidate("brand-1")
+    release.set()
+
+    assert (await task).name == "Before"
+    assert (await cache.get("brand-1", storage=storage)).name == "After"
+
+
+@pytest.mark.asyncio
+@patch("mobius.storage.brands.get_supabase_client")
+async def test_brand_storage_update_invalidates_shared_cache(mock_get_client):
+    """Test that BrandStorage.update_brand invalidates the shared cache entry."""
+    from mobius.storage.brand_cache import brand_cache
+
+    client = Mock()
+    for method in ("table", "update", "eq"):
+        setattr(client, method, Mock(return_value=client))
+    client.execute = Mock(return_value=Mock(data=[make_brand("brand-1", "Renamed").model_dump()]))
+    mock_get_client.return_value = client
+
+    await brand_cache.get("brand-1", storage=make_storage(make_brand("brand-1")))
+    await BrandStorage().update_brand("brand-1", {"name": "Renamed"})
+
+    assert brand_cache.stats()["size"] == 0
+    assert brand_cache.stats()["invalidations"] == 1
@@ -156,27 +156,23 @@ async def test_ingest_brand_accepts_valid_pdf(valid_pdf_bytes):
 
 @pytest.mark.asyncio
 @patch("mobius.api.routes.BrandStorage")
-@patch("mobius.api.routes.get_supabase_client")
-async def test_list_brands_returns_brands_with_stats(
-    mock_get_client, mock_storage_class, sample_brand
-):
-    """Test listing brands returns brands with computed statistics."""
-    # Mock storage
+async def test_list_brands_returns_brands_with_stats(mock_storage_class, sample_brand):
+    """Test listing brands returns brands with precomputed statistics."""
+    last_activity = datetime.now(timezone.utc)
+
+    # Mock storage (stats come from the brand_stats aggregate)
     mock_storage = Mock()
     mock_storage.list_brands = AsyncMock(return_value=[sample_brand])
-    mock_storage_class.return_value = mock_storage
-
-    # Mock Supabase client for asset queries
-    mock_client = Mock()
-    mock_execute = Mock()
-    mock_execute.data = [
-        {"compliance_score": 85.0, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"compliance_score": 90.0, "created_at": datetime.now(timezone.utc).isoformat()},
-    ]
-    mock_client.table.return_value.select.return_value.eq.return_value.execute.return_value = (
-        mock_execute
+    mock_storage.get_brand_stats = AsyncMock(
+        return_value={
+            sample_brand.brand_id: {
+                "asset_count": 2,
+                "avg_compliance_score": 87.5,
+                "last_activity": last_activity.isoformat(),
+            }
+        }
     )
-    mock_get_client.return_value = mock_client
+    mock_storage_class.return_value = mock_storage
 
     response = await list_brands_handler(
         organization_id="org-123",
@@ -189,27 +185,20 @@ async def test_list_brands_returns_brands_with_stats(
     assert response.brands[0].name == sample_brand.name
     assert response.brands[0].asset_count == 2
     assert response.brands[0].avg_compliance_score == 87.5  # (85 + 90) / 2
+    assert response.brands[0].last_activity == last_activity
     assert response.total == 1
+    mock_storage.get_brand_stats.assert_called_once_with([sample_brand.brand_id])
 
 
 @pytest.mark.asyncio
 @patch("mobius.api.routes.BrandStorage")
-@patch("mobius.api.routes.get_supabase_client")
-async def test_list_brands_with_search(mock_get_client, mock_storage_class, sample_brand):
+async def test_list_brands_with_search(mock_storage_class, sample_brand):
     """Test listing brands with search filter."""
     mock_storage = Mock()
     mock_storage.list_brands = AsyncMock(return_value=[sample_brand])
+    mock_storage.get_brand_stats = AsyncMock(return_value={})
     mock_storage_class.return_value = mock_storage
 
-    # Mock Supabase client
-    mock_client = Mock()
-    mock_execute = Mock()
-    mock_execute.data = []
-    mock_client.table.return_value.select.return_value.eq.return_value.execute.return_value = (
-        mock_execute
-    )
-    mock_get_client.return_value = mock_client
-
     response = await list_brands_handler(
         organization_id="org-123",
         search="Test",
@@ -222,24 +211,15 @@ async def test_list_brands_with_search(mock_get_client, mock_storage_class, samp
 
 @pytest.mark.asyncio
 @patch("mobius.api.routes.BrandStorage")
-@patch("mobius.api.routes.get_supabase_client")
 async def test_list_brands_handles_no_assets(
-    mock_get_client, mock_storage_class, sample_brand
+    mock_storage_class, sample_brand
 ):
     """Test listing brands when brand has no assets."""
     mock_storage = Mock()
     mock_storage.list_brands = AsyncMock(return_value=[sample_brand])
+    mock_storage.get_brand_stats = AsyncMock(return_value={})
     mock_storage_class.return_value = mock_storage
 
-    # Mock Supabase client with no assets
-    mock_client = Mock()
-    mock_execute = Mock()
-    mock_execute.data = []
-    mock_client.table.return_value.select.return_value.eq.return_value.execute.return_value = (
-        mock_execute
-    )
-    mock_get_client.return_value = mock_client
-
     response = await list_brands_handler(
         organization_id="org-123",
         search=None,
@@ -392,8 +372,7 @@ async def test_delete_brand_raises_not_found(mock_storage_class):
 
 @pytest.mark.asyncio
 @patch("mobius.api.routes.BrandStorage")
-@patch("mobius.api.routes.get_supabase_client")
-async def test_list_brands_handles_storage_error(mock_get_client, mock_storage_class):
+async def test_list_brands_handles_storage_error(mock_storage_class):
     """Test that storage errors are properly handled."""
     mock_storage = Mock()
     mock_storage.list_brands = AsyncMock(side_effect=Exception("Database error"))
@@ -431,24 +410,15 @@ async def test_get_brand_handles_storage_error(mock_storage_class):
 
 @pytest.mark.asyncio
 @patch("mobius.api.routes.BrandStorage")
-@patch("mobius.api.routes.get_supabase_client")
 async def test_list_brands_filters_by_organization(
-    mock_get_client, mock_storage_class, sample_brand
+    mock_storage_class, sample_brand
 ):
     """Test that brands are filtered by organization_id."""
     mock_storage = Mock()
     mock_storage.list_brands = AsyncMock(return_value=[sample_brand])
+    mock_storage.get_brand_stats = AsyncMock(return_value={})
     mock_storage_class.return_value = mock_storage
 
-    # Mock Supabase client
-    mock_client = Mock()
-    mock_execute = Mock()
-    mock_execute.data = []
-    mock_client.table.return_value.select.return_value.eq.return_value.execute.return_value = (
-        mock_execute
-    )
-    mock_get_client.return_value = mock_client
-
     response = await list_brands_handler(
         organization_id="specific-org-123",
         search=None,
@@ -461,24 +431,15 @@ async def test_list_brands_filters_by_organization(
 
 @pytest.mark.asyncio
 @patch("mobius.api.routes.BrandStorage")
-@patch("mobius.api.routes.get_supabase_client")
 async def test_list_brands_respects_limit(
-    mock_get_client, mock_storage_class, sample_brand
+    mock_storage_class, sample_brand
 ):
     """Test that brand list respects the limit parameter."""
     mock_storage = Mock()
     mock_storage.list_brands = AsyncMock(return_value=[sample_brand])
+    mock_storage.get_brand_stats = AsyncMock(return_value={})
     mock_storage_class.return_value = mock_storage
 
-    # Mock Supabase client
-    mock_client = Mock()
-    mock_execute = Mock()
-    mock_execute.data = []
-    mock_client.table.return_value.select.return_value.eq.return_value.execute.return_value = (
-        mock_execute
-    )
-    mock_get_client.return_value = mock_client
-
     response = await list_brands_handler(
         organization_id="org-123",
         search=None,
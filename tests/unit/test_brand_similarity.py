@@ -0,0 +1,252 @@
+"""
+Unit tests for the in-process brand similarity index.
+
+Runs against the in-memory storage backend and checks the sparse results
+against a brute-force Jaccard computation.
+"""
+
+import asyncio
+import random
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import patch
+from mobius.models.brand import Brand, BrandGuidelines, Color
+from mobius.storage.brand_similarity import (
+    COLOR_DELTA_MERGE_SIZE,
+    BrandSimilarityIndex,
+    brand_similarity_index,
+)
+from mobius.storage.brands import BrandStorage
+from mobius.storage.local import LocalSupabaseClient, MemoryStore
+
+
+def make_brand(brand_id: str, org_id: str, colors: dict) -> Brand:
+    now = datetime.now(timezone.utc).isoformat()
+    return Brand(
+        brand_id=brand_id,
+        organization_id=org_id,
+        name=f"Brand {brand_id}",
+        guidelines=BrandGuidelines(
+            colors=[
+                Color(name=hex, hex=hex, usage="primary", usage_weight=weight)
+                for hex, weight in colors.items()
+            ]
+        ),
+        created_at=now,
+        updated_at=now,
+    )
+
+
+@pytest.fixture
+def client():
+    client = LocalSupabaseClient(MemoryStore())
+    brand_similarity_index.clear()
+    with patch("mobius.storage.brand_similarity.get_supabase_client", return_value=client), patch(
+        "mobius.storage.brands.get_supabase_client", return_value=client
+    ):
+        yield client
+    brand_similarity_index.clear()
+
+
+def insert(client, brand: Brand) -> None:
+    client.table("brands").insert(brand.model_dump(exclude_none=True, exclude={"website"})).execute()
+
+
+@pytest.mark.asyncio
+async def test_matches_brute_force_jaccard(client):
+    """Test that sparse scores and ranking match a per-pair computation."""
+    rng = random.Random(3)
+    hexes = [f"#{i:06X}" for i in range(12)]
+    palettes = {}
+    for i in range(40):
+        palettes[f"brand-{i:02d}"] = set(rng.sample(hexes, rng.randint(2, 6)))
+        insert(client, make_brand(f"brand-{i:02d}", f"org-{i % 7}", dict.fromkeys(palettes[f"brand-{i:02d}"], 0.0)))
+
+    results = await BrandSimilarityIndex().find_similar("brand-00", min_shared_colors=2, limit=5)
+
+    subject = palettes["brand-00"]
+    expected = sorted(
+        (
+            (-len(subject & other) / len(subject | other), brand_id)
+            for brand_id, other in palettes.items()
+            if brand_id != "brand-00"
+            and int(brand_id[-2:]) % 7 != 0
+            and len(subject & other) >= 2
+        )
+    )[:5]
+    assert [r["similar_brand_id"] for r in results] == [brand_id for _, brand_id in expected]
+    for result, (score, brand_id) in zip(results, expected):
+        assert result["similarity_score"] == pytest.approx(-score)
+        assert set(result["shared_colors"]) == subject & palettes[brand_id]
+
+
+@pytest.mark.asyncio
+async def test_weighted_similarity_uses_usage_weights(client):
+    """Test that weighted Jaccard favours brands sharing the dominant colors."""
+    insert(client, make_brand("subject", "org-1", {"#111111": 0.6, "#222222": 0.3, "#333333": 0.1}))
+    insert(client, make_brand("dominant", "org-2", {"#111111": 0.6, "#222222": 0.3, "#444444": 0.1}))
+    insert(client, make_brand("accent", "org-2", {"#111111": 0.1, "#333333": 0.1, "#555555": 0.8}))
+    index = BrandSimilarityIndex()
+
+    weighted = await index.find_similar("subject", min_shared_colors=2, weighted=True)
+
+    assert [r["similar_brand_id"] for r in weighted] == ["dominant", "accent"]
+    assert weighted[0]["similarity_score"] == pytest.approx(0.9 / 1.1)
+
+
+@pytest.mark.asyncio
+async def test_brand_writes_update_loaded_index(client):
+    """Test that create/update/delete through BrandStorage refresh the index."""
+    storage = BrandStorage()
+    await storage.create_brand(make_brand("subject", "org-1", dict.fromkeys(["#111111", "#222222"], 0.5)))
+    assert await brand_similarity_index.find_similar("subject", min_shared_colors=2) == []
+
+    await storage.create_brand(make_brand("other", "org-2", dict.fromkeys(["#111111", "#222222"], 0.5)))
+    assert [r["similar_brand_id"] for r in await brand_similarity_index.find_similar("subject", 2)] == [
+        "other"
+    ]
+
+    await storage.update_brand("other", {"organization_id": "org-1"})
+    assert await brand_similarity_index.find_similar("subject", 2) == []
+
+    await storage.update_brand("other", {"organization_id": "org-2"})
+    await storage.delete_brand("other")
+    assert await brand_similarity_index.find_similar("subject", 2) == []
+    assert brand_similarity_index.loads == 1
+
+
+def test_hex_to_lab_matches_reference_values():
+    """Test sRGB -> CIELAB conversion against known D65 values."""
+    from mobius.utils.color import hex_to_lab
+
+    lab = hex_to_lab(["#FFFFFF", "#000000", "#FF0000"])
+
+    assert lab[0] == pytest.approx([100.0, 0.0, 0.0], abs=0.01)
+    assert lab[1] == pytest.approx([0.0, 0.0, 0.0], abs=0.01)
+    assert lab[2] == pytest.approx([53.24, 80.09, 67.20], abs=0.05)
+
+
+@pytest.mark.asyncio
+async def test_perceptual_color_search_matches_near_colors(client):
+    """Test that tolerance matches near-identical hex codes, closest first."""
+    insert(client, make_brand("exact", "org-1", {"#0057B8": 0.6}))
+    insert(client, make_brand("near", "org-2", {"#0058B9": 0.3, "#FFFFFF": 0.7}))
+    insert(client, make_brand("far", "org-3", {"#FF0000": 1.0}))
+    index = BrandSimilarityIndex()
+
+    exact, total = await index.find_brands_near_color("#0057B8", 0)
+    assert [r["brand_id"] for r in exact] == ["exact"]
+    assert total == 1
+
+    results, total = await index.find_brands_near_color("#0057b8", tolerance=3)
+    assert [r["brand_id"] for r in results] == ["exact", "near"]
+    assert total == 2
+    assert results[0]["delta_e"] == 0.0
+    assert results[1]["matched_hex"] == "#0058B9"
+    assert 0 < results[1]["delta_e"] < 3
+    assert results[1]["usage"] == "primary"
+
+    nearest = await index.nearest_colors("#0057B8", k=2)
+    assert [c["hex"] for c in nearest] == ["#0057B8", "#0058B9"]
+    assert nearest[0]["brand_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_color_search_pages_through_every_match(client):
+    """Test that tolerance searches report the total and page past the limit."""
+    for i in range(5):
+        insert(client, make_brand(f"brand-{i}", "org-1", {f"#0057B{i}": 1.0}))
+    index = BrandSimilarityIndex()
+
+    first, total = await index.find_brands_near_color("#0057B0", tolerance=10, limit=2)
+    rest, _ = await index.find_brands_near_color("#0057B0", tolerance=10, limit=2, offset=2)
+    last, _ = await index.find_brands_near_color("#0057B0", tolerance=10, limit=2, offset=4)
+
+    assert total == 5
+    assert [r["brand_id"] for r in first + rest + last] == [f"brand-{i}" for i in range(5)]
+    assert await index.find_brands_near_color("#0057B0", tolerance=10, offset=5) == ([], 5)
+
+
+@pytest.mark.asyncio
+async def test_new_colors_are_searched_without_rebuilding_the_tree(client):
+    """Test that colors added after the tree was built are found via the delta buffer."""
+    insert(client, make_brand("base", "org-1", {"#102030": 1.0}))
+    index = BrandSimilarityIndex()
+    await index.nearest_colors("#102030", k=1)
+    assert index.tree_builds == 1
+
+    index.upsert(make_brand("added", "org-2", {"#102031": 1.0}))
+    results, total = await index.find_brands_near_color("#102031", tolerance=0)
+    nearest = await index.nearest_colors("#102031", k=2)
+
+    assert [r["brand_id"] for r in results] == ["added"]
+    assert total == 1
+    assert [c["hex"] for c in nearest] == ["#102031", "#102030"]
+    assert index.tree_builds == 1
+    assert index.stats()["delta_colors"] == 1
+
+    # A full delta buffer is merged into the tree by the next query
+    for i in range(COLOR_DELTA_MERGE_SIZE):
+        index.upsert(make_brand(f"bulk-{i}", "org-3", {f"#80{i:04X}": 1.0}))
+    results, _ = await index.find_brands_near_color("#800010", tolerance=0)
+
+    assert [r["brand_id"] for r in results] == ["bulk-16"]
+    assert index.tree_builds == 2
+    assert index.stats()["delta_colors"] == 0
+
+
+@pytest.mark.asyncio
+async def test_writes_update_rows_in_place_without_rebuilding(client):
+    """Test that upserts and removals splice rows and match a freshly built index."""
+    rng = random.Random(5)
+    hexes = [f"#{i:06X}" for i in range(10)]
+    storage = BrandStorage()
+    for i in range(30):
+        await storage.create_brand(
+            make_brand(f"brand-{i:02d}", f"org-{i % 4}", dict.fromkeys(rng.sample(hexes, 4), 0.25))
+        )
+    await brand_similarity_index.find_similar("brand-00", 2)
+    builds, updates = brand_similarity_index.builds, brand_similarity_index.row_updates
+
+    for i in range(10):
+        brand_id = f"brand-{rng.randrange(30):02d}"
+        if i % 3 == 2:
+            await storage.delete_brand(brand_id)
+        else:
+            await storage.update_brand(brand_id, {
+                "guidelines": make_brand(brand_id, "org-0", dict.fromkeys(
+                    rng.sample(hexes, 2) + ["#ABCDEF"], 0.3
+                )).guidelines.model_dump(),
+            })
+
+    assert brand_similarity_index.builds == builds
+    assert brand_similarity_index.row_updates - updates == 10
+    fresh = BrandSimilarityIndex()
+    for i in range(30):
+        brand_id = f"brand-{i:02d}"
+        assert await brand_similarity_index.find_similar(brand_id, 2, limit=30) == \
+            await fresh.find_similar(brand_id, 2, limit=30)
+    assert await brand_similarity_index.nearest_colors("#ABCDEF", k=3) == \
+        await fresh.nearest_colors("#ABCDEF", k=3)
+
+
+@pytest.mark.asyncio
+async def test_stale_index_reloads_in_background(client):
+    """Test that an expired index keeps serving while it reloads, keeping concurrent writes."""
+    insert(client, make_brand("subject", "org-1", dict.fromkeys(["#111111", "#222222"], 0.5)))
+    insert(client, make_brand("other", "org-2", dict.fromkeys(["#111111", "#222222"], 0.5)))
+    index = BrandSimilarityIndex(refresh_seconds=60)
+    assert len(await index.find_similar("subject", 2)) == 1
+
+    # Written by another container
+    insert(client, make_brand("third", "org-3", dict.fromkeys(["#111111", "#222222"], 0.5)))
+    index._loaded_at -= 120
+
+    assert len(await index.find_similar("subject", 2)) == 1
+    # Let the reload start reading, then write here while it is in flight
+    await asyncio.sleep(0)
+    index.remove("other")
+    await index._refresh_task
+
+    assert [r["similar_brand_id"] for r in await index.find_similar("subject", 2)] == ["third"]
+    assert index.loads == 2
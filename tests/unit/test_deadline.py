@@ -0,0 +1,82 @@
+"""
+Unit tests for workflow deadline budgets.
+"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mobius.graphs.generation import route_after_audit
+from mobius.models.brand import CompressedDigitalTwin
+from mobius.tools.gemini import GeminiClient
+from mobius.utils.deadline import (
+    DeadlineExceeded,
+    bind_deadline,
+    deadline_node,
+    new_deadline,
+    remaining_seconds,
+    step_timeout,
+)
+
+
+def test_steps_keep_their_timeout_without_a_deadline():
+    assert remaining_seconds() is None
+    assert step_timeout("logo_download", 60.0) == 60.0
+
+
+def test_step_timeouts_are_capped_by_the_remaining_budget():
+    with bind_deadline(time.time() + 40):
+        assert 39 < step_timeout("logo_download", 60.0) <= 40
+        assert step_timeout("prompt_optimization", 15.0) == 15.0
+
+    with bind_deadline(time.time() + 40, reserve_seconds=30):
+        with pytest.raises(DeadlineExceeded) as exc:
+            step_timeout("image_generation", 180.0, min_seconds=20)
+    assert exc.value.step == "image_generation"
+    # The binding ends with the block
+    assert remaining_seconds() is None
+
+
+async def test_nodes_run_under_the_state_deadline():
+    seen = {}
+
+    async def node(state):
+        seen["remaining"] = remaining_seconds()
+        return {"status": "generated"}
+
+    wrapped = deadline_node(node, reserve_seconds=30)
+
+    assert await wrapped({"deadline_at": new_deadline(100)}) == {"status": "generated"}
+    assert 69 < seen["remaining"] <= 70
+
+    with pytest.raises(DeadlineExceeded):
+        await wrapped({"deadline_at": new_deadline(20)})
+
+    # States from before deadlines existed run unchanged
+    await wrapped({})
+    assert seen["remaining"] is None
+
+
+def test_no_correction_round_without_budget_for_it():
+    state = {"is_approved": False, "attempt_count": 2, "compliance_scores": []}
+
+    assert route_after_audit({**state, "deadline_at": new_deadline(200)}) == "correct"
+    assert route_after_audit({**state, "deadline_at": new_deadline(10)}) == "failed"
+
+
+async def test_image_generation_is_not_started_without_budget():
+    # Token estimates would download the tokenizer
+    with patch("google.generativeai.configure"), \
+            patch("google.generativeai.GenerativeModel") as model_class, \
+            patch.object(GeminiClient, "_estimate_token_count", return_value=0), \
+            patch.object(CompressedDigitalTwin, "estimate_tokens", return_value=0):
+        vision_model = MagicMock()
+        model_class.return_value = vision_model
+        client = GeminiClient()
+
+        with bind_deadline(time.time() + 10):
+            with pytest.raises(DeadlineExceeded):
+                await client.generate_image("Summer sale banner", CompressedDigitalTwin())
+
+    vision_model.generate_content.assert_not_called()
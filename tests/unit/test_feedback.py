@@ -161,30 +161,21 @@ async def test_get_feedback_stats(mock_get_client, mock_supabase_client, test_br
     """
     mock_get_client.return_value = mock_supabase_client
     
-    # Mock feedback data
-    feedback_data = [
-        {"action": "approve"},
-        {"action": "approve"},
-        {"action": "approve"},
-        {"action": "reject"},
-        {"action": "reject"},
+    # Mock brand counter row (maintained by the feedback trigger)
+    brand_data = [
+        {
+            "feedback_count": 5,
+            "approval_count": 3,
+            "rejection_count": 2,
+            "learning_active": False,
+        }
     ]
     
-    # Mock brand data
-    brand_data = [{"learning_active": False}]
-    
-    # Setup mocks
-    mock_feedback_execute = Mock()
-    mock_feedback_execute.data = feedback_data
-    
     mock_brand_execute = Mock()
     mock_brand_execute.data = brand_data
-    
-    # Mock the select chains
-    mock_supabase_client.table.return_value.select.return_value.eq.return_value.execute.side_effect = [
-        mock_feedback_execute,
-        mock_brand_execute,
-    ]
+    mock_supabase_client.table.return_value.select.return_value.eq.return_value.execute.return_value = (
+        mock_brand_execute
+    )
     
     # Get statistics
     feedback_storage = FeedbackStorage()
@@ -195,6 +186,9 @@ async def test_get_feedback_stats(mock_get_client, mock_supabase_client, test_br
     assert stats["approvals"] == 3
     assert stats["rejections"] == 2
     assert stats["learning_active"] is False
+    
+    # Single counter read, no feedback scan
+    mock_supabase_client.table.assert_called_once_with("brands")
 
 
 @pytest.mark.asyncio
@@ -207,24 +201,21 @@ async def test_learning_active_at_threshold(mock_get_client, mock_supabase_clien
     """
     mock_get_client.return_value = mock_supabase_client
     
-    # Mock feedback data with exactly LEARNING_ACTIVATION_THRESHOLD items
-    feedback_data = [{"action": "approve"} for _ in range(LEARNING_ACTIVATION_THRESHOLD)]
-    
-    # Mock brand data with learning_active = True
-    brand_data = [{"learning_active": True}]
-    
-    # Setup mocks
-    mock_feedback_execute = Mock()
-    mock_feedback_execute.data = feedback_data
+    # Mock brand counter row with learning_active = True
+    brand_data = [
+        {
+            "feedback_count": LEARNING_ACTIVATION_THRESHOLD,
+            "approval_count": LEARNING_ACTIVATION_THRESHOLD,
+            "rejection_count": 0,
+            "learning_active": True,
+        }
+    ]
     
     mock_brand_execute = Mock()
     mock_brand_execute.data = brand_data
-    
-    # Mock the select chains
-    mock_supabase_client.table.return_value.select.return_value.eq.return_value.execute.side_effect = [
-        mock_feedback_execute,
-        mock_brand_execute,
-    ]
+    mock_supabase_client.table.return_value.select.return_value.eq.return_value.execute.return_value = (
+        mock_brand_execute
+    )
     
     # Get statistics
     feedback_storage = FeedbackStorage()
@@ -245,25 +236,23 @@ async def test_learning_active_below_threshold(mock_get_client, mock_supabase_cl
     """
     mock_get_client.return_value = mock_supabase_client
     
-    # Mock feedback data below threshold
     feedback_count = LEARNING_ACTIVATION_THRESHOLD - 1
-    feedback_data = [{"action": "approve"} for _ in range(feedback_count)]
-    
-    # Mock brand data with learning_active = False
-    brand_data = [{"learning_active": False}]
     
-    # Setup mocks
-    mock_feedback_execute = Mock()
-    mock_feedback_execute.data = feedback_data
+    # Mock brand counter row with learning_active = False
+    brand_data = [
+        {
+            "feedback_count": feedback_count,
+            "approval_count": feedback_count,
+            "rejection_count": 0,
+            "learning_active": False,
+        }
+    ]
     
     mock_brand_execute = Mock()
     mock_brand_execute.data = brand_data
-    
-    # Mock the select chains
-    mock_supabase_client.table.return_value.select.return_value.eq.return_value.execute.side_effect = [
-        mock_feedback_execute,
-        mock_brand_execute,
-    ]
+    mock_supabase_client.table.return_value.select.return_value.eq.return_value.execute.return_value = (
+        mock_brand_execute
+    )
     
     # Get statistics
     feedback_storage = FeedbackStorage()
@@ -300,7 +289,7 @@ async def test_list_feedback_by_brand(mock_get_client, mock_supabase_client, tes
     # Setup mock
     mock_execute = Mock()
     mock_execute.data = feedback_data
-    mock_supabase_client.table.return_value.select.return_value.eq.return_value.order.return_value.range.return_value.execute.return_value = mock_execute
+    mock_supabase_client.table.return_value.select.return_value.eq.return_value.order.return_value.order.return_value.limit.return_value.execute.return_value = mock_execute
     
     # List feedback
     feedback_storage = FeedbackStorage()
@@ -0,0 +1,174 @@
+"""
+Unit tests for batch generation (/v1/generate/batch).
+
+Runs the handlers against the in-memory storage backend; no worker runs,
+child jobs are moved through their lifecycle by hand.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from mobius.api.errors import ValidationError
+from mobius.api.routes import cancel_job_handler, generate_batch_handler, get_job_status_handler
+from mobius.models.brand import LogoRule
+from mobius.nodes import generate
+from mobius.storage.job_queue import PRIORITY_BATCH, GenerationWorker
+from mobius.storage.local import LocalSupabaseClient, MemoryStore
+
+BRAND_ID = "aaaaaaaa-0000-0000-0000-000000000000"
+ORG_ID = "0000000a-0000-0000-0000-000000000000"
+
+
+@pytest.fixture
+def client():
+    client = LocalSupabaseClient(MemoryStore())
+    brand = SimpleNamespace(brand_id=BRAND_ID, organization_id=ORG_ID)
+    with patch("mobius.storage.jobs.get_supabase_client", return_value=client), \
+            patch("mobius.storage.job_queue.get_supabase_client", return_value=client), \
+            patch("mobius.api.routes.brand_cache.get", AsyncMock(return_value=brand)), \
+            patch("mobius.api.routes.generation_worker") as worker:
+        client.worker = worker
+        yield client
+
+
+def get_row(client, job_id: str) -> dict:
+    return client.table("jobs").select("*").eq("job_id", job_id).execute().data[0]
+
+
+def finish_child(client, job_id: str, status: str, image_url: str = None) -> None:
+    row = get_row(client, job_id)
+    client.table("jobs").update({
+        "status": status,
+        "progress": 100.0,
+        "queued_at": None,
+        "state": {**row["state"], "image_uri": image_url, "compliance_scores": [{"overall_score": 91}]},
+    }).eq("job_id", job_id).execute()
+
+
+async def test_batch_queues_one_child_per_prompt(client):
+    result = await generate_batch_handler(
+        brand_id=BRAND_ID, prompts=["Summer sale post", "Summer sale banner"]
+    )
+
+    assert result["status"] == "pending"
+    assert result["total"] == 2
+    parent = get_row(client, result["batch_id"])
+    assert parent["state"]["batch"] is True
+    assert parent["queued_at"] is None
+
+    children = [get_row(client, job_id) for job_id in result["child_job_ids"]]
+    assert [c["state"]["prompt"] for c in children] == ["Summer sale post", "Summer sale banner"]
+    assert {c["parent_job_id"] for c in children} == {result["batch_id"]}
+    assert {c["queue_priority"] for c in children} == {PRIORITY_BATCH}
+    assert {c["organization_id"] for c in children} == {ORG_ID}
+    assert all(c["queued_at"] for c in children)
+    client.worker.start.assert_called_once()
+
+
+async def test_variations_of_one_prompt_are_numbered(client):
+    result = await generate_batch_handler(brand_id=BRAND_ID, prompt="Hero image", variations=3)
+
+    children = [get_row(client, job_id) for job_id in result["child_job_ids"]]
+    assert [c["state"]["generation_params"]["variation"] for c in children] == [1, 2, 3]
+    assert {c["state"]["prompt"] for c in children} == {"Hero image"}
+
+
+async def test_worker_runs_batch_children(client):
+    result = await generate_batch_handler(brand_id=BRAND_ID, prompt="Hero image", variations=2)
+
+    workflow = AsyncMock(return_value={"status": "completed", "current_image_url": "https://cdn/img.png"})
+    with patch("mobius.graphs.generation.run_generation_workflow", workflow):
+        worker = GenerationWorker(owner="worker-a", concurrency=2)
+        await asyncio.wait_for(worker.run(until_empty=True, poll_interval_seconds=0.01), timeout=2)
+
+    assert [get_row(client, job_id)["status"] for job_id in result["child_job_ids"]] == ["completed"] * 2
+    assert workflow.await_count == 2
+    for call in workflow.await_args_list:
+        assert call.kwargs["prompt"] == "Hero image"
+        assert "variation" not in call.kwargs
+
+
+async def test_batch_requires_prompts_within_size_limit(client):
+    with pytest.raises(ValidationError) as missing:
+        await generate_batch_handler(brand_id=BRAND_ID, prompts=[" "])
+    assert missing.value.error_response.error.code == "MISSING_PROMPTS"
+
+    with patch("mobius.api.routes.settings.generation_batch_max_size", 2):
+        with pytest.raises(ValidationError) as too_large:
+            await generate_batch_handler(brand_id=BRAND_ID, prompt="Hero image", variations=3)
+    assert too_large.value.error_response.error.code == "BATCH_TOO_LARGE"
+
+
+async def test_parent_reports_aggregate_progress_and_results(client):
+    result = await generate_batch_handler(brand_id=BRAND_ID, prompts=["One", "Two"])
+    first, second = result["child_job_ids"]
+
+    finish_child(client, first, "completed", "https://cdn.example.com/one.png")
+    status = await get_job_status_handler(result["batch_id"])
+
+    assert status["status"] == "processing"
+    assert status["progress"] == 50.0
+    assert status["batch"]["counts"] == {"completed": 1, "pending": 1}
+    assert status["batch"]["results"][0]["image_url"] == "https://cdn.example.com/one.png"
+    assert status["batch"]["results"][0]["compliance_score"] == 91
+
+    finish_child(client, second, "failed")
+    status = await get_job_status_handler(result["batch_id"])
+
+    assert status["status"] == "completed"
+    assert status["progress"] == 100.0
+    assert [r["prompt"] for r in status["batch"]["results"]] == ["One", "Two"]
+    # The parent row is kept in step for job listings
+    assert get_row(client, result["batch_id"])["status"] == "completed"
+
+
+async def test_cancelling_a_batch_cancels_unfinished_children(client):
+    result = await generate_batch_handler(brand_id=BRAND_ID, prompts=["One", "Two", "Three"])
+    first, second, _ = result["child_job_ids"]
+    client.table("jobs").update({"lease_owner": "worker-a", "status": "processing"}).eq("job_id", first).execute()
+    finish_child(client, second, "completed", "https://cdn.example.com/two.png")
+
+    with patch("mobius.api.routes.job_cancellations.cancel", AsyncMock()) as cancel:
+        await cancel_job_handler(result["batch_id"])
+
+    statuses = [get_row(client, job_id)["status"] for job_id in result["child_job_ids"]]
+    # The running child is cancelled too; its worker is told to stop it
+    assert statuses == ["cancelled", "completed", "cancelled"]
+    assert first in [call.args[0] for call in cancel.await_args_list]
+    assert (await get_job_status_handler(result["batch_id"]))["status"] == "cancelled"
+
+
+async def test_repeated_idempotency_key_returns_the_batch(client):
+    first = await generate_batch_handler(brand_id=BRAND_ID, prompts=["One"], idempotency_key="campaign-1")
+    second = await generate_batch_handler(brand_id=BRAND_ID, prompts=["One"], idempotency_key="campaign-1")
+
+    assert second["batch_id"] == first["batch_id"]
+    assert second["child_job_ids"] == first["child_job_ids"]
+    assert len(client.table("jobs").select("job_id").execute().data) == 2
+
+
+async def test_batch_children_share_processed_logos():
+    logos = [LogoRule(
+        variant_name="primary",
+        url="https://cdn.example.com/logo.png",
+        min_width_px=100,
+        clear_space_ratio=0.1,
+        forbidden_backgrounds=[],
+    )]
+    fetch = AsyncMock(return_value=[b"logo"])
+    generate._logo_cache.clear()
+
+    with patch.object(generate, "fetch_and_process_logos_parallel", fetch):
+        results = await asyncio.gather(*[
+            generate.get_processed_logos(logos, job_id=f"child-{i}", operation_type="generate_node")
+            for i in range(5)
+        ])
+        again = await generate.get_processed_logos(logos, job_id="child-6", operation_type="generate_node")
+
+    assert results == [[b"logo"]] * 5
+    assert again == [b"logo"]
+    fetch.assert_awaited_once()
+    generate._logo_cache.clear()
@@ -0,0 +1,217 @@
+"""
+Unit tests for the checkpointed bulk graph backfill.
+
+Runs against the in-memory storage backend with a mocked GraphStorage.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from mobius.storage.graph_backfill import GraphBackfill, GraphBackfillLeaseError, GraphBackfillRuns
+from mobius.storage.local import LocalSupabaseClient, MemoryStore
+
+
+def brand_row(i: int, org: str = "org-1") -> dict:
+    return {
+        "brand_id": f"00000000-0000-0000-0000-{i:012d}",
+        "organization_id": org,
+        "name": f"Brand {i}",
+        "guidelines": {},
+    }
+
+
+def asset_row(i: int, brand_id: str) -> dict:
+    return {
+        "asset_id": f"aaaaaaaa-0000-0000-0000-{i:012d}",
+        "brand_id": brand_id,
+        "job_id": "job-1",
+        "prompt": "A poster",
+        "image_url": "https://example.com/a.png",
+        "status": "completed",
+    }
+
+
+@pytest.fixture
+def client():
+    client = LocalSupabaseClient(MemoryStore())
+    with patch("mobius.storage.graph_backfill.get_supabase_client", return_value=client):
+        yield client
+
+
+@pytest.fixture
+def graph():
+    graph = MagicMock()
+    graph._is_enabled.return_value = True
+    graph.written = {"brand": [], "asset": []}
+
+    async def write_brands(brands):
+        graph.written["brand"].extend(brand.brand_id for brand in brands)
+
+    async def write_assets(assets):
+        graph.written["asset"].extend(asset.asset_id for asset in assets)
+
+    graph.write_brands = AsyncMock(side_effect=write_brands)
+    graph.write_assets = AsyncMock(side_effect=write_assets)
+    graph.write_templates = AsyncMock()
+    graph.write_feedback = AsyncMock()
+    return graph
+
+
+@pytest.mark.asyncio
+async def test_backfill_streams_all_entities_in_batches(client, graph):
+    """Test that every row is written once, in batches, and the run completes."""
+    client.table("brands").insert([brand_row(i) for i in range(25)]).execute()
+    client.table("assets").insert(
+        [asset_row(i, brand_row(i % 5)["brand_id"]) for i in range(12)]
+    ).execute()
+
+    summary = await GraphBackfill(graph=graph, batch_size=4, concurrency=3).run()
+
+    assert sorted(graph.written["brand"]) == [brand_row(i)["brand_id"] for i in range(25)]
+    assert len(set(graph.written["asset"])) == 12
+    assert graph.write_brands.await_count == 7
+    assert summary["entities"]["brand"]["synced"] == 25
+
+    run = await GraphBackfillRuns().get_run("full")
+    assert run["status"] == "completed"
+    assert run["progress"]["brand"] == {
+        "cursor": brand_row(24)["brand_id"],
+        "done": True,
+        "synced": 25,
+    }
+
+
+@pytest.mark.asyncio
+async def test_failed_backfill_resumes_from_checkpoint(client, graph):
+    """Test that a rerun after a failure continues without skipping rows."""
+    client.table("brands").insert([brand_row(i) for i in range(20)]).execute()
+    calls = {"count": 0}
+    write = graph.write_brands.side_effect
+
+    async def flaky(brands):
+        calls["count"] += 1
+        if calls["count"] == 3:
+            raise Exception("Neo4j unavailable")
+        await write(brands)
+
+    graph.write_brands.side_effect = flaky
+    backfill = GraphBackfill(graph=graph, batch_size=4, concurrency=1, max_attempts=1)
+
+    with pytest.raises(Exception, match="Neo4j unavailable"):
+        await backfill.run(entity_types=["brand"])
+
+    run = await GraphBackfillRuns().get_run("full")
+    assert run["status"] == "failed"
+    assert run["progress"]["brand"]["cursor"] == brand_row(7)["brand_id"]
+
+    summary = await backfill.run(entity_types=["brand"])
+
+    assert summary["entities"]["brand"]["synced"] == 12
+    assert sorted(set(graph.written["brand"])) == [brand_row(i)["brand_id"] for i in range(20)]
+    # Pages before the checkpoint were not written again
+    assert len(graph.written["brand"]) == 20
+
+
+@pytest.mark.asyncio
+async def test_organization_backfill_is_scoped(client, graph):
+    """Test that a per-org resync only writes that organization's data."""
+    client.table("brands").insert([brand_row(1, "org-1"), brand_row(2, "org-2")]).execute()
+    client.table("assets").insert(
+        [asset_row(1, brand_row(1)["brand_id"]), asset_row(2, brand_row(2)["brand_id"])]
+    ).execute()
+
+    summary = await GraphBackfill(graph=graph).run(organization_id="org-2")
+
+    assert summary["run_id"] == "org-org-2"
+    assert graph.written["brand"] == [brand_row(2)["brand_id"]]
+    assert graph.written["asset"] == [asset_row(2, "")["asset_id"]]
+
+
+@pytest.mark.asyncio
+async def test_organization_backfill_reads_brand_by_brand_and_resumes(client, graph):
+    """Test that per-org pages are packed across brands and resume from a [brand, key] cursor."""
+    brands = [brand_row(i, "org-1") for i in range(3)]
+    client.table("brands").insert(brands).execute()
+    client.table("assets").insert(
+        [asset_row(i, brands[i % 3]["brand_id"]) for i in range(7)]
+    ).execute()
+    calls = {"count": 0}
+    write = graph.write_assets.side_effect
+
+    async def flaky(assets):
+        calls["count"] += 1
+        if calls["count"] == 3:
+            raise Exception("Neo4j unavailable")
+        await write(assets)
+
+    graph.write_assets.side_effect = flaky
+    backfill = GraphBackfill(graph=graph, batch_size=2, concurrency=1, max_attempts=1)
+
+    with pytest.raises(Exception, match="Neo4j unavailable"):
+        await backfill.run(organization_id="org-1")
+
+    run = await GraphBackfillRuns().get_run("org-org-1")
+    # Brand 0 has assets 0, 3, 6 and brand 1 has 1, 4: the second page ended in brand 1
+    assert run["progress"]["asset"]["cursor"] == [brands[1]["brand_id"], asset_row(1, "")["asset_id"]]
+
+    await backfill.run(organization_id="org-1")
+
+    assert sorted(graph.written["asset"]) == [asset_row(i, "")["asset_id"] for i in range(7)]
+    assert [len(call.args[0]) for call in graph.write_assets.await_args_list] == [2, 2, 2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_run_in_progress_is_leased_to_one_worker(client, graph):
+    """Test that a leased run cannot be started again until its lease expires."""
+    client.table("brands").insert([brand_row(i) for i in range(3)]).execute()
+    runs = GraphBackfillRuns()
+    assert await runs.claim_run("full", None, "api-owner") is not None
+    assert await runs.claim_run("full", None, "other-api-call") is None
+
+    with pytest.raises(GraphBackfillLeaseError):
+        await GraphBackfill(graph=graph).run()
+
+    # The worker spawned with the claimed lease runs it and releases the lease
+    summary = await GraphBackfill(graph=graph).run(lease_owner="api-owner")
+    assert summary["status"] == "completed"
+    run = await runs.get_run("full")
+    assert run["lease_owner"] is None
+    assert await runs.claim_run("full", None, "other-api-call") is not None
+
+
+@pytest.mark.asyncio
+async def test_worker_stops_when_its_lease_is_taken_over(client, graph):
+    """Test that a worker whose lease expired and was reclaimed stops writing."""
+    client.table("brands").insert([brand_row(i) for i in range(6)]).execute()
+    runs = GraphBackfillRuns()
+    write = graph.write_brands.side_effect
+
+    async def slow_write(brands):
+        await write(brands)
+        if len(graph.written["brand"]) == 2:
+            # The lease lapses and another worker takes the run over
+            client.table("graph_backfill_runs").update(
+                {"leased_until": "2000-01-01T00:00:00+00:00"}
+            ).eq("run_id", "full").execute()
+            assert await runs.claim_run("full", None, "new-worker") is not None
+
+    graph.write_brands.side_effect = slow_write
+
+    with pytest.raises(GraphBackfillLeaseError):
+        await GraphBackfill(graph=graph, batch_size=2, concurrency=1).run()
+
+    run = await runs.get_run("full")
+    assert run["lease_owner"] == "new-worker"
+    assert run["status"] == "running"
+    assert len(graph.written["brand"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_dry_run_does_not_write_or_checkpoint(client, graph):
+    """Test that a dry run only counts rows."""
+    client.table("brands").insert([brand_row(i) for i in range(3)]).execute()
+
+    summary = await GraphBackfill(graph=graph).run(dry_run=True)
+
+    assert summary["entities"]["brand"]["synced"] == 3
+    graph.write_brands.assert_not_called()
+    assert await GraphBackfillRuns().get_run("full") is None
@@ -0,0 +1,183 @@
+"""
+Unit tests for the graph query result cache.
+
+Tests freshness, stale-while-revalidate, tag invalidation (including loads
+that overlap an invalidation), single-flight loading and GraphStorage
+invalidation on sync writes, locally and across processes.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from mobius.api.job_events import InMemoryJobEventBus
+from mobius.models.asset import Asset
+from mobius.storage.graph_cache import GraphQueryCache
+from tests.unit.test_graph_sync import make_brand, make_graph_storage
+
+
+def counting_loader(value="result"):
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return f"{value}-{len(calls)}"
+
+    return loader, calls
+
+
+@pytest.mark.asyncio
+async def test_fresh_entries_are_served_from_memory():
+    """Test that a second lookup within the TTL does not reload."""
+    cache = GraphQueryCache()
+    loader, calls = counting_loader()
+
+    assert await cache.get("k", loader, tags=lambda r: {"brand:1"}) == "result-1"
+    assert await cache.get("k", loader, tags=lambda r: {"brand:1"}) == "result-1"
+
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_are_served_while_refreshing():
+    """Test stale-while-revalidate: old value returned, refreshed in background."""
+    cache = GraphQueryCache(ttl_seconds=0, stale_seconds=60)
+    loader, calls = counting_loader()
+
+    await cache.get("k", loader, tags=lambda r: set())
+    assert await cache.get("k", loader, tags=lambda r: set()) == "result-1"
+
+    await asyncio.gather(*cache._refresh_tasks)
+    assert len(calls) == 2
+    assert cache._entries["k"][0] == "result-2"
+    assert cache.stats()["stale_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidation_drops_only_tagged_entries():
+    """Test that invalidating a tag leaves unrelated entries cached."""
+    cache = GraphQueryCache()
+    loader, _ = counting_loader()
+    await cache.get("a", loader, tags=lambda r: {"brand:1", "color:#FFFFFF"})
+    await cache.get("b", loader, tags=lambda r: {"brand:2"})
+
+    assert cache.invalidate_tags({"color:#FFFFFF"}) == 1
+
+    assert "a" not in cache._entries
+    assert "b" in cache._entries
+    assert "color:#FFFFFF" not in cache._tag_index
+
+
+@pytest.mark.asyncio
+async def test_load_overlapping_invalidation_is_not_cached():
+    """Test that a result read before a write is returned but not cached."""
+    cache = GraphQueryCache()
+    release = asyncio.Event()
+
+    async def slow_loader():
+        await release.wait()
+        return "old"
+
+    task = asyncio.create_task(cache.get("k", slow_loader, tags=lambda r: {"brand:1"}))
+    await asyncio.sleep(0)
+    cache.invalidate_tags({"brand:1"})
+    release.set()
+
+    assert await task == "old"
+    assert "k" not in cache._entries
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    """Test single-flight loading for the same key."""
+    cache = GraphQueryCache()
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ["row"]
+
+    results = await asyncio.gather(*[cache.get("k", loader, tags=lambda r: set()) for _ in range(5)])
+
+    assert results == [["row"]] * 5
+    assert len(calls) == 1
+    assert cache.stats()["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_failed_loads_are_not_cached():
+    """Test that errors propagate and the next lookup retries."""
+    cache = GraphQueryCache()
+    loader = AsyncMock(side_effect=[Exception("Neo4j unavailable"), ["row"]])
+
+    with pytest.raises(Exception, match="Neo4j unavailable"):
+        await cache.get("k", loader, tags=lambda r: set())
+    assert await cache.get("k", loader, tags=lambda r: set()) == ["row"]
+
+
+@pytest.mark.asyncio
+async def test_brand_sync_invalidates_cached_brand_colors():
+    """Test that GraphStorage.write_brands drops the brand's cached queries."""
+    storage, _ = make_graph_storage()
+    storage._read = AsyncMock(side_effect=[[{"hex": "#0057B8"}], [{"hex": "#FFFFFF"}]])
+
+    with patch("mobius.storage.graph.settings") as mock_settings:
+        mock_settings.graph_sync_enabled = True
+        assert await storage.get_brand_colors("brand-1") == [{"hex": "#0057B8"}]
+        assert await storage.get_brand_colors("brand-1") == [{"hex": "#0057B8"}]
+        await storage.write_brands([make_brand()])
+        assert await storage.get_brand_colors("brand-1") == [{"hex": "#FFFFFF"}]
+
+    assert storage._read.await_count == 2
+    assert storage._brand_palettes["brand-1"] == {"#0057B8", "#FFFFFF"}
+
+
+@pytest.mark.asyncio
+async def test_writes_in_another_process_evict_cached_entries():
+    """Test that tags invalidated by the drainer evict entries in web containers."""
+    bus = InMemoryJobEventBus()
+    drainer_storage, _ = make_graph_storage()
+    web_storage, _ = make_graph_storage()
+    drainer_storage._origin, web_storage._origin = "drainer", "web"
+    drainer_storage.attach_invalidation_bus(bus)
+    web_storage.attach_invalidation_bus(bus)
+    web_storage._read = AsyncMock(side_effect=[[{"hex": "#0057B8"}], [{"hex": "#FFFFFF"}]])
+
+    with patch("mobius.storage.graph.settings") as mock_settings, patch.object(
+        drainer_storage.query_cache, "invalidate_tags", wraps=drainer_storage.query_cache.invalidate_tags
+    ) as drainer_invalidate:
+        mock_settings.graph_sync_enabled = True
+        assert await web_storage.get_brand_colors("brand-1") == [{"hex": "#0057B8"}]
+        await drainer_storage.write_brands([make_brand()])
+        assert await web_storage.get_brand_colors("brand-1") == [{"hex": "#FFFFFF"}]
+
+    # The writer invalidates locally once and ignores its own published event
+    drainer_invalidate.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_pairing_invalidation_reads_unknown_palettes():
+    """Test that asset writes for brands not written here drop only their pairings."""
+    storage, _ = make_graph_storage()
+    storage._read = AsyncMock(return_value=[{"brand_id": "brand-1", "palette": ["#0057B8"]}])
+    bus = InMemoryJobEventBus()
+    published = AsyncMock()
+    bus.subscribe(published)
+    storage.attach_invalidation_bus(bus)
+    asset = Asset(
+        asset_id="asset-1",
+        brand_id="brand-1",
+        job_id="job-1",
+        prompt="A poster",
+        image_url="https://example.com/a.png",
+        status="completed",
+    )
+
+    with patch("mobius.storage.graph.settings") as mock_settings:
+        mock_settings.graph_sync_enabled = True
+        await storage.write_assets([asset])
+
+    _, message = published.await_args.args
+    assert message["tags"] == ["pairings:#0057B8"]
+    assert storage._brand_palettes["brand-1"] == {"#0057B8"}
@@ -0,0 +1,258 @@
+"""
+Unit tests for the graph sync outbox and drainer.
+
+Runs against the in-memory storage backend, which emulates the outbox
+triggers from migration 009, with a mocked GraphStorage.
+"""
+
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from mobius.models.asset import Asset
+from mobius.models.brand import Brand, BrandGuidelines
+from mobius.storage.assets import AssetStorage
+from mobius.storage.brands import BrandStorage
+from mobius.storage.feedback import FeedbackStorage
+from mobius.storage.graph_outbox import GraphSyncDrainer, GraphSyncOutbox
+from mobius.storage.local import LocalSupabaseClient, MemoryStore
+
+BRAND_A = "aaaaaaaa-0000-0000-0000-000000000000"
+BRAND_B = "bbbbbbbb-0000-0000-0000-000000000000"
+
+
+def make_brand(brand_id: str) -> Brand:
+    now = datetime.now(timezone.utc).isoformat()
+    return Brand(
+        brand_id=brand_id,
+        organization_id="org-1",
+        name=f"Brand {brand_id[:1]}",
+        guidelines=BrandGuidelines(),
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def make_asset(asset_id: str, brand_id: str) -> Asset:
+    return Asset(
+        asset_id=asset_id,
+        brand_id=brand_id,
+        job_id="job-1",
+        prompt="A poster",
+        image_url="https://example.com/a.png",
+        status="completed",
+    )
+
+
+@pytest.fixture
+def client():
+    client = LocalSupabaseClient(MemoryStore())
+    with patch("mobius.storage.graph_outbox.get_supabase_client", return_value=client), patch(
+        "mobius.storage.brands.get_supabase_client", return_value=client
+    ), patch("mobius.storage.assets.get_supabase_client", return_value=client), patch(
+        "mobius.storage.feedback.get_supabase_client", return_value=client
+    ), patch("mobius.storage.brands.brand_similarity_index"):
+        yield client
+
+
+@pytest.fixture
+def graph():
+    """Mocked GraphStorage whose writes report every entity as written."""
+    graph = MagicMock()
+    graph._is_enabled.return_value = True
+    graph.write_brands = AsyncMock(side_effect=lambda brands: {b.brand_id for b in brands})
+    graph.write_assets = AsyncMock(side_effect=lambda assets: {a.asset_id for a in assets})
+    graph.write_templates = AsyncMock(side_effect=lambda templates: {t.template_id for t in templates})
+    graph.write_feedback = AsyncMock(side_effect=lambda items: {i["feedback_id"] for i in items})
+    graph.delete_brands = AsyncMock()
+    graph.delete_templates = AsyncMock()
+    return graph
+
+
+def outbox_rows(client) -> list:
+    return client.table("graph_sync_outbox").select("*").order("event_id").execute().data
+
+
+@pytest.mark.asyncio
+async def test_writes_enqueue_events_and_drainer_applies_them_in_order(client, graph):
+    """Test that storage writes are queued and applied brand-before-asset."""
+    await BrandStorage().create_brand(make_brand(BRAND_A))
+    await AssetStorage().create_asset(make_asset("asset-1", BRAND_A))
+    await AssetStorage().create_asset(make_asset("asset-2", BRAND_A))
+
+    assert [row["entity_type"] for row in outbox_rows(client)] == ["brand", "asset", "asset"]
+
+    calls = []
+
+    def record(name, write):
+        def side_effect(entities):
+            calls.append((name, len(entities)))
+            return write(entities)
+        return side_effect
+
+    graph.write_brands.side_effect = record("brands", graph.write_brands.side_effect)
+    graph.write_assets.side_effect = record("assets", graph.write_assets.side_effect)
+
+    summary = await GraphSyncDrainer(graph=graph).drain_once()
+
+    assert summary["processed"] == 3
+    # Consecutive asset events are written as one batch
+    assert calls == [("brands", 1), ("assets", 2)]
+    assert all(row["processed_at"] for row in outbox_rows(client))
+    assert (await GraphSyncOutbox().get_backlog_stats())["backlog"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_brand_blocks_only_its_own_later_events(client, graph):
+    """Test that a failure keeps per-brand order without stalling other brands."""
+    await BrandStorage().create_brand(make_brand(BRAND_A))
+    await BrandStorage().create_brand(make_brand(BRAND_B))
+    await AssetStorage().create_asset(make_asset("asset-a", BRAND_A))
+    await AssetStorage().create_asset(make_asset("asset-b", BRAND_B))
+
+    async def write_brands(brands):
+        if any(brand.brand_id == BRAND_A for brand in brands):
+            raise Exception("Neo4j unavailable")
+        return {brand.brand_id for brand in brands}
+
+    graph.write_brands.side_effect = write_brands
+    # Apply brands one at a time so only brand A's batch fails
+    drainer = GraphSyncDrainer(graph=graph, batch_size=1)
+    for _ in range(4):
+        await drainer.drain_once()
+
+    rows = {(row["entity_type"], row["brand_id"]): row for row in outbox_rows(client)}
+    assert rows[("brand", BRAND_A)]["attempts"] >= 1
+    assert rows[("brand", BRAND_A)]["processed_at"] is None
+    assert rows[("asset", BRAND_A)]["processed_at"] is None
+    assert rows[("asset", BRAND_A)]["attempts"] == 0
+    assert rows[("brand", BRAND_B)]["processed_at"] is not None
+    assert rows[("asset", BRAND_B)]["processed_at"] is not None
+
+    stats = await GraphSyncOutbox().get_backlog_stats()
+    assert stats["backlog"] == 2
+    assert stats["retrying"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_events_are_retried_after_backoff(client, graph):
+    """Test that a failed event is applied once its backoff has elapsed."""
+    await BrandStorage().create_brand(make_brand(BRAND_A))
+    graph.write_brands.side_effect = [Exception("Neo4j unavailable"), {BRAND_A}]
+    drainer = GraphSyncDrainer(graph=graph)
+
+    assert (await drainer.drain_once())["failed"] == 1
+    assert (await drainer.drain_once())["processed"] == 0
+
+    # Backoff elapses
+    client.table("graph_sync_outbox").update(
+        {"next_attempt_at": datetime.now(timezone.utc).isoformat()}
+    ).execute()
+
+    assert (await drainer.drain_once())["processed"] == 1
+    assert outbox_rows(client)[0]["processed_at"] is not None
+
+
+@pytest.mark.asyncio
+async def test_events_stay_queued_when_graph_is_disabled(client, graph):
+    """Test that nothing is dropped while Neo4j is not configured."""
+    graph._is_enabled.return_value = False
+    await BrandStorage().create_brand(make_brand(BRAND_A))
+
+    summary = await GraphSyncDrainer(graph=graph).drain_once()
+
+    assert summary["processed"] == 0
+    graph.write_brands.assert_not_called()
+    assert (await GraphSyncOutbox().get_backlog_stats())["backlog"] == 1
+
+
+@pytest.mark.asyncio
+async def test_storage_writes_do_not_touch_neo4j(client):
+    """Test that create_brand no longer waits on graph sync."""
+    with patch("mobius.storage.graph.graph_storage.write_brands", new=AsyncMock()) as write:
+        await BrandStorage().create_brand(make_brand(BRAND_A))
+
+    write.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_only_graph_columns_enqueue_events(client):
+    """Test that counter and non-graph column updates do not resync the brand."""
+    await BrandStorage().create_brand(make_brand(BRAND_A))
+    await AssetStorage().create_asset(make_asset("asset-1", BRAND_A))
+    await FeedbackStorage().create_feedback("asset-1", BRAND_A, "approve")
+    client.table("assets").update({"compliance_details": {"score": 90}}).eq(
+        "asset_id", "asset-1"
+    ).execute()
+
+    assert [row["entity_type"] for row in outbox_rows(client)] == ["brand", "asset", "feedback"]
+
+    client.table("brands").update({"name": "Renamed"}).eq("brand_id", BRAND_A).execute()
+    assert outbox_rows(client)[-1]["entity_type"] == "brand"
+
+
+@pytest.mark.asyncio
+async def test_feedback_events_refresh_brand_counters(client, graph):
+    """Test that feedback sync carries the brand counters the trigger skipped."""
+    await BrandStorage().create_brand(make_brand(BRAND_A))
+    await AssetStorage().create_asset(make_asset("asset-1", BRAND_A))
+    await FeedbackStorage().create_feedback("asset-1", BRAND_A, "approve")
+
+    await GraphSyncDrainer(graph=graph).drain_once()
+
+    item = graph.write_feedback.await_args.args[0][0]
+    assert item["brand_feedback_count"] == 1
+    assert item["brand_learning_active"] is False
+
+
+@pytest.mark.asyncio
+async def test_soft_delete_queues_delete_event(client, graph):
+    """Test that a soft-deleted brand is removed from the graph, not re-synced."""
+    await BrandStorage().create_brand(make_brand(BRAND_A))
+    await BrandStorage().delete_brand(BRAND_A)
+
+    assert [row["operation"] for row in outbox_rows(client)] == ["upsert", "delete"]
+
+    summary = await GraphSyncDrainer(graph=graph).drain_once()
+
+    assert summary["processed"] == 2
+    # The upsert event sees the row already deleted and writes nothing
+    graph.write_brands.assert_not_called()
+    graph.delete_brands.assert_awaited_once_with([BRAND_A])
+
+
+@pytest.mark.asyncio
+async def test_unwritten_entities_are_retried(client, graph):
+    """Test that an asset whose brand node is missing is not marked processed."""
+    await BrandStorage().create_brand(make_brand(BRAND_A))
+    await AssetStorage().create_asset(make_asset("asset-1", BRAND_A))
+    await AssetStorage().create_asset(make_asset("asset-2", BRAND_A))
+    graph.write_assets.side_effect = lambda assets: {"asset-1"}
+
+    summary = await GraphSyncDrainer(graph=graph).drain_once()
+
+    assert summary["processed"] == 2
+    assert summary["failed"] == 1
+    rows = {row["entity_id"]: row for row in outbox_rows(client)}
+    assert rows["asset-1"]["processed_at"] is not None
+    assert rows["asset-2"]["processed_at"] is None
+    assert rows["asset-2"]["attempts"] == 1
+    assert rows["asset-2"]["last_error"] == "Parent node not found in graph"
+
+
+@pytest.mark.asyncio
+async def test_claimed_brands_are_not_handed_to_another_drainer(client):
+    """Test that a brand's events go to one drainer at a time, in order."""
+    await BrandStorage().create_brand(make_brand(BRAND_A))
+    await BrandStorage().create_brand(make_brand(BRAND_B))
+    await AssetStorage().create_asset(make_asset("asset-a", BRAND_A))
+
+    first = await GraphSyncOutbox().claim_pending(limit=1)
+    second = await GraphSyncOutbox().claim_pending(limit=10)
+
+    assert [row["brand_id"] for row in first] == [BRAND_A]
+    # Brand A's asset waits for the first drainer's lease
+    assert [row["brand_id"] for row in second] == [BRAND_B]
+    assert await GraphSyncOutbox().claim_pending(limit=10) == []
+
+    await GraphSyncOutbox().mark_processed([first[0]["event_id"]])
+    assert [row["entity_id"] for row in await GraphSyncOutbox().claim_pending(limit=10)] == ["asset-a"]
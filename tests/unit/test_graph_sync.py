@@ -0,0 +1,196 @@
+"""
+Unit tests for batched Neo4j graph sync.
+
+Tests that brand, asset and template syncs run as a few UNWIND statements
+inside a single managed write transaction.
+"""
+
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from mobius.models.asset import Asset
+from mobius.models.brand import (
+    Brand,
+    BrandGuidelines,
+    BrandRule,
+    Color,
+    ContextualRule,
+    IdentityCore,
+    Typography,
+)
+from mobius.models.template import Template
+from mobius.storage.graph import GraphStorage, _brand_sync_statements, _run_statements
+from mobius.storage.graph_cache import GraphQueryCache
+
+
+def make_brand(rule_count: int = 150) -> Brand:
+    now = datetime.now(timezone.utc).isoformat()
+    return Brand(
+        brand_id="brand-1",
+        organization_id="org-1",
+        name="Acme",
+        guidelines=BrandGuidelines(
+            colors=[
+                Color(name="Blue", hex="#0057B8", usage="primary"),
+                Color(name="White", hex="#FFFFFF", usage="neutral"),
+            ],
+            typography=[Typography(family="Inter", weights=["400"], usage="Body")],
+            identity_core=IdentityCore(
+                archetype="The Sage",
+                voice_vectors={"formal": 0.8, "witty": 0.2},
+                negative_constraints=["No neon colors"],
+            ),
+            rules=[
+                BrandRule(category="visual", instruction=f"Rule {i}", severity="warning")
+                for i in range(rule_count)
+            ],
+            contextual_rules=[
+                ContextualRule(context="social_media", rule="Logo top-left", priority=1)
+            ],
+        ),
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def make_graph_storage():
+    """GraphStorage with a mocked driver whose session records execute_write calls."""
+    session = MagicMock()
+    session.execute_write = AsyncMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=False)
+
+    storage = GraphStorage.__new__(GraphStorage)
+    storage.driver = MagicMock()
+    storage.driver.session.return_value = session
+    storage.query_cache = GraphQueryCache()
+    storage._brand_palettes = {}
+    storage.invalidation_bus = None
+    storage._origin = "test"
+    return storage, session
+
+
+def test_brand_statements_are_one_per_entity_type():
+    """Test that statement count does not grow with the number of rules."""
+    small = _brand_sync_statements([make_brand(rule_count=1)])
+    large = _brand_sync_statements([make_brand(rule_count=150)])
+
+    # brand, colors, archetype, voice vectors, forbids, typography, rules, contextual rules
+    assert len(large) == len(small) == 8
+    rule_params = next(params for query, params in large if ":Rule " in query)
+    assert len(rule_params["rows"]) == 150
+    assert len({row["rule_id"] for row in rule_params["rows"]}) == 150
+
+
+def test_brand_batch_shares_statements_across_brands():
+    """Test that a batch of brands costs one statement per entity type, not per brand."""
+    brands = [make_brand(rule_count=2) for _ in range(50)]
+    for i, brand in enumerate(brands):
+        brand.brand_id = f"brand-{i}"
+
+    statements = _brand_sync_statements(brands)
+
+    assert len(statements) == 8
+    brand_rows = next(params["rows"] for query, params in statements if "MERGE (b:Brand" in query)
+    assert [row["brand_id"] for row in brand_rows] == [f"brand-{i}" for i in range(50)]
+    rule_rows = next(params["rows"] for query, params in statements if ":Rule " in query)
+    assert len(rule_rows) == 100
+    assert {row["brand_id"] for row in rule_rows} == {f"brand-{i}" for i in range(50)}
+
+
+def test_brand_without_guidelines_only_merges_brand_node():
+    """Test that empty entity types are skipped."""
+    brand = make_brand()
+    brand.guidelines = BrandGuidelines()
+
+    statements = _brand_sync_statements([brand])
+
+    assert len(statements) == 1
+    assert "MERGE (b:Brand" in statements[0][0]
+
+
+@pytest.mark.asyncio
+async def test_run_statements_runs_each_statement_in_transaction():
+    """Test that the transaction function runs every statement and collects written ids."""
+    tx = MagicMock()
+    brand_result, other_result = MagicMock(), MagicMock()
+    brand_result.data = AsyncMock(return_value=[{"entity_id": "brand-1"}])
+    other_result.data = AsyncMock(return_value=[])
+    statements = _brand_sync_statements([make_brand()])
+    tx.run = AsyncMock(side_effect=[brand_result] + [other_result] * (len(statements) - 1))
+
+    written = await _run_statements(tx, statements)
+
+    assert tx.run.await_count == len(statements)
+    assert written == {"brand-1"}
+
+
+@pytest.mark.asyncio
+async def test_sync_brand_uses_single_write_transaction():
+    """Test that sync_brand issues one execute_write call."""
+    storage, session = make_graph_storage()
+
+    with patch("mobius.storage.graph.settings") as mock_settings:
+        mock_settings.graph_sync_enabled = True
+        await storage.sync_brand(make_brand())
+
+    session.execute_write.assert_awaited_once()
+    tx_fn, statements = session.execute_write.await_args.args
+    assert tx_fn is _run_statements
+    assert len(statements) == 8
+
+
+@pytest.mark.asyncio
+async def test_sync_brand_failure_does_not_raise():
+    """Test that graph failures are logged, not propagated."""
+    storage, session = make_graph_storage()
+    session.execute_write.side_effect = Exception("Neo4j unavailable")
+
+    with patch("mobius.storage.graph.settings") as mock_settings:
+        mock_settings.graph_sync_enabled = True
+        await storage.sync_brand(make_brand())
+
+
+@pytest.mark.asyncio
+async def test_sync_assets_and_templates_batch_rows():
+    """Test that asset and template batches are a single UNWIND statement."""
+    storage, session = make_graph_storage()
+    now = datetime.now(timezone.utc)
+    assets = [
+        Asset(
+            asset_id=f"asset-{i}",
+            brand_id="brand-1",
+            job_id="job-1",
+            prompt="A poster",
+            image_url="https://example.com/a.png",
+            status="completed",
+            created_at=now,
+        )
+        for i in range(3)
+    ]
+    template = Template(
+        template_id="template-1",
+        brand_id="brand-1",
+        name="Poster",
+        description="Poster template",
+        generation_params={},
+        thumbnail_url="https://example.com/t.png",
+        source_asset_id="asset-0",
+        created_at=now,
+        updated_at=now,
+    )
+
+    with patch("mobius.storage.graph.settings") as mock_settings:
+        mock_settings.graph_sync_enabled = True
+        await storage.sync_assets(assets)
+        await storage.sync_template(template)
+
+    asset_call, template_call = session.execute_write.await_args_list
+    asset_statements = asset_call.args[1]
+    assert len(asset_statements) == 1
+    assert len(asset_statements[0][1]["rows"]) == 3
+
+    template_statements = template_call.args[1]
+    assert len(template_statements) == 1
+    assert "BASED_ON_ASSET" in template_statements[0][0]
+    assert template_statements[0][1]["rows"][0]["source_asset_id"] == "asset-0"
@@ -0,0 +1,188 @@
+"""
+Unit tests for cooperative job cancellation.
+
+Worker tests run against the in-memory storage backend; the cross-process
+bus is the in-memory job event bus.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from mobius.api.job_cancellation import JobCancellationRegistry, JobCancelledError, job_cancellations
+from mobius.api.job_events import InMemoryJobEventBus
+from mobius.graphs import generation
+from mobius.models.job import Job
+from mobius.storage.job_queue import GenerationWorker
+from mobius.storage.jobs import JobStorage
+from mobius.storage.local import LocalSupabaseClient, MemoryStore
+from mobius.tools.gemini import _call_async
+
+BRAND_ID = "aaaaaaaa-0000-0000-0000-000000000000"
+
+
+@pytest.fixture
+def client():
+    client = LocalSupabaseClient(MemoryStore())
+    job_cancellations.clear()
+    with patch("mobius.storage.job_queue.get_supabase_client", return_value=client), \
+            patch("mobius.storage.jobs.get_supabase_client", return_value=client):
+        yield client
+    job_cancellations.clear()
+
+
+async def queue_job(job_id: str = "job-0") -> None:
+    await JobStorage().create_job(Job(
+        job_id=job_id,
+        brand_id=BRAND_ID,
+        status="pending",
+        state={"prompt": "Prompt", "brand_id": BRAND_ID},
+        queued_at=datetime.now(timezone.utc),
+    ))
+
+
+def get_row(client, job_id: str) -> dict:
+    return client.table("jobs").select("*").eq("job_id", job_id).execute().data[0]
+
+
+async def test_cancel_stops_a_running_job_within_a_second():
+    registry = JobCancellationRegistry()
+    started = asyncio.Event()
+
+    async def work():
+        started.set()
+        await asyncio.sleep(30)
+        return "done"
+
+    run = asyncio.create_task(registry.run("job-1", work()))
+    await started.wait()
+    assert registry.is_running("job-1")
+
+    assert await registry.cancel("job-1") == 1
+    with pytest.raises(JobCancelledError):
+        await asyncio.wait_for(run, timeout=1)
+
+    assert not registry.is_running("job-1")
+    stats = registry.stats()
+    assert stats["jobs_stopped"] == 1
+    assert stats["max_stop_seconds"] < 1
+    assert stats["reclaimed_seconds"] > 0
+
+
+async def test_run_returns_results_and_refuses_cancelled_jobs():
+    registry = JobCancellationRegistry()
+
+    assert await registry.run("job-1", asyncio.sleep(0, result="done")) == "done"
+
+    await registry.cancel("job-2")
+    work = asyncio.sleep(0)
+    with pytest.raises(JobCancelledError):
+        await registry.run("job-2", work)
+    # The coroutine is closed, not left un-awaited
+    assert work.cr_frame is None
+
+
+async def test_caller_cancellation_is_not_reported_as_job_cancellation():
+    registry = JobCancellationRegistry()
+    run = asyncio.create_task(registry.run("job-1", asyncio.sleep(30)))
+    await asyncio.sleep(0)
+
+    run.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await run
+    assert not registry.is_cancelled("job-1")
+
+
+async def test_cancellations_reach_other_processes_over_the_bus():
+    bus = InMemoryJobEventBus()
+    api, worker = JobCancellationRegistry(), JobCancellationRegistry()
+    api.attach_bus(bus)
+    worker.attach_bus(bus)
+
+    run = asyncio.create_task(worker.run("job-1", asyncio.sleep(30)))
+    await asyncio.sleep(0)
+    await api.cancel("job-1")
+
+    with pytest.raises(JobCancelledError):
+        await asyncio.wait_for(run, timeout=1)
+    assert worker.stats()["jobs_stopped"] == 1
+
+
+async def test_worker_frees_the_slot_of_a_cancelled_job(client):
+    await queue_job()
+    started = asyncio.Event()
+
+    async def handler(job):
+        started.set()
+        await asyncio.sleep(30)
+        return {"status": "completed"}
+
+    worker = GenerationWorker(owner="worker-a", handler=handler)
+    run = asyncio.create_task(worker.run(until_empty=True, poll_interval_seconds=0.01))
+    await asyncio.wait_for(started.wait(), timeout=1)
+
+    await job_cancellations.cancel("job-0")
+    await asyncio.wait_for(run, timeout=1)
+
+    row = get_row(client, "job-0")
+    assert row["status"] == "cancelled"
+    assert row["lease_owner"] is None
+    assert row["queued_at"] is None
+    assert worker.stats()["cancelled_total"] == 1
+    assert worker.stats()["running"] == 0
+
+
+async def test_worker_heartbeat_stops_jobs_cancelled_in_the_database(client):
+    await queue_job()
+    started = asyncio.Event()
+
+    async def handler(job):
+        started.set()
+        await asyncio.sleep(30)
+        return {"status": "completed"}
+
+    worker = GenerationWorker(owner="worker-a", heartbeat_seconds=0.01, handler=handler)
+    run = asyncio.create_task(worker.run(until_empty=True, poll_interval_seconds=0.01))
+    await asyncio.wait_for(started.wait(), timeout=1)
+
+    # Cancelled by an API process whose broadcast never arrived
+    client.table("jobs").update({"status": "cancelled", "queued_at": None}).eq("job_id", "job-0").execute()
+    await asyncio.wait_for(run, timeout=1)
+
+    assert get_row(client, "job-0")["lease_owner"] is None
+    assert worker.stats()["cancelled_total"] == 1
+
+
+async def test_generation_workflow_reports_cancellation(client):
+    async def ainvoke(state, config=None):
+        await asyncio.sleep(30)
+
+    workflow = SimpleNamespace(ainvoke=ainvoke)
+    with patch.object(generation, "get_generation_workflow", return_value=workflow), \
+            patch.object(generation, "broadcast_workflow_event", AsyncMock()), \
+            patch.object(generation.workflow_checkpointer, "thread_config", AsyncMock(return_value=None)):
+        run = asyncio.create_task(
+            generation.run_generation_workflow(brand_id=BRAND_ID, prompt="Prompt", job_id="job-0")
+        )
+        while not job_cancellations.is_running("job-0"):
+            await asyncio.sleep(0)
+        await job_cancellations.cancel("job-0")
+        result = await asyncio.wait_for(run, timeout=1)
+
+    assert result["status"] == "cancelled"
+
+
+async def test_gemini_calls_use_the_async_variant():
+    model = MagicMock()
+    model.generate_content_async = AsyncMock(return_value="async result")
+
+    assert await _call_async(model, "generate_content", ["prompt"]) == "async result"
+    model.generate_content.assert_not_called()
+
+    # Test doubles with only the synchronous method keep working
+    sync_model = MagicMock()
+    sync_model.generate_content.return_value = "sync result"
+    assert await _call_async(sync_model, "generate_content", ["prompt"]) == "sync result"
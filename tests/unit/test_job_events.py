@@ -0,0 +1,325 @@
+"""
+Unit tests for the cross-process job event bus.
+"""
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from fastapi import WebSocketDisconnect
+
+from mobius.api.job_events import (
+    BROADCAST_EVENT,
+    InMemoryJobEventBus,
+    JobEventBus,
+    JobEventLog,
+    JobEventSequencer,
+    SupabaseRealtimeJobEventBus,
+)
+from mobius.api import websocket_handlers
+from mobius.storage.local import LocalSupabaseClient, MemoryStore
+
+
+def make_realtime_bus(**kwargs) -> SupabaseRealtimeJobEventBus:
+    kwargs.setdefault("retry_base_seconds", 0)
+    bus = SupabaseRealtimeJobEventBus(
+        supabase_url="https://test.supabase.co/",
+        supabase_key="test-key",
+        channel="test-events",
+        **kwargs,
+    )
+    response = MagicMock()
+    response.raise_for_status = MagicMock()
+    bus._http = MagicMock()
+    bus._http.post = AsyncMock(return_value=response)
+    bus._http.aclose = AsyncMock()
+    return bus
+
+
+class TestInMemoryJobEventBus:
+    def test_base_bus_is_abstract(self):
+        with pytest.raises(TypeError):
+            JobEventBus()
+
+    async def test_publish_reaches_every_subscriber(self):
+        bus = InMemoryJobEventBus()
+        first, second = AsyncMock(), AsyncMock()
+        bus.subscribe(first)
+        bus.subscribe(second)
+        bus.subscribe(first)
+
+        await bus.publish("job-1", {"type": "status_change"})
+
+        first.assert_awaited_once_with("job-1", {"type": "status_change"})
+        second.assert_awaited_once_with("job-1", {"type": "status_change"})
+
+    async def test_failing_subscriber_does_not_block_others(self):
+        bus = InMemoryJobEventBus()
+        failing = AsyncMock(side_effect=RuntimeError("boom"))
+        healthy = AsyncMock()
+        bus.subscribe(failing)
+        bus.subscribe(healthy)
+
+        await bus.publish("job-1", {"type": "ping"})
+
+        healthy.assert_awaited_once()
+
+    async def test_broadcast_functions_fan_out_through_the_bus(self):
+        bus = InMemoryJobEventBus()
+        bus.subscribe(websocket_handlers._deliver_to_local_connections)
+
+        with patch.object(websocket_handlers, "job_event_bus", bus), \
+                patch.object(websocket_handlers, "connection_manager") as manager:
+            manager.send_to_job = AsyncMock()
+            await websocket_handlers.broadcast_status_change("job-1", "generating", 50, "Generating")
+
+        job_id, message = manager.send_to_job.await_args.args
+        assert job_id == "job-1"
+        assert message["payload"]["status"] == "generating"
+
+    def test_job_has_listeners(self):
+        with patch.object(websocket_handlers, "job_event_bus", InMemoryJobEventBus()):
+            assert websocket_handlers.job_has_listeners("job-without-sockets") is False
+        with patch.object(websocket_handlers, "job_event_bus", make_realtime_bus()):
+            assert websocket_handlers.job_has_listeners("job-without-sockets") is True
+
+
+class TestSupabaseRealtimeJobEventBus:
+    async def test_publishes_are_batched_and_flushed_on_close(self):
+        bus = make_realtime_bus(max_batch=2)
+        http = bus._http
+
+        for i in range(5):
+            await bus.publish(f"job-{i}", {"type": "reasoning_log", "n": i})
+        await bus.close()
+
+        batches = [call.kwargs["json"]["messages"] for call in http.post.await_args_list]
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        first = batches[0][0]
+        assert first["topic"] == "test-events"
+        assert first["event"] == BROADCAST_EVENT
+        assert first["payload"] == {"job_id": "job-0", "message": {"type": "reasoning_log", "n": 0}}
+        assert first["private"] is True
+
+        call = http.post.await_args_list[0]
+        assert call.args[0] == "https://test.supabase.co/realtime/v1/api/broadcast"
+        assert call.kwargs["headers"]["Authorization"] == "Bearer test-key"
+        assert bus.stats()["published"] == 5
+
+    async def test_publish_does_not_wait_for_the_network(self):
+        bus = make_realtime_bus()
+        sent = asyncio.Event()
+
+        async def slow_post(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            sent.set()
+            return MagicMock()
+
+        bus._http.post = AsyncMock(side_effect=slow_post)
+
+        await asyncio.wait_for(bus.publish("job-1", {"type": "ping"}), timeout=0.01)
+        assert not sent.is_set()
+        await bus.close()
+        assert sent.is_set()
+
+    async def test_failed_publish_is_counted_as_dropped(self):
+        bus = make_realtime_bus()
+        bus._http.post = AsyncMock(side_effect=ConnectionError("unreachable"))
+
+        await bus.publish("job-1", {"type": "ping"})
+        await bus.close()
+
+        assert bus._http is None
+        assert bus.stats()["dropped"] == 1
+        assert bus.stats()["published"] == 0
+        assert bus.stats()["retries"] == 2
+
+    async def test_transient_failures_are_retried(self):
+        bus = make_realtime_bus()
+        ok = MagicMock()
+        http = bus._http
+        http.post = AsyncMock(side_effect=[httpx.ConnectError("reset"), ok])
+
+        await bus.publish("job-1", {"type": "ping"})
+        await bus.close()
+
+        assert http.post.await_count == 2
+        assert bus.stats()["published"] == 1
+        assert bus.stats()["dropped"] == 0
+
+    async def test_client_errors_are_not_retried(self):
+        bus = make_realtime_bus()
+        http = bus._http
+        request = httpx.Request("POST", "https://test.supabase.co/realtime/v1/api/broadcast")
+        response = httpx.Response(403, request=request)
+        http.post = AsyncMock(return_value=response)
+
+        await bus.publish("job-1", {"type": "ping"})
+        await bus.close()
+
+        assert http.post.await_count == 1
+        assert bus.stats()["dropped"] == 1
+
+    async def test_received_broadcasts_are_dispatched_to_subscribers(self):
+        bus = make_realtime_bus()
+        handler = AsyncMock()
+        bus.subscribe(handler)
+
+        bus._on_broadcast({
+            "event": BROADCAST_EVENT,
+            "payload": {"job_id": "job-1", "message": {"type": "status_change"}},
+        })
+        bus._on_broadcast({"event": BROADCAST_EVENT, "payload": {"job_id": "job-2"}})
+        assert len(bus._dispatch_tasks) == 1
+        await asyncio.sleep(0)
+
+        handler.assert_awaited_once_with("job-1", {"type": "status_change"})
+        assert bus.stats()["received"] == 1
+
+
+def sequenced(seq: int, event_type: str = "reasoning_log", **payload) -> dict:
+    return {"type": event_type, "jobId": "job-1", "seq": seq, "payload": payload}
+
+
+class TestJobEventLog:
+    def test_since_returns_events_after_last_seq(self):
+        log = JobEventLog(max_events=10)
+        for seq in (5, 6, 7):
+            log.record("job-1", sequenced(seq))
+
+        assert [e["seq"] for e in log.since("job-1", 5)] == [6, 7]
+        assert log.since("job-1", 7) == []
+        assert [e["seq"] for e in log.since("job-1", None)] == [5, 6, 7]
+        assert log.since("unknown-job", None) == []
+
+    def test_since_reports_gaps_it_cannot_cover(self):
+        log = JobEventLog(max_events=3)
+        for seq in range(10, 15):
+            log.record("job-1", sequenced(seq))
+
+        # 10 and 11 were evicted
+        assert log.since("job-1", 10) is None
+        assert [e["seq"] for e in log.since("job-1", 11)] == [12, 13, 14]
+        # This process started receiving after the client's last event
+        assert log.since("job-1", 5) is None
+        assert log.since("unknown-job", 3) is None
+        assert log.stats()["misses"] == 3
+
+    def test_unsequenced_messages_are_not_buffered(self):
+        log = JobEventLog()
+        log.record("job-1", {"type": "ping"})
+        assert log.stats()["jobs"] == 0
+
+    def test_buffers_expire_after_terminal_status(self):
+        log = JobEventLog(max_events=10, ttl_seconds=3600, grace_seconds=0.01)
+        log.record("job-1", sequenced(1))
+        log.record("job-1", sequenced(2, "status_change", status="completed"))
+        log.record("job-2", sequenced(1))
+
+        log._expired_at = 0.0
+        with patch("mobius.api.job_events.time.monotonic", return_value=time.monotonic() + 1):
+            assert log.since("job-1", 1) is None
+            assert log.since("job-2", 1) == []
+
+
+class TestJobEventSequencer:
+    async def test_workers_continue_the_job_sequence(self):
+        client = LocalSupabaseClient(MemoryStore())
+        client.table("jobs").insert({"job_id": "job-1", "status": "pending", "state": {}}).execute()
+
+        generation_worker = JobEventSequencer(block_size=3)
+        resume_worker = JobEventSequencer(block_size=3)
+        generation_worker._client = resume_worker._client = client
+
+        first = [await generation_worker.next_seq("job-1") for _ in range(4)]
+        resumed = [await resume_worker.next_seq("job-1") for _ in range(2)]
+
+        assert first == [1, 2, 3, 4]
+        assert resumed == [7, 8]
+
+    async def test_unknown_job_is_unsequenced(self):
+        sequencer = JobEventSequencer()
+        sequencer._client = LocalSupabaseClient(MemoryStore())
+
+        assert await sequencer.next_seq("missing-job") is None
+
+
+class FakeWebSocket:
+    """WebSocket that records sent messages and disconnects after the replay."""
+
+    def __init__(self, query_params: dict):
+        self.query_params = query_params
+        self.sent: list = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        self.sent.append(json.loads(text))
+
+    async def receive_text(self):
+        # Give the connection's writer time to send the replay first
+        await asyncio.sleep(0.01)
+        raise WebSocketDisconnect()
+
+
+class TestReconnectReplay:
+    @pytest.fixture
+    def live(self):
+        """In-memory bus, replay buffer and sequencer wired to a local database."""
+        client = LocalSupabaseClient(MemoryStore())
+        client.table("jobs").insert({"job_id": "job-1", "status": "processing", "state": {}}).execute()
+        sequencer = JobEventSequencer(block_size=10)
+        sequencer._client = client
+        bus = InMemoryJobEventBus()
+        bus.subscribe(websocket_handlers._deliver_to_local_connections)
+        manager = websocket_handlers.WebSocketConnectionManager()
+
+        with patch.object(websocket_handlers, "job_event_bus", bus), \
+                patch.object(websocket_handlers, "job_event_sequencer", sequencer), \
+                patch.object(websocket_handlers, "job_event_log", JobEventLog(max_events=50)), \
+                patch.object(websocket_handlers, "connection_manager", manager), \
+                patch.object(websocket_handlers, "send_initial_job_status", AsyncMock()) as initial:
+            yield manager, initial
+
+    async def test_reconnect_with_last_seq_replays_missed_events(self, live):
+        manager, initial_status = live
+        for step in ("plan", "generate", "audit"):
+            await websocket_handlers.broadcast_reasoning_log("job-1", {"step": step})
+
+        websocket = FakeWebSocket({"last_seq": "1"})
+        await websocket_handlers.websocket_monitoring_endpoint(websocket, "job-1")
+        await manager.drain()
+
+        replayed = [m for m in websocket.sent if m["type"] == "reasoning_log"]
+        assert [m["seq"] for m in replayed] == [2, 3]
+        assert [m["payload"]["step"] for m in replayed] == ["generate", "audit"]
+        initial_status.assert_not_awaited()
+
+    async def test_new_subscriber_gets_history_and_current_state(self, live):
+        manager, initial_status = live
+        await websocket_handlers.broadcast_reasoning_log("job-1", {"step": "plan"})
+
+        websocket = FakeWebSocket({})
+        await websocket_handlers.websocket_monitoring_endpoint(websocket, "job-1")
+        await manager.drain()
+
+        assert [m["seq"] for m in websocket.sent if m["type"] == "reasoning_log"] == [1]
+        initial_status.assert_awaited_once()
+
+    async def test_unparseable_last_seq_falls_back_to_job_state(self, live):
+        manager, initial_status = live
+        await websocket_handlers.websocket_monitoring_endpoint(
+            FakeWebSocket({"last_seq": "latest"}), "job-1"
+        )
+        initial_status.assert_awaited_once()
+
+
+def test_parse_last_seq():
+    assert websocket_handlers._parse_last_seq("42") == 42
+    assert websocket_handlers._parse_last_seq(7) == 7
+    assert websocket_handlers._parse_last_seq(None) is None
+    assert websocket_handlers._parse_last_seq("latest") is None
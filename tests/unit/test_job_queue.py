@@ -0,0 +1,283 @@
+"""
+Unit tests for the durable generation job queue and workers.
+
+Runs against the in-memory storage backend, which emulates the claim and
+reaper functions from migration 013.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from mobius.models.job import Job
+from mobius.storage.job_queue import (
+    PRIORITY_BATCH,
+    PRIORITY_STANDARD,
+    GenerationJobQueue,
+    GenerationWorker,
+    run_generation_job,
+)
+from mobius.storage.jobs import JobStorage
+from mobius.storage.local import LocalSupabaseClient, MemoryStore
+
+BRAND_ID = "aaaaaaaa-0000-0000-0000-000000000000"
+ORG_A = "0000000a-0000-0000-0000-000000000000"
+ORG_B = "0000000b-0000-0000-0000-000000000000"
+
+
+@pytest.fixture
+def client():
+    client = LocalSupabaseClient(MemoryStore())
+    with patch("mobius.storage.job_queue.get_supabase_client", return_value=client), \
+            patch("mobius.storage.jobs.get_supabase_client", return_value=client):
+        yield client
+
+
+async def queue_jobs(
+    count: int,
+    start: int = 0,
+    prefix: str = "job",
+    brand_id: str = BRAND_ID,
+    organization_id: str = None,
+    priority: int = PRIORITY_STANDARD,
+) -> list:
+    storage = JobStorage()
+    base = datetime.now(timezone.utc) - timedelta(minutes=10)
+    job_ids = []
+    for i in range(start, start + count):
+        job_id = f"{prefix}-{i}"
+        await storage.create_job(Job(
+            job_id=job_id,
+            brand_id=brand_id,
+            status="pending",
+            state={"prompt": f"Prompt {i}", "brand_id": brand_id},
+            queued_at=base + timedelta(seconds=i),
+            queue_priority=priority,
+            organization_id=organization_id,
+        ))
+        job_ids.append(job_id)
+    return job_ids
+
+
+def get_row(client, job_id: str) -> dict:
+    return client.table("jobs").select("*").eq("job_id", job_id).execute().data[0]
+
+
+def expire_lease(client, job_id: str) -> None:
+    past = (datetime.now(timezone.utc) - timedelta(seconds=1)).isoformat()
+    client.table("jobs").update({"leased_until": past}).eq("job_id", job_id).execute()
+
+
+async def test_claims_are_exclusive_and_oldest_first(client):
+    await queue_jobs(5)
+    queue = GenerationJobQueue()
+
+    first = await queue.claim("worker-a", limit=3)
+    second = await queue.claim("worker-b", limit=3)
+
+    assert [job["job_id"] for job in first] == ["job-0", "job-1", "job-2"]
+    assert [job["job_id"] for job in second] == ["job-3", "job-4"]
+    assert await queue.claim("worker-c", limit=3) == []
+    assert get_row(client, "job-0")["queue_attempts"] == 1
+
+    stats = await queue.get_stats()
+    assert stats["depth"] == 0
+    assert stats["running"] == 5
+
+
+async def test_worker_runs_jobs_and_releases_them(client):
+    await queue_jobs(3)
+    seen = []
+
+    async def handler(job):
+        seen.append(job["job_id"])
+        return {"status": "completed", "progress": 100.0}
+
+    worker = GenerationWorker(owner="worker-a", concurrency=2, handler=handler)
+    await asyncio.wait_for(worker.run(until_empty=True, poll_interval_seconds=0.01), timeout=2)
+
+    assert sorted(seen) == ["job-0", "job-1", "job-2"]
+    for job_id in seen:
+        row = get_row(client, job_id)
+        assert row["status"] == "completed"
+        assert row["queued_at"] is None
+        assert row["lease_owner"] is None
+    assert worker.stats()["completed_total"] == 3
+    assert (await GenerationJobQueue().get_stats())["depth"] == 0
+
+
+async def test_handler_errors_fail_the_job(client):
+    await queue_jobs(1)
+
+    async def handler(job):
+        raise RuntimeError("model unavailable")
+
+    worker = GenerationWorker(owner="worker-a", handler=handler)
+    await asyncio.wait_for(worker.run(until_empty=True, poll_interval_seconds=0.01), timeout=2)
+
+    row = get_row(client, "job-0")
+    assert row["status"] == "failed"
+    assert row["error"] == "model unavailable"
+    assert row["queued_at"] is None
+
+
+async def test_jobs_queued_by_generate_handler_run(client):
+    from mobius.api.routes import generate_handler
+
+    brand = SimpleNamespace(brand_id=BRAND_ID, organization_id=ORG_A, updated_at=None)
+    with patch("mobius.api.routes.brand_cache.get", AsyncMock(return_value=brand)), \
+            patch("mobius.api.routes.generation_worker"):
+        queued = await generate_handler(brand_id=BRAND_ID, prompt="Summer sale banner", async_mode=True)
+
+    workflow = AsyncMock(return_value={"status": "completed", "current_image_url": "https://cdn/img.png"})
+    with patch("mobius.graphs.generation.run_generation_workflow", workflow):
+        updates = await run_generation_job(get_row(client, queued["job_id"]))
+
+    assert updates["status"] == "completed"
+    assert workflow.await_args.kwargs["prompt"] == "Summer sale banner"
+    assert updates["state"]["generation_params"]["prompt"] == "Summer sale banner"
+
+
+async def test_reaper_requeues_expired_leases_until_attempts_run_out(client):
+    await queue_jobs(1)
+    queue = GenerationJobQueue()
+
+    for attempt in range(1, 3):
+        assert [job["job_id"] for job in await queue.claim(f"worker-{attempt}", limit=1)] == ["job-0"]
+        expire_lease(client, "job-0")
+        assert await queue.requeue_expired(max_attempts=2) == (
+            {"requeued": 1, "failed": 0} if attempt == 1 else {"requeued": 0, "failed": 1}
+        )
+
+    row = get_row(client, "job-0")
+    assert row["status"] == "failed"
+    assert row["queued_at"] is None
+    assert "lease expired" in row["error"]
+    assert await queue.claim("worker-3", limit=1) == []
+
+
+async def test_worker_that_loses_its_lease_stops_the_job(client):
+    await queue_jobs(1)
+    queue = GenerationJobQueue()
+    started = asyncio.Event()
+
+    async def handler(job):
+        started.set()
+        await asyncio.sleep(10)
+        return {"status": "completed"}
+
+    worker = GenerationWorker(owner="worker-a", heartbeat_seconds=0.01, handler=handler)
+    run = asyncio.create_task(worker.run(until_empty=True, poll_interval_seconds=0.01))
+    await asyncio.wait_for(started.wait(), timeout=1)
+
+    # The reaper hands the job to another worker
+    expire_lease(client, "job-0")
+    await queue.requeue_expired()
+    assert [job["job_id"] for job in await queue.claim("worker-b", limit=1)] == ["job-0"]
+
+    await asyncio.wait_for(run, timeout=2)
+    row = get_row(client, "job-0")
+    assert row["lease_owner"] == "worker-b"
+    assert row["status"] == "pending"
+    assert worker.stats()["lease_lost_total"] == 1
+
+
+async def test_start_picks_up_jobs_queued_while_running(client):
+    await queue_jobs(1)
+    done = []
+
+    async def handler(job):
+        done.append(job["job_id"])
+        if len(done) == 1:
+            await queue_jobs(1, start=1)
+            worker.start()
+        return {"status": "completed"}
+
+    worker = GenerationWorker(owner="worker-a", handler=handler)
+    worker.start()
+    await asyncio.wait_for(worker._loop_task, timeout=2)
+
+    assert done == ["job-0", "job-1"]
+
+
+async def test_batch_campaign_does_not_starve_other_requests(client):
+    # Org A queued a large campaign first; org B's single requests jump it
+    await queue_jobs(10, prefix="campaign", organization_id=ORG_A, priority=PRIORITY_BATCH)
+    await queue_jobs(2, start=20, prefix="single", brand_id="brand-b", organization_id=ORG_B)
+
+    claimed = await GenerationJobQueue().claim("worker-a", limit=3)
+
+    assert [job["job_id"] for job in claimed] == ["single-20", "single-21", "campaign-0"]
+
+
+async def test_organizations_share_workers_fairly(client):
+    await queue_jobs(6, prefix="a", organization_id=ORG_A)
+    await queue_jobs(2, start=10, prefix="b", brand_id="brand-b", organization_id=ORG_B)
+    queue = GenerationJobQueue()
+
+    claimed = [job["job_id"] for job in await queue.claim("worker-a", limit=4)]
+
+    assert sorted(claimed) == ["a-0", "a-1", "b-10", "b-11"]
+    # Org B now runs fewer jobs than org A, so its next job goes first
+    # even though org A's waiting jobs are older
+    await queue.complete("b-10", "worker-a", {"status": "completed"})
+    await queue_jobs(1, start=30, prefix="b", brand_id="brand-b", organization_id=ORG_B)
+    assert [job["job_id"] for job in await queue.claim("worker-a", limit=1)] == ["b-30"]
+
+
+async def test_brands_round_robin_within_an_organization(client):
+    await queue_jobs(3, prefix="one", brand_id="brand-1", organization_id=ORG_A)
+    await queue_jobs(3, start=10, prefix="two", brand_id="brand-2", organization_id=ORG_A)
+
+    claimed = await GenerationJobQueue().claim("worker-a", limit=4)
+
+    assert [job["job_id"] for job in claimed] == ["one-0", "two-10", "one-1", "two-11"]
+
+
+async def test_organization_concurrency_cap(client):
+    client.table("generation_queue_shares").insert(
+        {"organization_id": ORG_A, "weight": 1, "max_concurrency": 2}
+    ).execute()
+    await queue_jobs(5, prefix="a", organization_id=ORG_A)
+    queue = GenerationJobQueue()
+
+    assert len(await queue.claim("worker-a", limit=5)) == 2
+    assert await queue.claim("worker-b", limit=5) == []
+
+    await queue.complete("a-0", "worker-a", {"status": "completed"})
+    assert [job["job_id"] for job in await queue.claim("worker-b", limit=5)] == ["a-2"]
+
+
+async def test_worker_keeps_slots_free_for_standard_jobs(client):
+    await queue_jobs(6, prefix="campaign", organization_id=ORG_A, priority=PRIORITY_BATCH)
+    worker = GenerationWorker(owner="worker-a", concurrency=4, handler=lambda job: asyncio.sleep(10))
+
+    assert await worker.run_once() == 2
+    assert worker.stats()["running_batch"] == 2
+
+    await queue_jobs(3, start=20, prefix="single", brand_id="brand-b", organization_id=ORG_B)
+    assert await worker.run_once() == 2
+    assert worker.stats()["running_batch"] == 2
+
+    for task in worker._running.values():
+        task.cancel()
+    await asyncio.gather(*worker._running.values(), return_exceptions=True)
+
+
+async def test_queue_position_and_eta(client):
+    await queue_jobs(3)
+    queue = GenerationJobQueue()
+
+    first = await queue.get_position("job-0")
+    last = await queue.get_position("job-2")
+
+    assert first["queue_position"] == 0
+    assert last["queue_position"] == 2
+    assert last["eta_seconds"] > first["eta_seconds"] > 0
+
+    await queue.claim("worker-a", limit=1)
+    assert await queue.get_position("job-0") is None
+    assert (await queue.get_position("job-2"))["queue_position"] == 1
@@ -0,0 +1,130 @@
+"""
+Unit tests for the compact Job.state format.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from mobius.models.job import Job
+from mobius.storage import job_state
+from mobius.storage.job_state import (
+    compact_job_state,
+    expand_job_state,
+    job_state_metrics,
+    state_size,
+)
+from mobius.storage.jobs import JobStorage
+from mobius.storage.local import LocalSupabaseClient, MemoryStore
+
+BRAND_ID = "aaaaaaaa-0000-0000-0000-000000000000"
+
+
+def audit(score: float) -> dict:
+    return {
+        "overall_score": score,
+        "approved": score >= 80,
+        "summary": f"Scored {score}",
+        "categories": [{
+            "category": "colors",
+            "score": score,
+            "violations": [{"description": "Off-brand accent colour " * 20, "severity": "medium"}],
+        }],
+    }
+
+
+def workflow_state() -> dict:
+    first, second = audit(62), audit(85)
+    error = {"overall_score": 0.0, "categories": [], "approved": False, "summary": "Audit failed"}
+    return {
+        "job_id": "job-0",
+        "brand_id": BRAND_ID,
+        "prompt": "Summer sale banner",
+        "generation_params": {"prompt": "Summer sale banner", "seed": 7},
+        # audit_node puts the same record in both lists; failed audits only in the history
+        "audit_history": [first, error, second],
+        "compliance_scores": [first, second],
+        "attempt_count": 3,
+        "image_data_uri": "data:image/png;base64,AAAA",
+        "deadline_at": 1.0,
+    }
+
+
+@pytest.fixture(autouse=True)
+def metrics():
+    job_state_metrics.clear()
+    yield job_state_metrics
+
+
+async def test_audits_are_stored_once_and_expand_back():
+    state = workflow_state()
+    compact = await compact_job_state(state)
+
+    assert "audit_history" not in compact and "compliance_scores" not in compact
+    assert compact["audit_refs"] == {"audit_history": [0, 1, 2], "compliance_scores": [0, 2]}
+    # The latest record stays readable in the row, earlier attempts are archived
+    assert compact["audits"] == [state["compliance_scores"][-1]]
+    assert compact["archived_audits"]["count"] == 2
+    assert compact["generation_params"] == {"seed": 7}
+    assert "image_data_uri" not in compact and "deadline_at" not in compact
+    assert state_size(compact) < state_size(state) / 2
+
+    expanded = expand_job_state(compact)
+    expected = {k: v for k, v in state.items() if k not in ("image_data_uri", "deadline_at")}
+    assert expanded == expected
+    assert job_state_metrics.stats()["saved_ratio"] > 0.5
+
+
+async def test_old_states_and_compact_states_are_accepted():
+    legacy = {"prompt": "Hero image", "compliance_scores": [audit(90)]}
+    assert expand_job_state(legacy) is legacy
+
+    compact = await compact_job_state(workflow_state())
+    again = await compact_job_state(compact)
+    assert expand_job_state(again) == expand_job_state(compact)
+
+
+async def test_archives_fall_back_to_zlib_without_zstandard():
+    with patch.object(job_state, "ZSTD_AVAILABLE", False):
+        compact = await compact_job_state(workflow_state())
+
+    assert compact["archived_audits"]["codec"] == "zlib"
+    assert expand_job_state(compact)["compliance_scores"] == workflow_state()["compliance_scores"]
+
+
+async def test_inline_images_move_to_storage():
+    image = "data:image/png;base64," + "A" * 20000
+    upload = AsyncMock(return_value="https://cdn/job-0.png")
+    with patch("mobius.storage.files.FileStorage.__init__", return_value=None), \
+            patch("mobius.storage.files.FileStorage.upload_generated_image", upload):
+        compact = await compact_job_state({"prompt": "Hero", "current_image_url": image}, job_id="job-0")
+
+    assert compact["current_image_url"] == "https://cdn/job-0.png"
+    assert job_state_metrics.stats()["blobs_moved"] == 1
+
+
+async def test_states_over_budget_are_shrunk_to_fit():
+    state = {**workflow_state(), "error": "Traceback " * 5000}
+    with patch.object(job_state.settings, "job_state_max_bytes", 4096):
+        compact = await compact_job_state(state)
+
+    assert state_size(compact) <= 4096
+    assert compact["error"].endswith("bytes]")
+    # The latest audit survives in the compressed archive
+    assert expand_job_state(compact)["compliance_scores"][-1]["overall_score"] == 85
+    assert job_state_metrics.stats()["over_budget"] == 1
+
+
+async def test_job_storage_stores_compact_rows():
+    client = LocalSupabaseClient(MemoryStore())
+    with patch("mobius.storage.jobs.get_supabase_client", return_value=client):
+        storage = JobStorage()
+        await storage.create_job(Job(job_id="job-0", brand_id=BRAND_ID, status="processing", state={"prompt": "P"}))
+        await storage.update_job("job-0", {"state": workflow_state()})
+
+        row = client.table("jobs").select("*").eq("job_id", "job-0").execute().data[0]
+        job = await storage.get_job("job-0")
+
+    assert row["state"]["_format"] == job_state.STATE_FORMAT
+    assert job.state["compliance_scores"] == workflow_state()["compliance_scores"]
+    assert job.state["generation_params"]["prompt"] == "Summer sale banner"
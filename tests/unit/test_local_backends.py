@@ -0,0 +1,214 @@
+"""
+Unit tests for the in-process storage backends and the fake Gemini client.
+
+Tests that the storage classes run unchanged against the memory and SQLite
+backends (including keyset pagination and trigger emulation) and that the
+fake Gemini client returns usable results with modelled latency and 429s.
+"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from mobius.models.brand import Brand, BrandGuidelines, CompressedDigitalTwin
+from mobius.models.job import Job
+from mobius.storage.brands import BrandStorage
+from mobius.storage.feedback import FeedbackStorage
+from mobius.storage.jobs import JobStorage
+from mobius.storage.local import LocalSupabaseClient, MemoryStore, SQLiteStore
+from mobius.tools.fake_gemini import FakeGeminiClient
+from mobius.tools.gemini import GeminiClient
+
+BRAND_ID = "11111111-1111-1111-1111-111111111111"
+
+
+def make_brand() -> Brand:
+    now = datetime.now(timezone.utc).isoformat()
+    return Brand(
+        brand_id=BRAND_ID,
+        organization_id="00000000-0000-0000-0000-000000000000",
+        name="Acme",
+        guidelines=BrandGuidelines(),
+        created_at=now,
+        updated_at=now,
+    )
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def local_client(request, tmp_path):
+    store = MemoryStore() if request.param == "memory" else SQLiteStore(str(tmp_path / "mobius.db"))
+    client = LocalSupabaseClient(store)
+    with patch("mobius.storage.brands.get_supabase_client", return_value=client), patch(
+        "mobius.storage.jobs.get_supabase_client", return_value=client
+    ), patch("mobius.storage.feedback.get_supabase_client", return_value=client):
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_brand_round_trip(local_client):
+    """Test that a brand can be created, read, updated and deleted."""
+    storage = BrandStorage()
+    await storage.create_brand(make_brand())
+
+    brand = await storage.get_brand(BRAND_ID)
+    assert brand.name == "Acme"
+
+    updated = await storage.update_brand(BRAND_ID, {"name": "Acme Corp"})
+    assert updated.name == "Acme Corp"
+
+    assert await storage.delete_brand(BRAND_ID) is True
+    assert await storage.get_brand(BRAND_ID) is None
+
+
+@pytest.mark.asyncio
+async def test_keyset_pagination_walks_all_jobs(local_client):
+    """Test that cursor pages cover every job once, including timestamp ties."""
+    storage = JobStorage()
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for i in range(7):
+        await storage.create_job(
+            Job(
+                job_id=f"00000000-0000-0000-0000-00000000000{i}",
+                brand_id=BRAND_ID,
+                status="completed",
+                state={},
+                # Pairs of jobs share a timestamp so the id tie-breaker is used
+                created_at=created_at + timedelta(seconds=i // 2),
+            )
+        )
+
+    seen, cursor = [], None
+    while True:
+        page = await storage.list_jobs(limit=3, cursor=cursor)
+        seen.extend(job.job_id for job in page)
+        if len(page) < 3:
+            break
+        last = page[-1]
+        from mobius.storage.pagination import encode_cursor
+
+        cursor = encode_cursor(last.created_at, last.job_id)
+
+    assert len(seen) == 7
+    assert len(set(seen)) == 7
+
+
+@pytest.mark.asyncio
+async def test_feedback_counters_are_maintained(local_client):
+    """Test that feedback inserts update the brand counters like the trigger."""
+    await BrandStorage().create_brand(make_brand())
+    feedback = FeedbackStorage()
+    await feedback.create_feedback("asset-1", BRAND_ID, "approve")
+    await feedback.create_feedback("asset-2", BRAND_ID, "reject", reason="Off-brand")
+
+    stats = await feedback.get_feedback_stats(BRAND_ID)
+    assert stats["approvals"] == 1
+    assert stats["rejections"] == 1
+
+
+def test_brand_stats_follow_asset_writes():
+    """Test that asset inserts and deletes keep brand_stats in sync."""
+    client = LocalSupabaseClient(MemoryStore())
+    client.table("assets").insert(
+        [
+            {"asset_id": "a1", "brand_id": BRAND_ID, "compliance_score": 80.0},
+            {"asset_id": "a2", "brand_id": BRAND_ID, "compliance_score": 90.0},
+        ]
+    ).execute()
+    client.table("assets").delete().eq("asset_id", "a1").execute()
+
+    stats = client.table("brand_stats").select("*").eq("brand_id", BRAND_ID).execute().data[0]
+    assert stats["asset_count"] == 1
+    assert stats["compliance_score_sum"] == 90.0
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_indexed_lookups_follow_writes(backend, tmp_path):
+    """Test that brand_id/primary key lookups stay correct as rows move and disappear."""
+    store = MemoryStore() if backend == "memory" else SQLiteStore(str(tmp_path / "mobius.db"))
+    client = LocalSupabaseClient(store)
+    other_brand = "22222222-2222-2222-2222-222222222222"
+    client.table("assets").insert(
+        [{"asset_id": f"a{i}", "brand_id": BRAND_ID, "compliance_score": 80.0} for i in range(5)]
+    ).execute()
+    client.table("assets").update({"brand_id": other_brand}).eq("asset_id", "a1").execute()
+    client.table("assets").delete().eq("asset_id", "a2").execute()
+
+    def asset_ids(query):
+        return sorted(row["asset_id"] for row in query.execute().data)
+
+    assets = client.table("assets")
+    assert asset_ids(assets.select("asset_id").eq("brand_id", BRAND_ID)) == ["a0", "a3", "a4"]
+    assert asset_ids(client.table("assets").select("asset_id").eq("brand_id", other_brand)) == ["a1"]
+    assert asset_ids(
+        client.table("assets").select("asset_id").in_("asset_id", ["a0", "a2", "a4"])
+        .eq("brand_id", BRAND_ID)
+    ) == ["a0", "a4"]
+    assert asset_ids(
+        client.table("assets").select("asset_id").not_.in_("brand_id", [other_brand])
+    ) == ["a0", "a3", "a4"]
+
+
+def test_sqlite_backend_persists_rows_and_files(tmp_path):
+    """Test that rows and uploaded files survive reopening the database."""
+    path = str(tmp_path / "mobius.db")
+    client = LocalSupabaseClient(SQLiteStore(path))
+    client.table("brands").insert({"brand_id": BRAND_ID, "name": "Acme"}).execute()
+    client.storage.from_("brands").upload("org/logo.png", b"png-bytes")
+
+    reopened = LocalSupabaseClient(SQLiteStore(path))
+    rows = reopened.table("brands").select("name").eq("brand_id", BRAND_ID).execute().data
+    assert rows == [{"name": "Acme"}]
+    assert reopened.storage.from_("brands").download("org/logo.png") == b"png-bytes"
+
+
+@pytest.fixture
+def fast_fake_settings():
+    with patch("mobius.tools.fake_gemini.settings") as mock_settings:
+        mock_settings.fake_gemini_seed = 7
+        mock_settings.fake_gemini_latency_scale = 0.0
+        mock_settings.fake_gemini_rate_limit_rate = 0.0
+        mock_settings.fake_gemini_audit_mean_score = 95.0
+        mock_settings.compliance_threshold = 0.80
+        for profile in ("vision", "reasoning", "fast"):
+            setattr(mock_settings, f"fake_gemini_{profile}_median_ms", 100.0)
+            setattr(mock_settings, f"fake_gemini_{profile}_p95_ms", 300.0)
+        yield mock_settings
+
+
+@pytest.mark.asyncio
+async def test_fake_gemini_generates_and_audits(fast_fake_settings):
+    """Test that the fake client returns an image and an approved audit."""
+    client = FakeGeminiClient()
+    twin = CompressedDigitalTwin(primary_colors=["#0057B8"])
+
+    result = await client.generate_image("A poster", twin, job_id="job-1")
+    assert result["image_uri"].startswith("data:image/png;base64,")
+
+    audit = await client.audit_compliance(result["image_uri"], BrandGuidelines())
+    assert audit.approved is True
+    assert client.calls == {"image_generation": 1, "compliance_audit": 1}
+
+
+@pytest.mark.asyncio
+async def test_fake_gemini_rate_limits_degrade_like_real_client(fast_fake_settings):
+    """Test that simulated 429s fail generation and degrade the audit."""
+    fast_fake_settings.fake_gemini_rate_limit_rate = 1.0
+    client = FakeGeminiClient()
+    twin = CompressedDigitalTwin(primary_colors=["#0057B8"])
+
+    with pytest.raises(Exception, match="Rate limit exceeded"):
+        await client.generate_image("A poster", twin)
+    assert client.calls["image_generation"] == 2
+
+    audit = await client.audit_compliance("data:image/png;base64,", BrandGuidelines())
+    assert audit.approved is False
+    assert audit.overall_score == 0.0
+    assert await client.optimize_prompt("A poster", twin) == "A poster"
+
+
+def test_gemini_client_returns_fake_when_configured(fast_fake_settings):
+    """Test that GeminiClient() is swapped for the fake by settings."""
+    with patch("mobius.tools.gemini.settings") as mock_settings:
+        mock_settings.gemini_backend = "fake"
+        client = GeminiClient()
+
+    assert isinstance(client, FakeGeminiClient)
@@ -0,0 +1,54 @@
+"""
+Unit tests for keyset pagination helpers.
+
+Tests cursor encoding/decoding and next-page cursor construction.
+"""
+
+import pytest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from mobius.storage.pagination import decode_cursor, encode_cursor, next_cursor
+
+
+def test_cursor_round_trip():
+    """Test that a cursor decodes to the position it was built from."""
+    created_at = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+
+    cursor = encode_cursor(created_at, "asset-123")
+
+    assert decode_cursor(cursor) == (created_at.isoformat(), "asset-123")
+
+
+def test_cursor_is_url_safe():
+    """Test that cursors can be passed as query parameters without escaping."""
+    cursor = encode_cursor("2024-05-01T12:30:00.123456+00:00", "job-1")
+
+    assert all(c.isalnum() or c in "-_" for c in cursor)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not-a-cursor",
+        encode_cursor("yesterday", "job-1"),
+        encode_cursor("2024-05-01T12:30:00+00:00", 'job",id.gt.0'),
+        encode_cursor("2024-05-01T12:30:00+00:00", ""),
+    ],
+)
+def test_decode_rejects_invalid_cursor(cursor):
+    """Test that malformed or tampered cursors raise ValueError."""
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_next_cursor_only_for_full_pages():
+    """Test that next_cursor is emitted only when the page was filled."""
+    created_at = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    items = [SimpleNamespace(job_id=f"job-{i}", created_at=created_at) for i in range(3)]
+
+    assert next_cursor(items, "job_id", limit=5) is None
+    assert next_cursor([], "job_id", limit=5) is None
+    assert decode_cursor(next_cursor(items, "job_id", limit=3)) == (
+        created_at.isoformat(),
+        "job-2",
+    )
@@ -0,0 +1,144 @@
+"""
+Unit tests for the exact-request generation result cache.
+
+Runs generate_handler against the in-memory storage backend; no worker
+runs, jobs are finished by hand.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from mobius.api.errors import ValidationError
+from mobius.api.routes import generate_handler
+from mobius.storage.local import LocalSupabaseClient, MemoryStore
+from mobius.storage.result_cache import result_cache, result_cache_key
+
+BRAND_ID = "aaaaaaaa-0000-0000-0000-000000000000"
+ORG_ID = "0000000a-0000-0000-0000-000000000000"
+
+
+def make_brand(updated_at: str = "2026-01-01T00:00:00+00:00"):
+    return SimpleNamespace(brand_id=BRAND_ID, organization_id=ORG_ID, updated_at=updated_at)
+
+
+@pytest.fixture
+def client():
+    client = LocalSupabaseClient(MemoryStore())
+    result_cache.clear()
+    with patch("mobius.storage.jobs.get_supabase_client", return_value=client), \
+            patch("mobius.storage.job_queue.get_supabase_client", return_value=client), \
+            patch("mobius.api.routes.brand_cache.get", AsyncMock(return_value=make_brand())), \
+            patch("mobius.api.routes.generation_worker") as worker:
+        client.worker = worker
+        yield client
+
+
+def get_row(client, job_id: str) -> dict:
+    return client.table("jobs").select("*").eq("job_id", job_id).execute().data[0]
+
+
+def finish_job(client, job_id: str, status: str = "completed") -> None:
+    row = get_row(client, job_id)
+    client.table("jobs").update({
+        "status": status,
+        "queued_at": None,
+        "state": {**row["state"], "image_uri": "https://cdn/img.png", "compliance_scores": [{"overall_score": 92}]},
+    }).eq("job_id", job_id).execute()
+
+
+def test_keys_ignore_whitespace_but_not_what_changes_the_image():
+    brand = make_brand()
+    key = result_cache_key(brand, {"prompt": "Summer  sale\nbanner", "seed": 7})
+
+    assert key == result_cache_key(brand, {"prompt": " Summer sale banner ", "seed": 7})
+    assert key != result_cache_key(brand, {"prompt": "Summer sale banner", "seed": 8})
+    assert key != result_cache_key(brand, {"prompt": "Summer sale banner", "seed": 7}, template_id="t-1")
+    assert key != result_cache_key(brand, {"prompt": "summer sale banner", "seed": 7})
+    # Editing the brand's guidelines changes every key
+    edited = make_brand(updated_at="2026-02-01T00:00:00+00:00")
+    assert key != result_cache_key(edited, {"prompt": "Summer sale banner", "seed": 7})
+
+
+async def test_repeated_request_returns_the_approved_result(client):
+    first = await generate_handler(brand_id=BRAND_ID, prompt="Summer sale banner", async_mode=True, cache="use")
+    assert first["cached"] is False
+    finish_job(client, first["job_id"])
+
+    repeat = await generate_handler(brand_id=BRAND_ID, prompt="Summer sale  banner", async_mode=True, cache="use")
+
+    assert repeat["cached"] is True
+    assert repeat["job_id"] == first["job_id"]
+    assert repeat["status"] == "completed"
+    assert repeat["image_url"] == "https://cdn/img.png"
+    assert repeat["compliance_score"] == 92
+    assert len(client.table("jobs").select("*").execute().data) == 1
+    assert result_cache.stats()["hits"] == 1
+
+
+async def test_failed_results_and_requests_without_cache_are_not_served(client):
+    failed = await generate_handler(brand_id=BRAND_ID, prompt="Hero image", async_mode=True, cache="use")
+    finish_job(client, failed["job_id"], status="failed")
+
+    retry = await generate_handler(brand_id=BRAND_ID, prompt="Hero image", async_mode=True, cache="use")
+    assert retry["cached"] is False
+    assert retry["job_id"] != failed["job_id"]
+
+    finish_job(client, retry["job_id"])
+    uncached = await generate_handler(brand_id=BRAND_ID, prompt="Hero image", async_mode=True)
+    assert uncached["cached"] is False
+    assert get_row(client, uncached["job_id"])["result_cache_key"] is None
+
+
+async def test_refresh_generates_anew_and_replaces_the_cached_result(client):
+    first = await generate_handler(brand_id=BRAND_ID, prompt="Hero image", async_mode=True, cache="use")
+    finish_job(client, first["job_id"])
+
+    refreshed = await generate_handler(brand_id=BRAND_ID, prompt="Hero image", async_mode=True, cache="refresh")
+    assert refreshed["cached"] is False
+    assert refreshed["job_id"] != first["job_id"]
+    finish_job(client, refreshed["job_id"])
+
+    repeat = await generate_handler(brand_id=BRAND_ID, prompt="Hero image", async_mode=True, cache="use")
+    assert repeat["job_id"] == refreshed["job_id"]
+    assert result_cache.stats()["refreshes"] == 1
+
+
+async def test_identical_requests_in_flight_share_one_job(client):
+    first = await generate_handler(brand_id=BRAND_ID, prompt="Hero image", async_mode=True, cache="use")
+    second = await generate_handler(brand_id=BRAND_ID, prompt="Hero image", async_mode=True, cache="refresh")
+
+    assert second["job_id"] == first["job_id"]
+    assert second["status"] == "pending"
+    assert len(client.table("jobs").select("*").execute().data) == 1
+
+
+async def test_concurrent_sync_requests_run_the_workflow_once(client):
+    async def workflow(**kwargs):
+        await asyncio.sleep(0.05)
+        return {
+            "status": "completed",
+            "current_image_url": "https://cdn/img.png",
+            "compliance_scores": [{"overall_score": 90}],
+            "is_approved": True,
+        }
+
+    run = AsyncMock(side_effect=workflow)
+    with patch("mobius.graphs.generation.run_generation_workflow", run):
+        first, second = await asyncio.gather(
+            generate_handler(brand_id=BRAND_ID, prompt="Hero image", cache="use"),
+            generate_handler(brand_id=BRAND_ID, prompt="Hero image", cache="use"),
+        )
+
+    run.assert_awaited_once()
+    assert first["job_id"] == second["job_id"]
+    assert second["image_url"] == "https://cdn/img.png"
+    assert first["request_id"] != second["request_id"]
+
+
+async def test_unknown_cache_mode_is_rejected(client):
+    with pytest.raises(ValidationError) as exc:
+        await generate_handler(brand_id=BRAND_ID, prompt="Hero image", cache="always")
+    assert exc.value.error_response.error.code == "INVALID_CACHE_MODE"
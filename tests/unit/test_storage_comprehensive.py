@@ -11,6 +11,7 @@ from mobius.storage.brands import BrandStorage
 from mobius.storage.jobs import JobStorage
 from mobius.storage.assets import AssetStorage
 from mobius.storage.templates import TemplateStorage
+from mobius.storage.pagination import encode_cursor
 from mobius.models.brand import Brand, BrandGuidelines, Color, Typography, LogoRule
 from mobius.models.job import Job
 from mobius.models.asset import Asset
@@ -31,11 +32,13 @@ def mock_supabase_client():
     client.eq = Mock(return_value=client)
     client.is_ = Mock(return_value=client)
     client.ilike = Mock(return_value=client)
+    client.in_ = Mock(return_value=client)
     client.gt = Mock(return_value=client)
     client.lt = Mock(return_value=client)
     client.limit = Mock(return_value=client)
     client.order = Mock(return_value=client)
     client.range = Mock(return_value=client)
+    client.or_ = Mock(return_value=client)
     client.execute = Mock()
     return client
 
@@ -242,13 +245,18 @@ async def test_brand_storage_get_with_stats(mock_get_client, mock_supabase_clien
     # Mock brand fetch
     brand_response = Mock(data=[sample_brand.model_dump()])
     
-    # Mock assets fetch
-    assets_response = Mock(data=[
-        {"compliance_score": 85.0},
-        {"compliance_score": 90.0},
+    # Mock brand_stats fetch
+    stats_response = Mock(data=[
+        {
+            "brand_id": "brand-123",
+            "asset_count": 2,
+            "scored_asset_count": 2,
+            "compliance_score_sum": 175.0,
+            "last_activity": "2025-01-01T00:00:00+00:00",
+        },
     ])
     
-    mock_supabase_client.execute.side_effect = [brand_response, assets_response]
+    mock_supabase_client.execute.side_effect = [brand_response, stats_response]
     
     storage = BrandStorage()
     result = await storage.get_brand_with_stats("brand-123")
@@ -257,6 +265,45 @@ async def test_brand_storage_get_with_stats(mock_get_client, mock_supabase_clien
     assert result["brand_id"] == "brand-123"
     assert result["asset_count"] == 2
     assert result["avg_compliance_score"] == 87.5
+    mock_supabase_client.table.assert_called_with("brand_stats")
+
+
+@pytest.mark.asyncio
+@patch("mobius.storage.brands.get_supabase_client")
+async def test_brand_storage_get_brand_stats(mock_get_client, mock_supabase_client):
+    """Test batch statistics lookup from the brand_stats aggregate."""
+    mock_get_client.return_value = mock_supabase_client
+    mock_supabase_client.execute.return_value = Mock(data=[
+        {
+            "brand_id": "brand-1",
+            "asset_count": 3,
+            "scored_asset_count": 2,
+            "compliance_score_sum": 150.0,
+            "last_activity": "2025-01-01T00:00:00+00:00",
+        },
+    ])
+    
+    storage = BrandStorage()
+    result = await storage.get_brand_stats(["brand-1", "brand-2"])
+    
+    # Unscored assets count towards asset_count but not the average
+    assert result["brand-1"]["asset_count"] == 3
+    assert result["brand-1"]["avg_compliance_score"] == 75.0
+    assert "brand-2" not in result
+    mock_supabase_client.in_.assert_called_with("brand_id", ["brand-1", "brand-2"])
+
+
+@pytest.mark.asyncio
+@patch("mobius.storage.brands.get_supabase_client")
+async def test_brand_storage_get_brand_stats_empty(mock_get_client, mock_supabase_client):
+    """Test that an empty brand list skips the query."""
+    mock_get_client.return_value = mock_supabase_client
+    
+    storage = BrandStorage()
+    result = await storage.get_brand_stats([])
+    
+    assert result == {}
+    mock_supabase_client.execute.assert_not_called()
 
 
 # JobStorage Tests
@@ -345,6 +392,26 @@ async def test_job_storage_list_with_status(mock_get_client, mock_supabase_clien
     mock_supabase_client.eq.assert_any_call("status", "pending")
 
 
+@pytest.mark.asyncio
+@patch("mobius.storage.jobs.get_supabase_client")
+async def test_job_storage_list_with_cursor(mock_get_client, mock_supabase_client, sample_job):
+    """Test that listing jobs from a cursor uses a keyset filter instead of an offset."""
+    mock_get_client.return_value = mock_supabase_client
+    mock_supabase_client.execute.return_value = Mock(data=[sample_job.model_dump()])
+    cursor = encode_cursor("2024-01-01T00:00:00+00:00", "job-999")
+
+    storage = JobStorage()
+    await storage.list_jobs(limit=10, cursor=cursor)
+
+    mock_supabase_client.or_.assert_called_once_with(
+        'created_at.lt."2024-01-01T00:00:00+00:00",'
+        'and(created_at.eq."2024-01-01T00:00:00+00:00",job_id.lt."job-999")'
+    )
+    mock_supabase_client.order.assert_any_call("job_id", desc=True)
+    mock_supabase_client.limit.assert_called_once_with(10)
+    mock_supabase_client.range.assert_not_called()
+
+
 @pytest.mark.asyncio
 @patch("mobius.storage.jobs.get_supabase_client")
 async def test_job_storage_update(mock_get_client, mock_supabase_client, sample_job):
@@ -50,6 +50,9 @@ async def test_health_check_all_healthy(mock_get_client):
     # Request ID should be present
     assert response["request_id"].startswith("req_")
 
+    # Brand cache metrics are reported
+    assert {"hits", "misses", "hit_ratio"} <= set(response["brand_cache"])
+
 
 @pytest.mark.asyncio
 @patch("mobius.storage.database.get_supabase_client")
@@ -18,6 +18,7 @@ from mobius.api.errors import ValidationError, NotFoundError
 from mobius.models.asset import Asset
 from mobius.models.template import Template
 from mobius.models.brand import Brand, BrandGuidelines, Color
+from mobius.storage.pagination import decode_cursor
 import uuid
 
 
@@ -142,7 +143,49 @@ async def test_list_templates_by_brand():
         assert result["total"] == 3
         assert len(result["templates"]) == 3
         assert all(t["brand_id"] == brand_id for t in result["templates"])
-        mock_template_storage.list_templates.assert_called_once_with(brand_id, 100)
+        assert result["next_cursor"] is None
+        mock_template_storage.list_templates.assert_called_once_with(brand_id, 100, cursor=None)
+
+
+@pytest.mark.asyncio
+async def test_list_templates_returns_next_cursor_for_full_page():
+    """Test that a full page of templates yields a cursor for the next page."""
+    brand_id = str(uuid.uuid4())
+
+    templates = [
+        Template(
+            template_id=str(uuid.uuid4()),
+            brand_id=brand_id,
+            name=f"Template {i}",
+            description=f"Description {i}",
+            generation_params={"prompt": f"Test {i}"},
+            thumbnail_url=f"https://example.com/thumb{i}.png",
+        )
+        for i in range(2)
+    ]
+
+    with patch("mobius.storage.templates.TemplateStorage") as MockTemplateStorage:
+        mock_template_storage = AsyncMock()
+        mock_template_storage.list_templates.return_value = templates
+        MockTemplateStorage.return_value = mock_template_storage
+
+        result = await list_templates_handler(brand_id=brand_id, limit=2)
+
+        assert decode_cursor(result["next_cursor"]) == (
+            templates[-1].created_at.isoformat(),
+            templates[-1].template_id,
+        )
+
+
+@pytest.mark.asyncio
+async def test_list_templates_rejects_invalid_cursor():
+    """Test that a malformed cursor is rejected before hitting storage."""
+    with patch("mobius.storage.templates.TemplateStorage") as MockTemplateStorage:
+        with pytest.raises(ValidationError) as exc_info:
+            await list_templates_handler(brand_id=str(uuid.uuid4()), cursor="not-a-cursor")
+
+        assert exc_info.value.error_response.error.code == "INVALID_CURSOR"
+        MockTemplateStorage.assert_not_called()
 
 
 @pytest.mark.asyncio
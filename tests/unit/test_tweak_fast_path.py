@@ -0,0 +1,156 @@
+"""
+Unit tests for tweak delta audits.
+
+A tweak re-audits only the categories its instruction can affect and carries
+the previous audit's other category scores over.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from mobius.models.brand import BrandGuidelines, Color, Typography
+from mobius.models.compliance import CategoryScore, ComplianceScore
+from mobius.nodes.audit import audit_node
+from mobius.nodes.correct import correct_node, tweak_audit_scope
+from mobius.tools.gemini import GeminiClient
+
+BRAND_ID = "aaaaaaaa-0000-0000-0000-000000000000"
+
+
+def previous_audit(score: float = 90.0) -> dict:
+    categories = [
+        {"category": c, "score": score, "passed": True, "violations": []}
+        for c in ("colors", "typography", "layout", "logo_usage")
+    ]
+    return {"overall_score": score, "categories": categories, "approved": False, "summary": "Full audit"}
+
+
+def delta_result(*scores) -> ComplianceScore:
+    return ComplianceScore(
+        overall_score=sum(s for _, s in scores) / len(scores),
+        categories=[CategoryScore(category=c, score=s, passed=True) for c, s in scores],
+        approved=True,
+        summary="Headline fixed",
+    )
+
+
+@pytest.fixture
+def gemini():
+    client = SimpleNamespace(audit_compliance=AsyncMock())
+    brand = SimpleNamespace(guidelines=BrandGuidelines())
+    with patch("mobius.nodes.audit.GeminiClient", return_value=client), \
+            patch("mobius.nodes.audit.BrandStorage"), \
+            patch("mobius.nodes.audit.brand_cache.get", AsyncMock(return_value=brand)):
+        yield client
+
+
+def tweak_state(**overrides) -> dict:
+    state = {
+        "job_id": "job-0",
+        "brand_id": BRAND_ID,
+        "current_image_url": "https://cdn/img.png",
+        "audit_history": [previous_audit()],
+        "compliance_scores": [previous_audit()],
+        "audit_scope": ["typography", "layout"],
+    }
+    state.update(overrides)
+    return state
+
+
+def test_instructions_map_to_the_categories_they_affect():
+    assert tweak_audit_scope("Change the headline to 'Summer Sale'") == ["typography", "layout"]
+    assert tweak_audit_scope("Make the background darker blue") == ["colors"]
+    assert tweak_audit_scope("Move the logo to the top left corner") == ["layout", "logo_usage"]
+    # Unrecognized, sweeping or all-category tweaks get a full audit
+    assert tweak_audit_scope("Add a dog") is None
+    assert tweak_audit_scope("Redo it in a watercolor style") is None
+    assert tweak_audit_scope("Make the headline red and move the logo") is None
+    # Whole words only: "reduce" is not a colour
+    assert tweak_audit_scope("Reduce the headline") == ["typography", "layout"]
+
+
+async def test_correct_node_scopes_user_tweaks():
+    result = await correct_node({"job_id": "job-0", "user_tweak_instruction": "Make the logo bigger"})
+
+    assert result["audit_scope"] == ["layout", "logo_usage"]
+    assert result["user_tweak_instruction"] is None
+
+    with patch("mobius.nodes.correct.settings.tweak_delta_audit", False):
+        result = await correct_node({"job_id": "job-0", "user_tweak_instruction": "Make the logo bigger"})
+    assert result["audit_scope"] is None
+
+
+async def test_delta_audit_rescores_the_scope_and_carries_the_rest(gemini):
+    gemini.audit_compliance.return_value = delta_result(("typography", 100.0), ("layout", 100.0))
+
+    result = await audit_node(tweak_state())
+
+    assert gemini.audit_compliance.await_args.kwargs["categories"] == ["typography", "layout"]
+    latest = result["compliance_scores"][-1]
+    assert {c["category"]: c["score"] for c in latest["categories"]} == {
+        "colors": 90.0, "typography": 100.0, "layout": 100.0, "logo_usage": 90.0,
+    }
+    # Weighted: colors .30 and logo_usage .20 at 90, the rest at 100
+    assert latest["overall_score"] == 95.0
+    assert result["is_approved"] is True
+    assert result["audit_scope"] is None
+
+
+async def test_failed_previous_audit_falls_back_to_a_full_audit(gemini):
+    failed = {
+        **previous_audit(0.0),
+        "categories": [{
+            "category": "colors", "score": 0.0, "passed": False,
+            "violations": [{
+                "category": "audit_error", "description": "Quota", "severity": "critical",
+                "fix_suggestion": "Manual review",
+            }],
+        }],
+    }
+    gemini.audit_compliance.return_value = delta_result(
+        ("colors", 80.0), ("typography", 80.0), ("layout", 80.0), ("logo_usage", 80.0)
+    )
+
+    result = await audit_node(tweak_state(compliance_scores=[failed]))
+
+    assert "categories" not in gemini.audit_compliance.await_args.kwargs
+    assert result["compliance_scores"][-1]["summary"] == "Headline fixed"
+
+
+async def test_failed_delta_audit_is_not_merged(gemini):
+    error = ComplianceScore.model_validate({
+        "overall_score": 0.0,
+        "approved": False,
+        "summary": "Audit failed",
+        "categories": [{
+            "category": "typography", "score": 0.0, "passed": False,
+            "violations": [{
+                "category": "audit_error", "description": "Quota", "severity": "critical",
+                "fix_suggestion": "Manual review",
+            }],
+        }],
+    })
+    gemini.audit_compliance.return_value = error
+
+    result = await audit_node(tweak_state(audit_scope=["typography"]))
+
+    assert result["compliance_scores"][-1]["overall_score"] == 0.0
+    assert result["is_approved"] is False
+
+
+def test_scoped_audit_prompt_only_carries_the_scoped_guidelines():
+    guidelines = BrandGuidelines(
+        colors=[Color(name="Midnight", hex="#0057B8", usage="primary")],
+        typography=[Typography(family="Inter", weights=["400"], usage="Body")],
+    )
+    client = GeminiClient.__new__(GeminiClient)
+
+    full = client._build_audit_prompt(guidelines)
+    scoped = client._build_audit_prompt(guidelines, ["typography", "layout"])
+
+    assert "#0057B8" in full and "4. **logo_usage**" in full
+    assert "#0057B8" not in scoped and "Inter" in scoped
+    assert "1. **typography**" in scoped and "2. **layout**" in scoped
+    assert "**colors**" not in scoped and "**logo_usage**" not in scoped
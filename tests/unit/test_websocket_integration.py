@@ -9,6 +9,7 @@ import pytest
 import asyncio
 import json
 from unittest.mock import Mock, AsyncMock, patch
+from mobius.api import websocket_handlers
 from mobius.api.websocket_handlers import (
     WebSocketConnectionManager,
     broadcast_compliance_scores,
@@ -17,6 +18,17 @@ from mobius.api.websocket_handlers import (
 )
 
 
+def make_websocket():
+    websocket = Mock()
+    websocket.accept = AsyncMock()
+    websocket.send_text = AsyncMock()
+    return websocket
+
+
+def sent_messages(websocket) -> list:
+    return [json.loads(call.args[0]) for call in websocket.send_text.call_args_list]
+
+
 class TestWebSocketConnectionManager:
     """Test WebSocket connection management functionality."""
 
@@ -84,9 +96,10 @@ class TestWebSocketConnectionManager:
         
         # Send message to job
         await manager.send_to_job(job_id, message)
+        await manager.drain()
         
-        # Verify message was sent
-        mock_websocket.send_text.assert_called_once()
+        # Verify message was sent after the connection confirmation
+        assert mock_websocket.send_text.call_count == 2
         sent_data = mock_websocket.send_text.call_args[0][0]
         assert json.loads(sent_data) == message
 
@@ -115,10 +128,11 @@ class TestWebSocketConnectionManager:
         # Send message to job
         message = {"type": "test", "jobId": job_id, "payload": {}}
         await manager.send_to_job(job_id, message)
+        await manager.drain()
         
-        # Verify both received the message
-        ws1.send_text.assert_called_once()
-        ws2.send_text.assert_called_once()
+        # Verify both received the message (after their connection confirmation)
+        assert json.loads(ws1.send_text.call_args[0][0]) == message
+        assert json.loads(ws2.send_text.call_args[0][0]) == message
 
     @pytest.mark.asyncio
     async def test_send_to_nonexistent_job(self, manager):
@@ -133,6 +147,210 @@ class TestWebSocketConnectionManager:
         assert manager.get_job_connection_count(job_id) == 0
 
 
+class TestWebSocketFanOut:
+    """Test per-connection send queues for slow consumers."""
+
+    @pytest.mark.asyncio
+    async def test_slow_consumer_does_not_block_broadcast(self):
+        """Test that broadcast returns while a subscriber is stuck sending."""
+        manager = WebSocketConnectionManager()
+        release = asyncio.Event()
+
+        async def blocked_send(text):
+            await release.wait()
+
+        slow = Mock()
+        slow.accept = AsyncMock()
+        slow.send_text = AsyncMock(side_effect=blocked_send)
+        fast = Mock()
+        fast.accept = AsyncMock()
+        fast.send_text = AsyncMock()
+
+        await manager.connect(slow, "job-1")
+        await manager.connect(fast, "job-1")
+
+        await asyncio.wait_for(
+            manager.send_to_job("job-1", {"type": "reasoning_log", "payload": {}}), timeout=0.1
+        )
+        await asyncio.sleep(0.01)
+
+        # Fast subscriber got confirmation + log; slow one is still on its first send
+        assert fast.send_text.call_count == 2
+        assert slow.send_text.call_count == 1
+        release.set()
+        await manager.drain()
+        assert slow.send_text.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_status_messages_coalesce_and_queue_is_bounded(self):
+        """Test latest-status-wins coalescing and drop-oldest when full."""
+        manager = WebSocketConnectionManager(queue_size=3)
+        release = asyncio.Event()
+
+        async def blocked_send(text):
+            await release.wait()
+
+        ws = Mock()
+        ws.accept = AsyncMock()
+        ws.send_text = AsyncMock(side_effect=blocked_send)
+
+        await manager.connect(ws, "job-1")
+        await asyncio.sleep(0)  # writer is now blocked sending the confirmation
+
+        for progress in range(5):
+            manager.broadcast("job-1", {"type": "status_change", "payload": {"progress": progress}})
+        for i in range(4):
+            manager.broadcast("job-1", {"type": "reasoning_log", "payload": {"i": i}})
+
+        stats = manager.get_connection_stats()["per_connection"][0]
+        assert stats["queued"] == 3
+        assert stats["coalesced"] == 4
+        assert stats["dropped"] == 2
+
+        release.set()
+        await manager.drain()
+        sent = [json.loads(call.args[0]) for call in ws.send_text.call_args_list[1:]]
+        assert sent[0] == {"type": "status_change", "payload": {"progress": 4}}
+        assert [m["payload"]["i"] for m in sent[1:]] == [2, 3]
+        assert manager.get_connection_stats()["per_connection"][0]["sent"] == 4
+
+    @pytest.mark.asyncio
+    async def test_coalesced_status_follows_messages_queued_before_it(self):
+        """Test that a replaced status moves behind logs sent ahead of it."""
+        manager = WebSocketConnectionManager()
+        release = asyncio.Event()
+
+        async def blocked_send(text):
+            await release.wait()
+
+        ws = Mock()
+        ws.accept = AsyncMock()
+        ws.send_text = AsyncMock(side_effect=blocked_send)
+
+        await manager.connect(ws, "job-1")
+        await asyncio.sleep(0)
+
+        manager.broadcast("job-1", {"type": "status_change", "payload": {"status": "generating"}})
+        manager.broadcast("job-1", {"type": "reasoning_log", "payload": {"i": 0}})
+        manager.broadcast("job-1", {"type": "reasoning_log", "payload": {"i": 1}})
+        manager.broadcast("job-1", {"type": "status_change", "payload": {"status": "completed"}})
+
+        release.set()
+        await manager.drain()
+        sent = [json.loads(call.args[0]) for call in ws.send_text.call_args_list[1:]]
+        assert [m["type"] for m in sent] == ["reasoning_log", "reasoning_log", "status_change"]
+        assert sent[-1]["payload"]["status"] == "completed"
+
+
+    @pytest.mark.asyncio
+    async def test_status_messages_of_different_jobs_are_not_coalesced(self):
+        """Test that one job's status does not replace another's on a shared connection."""
+        manager = WebSocketConnectionManager()
+        release = asyncio.Event()
+
+        async def blocked_send(text):
+            await release.wait()
+
+        ws = Mock()
+        ws.accept = AsyncMock()
+        ws.send_text = AsyncMock(side_effect=blocked_send)
+
+        await manager.connect(ws)
+        manager.subscribe_job(ws, "job-A")
+        manager.subscribe_job(ws, "job-B")
+        await asyncio.sleep(0)
+
+        manager.broadcast("job-A", {"type": "status_change", "jobId": "job-A", "payload": {"status": "completed"}})
+        manager.broadcast("job-B", {"type": "status_change", "jobId": "job-B", "payload": {"status": "generating"}})
+        manager.broadcast("job-B", {"type": "status_change", "jobId": "job-B", "payload": {"status": "auditing"}})
+        await manager.send_to_connection(ws, {"type": "compliance_score", "jobId": "job-A", "payload": {}})
+        await manager.send_to_connection(ws, {"type": "compliance_score", "jobId": "job-B", "payload": {}})
+
+        release.set()
+        await manager.drain()
+        sent = [json.loads(call.args[0]) for call in ws.send_text.call_args_list[1:]]
+        assert [(m["type"], m["jobId"]) for m in sent] == [
+            ("status_change", "job-A"),
+            ("status_change", "job-B"),
+            ("compliance_score", "job-A"),
+            ("compliance_score", "job-B"),
+        ]
+        assert sent[1]["payload"]["status"] == "auditing"
+
+
+class TestMultiplexedSubscriptions:
+    """Test one connection following many jobs and brands."""
+
+    @pytest.mark.asyncio
+    async def test_one_connection_follows_many_jobs(self):
+        """Test per-job routing, unsubscribe and cleanup on a multiplexed connection."""
+        manager = WebSocketConnectionManager()
+        ws = make_websocket()
+        await manager.connect(ws)
+
+        for job_id in ("job-1", "job-2", "job-3"):
+            assert manager.subscribe_job(ws, job_id)
+        manager.unsubscribe_job(ws, "job-3")
+        for job_id in ("job-1", "job-2", "job-3"):
+            await manager.send_to_job(job_id, {"type": "reasoning_log", "jobId": job_id})
+        await manager.drain()
+
+        assert [m["jobId"] for m in sent_messages(ws)[1:]] == ["job-1", "job-2"]
+        assert manager.get_total_connections() == 1
+        assert manager.get_connection_stats()["subscriptions"] == 2
+
+        manager.disconnect(ws)
+        assert manager.job_connections == {}
+        assert manager.get_total_connections() == 0
+
+    @pytest.mark.asyncio
+    async def test_brand_subscription_receives_every_job_of_the_brand_once(self):
+        """Test brand routing, including a connection also following the job itself."""
+        manager = WebSocketConnectionManager()
+        ws, other = make_websocket(), make_websocket()
+        await manager.connect(ws)
+        await manager.connect(other)
+        manager.subscribe_brand(ws, "brand-1")
+        manager.subscribe_job(ws, "job-1")
+        manager.subscribe_brand(other, "brand-2")
+        brands = {"job-1": "brand-1", "job-2": "brand-1", "job-3": "brand-2"}
+
+        with patch.object(manager, "_job_brand", AsyncMock(side_effect=brands.get)):
+            for job_id in brands:
+                await manager.send_to_job(job_id, {"type": "reasoning_log", "jobId": job_id})
+        await manager.drain()
+
+        assert [m["jobId"] for m in sent_messages(ws)[1:]] == ["job-1", "job-2"]
+        assert [m["jobId"] for m in sent_messages(other)[1:]] == ["job-3"]
+
+    @pytest.mark.asyncio
+    async def test_subscription_messages_replay_and_enforce_the_limit(self):
+        """Test the subscribe control message: replay per job, rejections past the limit."""
+        manager = WebSocketConnectionManager(max_subscriptions=2)
+        ws = make_websocket()
+        await manager.connect(ws)
+
+        with patch.object(websocket_handlers, "connection_manager", manager), \
+                patch.object(websocket_handlers, "replay_job_events", AsyncMock(return_value=False)), \
+                patch.object(websocket_handlers, "send_initial_job_status", AsyncMock()) as initial:
+            await websocket_handlers.handle_multiplexed_message(ws, {
+                "type": "subscribe",
+                "jobIds": ["job-1", "job-2", "job-3"],
+                "lastSeq": {"job-1": 5},
+            })
+            websocket_handlers.replay_job_events.assert_any_await(ws, "job-1", 5)
+            await websocket_handlers.handle_multiplexed_message(
+                ws, {"type": "unsubscribe", "jobIds": "job-2"}
+            )
+        await manager.drain()
+
+        acks = [m for m in sent_messages(ws) if m["type"] in ("subscribed", "unsubscribed")]
+        assert acks[0]["payload"] == {"jobIds": ["job-1", "job-2"], "brandIds": [], "rejected": ["job-3"]}
+        assert acks[1]["payload"]["jobIds"] == ["job-2"]
+        assert [call.args[1] for call in initial.await_args_list] == ["job-1", "job-2"]
+        assert manager.connection_states[ws].jobs == {"job-1"}
+
+
 class TestWebSocketBroadcasting:
     """Test WebSocket message broadcasting functions."""
 
@@ -259,6 +477,7 @@ class TestWebSocketMessageValidation:
         # Try to send message (should handle failure gracefully)
         message = {"type": "test", "jobId": job_id, "payload": {}}
         await manager.send_to_job(job_id, message)
+        await manager.drain()
         
         # Verify failed connection was cleaned up
         assert manager.get_job_connection_count(job_id) == 0
@@ -0,0 +1,178 @@
+"""
+Unit tests for checkpointed pause/resume of the generation workflow.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from mobius.graphs import generation
+from mobius.graphs.checkpoint import REVIEW_NODE, WorkflowCheckpointer
+
+IMAGE_DATA = "data:image/png;base64,iVBORw0KGgo="
+
+
+class FakeNodes:
+    """Generation nodes that record the state they ran with."""
+
+    def __init__(self, scores):
+        self.scores = list(scores)
+        self.calls = []
+
+    async def generate(self, state):
+        self.calls.append(("generate", dict(state)))
+        return {
+            "attempt_count": state.get("attempt_count", 0) + 1,
+            "current_image_url": IMAGE_DATA,
+            "image_data_uri": None,
+            "original_had_logos": True,
+            "status": "generated",
+        }
+
+    async def audit(self, state):
+        self.calls.append(("audit", dict(state)))
+        score = self.scores.pop(0)
+        return {
+            "compliance_scores": state.get("compliance_scores", []) + [{"overall_score": score}],
+            "is_approved": score >= 95,
+            "status": "audited",
+        }
+
+    async def correct(self, state):
+        self.calls.append(("correct", dict(state)))
+        return {"prompt": f"{state['prompt']} ({state['user_tweak_instruction']})", "user_tweak_instruction": None}
+
+    async def needs_review(self, state):
+        self.calls.append(("needs_review", dict(state)))
+        return {
+            "status": "needs_review",
+            "needs_review": True,
+            "current_image_url": "https://cdn.example.com/job-1.png",
+            "image_data_uri": state["current_image_url"],
+        }
+
+    async def finalize(self, state):
+        self.calls.append(("finalize", dict(state)))
+        return {"status": "finalized"}
+
+    async def complete(self, state):
+        self.calls.append(("complete", dict(state)))
+        return {"status": "completed"}
+
+    def ran(self, node):
+        return [state for name, state in self.calls if name == node]
+
+
+@pytest.fixture
+def nodes():
+    fake = FakeNodes(scores=[80, 97])
+    with patch.object(generation, "generate_node", fake.generate), \
+            patch.object(generation, "audit_node", fake.audit), \
+            patch.object(generation, "correct_node", fake.correct), \
+            patch.object(generation, "needs_review_node", fake.needs_review), \
+            patch.object(generation, "finalize_node", fake.finalize), \
+            patch.object(generation, "complete_node", fake.complete):
+        yield fake
+
+
+def initial_state(job_id="job-1"):
+    return {
+        "job_id": job_id,
+        "brand_id": "brand-1",
+        "prompt": "A summer banner",
+        "attempt_count": 0,
+        "compliance_scores": [],
+        "audit_history": [],
+        "is_approved": False,
+        "status": "pending",
+    }
+
+
+async def run_until_review(checkpointer):
+    workflow = generation.create_generation_workflow(checkpointer=checkpointer.saver)
+    config = await checkpointer.thread_config("job-1")
+    paused = await workflow.ainvoke(initial_state(), config=config)
+    return workflow, paused
+
+
+async def test_workflow_pauses_before_review(nodes):
+    checkpointer = WorkflowCheckpointer(backend="memory")
+    workflow, paused = await run_until_review(checkpointer)
+
+    assert paused["status"] == "needs_review"
+    snapshot = await workflow.aget_state(await checkpointer.thread_config("job-1"))
+    assert snapshot.next == (REVIEW_NODE,)
+
+
+async def test_review_decision_resumes_from_checkpoint_with_full_state(nodes):
+    checkpointer = WorkflowCheckpointer(backend="memory")
+    workflow, _ = await run_until_review(checkpointer)
+
+    final_state = await checkpointer.resume(
+        workflow, "job-1", {"user_decision": "tweak", "prompt": "Make the logo bigger"}
+    )
+
+    assert final_state["status"] == "completed"
+    resumed = nodes.ran("generate")[-1]
+    # Nothing was rebuilt by hand: brand, logo config and image bytes come from the checkpoint
+    assert resumed["brand_id"] == "brand-1"
+    assert resumed["original_had_logos"] is True
+    assert resumed["image_data_uri"] == IMAGE_DATA
+    assert resumed["prompt"] == "Make the logo bigger"
+    assert resumed["needs_review"] is False
+    assert len(nodes.ran("needs_review")) == 1
+
+
+async def test_completed_run_is_reentered_after_audit_for_a_tweak(nodes):
+    nodes.scores = [97, 97]
+    checkpointer = WorkflowCheckpointer(backend="memory")
+    workflow = generation.create_generation_workflow(checkpointer=checkpointer.saver)
+    await workflow.ainvoke(initial_state(), config=await checkpointer.thread_config("job-1"))
+
+    final_state = await checkpointer.resume(
+        workflow,
+        "job-1",
+        {"user_tweak_instruction": "warmer colors", "user_decision": "tweak", "is_approved": False},
+        as_node="audit",
+    )
+
+    assert final_state["status"] == "completed"
+    assert nodes.ran("correct")[0]["user_tweak_instruction"] == "warmer colors"
+    assert nodes.ran("generate")[-1]["prompt"] == "A summer banner (warmer colors)"
+    assert nodes.ran("generate")[-1]["attempt_count"] == 1
+
+
+async def test_resume_without_checkpoint_falls_back(nodes):
+    checkpointer = WorkflowCheckpointer(backend="memory")
+    workflow = generation.create_generation_workflow(checkpointer=checkpointer.saver)
+
+    assert await checkpointer.resume(workflow, "unknown-job", {"user_decision": "approve"}) is None
+
+    disabled = WorkflowCheckpointer(backend="none")
+    assert disabled.saver is None
+    assert await disabled.resume(workflow, "job-1", {"user_decision": "approve"}) is None
+
+
+async def test_workflow_without_checkpointer_ends_at_review(nodes):
+    workflow = generation.create_generation_workflow()
+
+    final_state = await workflow.ainvoke(initial_state())
+
+    assert final_state["status"] == "needs_review"
+    assert nodes.ran("finalize") == []
+
+
+async def test_tweak_without_checkpointer_stops_at_needs_review_again(nodes):
+    # The review fallback rebuilds the state with the decision already set
+    nodes.scores = [80, 80, 80]
+    workflow = generation.create_generation_workflow()
+
+    final_state = await workflow.ainvoke({**initial_state(), "user_decision": "tweak"})
+
+    assert final_state["status"] == "needs_review"
+    assert len(nodes.ran("generate")) == 1
+
+
+def test_unknown_backend_raises():
+    with pytest.raises(ValueError):
+        WorkflowCheckpointer(backend="redis")
@@ -0,0 +1,57 @@
+"""
+Unit tests for the compile-once workflow registry.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from mobius.graphs.registry import WorkflowRegistry, get_generation_workflow, workflow_registry
+
+
+def test_workflow_is_compiled_once_and_shared():
+    """Test that the factory runs on first use only."""
+    registry = WorkflowRegistry()
+    factory = MagicMock(side_effect=lambda: object())
+    registry.register("generation", factory)
+
+    first = registry.get("generation")
+
+    assert registry.get("generation") is first
+    factory.assert_called_once()
+    stats = registry.stats()
+    assert stats["compiled"] == ["generation"]
+    assert stats["compile_ms"]["generation"] >= 0
+
+
+def test_warm_up_compiles_every_registered_workflow():
+    """Test that warm_up compiles ahead of use and reports compile times."""
+    registry = WorkflowRegistry()
+    generation, ingestion = MagicMock(), MagicMock()
+    registry.register("generation", generation)
+    registry.register("ingestion", ingestion)
+
+    compile_ms = registry.warm_up()
+
+    assert set(compile_ms) == {"generation", "ingestion"}
+    generation.assert_called_once()
+    ingestion.assert_called_once()
+
+    registry.clear()
+    registry.get("generation")
+    assert generation.call_count == 2
+
+
+def test_unknown_workflow_raises():
+    with pytest.raises(KeyError):
+        WorkflowRegistry().get("missing")
+
+
+def test_global_registry_compiles_the_generation_graph():
+    """Test that the real generation graph compiles once per process."""
+    workflow_registry.clear()
+
+    workflow = get_generation_workflow()
+
+    assert get_generation_workflow() is workflow
+    assert "generate" in workflow.get_graph().nodes